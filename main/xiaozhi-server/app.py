@@ -10,6 +10,8 @@ from core.http_server import SimpleHttpServer
 from core.websocket_server import WebSocketServer
 from core.utils.util import check_ffmpeg_installed
 from core.utils.gc_manager import get_gc_manager
+from core.utils.http_pool import close_http_clients
+from core.providers.tools.server_mcp.mcp_pool import server_mcp_pool
 
 TAG = __name__
 logger = setup_logging()
@@ -129,6 +131,10 @@ async def main():
     finally:
         # 停止全局GC管理器
         await gc_manager.stop()
+        # 关闭共享HTTP客户端的长连接
+        await close_http_clients()
+        # 停止共享的服务端MCP服务（stdio子进程）和健康检查
+        await server_mcp_pool.close_all()
 
         # 取消所有任务（关键修复点）
         stdin_task.cancel()
@@ -45,6 +45,13 @@ from core.utils.prompt_manager import PromptManager
 from core.utils.voiceprint_provider import VoiceprintProvider
 from core.utils.util import get_system_error_response
 from core.utils import textUtils
+from core.utils import llm as llm_utils
+from core.utils.pipeline import BridgeQueue, is_async_pipeline, get_shared_executor
+from core.utils.audio_ingress import get_audio_ingress, is_audio_ingress_enabled
+from core.utils.pcm_buffer import PcmArena, PcmFrameBuffer
+from core.utils.stream_json import JsonFieldStream
+from core.utils.speculative_stream import SpeculativeStream
+from core.utils.tool_retrieval import ToolRetriever
 
 
 TAG = __name__
@@ -75,6 +82,11 @@ DIRECT_ANSWER_TOOL = {
     },
 }
 
+# response 中可能泄漏的 JSON 闭合垃圾字符
+RESPONSE_GARBAGE_CHARS = frozenset('")\'}）')
+# 流式播报 direct_answer 时，末尾出现这些字符先暂缓发送，等确认不是垃圾再送 TTS
+DA_HOLD_CHARS = RESPONSE_GARBAGE_CHARS | frozenset("] \t\r\n")
+
 
 class ConnectionHandler:
     def __init__(
@@ -114,18 +126,42 @@ class ConnectionHandler:
 
         # 客户端状态相关
         self.client_abort = False
+        # 当前对话任务及其打断事件，打断时取消进行中的LLM请求
+        self.llm_task = None
+        self.llm_abort_event = None
+        # 意图识别期间预先发起的主LLM请求（intent_llm 模式的 speculative_chat）
+        self.speculative_chat = False
+        self.speculative_llm = None
+        # function_call 模式按用户问题筛选工具（tool_retrieval），本轮选中的工具在递归调用时沿用
+        self.tool_retriever = None
+        self.turn_functions = None
         self.client_is_speaking = False
         self.client_listen_mode = "auto"
         self.client_aec = False  # 是否启用了服务端AEC
+        # AEC参考帧缓存由事件循环写入、音频入口分片线程读取，读写都需持有该锁
+        self.aec_cache_lock = threading.Lock()
 
         # 线程任务相关
         self.loop = None  # 在 handle_connection 中获取运行中的事件循环
         self.stop_event = threading.Event()
-        self.executor = ThreadPoolExecutor(max_workers=5)
+        # asyncio 管线模式：队列消费改为事件循环任务，阻塞任务使用进程级共享线程池
+        self.use_async_pipeline = is_async_pipeline(self.config)
+        if self.use_async_pipeline:
+            self.executor = get_shared_executor(
+                self.config.get("shared_executor_workers")
+            )
+        else:
+            self.executor = ThreadPoolExecutor(max_workers=5)
+
+        # 音频入口分片：解码、AEC、VAD推理在分片线程中完成，不占用事件循环
+        self.audio_ingress = None
+        if is_audio_ingress_enabled(self.config):
+            self.audio_ingress = get_audio_ingress(self.config)
 
         # 添加上报线程池
         self.report_queue = queue.Queue()
         self.report_thread = None
+        self.report_task = None
         # 未来可以通过修改此处，调节asr的上报和tts的上报，目前默认都开启
         self.report_asr_enable = self.read_config_from_api
         self.report_tts_enable = self.read_config_from_api
@@ -139,31 +175,52 @@ class ConnectionHandler:
         self.llm = _llm
         self.memory = _memory
         self.intent = _intent
+        # 从共享注册表获取的LLM实例，关闭连接时归还
+        self.acquired_llms = []
+        if _llm is not None:
+            # 沿用服务器的LLM实例也持有引用，服务器重载配置换用新LLM后，旧实例在连接关闭前不会被释放
+            llm_utils.retain_instance(_llm)
+            self.acquired_llms.append(_llm)
 
         # 为每个连接单独管理声纹识别
         self.voiceprint_provider = None
 
         # vad相关变量
-        self.client_audio_buffer = bytearray()
+        self.client_audio_buffer = PcmArena()  # 待VAD推理的PCM，按块零拷贝读取
+        # 启用音频入口分片时，VAD缓冲区和模型状态只由分片线程读写；
+        # 事件循环重置时只增加序号，由分片线程在处理下一个音频包前清空
+        self.vad_reset_seq = 0
+        self.vad_reset_applied = 0
         self.client_have_voice = False
         self.client_voice_window = deque(maxlen=5)
         self.first_activity_time = 0.0  # 记录首次活动的时间（毫秒）
         self.last_activity_time = 0.0  # 统一的活动时间戳（毫秒）
         self.vad_last_voice_time = 0.0  # 记录用户最后一次说话的时间（毫秒）
         self.client_voice_stop = False
+        self.client_voice_pause = False  # 短暂停顿（达到预识别静音时长，未达到结束阈值）
         self.last_is_voice = False
 
         # asr相关变量
         # 因为实际部署时可能会用到公共的本地ASR，不能把变量暴露给公共ASR
         # 所以涉及到ASR的变量，需要在这里定义，属于connection的私有变量
-        self.asr_audio = []  # 存储PCM帧列表，供VAD和ASR共享
+        self.asr_audio = PcmFrameBuffer()  # 存储PCM帧（兼容帧列表用法），供VAD和ASR共享
+        self.asr_incremental_active = False  # 本地流式ASR是否已开始当前这句话的增量识别
+        self.asr_speculation = None  # 短暂停顿时开始的预识别
         self.asr_audio_queue = queue.Queue()
         self.current_speaker = None  # 存储当前说话人
         self.introduced_speakers = set()  # 已"首次引入"的说话人，控制只在首轮带名字
         self.system_introduced_speakers = set()  # 已在 system 注入过身份的说话人，控制 system 身份只首轮出现
 
         # llm相关变量
-        self.dialogue = Dialogue()
+        history_config = self.config.get("dialogue_history") or {}
+        self.dialogue = Dialogue(
+            cache_friendly=str(self.config.get("prompt_cache_layout", False)).lower()
+            in ("true", "1", "yes"),
+            token_budget=int(history_config.get("token_budget", 0) or 0),
+            keep_recent_turns=int(history_config.get("keep_recent_turns", 4)),
+        )
+        if str(history_config.get("summarize", True)).lower() in ("true", "1", "yes"):
+            self.dialogue.set_summarizer(self._summarize_dialogue, self.executor)
 
         # tts相关变量
         self.sentence_id = None
@@ -204,6 +261,14 @@ class ConnectionHandler:
         try:
             # 获取运行中的事件循环（必须在异步上下文中）
             self.loop = asyncio.get_running_loop()
+            if self.use_async_pipeline:
+                # 音频是实时数据，消费跟不上时丢弃最旧的帧，避免积压
+                self.asr_audio_queue = BridgeQueue(
+                    self.loop,
+                    maxsize=int(self.config.get("asr_audio_queue_size", 500)),
+                    drop_oldest=True,
+                )
+                self.report_queue = BridgeQueue(self.loop)
 
             # 获取并验证headers
             self.headers = dict(ws.request.headers)
@@ -368,6 +433,10 @@ class ConnectionHandler:
             if self.vad is None or self.asr is None:
                 return
 
+            if self.audio_ingress is not None:
+                self._submit_audio_ingress(message)
+                return
+
             # 处理来自MQTT网关的音频包
             if self.conn_from_mqtt_gateway and len(message) >= 16:
                 handled = await self._process_mqtt_audio_message(message)
@@ -379,6 +448,16 @@ class ConnectionHandler:
             if pcm_frame:
                 self.asr_audio_queue.put(pcm_frame)
 
+    def _submit_audio_ingress(self, message):
+        """把音频包交给入口分片线程，解码、AEC和VAD推理都在分片线程中完成"""
+        timestamp = 0
+        if self.conn_from_mqtt_gateway and len(message) >= 16:
+            # 解析MQTT网关音频包的16字节头部
+            timestamp = int.from_bytes(message[8:12], "big")
+            message = message[16:]
+        if not self.audio_ingress.submit(self, message, timestamp):
+            self.logger.bind(tag=TAG).debug("音频入口分片队列已满，丢弃音频包")
+
     async def _process_mqtt_audio_message(self, message):
         """
         处理来自MQTT网关的音频消息，解析16字节头部并提取音频数据，在入队前进行AEC处理
@@ -426,16 +505,21 @@ class ConnectionHandler:
             if mic_rms < 100:
                 return pcm_frame
 
-            sorted_timestamps = sorted(self.aec_audio_cache.keys())
-            if len(sorted_timestamps) < 2:
-                return pcm_frame
+            # 在锁内取出候选参考帧，之后的计算不再访问缓存
+            with self.aec_cache_lock:
+                sorted_timestamps = sorted(self.aec_audio_cache.keys())
+                if len(sorted_timestamps) < 2:
+                    return pcm_frame
+                # 找最接近的timestamp作为起点
+                closest_idx = min(range(len(sorted_timestamps)), key=lambda i: abs(sorted_timestamps[i] - timestamp))
+                ref_frames = {
+                    ts: self.aec_audio_cache[ts]
+                    for ts in sorted_timestamps[max(closest_idx - 2, 0):closest_idx + 3]
+                }
 
             # ========== 匹配参考帧（对数功率谱匹配） ==========
             n = len(mic_audio)
 
-            # 找最接近的timestamp作为起点
-            closest_idx = min(range(len(sorted_timestamps)), key=lambda i: abs(sorted_timestamps[i] - timestamp))
-
             # 预计算 mic_audio 的对数功率谱（循环内共用，避免重复FFT）
             mic_window = np.hanning(n)
             mic_fft = np.fft.rfft(mic_audio * mic_window)
@@ -453,7 +537,7 @@ class ConnectionHandler:
                 if test_idx < 0 or test_idx >= len(sorted_timestamps):
                     continue
                 test_ts = sorted_timestamps[test_idx]
-                test_ref = np.frombuffer(self.aec_audio_cache[test_ts], dtype=np.int16).astype(np.float32)
+                test_ref = np.frombuffer(ref_frames[test_ts], dtype=np.int16).astype(np.float32)
                 test_ref_rms = np.sqrt(np.mean(test_ref ** 2))
                 if test_ref_rms < 50:
                     continue
@@ -473,7 +557,7 @@ class ConnectionHandler:
                     best_ref_rms = test_ref_rms
 
             best_ts = sorted_timestamps[best_ref_idx]
-            best_ref = np.frombuffer(self.aec_audio_cache[best_ts], dtype=np.int16).astype(np.float32)
+            best_ref = np.frombuffer(ref_frames[best_ts], dtype=np.int16).astype(np.float32)
             ref_rms = best_ref_rms
 
             if ref_rms < 50:
@@ -733,6 +817,13 @@ class ConnectionHandler:
             return
         if self.chat_history_conf == 0:
             return
+        if self.use_async_pipeline:
+            if self.report_task is None or self.report_task.done():
+                self.report_task = asyncio.run_coroutine_threadsafe(
+                    self._report_worker_async(), self.loop
+                )
+                self.logger.bind(tag=TAG).info("TTS上报任务已启动")
+            return
         if self.report_thread is None or not self.report_thread.is_alive():
             self.report_thread = threading.Thread(
                 target=self._report_worker, daemon=True
@@ -809,6 +900,8 @@ class ConnectionHandler:
             )
             private_config["delete_audio"] = bool(self.config.get("delete_audio", True))
             private_config["tts_timeout"] = self.config.get("tts_timeout", 15)
+            # 录音工件和归档是进程级设置，沿用服务器配置
+            private_config["asr_audio_artifacts"] = self.config.get("asr_audio_artifacts", {})
             self.logger.bind(tag=TAG).info(
                 f"{time.time() - begin_time} 秒，异步获取差异化配置成功: {json.dumps(filter_sensitive_info(private_config), ensure_ascii=False)}"
             )
@@ -948,6 +1041,7 @@ class ConnectionHandler:
             self.asr = modules["asr"]
         if modules.get("llm", None) is not None:
             self.llm = modules["llm"]
+            self.acquired_llms.append(self.llm)
         if modules.get("intent", None) is not None:
             self.intent = modules["intent"]
         if modules.get("memory", None) is not None:
@@ -978,14 +1072,13 @@ class ConnectionHandler:
                 "llm"
             ]
             if memory_llm_name and memory_llm_name in self.config["LLM"]:
-                # 如果配置了专用LLM，则创建独立的LLM实例
-                from core.utils import llm as llm_utils
-
+                # 如果配置了专用LLM，则从共享注册表获取（相同配置的连接共用）
                 memory_llm_config = self.config["LLM"][memory_llm_name]
                 memory_llm_type = memory_llm_config.get("type", memory_llm_name)
-                memory_llm = llm_utils.create_instance(
+                memory_llm = llm_utils.acquire_instance(
                     memory_llm_type, memory_llm_config
                 )
+                self.acquired_llms.append(memory_llm)
                 self.logger.bind(tag=TAG).info(
                     f"为记忆总结创建了专用LLM: {memory_llm_name}, 类型: {memory_llm_type}"
                 )
@@ -1013,21 +1106,31 @@ class ConnectionHandler:
         # 如果使用 nointent，直接返回
         if intent_type == "nointent":
             return
+        elif intent_type == "function_call":
+            retrieval_config = intent_config[
+                self.config["selected_module"]["Intent"]
+            ].get("tool_retrieval") or {}
+            if retrieval_config.get("enable", False):
+                self.tool_retriever = ToolRetriever(retrieval_config)
         # 使用 intent_llm 模式
         elif intent_type == "intent_llm":
+            # 意图识别与主LLM生成并发
+            speculative_chat = intent_config[
+                self.config["selected_module"]["Intent"]
+            ].get("speculative_chat", False)
+            self.speculative_chat = str(speculative_chat).lower() in ("true", "1", "yes")
             intent_llm_name = intent_config[self.config["selected_module"]["Intent"]][
                 "llm"
             ]
 
             if intent_llm_name and intent_llm_name in self.config["LLM"]:
-                # 如果配置了专用LLM，则创建独立的LLM实例
-                from core.utils import llm as llm_utils
-
+                # 如果配置了专用LLM，则从共享注册表获取（相同配置的连接共用）
                 intent_llm_config = self.config["LLM"][intent_llm_name]
                 intent_llm_type = intent_llm_config.get("type", intent_llm_name)
-                intent_llm = llm_utils.create_instance(
+                intent_llm = llm_utils.acquire_instance(
                     intent_llm_type, intent_llm_config
                 )
+                self.acquired_llms.append(intent_llm)
                 self.logger.bind(tag=TAG).info(
                     f"为意图识别创建了专用LLM: {intent_llm_name}, 类型: {intent_llm_type}"
                 )
@@ -1044,12 +1147,174 @@ class ConnectionHandler:
         if hasattr(self, "loop") and self.loop:
             asyncio.run_coroutine_threadsafe(self.func_handler._initialize(), self.loop)
 
+    def _summarize_dialogue(self, previous_summary, messages):
+        """在线程池中用LLM汇总超出token预算的旧对话"""
+        if self.llm is None:
+            return None
+        lines = []
+        for message in messages:
+            content = message.get("content")
+            if not content or message["role"] not in ("user", "assistant"):
+                continue
+            lines.append(f"{message['role']}: {content}")
+        if not lines:
+            return previous_summary
+        system_prompt = (
+            "你是对话记录整理助手。请把已有摘要和新的对话记录合并成一段简洁的中文摘要，"
+            "保留用户身份、偏好、约定和未完成的事项，不超过200字，只输出摘要内容。"
+        )
+        user_prompt = f"已有摘要：{previous_summary or '无'}\n新的对话记录：\n" + "\n".join(lines)
+        summary = self.llm.response_no_stream(system_prompt, user_prompt)
+        self.logger.bind(tag=TAG).info(f"对话历史超出预算，已汇总 {len(messages)} 条旧消息")
+        return summary.strip() if summary else None
+
     def change_system_prompt(self, prompt):
         self.prompt = prompt
         # 更新系统prompt至上下文
         self.dialogue.update_system_message(self.prompt)
 
+    def start_chat(self, query, speculative=None):
+        """在事件循环中启动一轮对话，每轮使用新的打断事件
+        speculative 为意图识别期间预先发起的请求，确认为普通对话后直接接续其输出
+        """
+        self.llm_abort_event = asyncio.Event()
+        if speculative is not None:
+            if speculative is not self.speculative_llm:
+                # 意图识别期间已被打断取消
+                speculative = None
+            elif speculative.history_mark != self._history_mark():
+                # 意图识别期间对话历史被改动（如清理了工具消息），预先发起的请求上下文已过期
+                self.logger.bind(tag=TAG).debug("对话历史已变化，放弃预先生成的回复")
+                speculative.cancel()
+                speculative = None
+            else:
+                self.logger.bind(tag=TAG).debug(
+                    f"采用预先生成的回复，已缓冲 {speculative.buffered} 段"
+                )
+        self.speculative_llm = None
+        self.llm_task = self.loop.create_task(
+            self.chat_async(query, speculative=speculative)
+        )
+        return self.llm_task
+
+    def abort_chat(self):
+        """打断进行中的对话：取消正在读取的LLM流，断开HTTP请求"""
+        if self.llm_abort_event is not None:
+            self.llm_abort_event.set()
+        self.cancel_speculative_chat()
+
     def chat(self, query, depth=0):
+        """同步接口，供线程中调用：在事件循环中执行对话并等待结束"""
+
+        async def _run():
+            if depth == 0:
+                return await self.start_chat(query)
+            return await self.chat_async(query, depth)
+
+        return asyncio.run_coroutine_threadsafe(_run(), self.loop).result()
+
+    async def _iterate_until_abort(self, stream, abort_event):
+        """迭代LLM流，打断时立即取消进行中的读取并关闭流"""
+        if abort_event is None:
+            abort_event = asyncio.Event()
+        abort_wait = asyncio.ensure_future(abort_event.wait())
+        next_item = None
+        try:
+            while not self.client_abort:
+                next_item = asyncio.ensure_future(stream.__anext__())
+                await asyncio.wait(
+                    {next_item, abort_wait}, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not next_item.done():
+                    self.logger.bind(tag=TAG).info("对话被打断，取消LLM请求")
+                    break
+                try:
+                    item = next_item.result()
+                except StopAsyncIteration:
+                    break
+                yield item
+        finally:
+            abort_wait.cancel()
+            if next_item is not None and not next_item.done():
+                # 取消会传入服务商的异步生成器，由其关闭进行中的HTTP响应
+                next_item.cancel()
+                await asyncio.gather(next_item, return_exceptions=True)
+            await stream.aclose()
+
+    def _speaker_for_system(self):
+        """仅在该说话人首次出现时把身份注入 system，之后靠对话历史首轮保留，
+        避免每轮在 system 重复出现名字诱导模型反复称呼
+        """
+        cs = (self.current_speaker or "").strip()
+        if cs and cs != "未知说话人" and cs not in self.system_introduced_speakers:
+            return cs
+        return None
+
+    async def _open_llm_stream(self, query, functions, speaker_for_system, pending=None):
+        """查询记忆并发起LLM流式请求，pending 为尚未写入对话历史的本轮用户消息"""
+        # 使用带记忆的对话
+        memory_str = None
+        # 仅当query非空（代表用户询问）时查询记忆
+        if self.memory is not None and query:
+            memory_str = await self.memory.query_memory(query)
+
+        dialogue = self.dialogue.get_llm_dialogue_with_memory(
+            memory_str, self.config.get("voiceprint", {}), speaker_for_system, pending
+        )
+        if self.intent_type == "function_call" and functions is not None:
+            # 使用支持functions的streaming接口
+            return self.llm.response_stream_with_functions(
+                self.session_id, dialogue, functions=functions
+            )
+        return self.llm.response_stream(self.session_id, dialogue)
+
+    def _history_mark(self):
+        """对话历史的标记，用于判断预先发起请求之后历史是否被改动"""
+        messages = self.dialogue.dialogue
+        return len(messages), messages[-1].uniq_id if messages else None
+
+    def start_speculative_chat(self, query):
+        """intent_llm 模式下与意图识别并发，预先发起主LLM请求，输出先缓冲不播报"""
+        if not self.speculative_chat or self.intent_type != "intent_llm":
+            return None
+        self.cancel_speculative_chat()
+        speaker_for_system = self._speaker_for_system()
+        pending = Message(role="user", content=query)
+        speculative = SpeculativeStream(
+            self.loop,
+            lambda: self._open_llm_stream(query, None, speaker_for_system, pending),
+        )
+        speculative.speaker_for_system = speaker_for_system
+        speculative.history_mark = self._history_mark()
+        self.speculative_llm = speculative
+        return speculative
+
+    def cancel_speculative_chat(self):
+        """意图已被处理（或连接关闭），取消预先发起的请求"""
+        if self.speculative_llm is not None:
+            self.speculative_llm.cancel()
+            self.speculative_llm = None
+
+    def _retrieve_functions(self, tool_schema, query):
+        """按用户问题筛选本轮的工具，最近几轮调用过的工具一并保留，便于追问"""
+        text = query or ""
+        if text.startswith("{"):
+            # 带说话人信息的消息只取内容
+            try:
+                text = json.loads(text).get("content", text)
+            except (ValueError, AttributeError):
+                pass
+        recent_tools = set()
+        for message in self.dialogue.dialogue[-8:]:
+            for tool_call in message.tool_calls or ():
+                recent_tools.add(tool_call.get("function", {}).get("name"))
+        functions = self.tool_retriever.select(tool_schema, text, recent_tools)
+        self.logger.bind(tag=TAG).debug(
+            f"工具筛选: {len(tool_schema.functions)} -> {len(functions)}"
+        )
+        return functions
+
+    async def chat_async(self, query, depth=0, speculative=None):
         # 保存当前任务的sentence_id到局部变量，避免被新任务覆盖
         current_sentence_id = None
 
@@ -1097,48 +1362,37 @@ class ConnectionHandler:
                 and hasattr(self, "func_handler")
                 and not force_final_answer
         ):
-            functions = list(self.func_handler.get_functions())
+            # 编译后的工具描述在工具变化前每轮复用，列表只读
+            tool_schema = self.func_handler.get_tool_schema()
+            selected = tool_schema.functions
+            if self.tool_retriever is not None:
+                if depth == 0:
+                    self.turn_functions = self._retrieve_functions(tool_schema, query)
+                selected = self.turn_functions or selected
             # 仅在第一层调用时注入 direct_answer 虚拟工具
             # 递归调用（depth>0）不注入，避免模型在生成文本回复时再次调 direct_answer 导致循环
-            if functions is not None and depth == 0:
-                functions.append(DIRECT_ANSWER_TOOL)
+            if depth == 0:
+                if selected is tool_schema.functions:
+                    functions = tool_schema.with_tool(DIRECT_ANSWER_TOOL)
+                else:
+                    functions = selected + [DIRECT_ANSWER_TOOL]
+            else:
+                functions = selected
 
         response_message = []
 
         try:
-            # 使用带记忆的对话
-            memory_str = None
-            # 仅当query非空（代表用户询问）时查询记忆
-            if self.memory is not None and query:
-                future = asyncio.run_coroutine_threadsafe(
-                    self.memory.query_memory(query), self.loop
-                )
-                memory_str = future.result()
-
-            # 仅在该说话人首次出现时把身份注入 system，之后靠对话历史首轮保留，
-            # 避免每轮在 system 重复出现名字诱导模型反复称呼
-            speaker_for_system = None
-            cs = (self.current_speaker or "").strip()
-            if cs and cs != "未知说话人" and cs not in self.system_introduced_speakers:
-                self.system_introduced_speakers.add(cs)
-                speaker_for_system = cs
-
-            if self.intent_type == "function_call" and functions is not None:
-                # 使用支持functions的streaming接口
-                llm_responses = self.llm.response_with_functions(
-                    self.session_id,
-                    self.dialogue.get_llm_dialogue_with_memory(
-                        memory_str, self.config.get("voiceprint", {}), speaker_for_system
-                    ),
-                    functions=functions,
-                )
+            if speculative is not None:
+                # 意图识别期间预先发起的请求：回放已缓冲的输出并接续实时输出
+                speaker_for_system = speculative.speaker_for_system
+                llm_responses = speculative.iterate()
             else:
-                llm_responses = self.llm.response(
-                    self.session_id,
-                    self.dialogue.get_llm_dialogue_with_memory(
-                        memory_str, self.config.get("voiceprint", {}), speaker_for_system
-                    ),
+                speaker_for_system = self._speaker_for_system()
+                llm_responses = await self._open_llm_stream(
+                    query, functions, speaker_for_system
                 )
+            if speaker_for_system:
+                self.system_introduced_speakers.add(speaker_for_system)
         except Exception as e:
             self.logger.bind(tag=TAG).error(f"LLM 处理出错 {query}: {e}")
             return None
@@ -1150,9 +1404,9 @@ class ConnectionHandler:
         content_arguments = ""
         emotion_flag = True
         try:
-            for response in llm_responses:
-                if self.client_abort:
-                    break
+            async for response in self._iterate_until_abort(
+                llm_responses, self.llm_abort_event
+            ):
                 if self.intent_type == "function_call" and functions is not None:
                     content, tools_call = response
                     if "content" in response:
@@ -1168,40 +1422,30 @@ class ConnectionHandler:
                     if tools_call is not None and len(tools_call) > 0:
                         tool_call_flag = True
                         self._merge_tool_calls(tool_calls_list, tools_call)
+                        self._dispatch_early_tool_calls(tool_calls_list)
 
-                    # 流式提取 direct_answer 的 response 参数，实时送 TTS
-                    # 使用安全缓冲区，防止 JSON 闭合符号泄漏到 TTS
-                    _DA_STREAM_BUFFER = 5
+                    # 流式播报 direct_answer 的 response 参数：解析器只处理新到达的片段，
+                    # 这里只取本次新解码出的文本送 TTS
                     for tc in tool_calls_list:
-                        if tc["name"] == "direct_answer" and tc.get("arguments"):
-                            da_text = self._extract_direct_answer_response(tc["arguments"])
-                            sent_len = tc.get("_da_sent", 0)
-                            if da_text and len(da_text) > sent_len:
-                                safe_end = max(sent_len, len(da_text) - _DA_STREAM_BUFFER)
-                                if safe_end > sent_len:
-                                    new_part = da_text[sent_len:safe_end]
-                                    # 清理 delta 中可能泄漏的 JSON 闭合垃圾
-                                    new_part = self._clean_response_garbage(new_part)
-                                    if new_part:
-                                        tc["_da_sent"] = safe_end
-                                        self.tts.tts_text_queue.put(
-                                            TTSMessageDTO(
-                                                sentence_id=current_sentence_id,
-                                                sentence_type=SentenceType.MIDDLE,
-                                                content_type=ContentType.TEXT,
-                                                content_detail=new_part,
-                                            )
-                                        )
+                        if tc["name"] == "direct_answer" and tc.get("_da_new"):
+                            new_part = self._stream_direct_answer_text(tc, tc["_da_new"])
+                            tc["_da_new"] = ""
+                            if new_part:
+                                self.tts.tts_text_queue.put(
+                                    TTSMessageDTO(
+                                        sentence_id=current_sentence_id,
+                                        sentence_type=SentenceType.MIDDLE,
+                                        content_type=ContentType.TEXT,
+                                        content_detail=new_part,
+                                    )
+                                )
                 else:
                     content = response
 
                 # 在llm回复中获取情绪表情，一轮对话只在开头获取一次
                 if emotion_flag and content is not None and content.strip():
                     if (self.features or {}).get("emoji", True):
-                        asyncio.run_coroutine_threadsafe(
-                            textUtils.get_emotion(self, content),
-                            self.loop,
-                        )
+                        self.loop.create_task(textUtils.get_emotion(self, content))
                     emotion_flag = False
 
                 if content is not None and len(content) > 0:
@@ -1217,6 +1461,7 @@ class ConnectionHandler:
                         )
         except Exception as e:
             self.logger.bind(tag=TAG).error(f"LLM stream processing error: {e}")
+            self._cancel_early_tool_calls(tool_calls_list)
             self.tts.tts_text_queue.put(
                 TTSMessageDTO(
                     sentence_id=current_sentence_id,
@@ -1274,11 +1519,18 @@ class ConnectionHandler:
                         f"模型选择 direct_answer，流式已播报，写入对话历史"
                     )
                     for tc in direct_answer_calls:
-                        da_response = self._extract_direct_answer_response(tc.get("arguments", "{}"))
+                        parser = tc.get("_parser")
+                        if parser is not None and parser.field_found:
+                            da_response = parser.value
+                            # 刷新流式阶段暂缓发送的部分
+                            remaining = self._stream_direct_answer_text(
+                                tc, tc.get("_da_new", ""), final=True
+                            )
+                        else:
+                            # 参数不是规范的 JSON（或来自文本格式的工具调用），整体提取
+                            da_response = self._extract_direct_answer_response(tc.get("arguments", "{}"))
+                            remaining = da_response
                         if da_response:
-                            # 刷新流式缓冲区中未发送的部分
-                            sent_len = tc.get("_da_sent", 0)
-                            remaining = da_response[sent_len:]
                             if remaining:
                                 remaining = self._clean_response_garbage(remaining)
                                 if remaining:
@@ -1321,8 +1573,8 @@ class ConnectionHandler:
                     self.dialogue.put(Message(role="assistant", content=streamed_text))
                 response_message.clear()
 
-                # 收集所有工具调用的 Future
-                futures_with_data = []
+                # 收集所有工具调用的任务，并发执行
+                tasks_with_data = []
                 for tool_call_data in tool_calls_list:
                     self.logger.bind(tag=TAG).debug(
                         f"function_name={tool_call_data['name']}, function_id={tool_call_data['id']}, function_arguments={tool_call_data['arguments']}"
@@ -1332,22 +1584,24 @@ class ConnectionHandler:
                     tool_input = json.loads(tool_call_data.get("arguments") or "{}")
                     enqueue_tool_report(self, tool_call_data['name'], tool_input)
 
-                    future = asyncio.run_coroutine_threadsafe(
-                        self.func_handler.handle_llm_function_call(
-                            self, tool_call_data
-                        ),
-                        self.loop,
-                    )
-                    futures_with_data.append((future, tool_call_data, tool_input))
+                    # 流式阶段已提前开始执行的工具直接复用其任务
+                    task = tool_call_data.get("_task")
+                    if task is None:
+                        task = self.loop.create_task(
+                            self.func_handler.handle_llm_function_call(
+                                self, tool_call_data
+                            )
+                        )
+                    tasks_with_data.append((task, tool_call_data, tool_input))
 
                 # 工具调用超时时间，可配置，默认30秒
                 tool_call_timeout = int(self.config.get("tool_call_timeout", 30))
                 # 等待协程结束（实际等待时长为最慢的那个）
                 tool_results = []
 
-                for future, tool_call_data, tool_input in futures_with_data:
+                for task, tool_call_data, tool_input in tasks_with_data:
                     try:
-                        result = future.result(timeout=tool_call_timeout)
+                        result = await asyncio.wait_for(task, timeout=tool_call_timeout)
                         tool_results.append((result, tool_call_data))
                         # 使用公共方法上报工具调用结果
                         enqueue_tool_report(self, tool_call_data['name'], tool_input, str(result.result) if result.result else None, report_tool_call=False)
@@ -1366,7 +1620,7 @@ class ConnectionHandler:
 
                 # 统一处理工具调用结果
                 if tool_results:
-                    self._handle_function_result(tool_results, depth=depth, streamed_text=streamed_text)
+                    await self._handle_function_result(tool_results, depth=depth, streamed_text=streamed_text)
 
         # 存储对话内容
         if len(response_message) > 0:
@@ -1391,7 +1645,7 @@ class ConnectionHandler:
 
         return True
 
-    def _handle_function_result(self, tool_results, depth, streamed_text=""):
+    async def _handle_function_result(self, tool_results, depth, streamed_text=""):
         need_llm_tools = []
         record_tools = []
 
@@ -1497,7 +1751,7 @@ class ConnectionHandler:
                         )
                     )
 
-            self.chat(None, depth=depth + 1)
+            await self.chat_async(None, depth=depth + 1)
 
     def _report_worker(self):
         """聊天记录上报工作线程"""
@@ -1522,6 +1776,23 @@ class ConnectionHandler:
 
         self.logger.bind(tag=TAG).info("聊天记录上报线程已退出")
 
+    async def _report_worker_async(self):
+        """聊天记录上报任务（asyncio 管线模式）"""
+        while not self.stop_event.is_set():
+            try:
+                item = await self.report_queue.async_get(timeout=1)
+            except asyncio.TimeoutError:
+                continue
+            if item is None:  # 检测毒丸对象
+                break
+            try:
+                # 上报涉及音频编解码，交给共享线程池，不等待完成
+                self.loop.run_in_executor(self.executor, self._process_report, *item)
+            except Exception as e:
+                self.logger.bind(tag=TAG).error(f"聊天记录上报任务异常: {e}")
+
+        self.logger.bind(tag=TAG).info("聊天记录上报任务已退出")
+
     def _process_report(self, type, text, audio_data, report_time):
         """处理上报任务"""
         try:
@@ -1579,8 +1850,9 @@ class ConnectionHandler:
 
             # 清理AEC缓存
             if hasattr(self, "aec_audio_cache"):
-                self.aec_audio_cache.clear()
-                self.aec_audio_cache_time.clear()
+                with self.aec_cache_lock:
+                    self.aec_audio_cache.clear()
+                    self.aec_audio_cache_time.clear()
 
             # 清理工具处理器资源
             if hasattr(self, "func_handler") and self.func_handler:
@@ -1591,12 +1863,24 @@ class ConnectionHandler:
                         f"清理工具处理器时出错: {cleanup_error}"
                     )
 
+            # 取消意图识别期间预先发起的LLM请求
+            self.cancel_speculative_chat()
+
             # 触发停止事件
             if self.stop_event:
                 self.stop_event.set()
 
             # 清空任务队列
             self.clear_queues()
+            if self.use_async_pipeline:
+                # 唤醒可能阻塞在队列上的共享线程池任务，避免占用共享线程
+                for q in (self.asr_audio_queue, self.report_queue):
+                    if isinstance(q, BridgeQueue):
+                        q.close()
+                if self.tts:
+                    for q in (self.tts.tts_text_queue, self.tts.tts_audio_queue):
+                        if isinstance(q, BridgeQueue):
+                            q.close()
 
             # 关闭WebSocket连接
             try:
@@ -1637,10 +1921,11 @@ class ConnectionHandler:
             if self.tts:
                 await self.tts.close()
             if self.asr:
+                self.asr.discard_incremental(self.session_id)
                 await self.asr.close()
 
-            # 最后关闭线程池（避免阻塞）
-            if self.executor:
+            # 最后关闭线程池（避免阻塞），共享线程池由进程统一管理，不能关闭
+            if self.executor and not self.use_async_pipeline:
                 try:
                     self.executor.shutdown(wait=False)
                 except Exception as executor_error:
@@ -1652,6 +1937,10 @@ class ConnectionHandler:
         except Exception as e:
             self.logger.bind(tag=TAG).error(f"关闭连接时出错: {e}")
         finally:
+            # 归还共享的LLM实例
+            acquired_llms, self.acquired_llms = self.acquired_llms, []
+            for acquired_llm in acquired_llms:
+                llm_utils.release_instance(acquired_llm)
             # 确保停止事件被设置
             if self.stop_event:
                 self.stop_event.set()
@@ -1691,15 +1980,25 @@ class ConnectionHandler:
         重置所有音频相关状态(VAD + ASR)
         """
         # Reset VAD states
-        self.client_audio_buffer.clear()
+        if self.audio_ingress is not None:
+            self.vad_reset_seq += 1
+        else:
+            self.client_audio_buffer.clear()
         self.client_have_voice = False
         self.client_voice_stop = False
+        self.client_voice_pause = False
         self.client_voice_window.clear()
         self.last_is_voice = False
         self.vad_last_voice_time = 0.0
 
         # Clear ASR buffers
         self.asr_audio.clear()
+        self.asr_incremental_active = False
+        if self.asr_speculation is not None:
+            self.asr_speculation.rollback()
+            self.asr_speculation = None
+        if self.voiceprint_provider is not None:
+            self.voiceprint_provider.reset_utterance()
 
         self.logger.bind(tag=TAG).debug("All audio states reset.")
 
@@ -1755,9 +2054,10 @@ class ConnectionHandler:
                         ts for ts, cache_time in list(self.aec_audio_cache_time.items())
                         if current_time - cache_time > 120  # 2分钟过期
                     ]
-                    for ts in expired_keys:
-                        self.aec_audio_cache.pop(ts, None)
-                        self.aec_audio_cache_time.pop(ts, None)
+                    with self.aec_cache_lock:
+                        for ts in expired_keys:
+                            self.aec_audio_cache.pop(ts, None)
+                            self.aec_audio_cache_time.pop(ts, None)
                     if expired_keys:
                         self.logger.bind(tag=TAG).debug(f"[AEC] 清理过期缓存 {len(expired_keys)} 条")
                 # 每30秒检查一次
@@ -1807,19 +2107,61 @@ class ConnectionHandler:
         if not text:
             return text
         # 清理独立一行的 JSON 闭合垃圾（如 ）"}}  '}}  "}}  }}  } ）
-        _garbage_chars = frozenset('")\'}）')
         lines = text.split('\n')
-        cleaned = []
-        for line in lines:
-            stripped = line.strip()
-            if stripped and len(stripped) <= 8 and all(c in _garbage_chars for c in stripped):
-                continue
-            cleaned.append(line)
+        cleaned = [line for line in lines if not ConnectionHandler._is_garbage_line(line)]
         result = '\n'.join(cleaned)
         # 清理末尾残留的 JSON 闭合符号
         result = re.sub(r'["\'}\]]+$', '', result.rstrip()).rstrip()
         return result
 
+    @staticmethod
+    def _is_garbage_line(line):
+        """判断一行是否只由 JSON 闭合垃圾组成"""
+        stripped = line.strip()
+        return bool(stripped) and len(stripped) <= 8 and all(c in RESPONSE_GARBAGE_CHARS for c in stripped)
+
+    def _stream_direct_answer_text(self, tc, text, final=False):
+        """清理流式阶段新解码的 direct_answer 文本，返回可以立即播报的部分。
+        末尾疑似闭合垃圾的字符暂存在 tc["_da_hold"]，后面出现正常文字时一并发送；
+        final 时对暂存部分按整体规则清理。
+        """
+        pending = tc.get("_da_hold", "") + text
+        if final:
+            tc["_da_hold"] = ""
+            return self._clean_response_garbage(pending)
+        end = len(pending)
+        while end > 0 and pending[end - 1] in DA_HOLD_CHARS:
+            end -= 1
+        tc["_da_hold"] = pending[end:]
+        ready = pending[:end]
+        if "\n" in ready:
+            # 首行接在已发送的内容之后，只检查其后的完整行
+            lines = ready.split("\n")
+            ready = "\n".join(lines[:1] + [line for line in lines[1:] if not self._is_garbage_line(line)])
+        return ready
+
+    def _dispatch_early_tool_calls(self, tool_calls_list):
+        """参数已完整且声明为可提前执行的工具，不等LLM流结束立即开始执行，
+        任务记录在 tc["_task"]，流结束后按原顺序收集结果。
+        """
+        for tc in tool_calls_list:
+            if not tc.get("_complete") or "_task" in tc or not tc["name"]:
+                continue
+            if tc["name"] == "direct_answer" or not self.func_handler.can_execute_early(tc["name"]):
+                continue
+            self.logger.bind(tag=TAG).debug(f"工具参数已完整，提前执行: {tc['name']}")
+            tc["_task"] = self.loop.create_task(
+                self.func_handler.handle_llm_function_call(self, tc)
+            )
+
+    @staticmethod
+    def _cancel_early_tool_calls(tool_calls_list):
+        """LLM流出错时取消已提前开始的工具调用"""
+        for tc in tool_calls_list:
+            task = tc.get("_task")
+            if task is not None and not task.done():
+                task.cancel()
+
     def _merge_tool_calls(self, tool_calls_list, tools_call):
         """合并工具调用列表
 
@@ -1838,7 +2180,17 @@ class ConnectionHandler:
 
             # 确保列表有足够的位置
             if tool_index >= len(tool_calls_list):
-                tool_calls_list.append({"id": "", "name": "", "arguments": ""})
+                tool_calls_list.append(
+                    {
+                        "id": "",
+                        "name": "",
+                        "arguments": "",
+                        # 增量解析参数：只扫描新片段，解码 response 字段并判断参数是否完整
+                        "_parser": JsonFieldStream("response"),
+                        "_da_new": "",
+                        "_complete": False,
+                    }
+                )
 
             # 更新工具调用信息
             if tool_call.id:
@@ -1846,4 +2198,7 @@ class ConnectionHandler:
             if tool_call.function.name:
                 tool_calls_list[tool_index]["name"] = tool_call.function.name
             if tool_call.function.arguments:
-                tool_calls_list[tool_index]["arguments"] += tool_call.function.arguments
+                entry = tool_calls_list[tool_index]
+                entry["arguments"] += tool_call.function.arguments
+                entry["_da_new"] += entry["_parser"].feed(tool_call.function.arguments)
+                entry["_complete"] = entry["_parser"].complete
@@ -11,6 +11,7 @@ async def handleAbortMessage(conn: "ConnectionHandler"):
     # 设置成打断状态，会自动打断llm、tts任务
     conn.close_after_chat = False
     conn.client_abort = True
+    conn.abort_chat()
     conn.clear_queues()
     # 打断客户端说话状态
     await conn.websocket.send(
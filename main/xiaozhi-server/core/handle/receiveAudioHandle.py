@@ -6,6 +6,7 @@ from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from core.connection import ConnectionHandler
 from core.utils.util import audio_to_data
+from core.utils.audio_ingress import IngressFrame
 from core.handle.abortHandle import handleAbortMessage
 from core.handle.intentHandler import handle_user_intent
 from core.utils.output_counter import check_device_output_limit
@@ -16,7 +17,16 @@ TAG = __name__
 
 async def handleAudioMessage(conn: "ConnectionHandler", pcm_frame):
     # 当前片段是否有人说话
-    have_voice = conn.vad.is_vad(conn, pcm_frame)
+    if isinstance(pcm_frame, IngressFrame):
+        # 入口分片线程已完成VAD推理，这里只按顺序更新语音状态
+        speech_probs = pcm_frame.speech_probs
+        pcm_frame = pcm_frame.pcm
+        if speech_probs is None:
+            have_voice = await conn.vad.is_vad_async(conn, pcm_frame)
+        else:
+            have_voice = conn.vad.apply_speech_probs(conn, speech_probs)
+    else:
+        have_voice = await conn.vad.is_vad_async(conn, pcm_frame)
     # 如果设备刚刚被唤醒，短暂忽略VAD检测
     if hasattr(conn, "just_woken_up") and conn.just_woken_up:
         have_voice = False
@@ -87,11 +97,16 @@ async def startToChat(conn: "ConnectionHandler", text):
     if conn.client_is_speaking and conn.client_listen_mode != "manual":
         await handleAbortMessage(conn)
 
+    # 开启 speculative_chat 时，意图识别期间预先发起主LLM请求，输出先缓冲
+    speculative = conn.start_speculative_chat(actual_text)
+
     # 首先进行意图分析，使用实际文本内容
     intent_handled = await handle_user_intent(conn, actual_text)
 
     if intent_handled:
         # 如果意图已被处理，不再进行聊天
+        if speculative is not None:
+            conn.cancel_speculative_chat()
         return
 
     # 意图未被处理，继续常规聊天流程，使用实际文本内容
@@ -100,7 +115,7 @@ async def startToChat(conn: "ConnectionHandler", text):
     # 准备开始新会话
     conn.client_abort = False
 
-    conn.executor.submit(conn.chat, actual_text)
+    conn.start_chat(actual_text, speculative=speculative)
 
 
 async def no_voice_close_connect(conn: "ConnectionHandler", have_voice):
@@ -97,8 +97,9 @@ async def _send_to_mqtt_gateway(
             conn._send_opus_decoder = opuslib_next.Decoder(16000, 1)
         # 解码opus为PCM后缓存
         pcm_data = conn._send_opus_decoder.decode(bytes(opus_packet), 960)
-        conn.aec_audio_cache[timestamp] = bytes(pcm_data)
-        conn.aec_audio_cache_time[timestamp] = time.time()
+        with conn.aec_cache_lock:
+            conn.aec_audio_cache[timestamp] = bytes(pcm_data)
+            conn.aec_audio_cache_time[timestamp] = time.time()
 
     # 为opus数据包添加16字节头部
     header = bytearray(16)
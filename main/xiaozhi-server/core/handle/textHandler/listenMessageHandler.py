@@ -47,7 +47,8 @@ class ListenTextMessageHandler(TextMessageHandler):
             else:
                 # 非流式模式：直接触发ASR识别
                 if len(conn.asr_audio) > 0:
-                    asr_audio_task = conn.asr_audio.copy()
+                    # 重置前先拷贝出整段语音
+                    asr_audio_task = conn.asr_audio.to_bytes()
                     conn.reset_audio_states()
 
                     if len(asr_audio_task) > 0:
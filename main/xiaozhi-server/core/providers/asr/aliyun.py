@@ -1,6 +1,4 @@
-import http.client
 import json
-import asyncio
 from typing import Optional, Tuple, List
 import os
 import uuid
@@ -14,6 +12,7 @@ from datetime import datetime
 from config.logger import setup_logging
 from core.providers.asr.base import ASRProviderBase
 from core.providers.asr.dto.dto import InterfaceType
+from core.utils.http_pool import get_http_client
 
 TAG = __name__
 logger = setup_logging()
@@ -33,7 +32,7 @@ class AccessToken:
         return encoded_text.replace("+", "%20").replace("*", "%2A").replace("%7E", "~")
 
     @staticmethod
-    def create_token(access_key_id, access_key_secret):
+    def _build_token_url(access_key_id, access_key_secret):
         parameters = {
             "AccessKeyId": access_key_id,
             "Action": "CreateToken",
@@ -74,18 +73,36 @@ class AccessToken:
             query_string,
         )
         # print('url: %s' % full_url)
-        # 提交HTTP GET请求
-        response = requests.get(full_url)
+        return full_url
+
+    @staticmethod
+    def _parse_token(root_obj):
+        key = "Token"
+        if key in root_obj:
+            token = root_obj[key]["Id"]
+            expire_time = root_obj[key]["ExpireTime"]
+            return token, expire_time
+        return None, None
+
+    @staticmethod
+    def create_token(access_key_id, access_key_secret):
+        # 提交HTTP GET请求（初始化时使用，尚无事件循环）
+        response = requests.get(
+            AccessToken._build_token_url(access_key_id, access_key_secret)
+        )
         if response.ok:
-            root_obj = response.json()
-            key = "Token"
-            if key in root_obj:
-                token = root_obj[key]["Id"]
-                expire_time = root_obj[key]["ExpireTime"]
-                return token, expire_time
+            return AccessToken._parse_token(response.json())
         # print(response.text)
         return None, None
 
+    @staticmethod
+    async def create_token_async(access_key_id, access_key_secret):
+        full_url = AccessToken._build_token_url(access_key_id, access_key_secret)
+        response = await get_http_client(full_url).get(full_url)
+        if response.is_success:
+            return AccessToken._parse_token(response.json())
+        return None, None
+
 
 class ASRProvider(ASRProviderBase):
     def __init__(self, config: dict, delete_audio_file: bool):
@@ -118,30 +135,47 @@ class ASRProvider(ASRProviderBase):
     def _refresh_token(self):
         """刷新Token并记录过期时间"""
         if self.access_key_id and self.access_key_secret:
-            self.token, expire_time_str = AccessToken.create_token(
-                self.access_key_id, self.access_key_secret
+            self._apply_token(
+                *AccessToken.create_token(self.access_key_id, self.access_key_secret)
             )
-            if not expire_time_str:
-                raise ValueError("无法获取有效的Token过期时间")
-
-            try:
-                # 统一转换为字符串处理
-                expire_str = str(expire_time_str).strip()
+        else:
+            self.expire_time = None
 
-                if expire_str.isdigit():
-                    expire_time = datetime.fromtimestamp(int(expire_str))
-                else:
-                    expire_time = datetime.strptime(expire_str, "%Y-%m-%dT%H:%M:%SZ")
-                self.expire_time = expire_time.timestamp() - 60
-            except Exception as e:
-                raise ValueError(f"无效的过期时间格式: {expire_str}") from e
+        if not self.token:
+            raise ValueError("无法获取有效的访问Token")
 
+    async def _refresh_token_async(self):
+        """在事件循环中刷新Token，不阻塞其他连接"""
+        if self.access_key_id and self.access_key_secret:
+            self._apply_token(
+                *await AccessToken.create_token_async(
+                    self.access_key_id, self.access_key_secret
+                )
+            )
         else:
             self.expire_time = None
 
         if not self.token:
             raise ValueError("无法获取有效的访问Token")
 
+    def _apply_token(self, token, expire_time_str):
+        """记录Token及其过期时间"""
+        self.token = token
+        if not expire_time_str:
+            raise ValueError("无法获取有效的Token过期时间")
+
+        try:
+            # 统一转换为字符串处理
+            expire_str = str(expire_time_str).strip()
+
+            if expire_str.isdigit():
+                expire_time = datetime.fromtimestamp(int(expire_str))
+            else:
+                expire_time = datetime.strptime(expire_str, "%Y-%m-%dT%H:%M:%SZ")
+            self.expire_time = expire_time.timestamp() - 60
+        except Exception as e:
+            raise ValueError(f"无效的过期时间格式: {expire_str}") from e
+
     def _is_token_expired(self):
         """检查Token是否过期"""
         if not self.expire_time:
@@ -174,22 +208,12 @@ class ASRProvider(ASRProviderBase):
                 "Content-Length": str(len(pcm_data)),
             }
 
-            # 创建连接并发送请求
-            conn = http.client.HTTPSConnection(self.host)
+            # 复用共享连接池的长连接发送请求
             request_url = self._construct_request_url()
-
-            loop = asyncio.get_event_loop()
-            await loop.run_in_executor(
-                None,
-                lambda: conn.request(
-                    method="POST", url=request_url, body=pcm_data, headers=headers
-                ),
+            response = await get_http_client(request_url).post(
+                request_url, content=pcm_data, headers=headers
             )
-
-            # 获取响应
-            response = await loop.run_in_executor(None, conn.getresponse)
-            body = await loop.run_in_executor(None, response.read)
-            conn.close()
+            body = response.content
 
             # 解析响应
             try:
@@ -218,7 +242,7 @@ class ASRProvider(ASRProviderBase):
         """将语音数据转换为文本"""
         if self._is_token_expired():
             logger.warning("Token已过期，正在自动刷新...")
-            self._refresh_token()
+            await self._refresh_token_async()
 
         try:
             if artifacts is None:
@@ -12,6 +12,8 @@ from datetime import datetime
 from config.logger import setup_logging
 from core.providers.asr.base import ASRProviderBase
 from core.providers.asr.dto.dto import InterfaceType
+from core.providers.asr.ws_pool import get_ws_pool
+from core.providers.asr.coalesce import FrameCoalescer
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
@@ -104,6 +106,16 @@ class ASRProvider(ASRProviderBase):
         elif not self.token:
             raise ValueError("必须提供access_key_id+access_key_secret或者直接提供token")
 
+        # 预热连接池（ws_pool_size 大于 0 时启用）
+        self.ws_pool = get_ws_pool(
+            "aliyun_stream",
+            self.ws_url,
+            f"{self.appkey}:{self.access_key_id or self.token}",
+            config,
+        )
+        # 上行音频合包
+        self.coalescer = FrameCoalescer.from_config(config)
+
     def _refresh_token(self):
         """刷新Token"""
         self.token, expire_time_str = AccessToken.create_token(self.access_key_id, self.access_key_secret)
@@ -126,6 +138,8 @@ class ASRProvider(ASRProviderBase):
 
     async def open_audio_channels(self, conn):
         await super().open_audio_channels(conn)
+        if self.ws_pool is not None:
+            self.ws_pool.prewarm(self._open_ws)
 
     async def receive_audio(self, conn, pcm_frame, audio_have_voice):
         # 先调用父类方法处理基础逻辑
@@ -142,19 +156,20 @@ class ASRProvider(ASRProviderBase):
 
         if self.asr_ws and self.is_processing and self.server_ready:
             try:
-                await self.asr_ws.send(pcm_frame)
+                chunk = self.coalescer.push(pcm_frame, audio_have_voice)
+                if chunk:
+                    await self.asr_ws.send(chunk)
             except Exception as e:
                 logger.bind(tag=TAG).warning(f"发送音频失败: {str(e)}")
                 await self._cleanup()
 
-    async def _start_recognition(self, conn: "ConnectionHandler"):
-        """开始识别会话"""
+    async def _open_ws(self):
+        """建立WebSocket连接"""
         if self._is_token_expired():
             self._refresh_token()
-        
-        # 建立连接
+
         headers = {"X-NLS-Token": self.token}
-        self.asr_ws = await websockets.connect(
+        return await websockets.connect(
             self.ws_url,
             additional_headers=headers,
             max_size=1000000000,
@@ -163,6 +178,17 @@ class ASRProvider(ASRProviderBase):
             close_timeout=5,
         )
 
+    async def _start_recognition(self, conn: "ConnectionHandler"):
+        """开始识别会话"""
+        # 建立连接，优先取用预热好的连接
+        if self.ws_pool is not None:
+            self.asr_ws = await self.ws_pool.acquire(self._open_ws)
+        else:
+            self.asr_ws = await self._open_ws()
+        self.coalescer.reset()
+        if self.coalescer.adaptive:
+            asyncio.create_task(self.coalescer.measure_rtt(self.asr_ws))
+
         self.task_id = uuid.uuid4().hex
 
         logger.bind(tag=TAG).debug(f"WebSocket连接建立成功, task_id: {self.task_id}")
@@ -231,7 +257,9 @@ class ASRProvider(ASRProviderBase):
                         if conn.asr_audio:
                             for cached_pcm in conn.asr_audio[-10:]:
                                 try:
-                                    await self.asr_ws.send(cached_pcm)
+                                    chunk = self.coalescer.push(cached_pcm)
+                                    if chunk:
+                                        await self.asr_ws.send(chunk)
                                 except Exception as e:
                                     logger.bind(tag=TAG).warning(f"发送缓存音频失败: {e}")
                                     break
@@ -282,8 +310,11 @@ class ASRProvider(ASRProviderBase):
         """发送停止识别请求（不关闭连接）"""
         if self.asr_ws:
             try:
-                # 先停止音频发送
+                # 先停止音频发送，并发出合包中剩余的音频
                 self.is_processing = False
+                chunk = self.coalescer.flush()
+                if chunk:
+                    await self.asr_ws.send(chunk)
 
                 stop_msg = {
                     "header": {
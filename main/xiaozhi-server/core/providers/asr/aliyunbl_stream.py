@@ -10,6 +10,8 @@ if TYPE_CHECKING:
 from config.logger import setup_logging
 from core.providers.asr.base import ASRProviderBase
 from core.providers.asr.dto.dto import InterfaceType
+from core.providers.asr.ws_pool import get_ws_pool
+from core.providers.asr.coalesce import FrameCoalescer
 
 TAG = __name__
 logger = setup_logging()
@@ -50,8 +52,15 @@ class ASRProvider(ASRProviderBase):
         self.output_dir = config.get("output_dir", "./audio_output")
         self.delete_audio_file = delete_audio_file
 
+        # 预热连接池（ws_pool_size 大于 0 时启用）
+        self.ws_pool = get_ws_pool("aliyunbl_stream", self.ws_url, self.api_key, config)
+        # 上行音频合包
+        self.coalescer = FrameCoalescer.from_config(config)
+
     async def open_audio_channels(self, conn):
         await super().open_audio_channels(conn)
+        if self.ws_pool is not None:
+            self.ws_pool.prewarm(self._open_ws)
 
     async def receive_audio(self, conn, pcm_frame, audio_have_voice):
         # 先调用父类方法处理基础逻辑
@@ -69,11 +78,27 @@ class ASRProvider(ASRProviderBase):
         # 发送音频数据
         if self.asr_ws and self.is_processing and self.server_ready:
             try:
-                await self.asr_ws.send(pcm_frame)
+                chunk = self.coalescer.push(pcm_frame, audio_have_voice)
+                if chunk:
+                    await self.asr_ws.send(chunk)
             except Exception as e:
                 logger.bind(tag=TAG).warning(f"发送音频失败: {str(e)}")
                 await self._cleanup()
 
+    async def _open_ws(self):
+        """建立WebSocket连接"""
+        headers = {
+            "Authorization": f"Bearer {self.api_key}"
+        }
+        return await websockets.connect(
+            self.ws_url,
+            additional_headers=headers,
+            max_size=1000000000,
+            ping_interval=None,
+            ping_timeout=None,
+            close_timeout=5,
+        )
+
     async def _start_recognition(self, conn: "ConnectionHandler"):
         """开始识别会话"""
         try:
@@ -84,21 +109,16 @@ class ASRProvider(ASRProviderBase):
             self.is_processing = True
             self.task_id = uuid.uuid4().hex
 
-            # 建立WebSocket连接
-            headers = {
-                "Authorization": f"Bearer {self.api_key}"
-            }
-
             logger.bind(tag=TAG).debug(f"正在连接阿里百炼ASR服务, task_id: {self.task_id}")
 
-            self.asr_ws = await websockets.connect(
-                self.ws_url,
-                additional_headers=headers,
-                max_size=1000000000,
-                ping_interval=None,
-                ping_timeout=None,
-                close_timeout=5,
-            )
+            # 建立WebSocket连接，优先取用预热好的连接
+            if self.ws_pool is not None:
+                self.asr_ws = await self.ws_pool.acquire(self._open_ws)
+            else:
+                self.asr_ws = await self._open_ws()
+            self.coalescer.reset()
+            if self.coalescer.adaptive:
+                asyncio.create_task(self.coalescer.measure_rtt(self.asr_ws))
 
             logger.bind(tag=TAG).debug("WebSocket连接建立成功")
 
@@ -177,7 +197,9 @@ class ASRProvider(ASRProviderBase):
                         if conn.asr_audio:
                             for cached_pcm in conn.asr_audio[-10:]:
                                 try:
-                                    await self.asr_ws.send(cached_pcm)
+                                    chunk = self.coalescer.push(cached_pcm)
+                                    if chunk:
+                                        await self.asr_ws.send(chunk)
                                 except Exception as e:
                                     logger.bind(tag=TAG).warning(f"发送缓存音频失败: {e}")
                                     break
@@ -249,8 +271,11 @@ class ASRProvider(ASRProviderBase):
         """发送停止请求(用于手动模式停止录音)"""
         if self.asr_ws:
             try:
-                # 先停止音频发送
+                # 先停止音频发送，并发出合包中剩余的音频
                 self.is_processing = False
+                chunk = self.coalescer.flush()
+                if chunk:
+                    await self.asr_ws.send(chunk)
 
                 logger.bind(tag=TAG).debug("收到停止请求，发送finish-task指令")
                 await self._send_finish_task()
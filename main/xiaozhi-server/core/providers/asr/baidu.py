@@ -1,14 +1,20 @@
 import time
 import os
+import uuid
+import base64
 from typing import Optional, Tuple, List
-from aip import AipSpeech
 from core.providers.asr.base import ASRProviderBase
 from config.logger import setup_logging
 from core.providers.asr.dto.dto import InterfaceType
+from core.utils.http_pool import get_http_client
 
 TAG = __name__
 logger = setup_logging()
 
+# 百度短语音识别REST接口（与 baidu-aip SDK 使用的接口相同）
+TOKEN_URL = "https://aip.baidubce.com/oauth/2.0/token"
+ASR_URL = "https://vop.baidu.com/server_api"
+
 
 class ASRProvider(ASRProviderBase):
     def __init__(self, config: dict, delete_audio_file: bool = True):
@@ -24,11 +30,36 @@ class ASRProvider(ASRProviderBase):
         self.output_dir = config.get("output_dir")
         self.delete_audio_file = delete_audio_file
 
-        self.client = AipSpeech(str(self.app_id), self.api_key, self.secret_key)
+        # access_token 有效期约30天，过期前自动刷新
+        self.access_token = None
+        self.token_expire_time = 0
+        self.cuid = f"xiaozhi-{self.app_id}-{uuid.getnode()}"
 
         # 确保输出目录存在
         os.makedirs(self.output_dir, exist_ok=True)
 
+    async def _get_access_token(self) -> str:
+        """获取 access_token，有效期内复用"""
+        if self.access_token and time.time() < self.token_expire_time:
+            return self.access_token
+        response = await get_http_client(TOKEN_URL).post(
+            TOKEN_URL,
+            params={
+                "grant_type": "client_credentials",
+                "client_id": self.api_key,
+                "client_secret": self.secret_key,
+            },
+        )
+        result = response.json()
+        if "access_token" not in result:
+            raise Exception(
+                f"获取百度access_token失败: {result.get('error_description', result)}"
+            )
+        self.access_token = result["access_token"]
+        # 提前一小时刷新
+        self.token_expire_time = time.time() + int(result.get("expires_in", 0)) - 3600
+        return self.access_token
+
     async def speech_to_text(
         self, opus_data: List[bytes], session_id: str, artifacts=None
     ) -> Tuple[Optional[str], Optional[str]]:
@@ -47,15 +78,18 @@ class ASRProvider(ASRProviderBase):
                 return "", None
 
             start_time = time.time()
-            # 识别本地文件
-            result = self.client.asr(
-                artifacts.pcm_bytes,
-                "pcm",
-                16000,
-                {
-                    "dev_pid": str(self.dev_pid),
-                },
-            )
+            request_body = {
+                "format": "pcm",
+                "rate": 16000,
+                "channel": 1,
+                "cuid": self.cuid,
+                "token": await self._get_access_token(),
+                "dev_pid": self.dev_pid,
+                "speech": base64.b64encode(artifacts.pcm_bytes).decode("utf-8"),
+                "len": len(artifacts.pcm_bytes),
+            }
+            response = await get_http_client(ASR_URL).post(ASR_URL, json=request_body)
+            result = response.json()
 
             if result and result["err_no"] == 0:
                 logger.bind(tag=TAG).debug(
@@ -64,10 +98,12 @@ class ASRProvider(ASRProviderBase):
                 result = result["result"][0]
                 return result, artifacts.file_path
             else:
+                if result.get("err_no") in (3302, 3304):
+                    # 鉴权失败，下次重新获取 access_token
+                    self.access_token = None
                 raise Exception(
                     f"百度语音识别失败，错误码: {result['err_no']}，错误信息: {result['err_msg']}"
                 )
-                return None, artifacts.file_path
 
         except Exception as e:
             logger.bind(tag=TAG).error(f"处理音频时发生错误！{e}", exc_info=True)
@@ -1,11 +1,9 @@
 import os
-import io
 import wave
 import uuid
 import json
 import time
 import queue
-import shutil
 import asyncio
 import tempfile
 import traceback
@@ -17,6 +15,15 @@ from core.providers.asr.dto.dto import InterfaceType
 from core.handle.receiveAudioHandle import startToChat
 from core.handle.reportHandle import enqueue_asr_report
 from core.utils.util import remove_punctuation_and_length
+from core.utils.pcm_buffer import PcmFrameBuffer, PCM_FRAME_BYTES
+from core.providers.asr.speculation import SpeculativeRecognition
+from core.utils.audio_archive import (
+    pcm_to_wav,
+    has_disk_space,
+    create_memory_wav,
+    release_memory_wav,
+    set_disk_check_interval,
+)
 from core.handle.receiveAudioHandle import handleAudioMessage
 from typing import Optional, Tuple, List, NamedTuple, TYPE_CHECKING
 
@@ -27,6 +34,9 @@ if TYPE_CHECKING:
 TAG = __name__
 logger = setup_logging()
 
+# 未检测到语音时保留的预录音帧数（60ms一帧）
+PREROLL_FRAMES = 10
+
 
 class ASRProviderBase(ABC):
     def __init__(self):
@@ -34,11 +44,33 @@ class ASRProviderBase(ABC):
 
     # 打开音频通道
     async def open_audio_channels(self, conn: "ConnectionHandler"):
+        if getattr(conn, "use_async_pipeline", False):
+            # asyncio 管线模式：在事件循环中消费音频，不再占用独立线程
+            conn.asr_priority_task = asyncio.create_task(
+                self.asr_audio_priority_task(conn)
+            )
+            return
         conn.asr_priority_thread = threading.Thread(
             target=self.asr_text_priority_thread, args=(conn,), daemon=True
         )
         conn.asr_priority_thread.start()
 
+    # 有序处理ASR音频（asyncio 管线模式）
+    async def asr_audio_priority_task(self, conn: "ConnectionHandler"):
+        while not conn.stop_event.is_set():
+            try:
+                message = await conn.asr_audio_queue.async_get(timeout=1)
+                await handleAudioMessage(conn, message)
+            except asyncio.TimeoutError:
+                continue
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.bind(tag=TAG).error(
+                    f"处理ASR音频失败: {str(e)}, 类型: {type(e).__name__}, 堆栈: {traceback.format_exc()}"
+                )
+                continue
+
     # 有序处理ASR音频
     def asr_text_priority_thread(self, conn: "ConnectionHandler"):
         while not conn.stop_event.is_set():
@@ -66,51 +98,126 @@ class ASRProviderBase(ABC):
             # 自动/实时模式：使用VAD检测
             conn.asr_audio.append(pcm_frame)
 
-            # 如果没有语音，且之前也没有声音，缓存部分音频
+            # 如果没有语音，且之前也没有声音，缓存部分音频（只移动起始位置，不拷贝）
             if not audio_have_voice and not conn.client_have_voice:
-                conn.asr_audio = conn.asr_audio[-10:]
+                conn.asr_audio.keep_last_frames(PREROLL_FRAMES)
+                return
+
+            # 较长的语音：说话过程中先用开头一段音频开始声纹识别
+            if conn.voiceprint_provider is not None and audio_have_voice:
+                conn.voiceprint_provider.maybe_start_early(
+                    conn.asr_audio,
+                    conn.asr_audio.nbytes - PREROLL_FRAMES * PCM_FRAME_BYTES,
+                    conn.session_id,
+                )
+
+            # 本地流式模型：说话过程中就开始增量识别，语音开始时连同预录音一起送入
+            if self.supports_incremental():
+                if not conn.asr_incremental_active:
+                    conn.asr_incremental_active = True
+                    self.incremental_sessions.feed(
+                        conn.session_id, conn.asr_audio.frames(), start=True
+                    )
+                else:
+                    self.incremental_sessions.feed(conn.session_id, [pcm_frame])
+
+            # 停顿后继续说话，丢弃预识别结果
+            if conn.asr_speculation is not None and audio_have_voice:
+                conn.asr_speculation.rollback()
+                conn.asr_speculation = None
+
+            if conn.asr.interface_type == InterfaceType.STREAM:
                 return
 
             # 自动模式下通过VAD检测到语音停止时触发识别
-            if conn.asr.interface_type != InterfaceType.STREAM and conn.client_voice_stop:
-                # 直接使用asr_audio中的PCM数据
-                pcm_bytes = b"".join(conn.asr_audio)
+            if conn.client_voice_stop:
                 # 检查是否有足够的音频数据（每帧1920字节，15帧约28800字节）
-                if len(pcm_bytes) > 1920 * 15:
-                    await self.handle_voice_stop(conn, [pcm_bytes])
+                if conn.asr_audio.nbytes > 1920 * 15:
+                    speculation, conn.asr_speculation = conn.asr_speculation, None
+                    await self.handle_voice_stop(conn, conn.asr_audio, speculation)
+                else:
+                    self.discard_incremental(conn.session_id)
                 conn.reset_audio_states()
+            elif (
+                conn.client_voice_pause
+                and conn.asr_speculation is None
+                and not self.supports_incremental()
+                and conn.asr_audio.nbytes > 1920 * 15
+            ):
+                # 短暂停顿：提前识别，等待完整静音阈值期间识别已在进行
+                # 预识别可能被丢弃，不保存录音，提交后由 handle_voice_stop 保存
+                conn.asr_speculation = SpeculativeRecognition(
+                    self._recognize(conn, conn.asr_audio.to_bytes(), archive=False)
+                )
+
+    def supports_incremental(self) -> bool:
+        """是否支持说话过程中增量识别（本地流式模型设置 incremental_sessions）"""
+        return getattr(self, "incremental_sessions", None) is not None
+
+    def discard_incremental(self, session_id: str):
+        """丢弃会话的增量识别状态"""
+        if self.supports_incremental():
+            self.incremental_sessions.discard(session_id)
+
+    @staticmethod
+    def _combine_pcm(pcm_data) -> bytes:
+        """把一段语音合并为一个连续的 bytes，多帧只拷贝一次，单个 bytes 不拷贝"""
+        if isinstance(pcm_data, PcmFrameBuffer):
+            return pcm_data.to_bytes()
+        if isinstance(pcm_data, bytes):
+            return pcm_data
+        if isinstance(pcm_data, (bytearray, memoryview)):
+            return bytes(pcm_data)
+        return b"".join(pcm_data)
+
+    async def _recognize(
+        self, conn: "ConnectionHandler", combined_pcm_data: bytes, archive: bool = True
+    ):
+        """并行执行ASR和声纹识别，返回 (ASR结果, 声纹结果)"""
+        # 定义ASR任务
+        asr_task = self.speech_to_text_wrapper(
+            [combined_pcm_data], conn.session_id, archive=archive
+        )
+
+        if conn.voiceprint_provider and combined_pcm_data:
+            # 优先使用提前识别或缓存的结果，需要远程识别时才转换WAV
+            voiceprint_task = conn.voiceprint_provider.identify(
+                combined_pcm_data, conn.session_id
+            )
+            # 并发等待两个结果
+            return await asyncio.gather(
+                asr_task, voiceprint_task, return_exceptions=True
+            )
+        return await asr_task, None
 
     # 处理语音停止
-    async def handle_voice_stop(self, conn: "ConnectionHandler", asr_audio_task: List[bytes]):
-        """并行处理ASR和声纹识别"""
+    async def handle_voice_stop(
+        self,
+        conn: "ConnectionHandler",
+        asr_audio_task: List[bytes],
+        speculation: Optional[SpeculativeRecognition] = None,
+    ):
+        """并行处理ASR和声纹识别
+
+        Args:
+            speculation: 短暂停顿时已开始的预识别，说话未继续时直接采用其结果
+        """
         try:
             total_start_time = time.monotonic()
 
-            # 数据已经是PCM直接使用
-            pcm_data = asr_audio_task
-            combined_pcm_data = b"".join(pcm_data)
-
-            # 预先准备WAV数据
-            wav_data = None
-            if conn.voiceprint_provider and combined_pcm_data:
-                wav_data = self._pcm_to_wav(combined_pcm_data)
-
-            # 定义ASR任务
-            asr_task = self.speech_to_text_wrapper(
-                asr_audio_task, conn.session_id
-            )
+            # 整段语音只合并一次，ASR、声纹、上报共用同一份数据
+            combined_pcm_data = self._combine_pcm(asr_audio_task)
+            asr_audio_task = [combined_pcm_data]
 
-            if conn.voiceprint_provider and wav_data:
-                voiceprint_task = conn.voiceprint_provider.identify_speaker(
-                    wav_data, conn.session_id
-                )
-                # 并发等待两个结果
-                asr_result, voiceprint_result = await asyncio.gather(
-                    asr_task, voiceprint_task, return_exceptions=True
-                )
-            else:
-                asr_result = await asr_task
-                voiceprint_result = None
+            results = None
+            if speculation is not None:
+                results = await speculation.commit()
+                if results is not None and self._keeps_audio():
+                    # 预识别不保存录音，采用其结果后保存本段录音
+                    self._archive_audio(combined_pcm_data, conn.session_id)
+            if results is None:
+                results = await self._recognize(conn, combined_pcm_data)
+            asr_result, voiceprint_result = results
 
             # 记录识别结果 - 检查是否为异常
             if isinstance(asr_result, Exception):
@@ -164,8 +271,8 @@ class ASRProviderBase(ABC):
             self.stop_ws_connection()
 
             if text_len > 0:
-                audio_snapshot = asr_audio_task.copy()
-                enqueue_asr_report(conn, enhanced_text, audio_snapshot)
+                # 合并后的 bytes 不可变，直接作为上报快照
+                enqueue_asr_report(conn, enhanced_text, asr_audio_task)
                 # 使用自定义模块进行上报
                 await startToChat(conn, enhanced_text)
         except Exception as e:
@@ -193,19 +300,9 @@ class ASRProviderBase(ABC):
         if len(pcm_data) % 2 != 0:
             pcm_data = pcm_data[:-1]
 
-        # 创建WAV文件头
-        wav_buffer = io.BytesIO()
+        # 直接拼接WAV文件头和PCM数据，只拷贝一次
         try:
-            with wave.open(wav_buffer, "wb") as wav_file:
-                wav_file.setnchannels(1)  # 单声道
-                wav_file.setsampwidth(2)  # 16位
-                wav_file.setframerate(16000)  # 16kHz采样率
-                wav_file.writeframes(pcm_data)
-
-            wav_buffer.seek(0)
-            wav_data = wav_buffer.read()
-
-            return wav_data
+            return pcm_to_wav(pcm_data)
         except Exception as e:
             logger.bind(tag=TAG).error(f"WAV转换失败: {e}")
             return b""
@@ -229,6 +326,18 @@ class ASRProviderBase(ABC):
     def get_current_artifacts(self) -> Optional["ASRProviderBase.AudioArtifacts"]:
         return self._current_artifacts
 
+    # 需要文件输入的ASR是否使用内存文件（memfd），由 asr_audio_artifacts.memory_only 配置
+    memory_artifacts = True
+    # delete_audio 为 false 时的录音归档写入器
+    audio_archiver = None
+
+    def configure_artifacts(self, artifacts_config: dict, audio_archiver=None):
+        """应用 asr_audio_artifacts 配置"""
+        memory_only = artifacts_config.get("memory_only", True)
+        self.memory_artifacts = str(memory_only).lower() in ("true", "1", "yes")
+        self.audio_archiver = audio_archiver
+        set_disk_check_interval(artifacts_config.get("disk_check_interval", 5))
+
     def requires_file(self) -> bool:
         """是否需要文件输入"""
         return False
@@ -251,11 +360,14 @@ class ASRProviderBase(ABC):
             logger.bind(tag=TAG).error(f"临时音频文件生成失败: {e}")
             return None
 
-    def save_audio_to_file(self, pcm_data: List[bytes], session_id: str) -> str:
-        """PCM数据保存为WAV文件"""
+    def _audio_file_path(self, session_id: str) -> str:
         module_name = __name__.split(".")[-1]
         file_name = f"asr_{module_name}_{session_id}_{uuid.uuid4()}.wav"
-        file_path = os.path.join(self.output_dir, file_name)
+        return os.path.join(self.output_dir, file_name)
+
+    def save_audio_to_file(self, pcm_data: List[bytes], session_id: str) -> str:
+        """PCM数据保存为WAV文件"""
+        file_path = self._audio_file_path(session_id)
 
         with wave.open(file_path, "wb") as wf:
             wf.setnchannels(1)
@@ -265,24 +377,46 @@ class ASRProviderBase(ABC):
 
         return file_path
 
+    def _keeps_audio(self) -> bool:
+        """delete_audio 为 false 时保留录音"""
+        return hasattr(self, "delete_audio_file") and not self.delete_audio_file
+
+    def _archive_audio(self, pcm_bytes: bytes, session_id: str) -> Optional[str]:
+        """保留录音：有归档写入器时交给后台线程批量写入，否则同步写入"""
+        if not has_disk_space(self.output_dir, len(pcm_bytes) * 2):
+            logger.bind(tag=TAG).warning("磁盘空间不足，本次录音不保存")
+            return None
+        if self.audio_archiver is None:
+            return self.save_audio_to_file([pcm_bytes], session_id)
+        file_path = self._audio_file_path(session_id)
+        if not self.audio_archiver.submit(file_path, pcm_bytes):
+            return None
+        return file_path
+
     async def speech_to_text_wrapper(
-        self, pcm_data: List[bytes], session_id: str
+        self, pcm_data: List[bytes], session_id: str, archive: bool = True
     ) -> Tuple[Optional[str], Optional[str]]:
+        """识别一段语音
+
+        Args:
+            archive: 为 False 时不保留录音（预识别），需要文件输入的ASR识别后删除文件
+        """
+        if self.memory_artifacts:
+            return await self._speech_to_text_in_memory(pcm_data, session_id, archive)
+
+        keep_audio = archive and self._keeps_audio()
         file_path = None
         temp_path = None
         try:
             combined_pcm_data = b"".join(pcm_data)
 
-            free_space = shutil.disk_usage(self.output_dir).free
-            if free_space < len(combined_pcm_data) * 2:
+            if not has_disk_space(self.output_dir, len(combined_pcm_data) * 2):
                 raise OSError("磁盘空间不足")
 
             if self.requires_file() and self.prefers_temp_file():
                 temp_path = self.build_temp_file(combined_pcm_data)
 
-            if (hasattr(self, "delete_audio_file") and not self.delete_audio_file) or (
-                self.requires_file() and not self.prefers_temp_file()
-            ):
+            if keep_audio or (self.requires_file() and not self.prefers_temp_file()):
                 file_path = self.save_audio_to_file(pcm_data, session_id)
 
             if len(combined_pcm_data) == 0:
@@ -298,7 +432,7 @@ class ASRProviderBase(ABC):
             text, _ = await self.speech_to_text(
                 pcm_data, session_id, artifacts
             )
-            return text, file_path
+            return text, file_path if archive else None
         except OSError as e:
             logger.bind(tag=TAG).error(f"文件操作错误: {e}")
             return None, None
@@ -310,15 +444,62 @@ class ASRProviderBase(ABC):
                 if temp_path and os.path.exists(temp_path):
                     os.unlink(temp_path)
                 if (
-                    hasattr(self, "delete_audio_file")
-                    and self.delete_audio_file
-                    and file_path
+                    file_path
+                    and (not archive or getattr(self, "delete_audio_file", False))
                     and os.path.exists(file_path)
                 ):
                     os.remove(file_path)
             except Exception as e:
                 logger.bind(tag=TAG).error(f"文件清理失败: {e}")
 
+    async def _speech_to_text_in_memory(
+        self, pcm_data: List[bytes], session_id: str, archive: bool = True
+    ) -> Tuple[Optional[str], Optional[str]]:
+        """内存工件模式：识别过程不读写磁盘，需要文件路径的ASR使用内存文件"""
+        memory_path = None
+        memory_fd = -1
+        archive_path = None
+        try:
+            combined_pcm_data = b"".join(pcm_data)
+            if len(combined_pcm_data) == 0:
+                text, _ = await self.speech_to_text(pcm_data, session_id, None)
+                return text, None
+
+            if archive and self._keeps_audio():
+                archive_path = self._archive_audio(combined_pcm_data, session_id)
+
+            file_path = archive_path
+            temp_path = None
+            if self.requires_file():
+                # prefers_temp_file 的ASR把路径交给外部SDK（如 dashscope），需要真实的 .wav 文件名
+                memory_path, memory_fd = create_memory_wav(
+                    combined_pcm_data, allow_memfd=not self.prefers_temp_file()
+                )
+                if self.prefers_temp_file():
+                    temp_path = memory_path
+                else:
+                    file_path = memory_path
+
+            artifacts = ASRProviderBase.AudioArtifacts(
+                pcm_frames=pcm_data,
+                pcm_bytes=combined_pcm_data,
+                file_path=file_path,
+                temp_path=temp_path,
+            )
+            text, _ = await self.speech_to_text(pcm_data, session_id, artifacts)
+            return text, archive_path
+        except OSError as e:
+            logger.bind(tag=TAG).error(f"文件操作错误: {e}")
+            return None, None
+        except Exception as e:
+            logger.bind(tag=TAG).error(f"语音识别失败: {e}")
+            return None, None
+        finally:
+            try:
+                release_memory_wav(memory_path, memory_fd)
+            except Exception as e:
+                logger.bind(tag=TAG).error(f"内存文件释放失败: {e}")
+
     @abstractmethod
     async def speech_to_text(
         self,
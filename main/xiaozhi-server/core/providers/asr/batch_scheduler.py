@@ -0,0 +1,145 @@
+"""
+本地离线ASR动态微批调度器
+本地ASR实例在所有连接间共享，多个用户同时说完话时，把短时间内到达的整句音频合并为一批，
+用一次批量推理（FunASR generate / sherpa-onnx decode_streams）完成，再把结果分发回各连接
+"""
+
+import time
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List
+from config.logger import setup_logging
+
+TAG = __name__
+logger = setup_logging()
+
+# 16kHz 16bit 单声道每秒字节数，用于计算音频时长
+PCM_BYTES_PER_SECOND = 32000
+
+
+class ASRBatchScheduler:
+    """ASR 动态微批调度器
+
+    第一条音频到达后最多等待 max_wait_ms 毫秒，或凑满 max_batch_size 条立即推理。
+    批量推理在独立的单线程中按顺序执行，推理期间到达的音频自动进入下一批。
+    """
+
+    def __init__(
+        self,
+        batch_fn: Callable[[List[Any]], List[Any]],
+        max_wait_ms=30,
+        max_batch_size=8,
+        name="asr",
+    ):
+        """
+        Args:
+            batch_fn: 同步批量推理函数，输入列表，按相同顺序返回结果列表
+            max_wait_ms: 凑批最长等待时间（毫秒）
+            max_batch_size: 每批最多条数
+            name: 推理线程名前缀及日志标识
+        """
+        self.batch_fn = batch_fn
+        self.max_wait = max(float(max_wait_ms), 0) / 1000
+        self.max_batch_size = max(int(max_batch_size), 1)
+        self.name = name
+        self._pending = []
+        self._flush_handle = None
+        self._loop = None
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix=f"{name}-batch"
+        )
+        # 统计信息
+        self.total_batches = 0
+        self.total_items = 0
+        self.max_batch_seen = 0
+        self.total_queue_wait = 0.0
+        self.max_queue_wait = 0.0
+        self.total_audio_seconds = 0.0
+        self.total_infer_seconds = 0.0
+
+    async def submit(self, item, audio_seconds: float = 0.0):
+        """提交一条整句音频，等待并返回其识别结果
+
+        Args:
+            item: 传给 batch_fn 的单条输入
+            audio_seconds: 音频时长（秒），用于计算实时率
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._pending = []
+            self._flush_handle = None
+        future = loop.create_future()
+        self._pending.append((item, audio_seconds, time.monotonic(), future))
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.max_wait, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._pending = self._pending, []
+        if batch:
+            self._loop.create_task(self._run_batch(batch))
+
+    def _timed_batch(self, inputs):
+        start = time.monotonic()
+        results = self.batch_fn(inputs)
+        return results, start, time.monotonic()
+
+    async def _run_batch(self, batch):
+        try:
+            results, start, end = await self._loop.run_in_executor(
+                self._executor, self._timed_batch, [item[0] for item in batch]
+            )
+            if len(results) != len(batch):
+                raise RuntimeError(
+                    f"批量识别结果数量不匹配: 输入{len(batch)}条，返回{len(results)}条"
+                )
+        except Exception as e:
+            for _, _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        self._record(batch, start, end)
+        for (_, _, _, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    def _record(self, batch, start, end):
+        size = len(batch)
+        audio_seconds = sum(item[1] for item in batch)
+        max_wait = max(start - item[2] for item in batch)
+        self.total_batches += 1
+        self.total_items += size
+        self.max_batch_seen = max(self.max_batch_seen, size)
+        self.total_queue_wait += sum(start - item[2] for item in batch)
+        self.max_queue_wait = max(self.max_queue_wait, max_wait)
+        self.total_audio_seconds += audio_seconds
+        self.total_infer_seconds += end - start
+        logger.bind(tag=TAG).debug(
+            f"[{self.name}] 批量识别 {size} 条 | 最长排队 {max_wait * 1000:.1f}ms | "
+            f"推理 {(end - start) * 1000:.1f}ms | RTF {self._rtf(end - start, audio_seconds):.3f}"
+        )
+
+    @staticmethod
+    def _rtf(infer_seconds, audio_seconds):
+        return infer_seconds / audio_seconds if audio_seconds > 0 else 0.0
+
+    def metrics(self) -> dict:
+        """批大小、排队等待、实时率（推理耗时/音频时长）统计"""
+        items = self.total_items or 1
+        batches = self.total_batches or 1
+        return {
+            "batches": self.total_batches,
+            "items": self.total_items,
+            "avg_batch_size": self.total_items / batches,
+            "max_batch_size": self.max_batch_seen,
+            "avg_queue_wait_ms": self.total_queue_wait / items * 1000,
+            "max_queue_wait_ms": self.max_queue_wait * 1000,
+            "rtf": self._rtf(self.total_infer_seconds, self.total_audio_seconds),
+        }
@@ -0,0 +1,113 @@
+"""
+流式ASR上行音频合包
+设备每60ms上报一帧，逐帧转发时每个说话人每分钟要发送上千条WebSocket消息，
+每条都要付出一次系统调用和协议封装（豆包的gzip头、讯飞的JSON+base64等）开销。
+合包器在说话期间把若干帧攒成 100~200ms 的音频块再发送；
+检测到静音时立即把剩余音频连同静音帧一起发出，服务端的断句时机不受影响
+"""
+
+import time
+import asyncio
+from typing import Optional
+from config.logger import setup_logging
+
+TAG = __name__
+logger = setup_logging()
+
+# 16kHz 16bit 单声道，每毫秒32字节
+BYTES_PER_MS = 32
+# 自适应模式下RTT的平滑系数
+RTT_SMOOTHING = 0.3
+
+
+class FrameCoalescer:
+    """按时长合并PCM帧，每个流式ASR实例（即每个设备连接）持有一个"""
+
+    def __init__(self, chunk_ms=0, adaptive=False, min_ms=100, max_ms=200):
+        """
+        Args:
+            chunk_ms: 合包时长(ms)，0表示逐帧发送
+            adaptive: 是否按观测到的RTT调整合包时长（在 min_ms~max_ms 之间）
+            min_ms: 自适应模式下的最小合包时长
+            max_ms: 自适应模式下的最大合包时长
+        """
+        self.min_ms = max(int(min_ms), 0)
+        self.max_ms = max(int(max_ms), self.min_ms)
+        self.adaptive = bool(adaptive)
+        self.chunk_ms = max(int(chunk_ms), 0)
+        if self.adaptive and not self.chunk_ms:
+            self.chunk_ms = self.min_ms
+        self.rtt_ms = None
+        self._buffer = bytearray()
+        # 统计信息
+        self.frames_in = 0
+        self.messages_out = 0
+
+    @classmethod
+    def from_config(cls, config: dict) -> "FrameCoalescer":
+        """从ASR配置读取 coalesce_ms、coalesce_adaptive、coalesce_min_ms、coalesce_max_ms"""
+        return cls(
+            chunk_ms=int(config.get("coalesce_ms", 0) or 0),
+            adaptive=str(config.get("coalesce_adaptive", False)).lower() in ("true", "1", "yes"),
+            min_ms=int(config.get("coalesce_min_ms", 100) or 0),
+            max_ms=int(config.get("coalesce_max_ms", 200) or 0),
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.chunk_ms > 0
+
+    def push(self, pcm_frame: bytes, have_voice: bool = True) -> Optional[bytes]:
+        """放入一帧，返回需要立即发送的音频块，还需继续攒时返回 None"""
+        self.frames_in += 1
+        if not self.enabled:
+            self.messages_out += 1
+            return pcm_frame
+        self._buffer += pcm_frame
+        # 静音帧不再等待，服务端靠这段静音断句
+        if have_voice and len(self._buffer) < self.chunk_ms * BYTES_PER_MS:
+            return None
+        return self.flush()
+
+    def flush(self) -> Optional[bytes]:
+        """取出所有尚未发送的音频"""
+        if not self._buffer:
+            return None
+        chunk = bytes(self._buffer)
+        self._buffer.clear()
+        self.messages_out += 1
+        return chunk
+
+    def reset(self):
+        """新的识别会话开始时丢弃残留音频"""
+        self._buffer.clear()
+
+    def observe_rtt(self, seconds: float):
+        """记录一次RTT，自适应模式下合包时长跟随RTT：链路越慢，攒得越多"""
+        rtt_ms = seconds * 1000
+        if self.rtt_ms is None:
+            self.rtt_ms = rtt_ms
+        else:
+            self.rtt_ms += RTT_SMOOTHING * (rtt_ms - self.rtt_ms)
+        if self.adaptive:
+            self.chunk_ms = int(min(max(self.rtt_ms, self.min_ms), self.max_ms))
+
+    async def measure_rtt(self, ws):
+        """用WebSocket ping测量一次RTT，失败时保持当前合包时长"""
+        if not self.adaptive:
+            return
+        try:
+            start = time.monotonic()
+            pong_waiter = await ws.ping()
+            await asyncio.wait_for(pong_waiter, timeout=2.0)
+            self.observe_rtt(time.monotonic() - start)
+        except Exception as e:
+            logger.bind(tag=TAG).debug(f"测量RTT失败: {e}")
+
+    def stats(self) -> dict:
+        return {
+            "chunk_ms": self.chunk_ms,
+            "rtt_ms": self.rtt_ms,
+            "frames_in": self.frames_in,
+            "messages_out": self.messages_out,
+        }
@@ -6,6 +6,8 @@ import websockets
 from core.providers.asr.base import ASRProviderBase
 from config.logger import setup_logging
 from core.providers.asr.dto.dto import InterfaceType
+from core.providers.asr.ws_pool import get_ws_pool
+from core.providers.asr.coalesce import FrameCoalescer
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
@@ -63,8 +65,20 @@ class ASRProvider(ASRProviderBase):
         end_window_size = config.get("end_window_size")
         self.end_window_size = int(end_window_size) if end_window_size else 200
 
+        # 预热连接池（ws_pool_size 大于 0 时启用）
+        self.ws_pool = get_ws_pool(
+            "doubao_stream",
+            self.ws_url,
+            f"{self.appid}:{self.access_token}:{self.resource_id}",
+            config,
+        )
+        # 上行音频合包
+        self.coalescer = FrameCoalescer.from_config(config)
+
     async def open_audio_channels(self, conn):
         await super().open_audio_channels(conn)
+        if self.ws_pool is not None:
+            self.ws_pool.prewarm(self._open_session)
 
     async def receive_audio(self, conn: "ConnectionHandler", pcm_frame, audio_have_voice):
         # 先调用父类方法处理基础逻辑
@@ -74,47 +88,14 @@ class ASRProvider(ASRProviderBase):
         if audio_have_voice and self.asr_ws is None and not self.is_processing:
             try:
                 self.is_processing = True
-                # 建立新的WebSocket连接
-                headers = self.token_auth() if self.auth_method == "token" else None
-                logger.bind(tag=TAG).info(f"正在连接ASR服务，headers: {headers}")
-
-                self.asr_ws = await websockets.connect(
-                    self.ws_url,
-                    additional_headers=headers,
-                    max_size=1000000000,
-                    ping_interval=None,
-                    ping_timeout=None,
-                    close_timeout=10,
-                )
-
-                # 发送初始化请求
-                request_params = self.construct_request(str(uuid.uuid4()))
-                try:
-                    payload_bytes = str.encode(json.dumps(request_params))
-                    payload_bytes = gzip.compress(payload_bytes)
-                    full_client_request = self.generate_header()
-                    full_client_request.extend((len(payload_bytes)).to_bytes(4, "big"))
-                    full_client_request.extend(payload_bytes)
-
-                    logger.bind(tag=TAG).info(f"发送初始化请求: {request_params}")
-                    await self.asr_ws.send(full_client_request)
-
-                    # 等待初始化响应
-                    init_res = await self.asr_ws.recv()
-                    result = self.parse_response(init_res)
-                    logger.bind(tag=TAG).info(f"收到初始化响应: {result}")
-
-                    # 检查初始化响应
-                    if "code" in result and result["code"] != 1000:
-                        error_msg = f"ASR服务初始化失败: {result.get('payload_msg', {}).get('error', '未知错误')}"
-                        logger.bind(tag=TAG).error(error_msg)
-                        raise Exception(error_msg)
-
-                except Exception as e:
-                    logger.bind(tag=TAG).error(f"发送初始化请求失败: {str(e)}")
-                    if hasattr(e, "__cause__") and e.__cause__:
-                        logger.bind(tag=TAG).error(f"错误原因: {str(e.__cause__)}")
-                    raise e
+                # 优先取用预热好的连接（已完成初始化请求）
+                if self.ws_pool is not None:
+                    self.asr_ws = await self.ws_pool.acquire(self._open_session)
+                else:
+                    self.asr_ws = await self._open_session()
+                self.coalescer.reset()
+                if self.coalescer.adaptive:
+                    asyncio.create_task(self.coalescer.measure_rtt(self.asr_ws))
 
                 # 启动接收ASR结果的异步任务
                 self.forward_task = asyncio.create_task(self._forward_asr_results(conn))
@@ -123,13 +104,9 @@ class ASRProvider(ASRProviderBase):
                 if conn.asr_audio and len(conn.asr_audio) > 0:
                     for cached_pcm in conn.asr_audio[-10:]:
                         try:
-                            payload = gzip.compress(cached_pcm)
-                            audio_request = bytearray(
-                                self.generate_audio_default_header()
-                            )
-                            audio_request.extend(len(payload).to_bytes(4, "big"))
-                            audio_request.extend(payload)
-                            await self.asr_ws.send(audio_request)
+                            chunk = self.coalescer.push(cached_pcm)
+                            if chunk:
+                                await self._send_audio(chunk)
                         except Exception as e:
                             logger.bind(tag=TAG).info(
                                 f"发送缓存音频数据时发生错误: {e}"
@@ -148,14 +125,68 @@ class ASRProvider(ASRProviderBase):
         # 发送当前音频数据
         if self.asr_ws and self.is_processing and not self._is_stopping:
             try:
-                payload = gzip.compress(pcm_frame)
-                audio_request = bytearray(self.generate_audio_default_header())
-                audio_request.extend(len(payload).to_bytes(4, "big"))
-                audio_request.extend(payload)
-                await self.asr_ws.send(audio_request)
+                chunk = self.coalescer.push(pcm_frame, audio_have_voice)
+                if chunk:
+                    await self._send_audio(chunk)
             except Exception as e:
                 logger.bind(tag=TAG).info(f"发送音频数据时发生错误: {e}")
 
+    async def _send_audio(self, pcm: bytes, last: bool = False):
+        """发送一个音频包，last 为 True 时作为结束包"""
+        payload = gzip.compress(pcm)
+        if last:
+            audio_request = bytearray(self.generate_last_audio_default_header())
+        else:
+            audio_request = bytearray(self.generate_audio_default_header())
+        audio_request.extend(len(payload).to_bytes(4, "big"))
+        audio_request.extend(payload)
+        await self.asr_ws.send(audio_request)
+
+    async def _open_session(self):
+        """建立WebSocket连接并完成初始化请求，返回可直接发送音频的连接"""
+        headers = self.token_auth() if self.auth_method == "token" else None
+        logger.bind(tag=TAG).info(f"正在连接ASR服务，headers: {headers}")
+
+        ws = await websockets.connect(
+            self.ws_url,
+            additional_headers=headers,
+            max_size=1000000000,
+            ping_interval=None,
+            ping_timeout=None,
+            close_timeout=10,
+        )
+
+        # 发送初始化请求
+        request_params = self.construct_request(str(uuid.uuid4()))
+        try:
+            payload_bytes = str.encode(json.dumps(request_params))
+            payload_bytes = gzip.compress(payload_bytes)
+            full_client_request = self.generate_header()
+            full_client_request.extend((len(payload_bytes)).to_bytes(4, "big"))
+            full_client_request.extend(payload_bytes)
+
+            logger.bind(tag=TAG).info(f"发送初始化请求: {request_params}")
+            await ws.send(full_client_request)
+
+            # 等待初始化响应
+            init_res = await ws.recv()
+            result = self.parse_response(init_res)
+            logger.bind(tag=TAG).info(f"收到初始化响应: {result}")
+
+            # 检查初始化响应
+            if "code" in result and result["code"] != 1000:
+                error_msg = f"ASR服务初始化失败: {result.get('payload_msg', {}).get('error', '未知错误')}"
+                logger.bind(tag=TAG).error(error_msg)
+                raise Exception(error_msg)
+
+        except Exception as e:
+            logger.bind(tag=TAG).error(f"发送初始化请求失败: {str(e)}")
+            if hasattr(e, "__cause__") and e.__cause__:
+                logger.bind(tag=TAG).error(f"错误原因: {str(e.__cause__)}")
+            await ws.close()
+            raise e
+        return ws
+
     async def _forward_asr_results(self, conn: "ConnectionHandler"):
         try:
             while self.asr_ws and not conn.stop_event.is_set():
@@ -269,14 +300,8 @@ class ASRProvider(ASRProviderBase):
         self._is_stopping = True  # 先标记为停止状态，阻止后续音频发送
         if self.asr_ws:
             try:
-                # 发送结束标记的音频帧（gzip压缩的空数据）
-                empty_payload = gzip.compress(b"")
-                last_audio_request = bytearray(
-                    self.generate_last_audio_default_header()
-                )
-                last_audio_request.extend(len(empty_payload).to_bytes(4, "big"))
-                last_audio_request.extend(empty_payload)
-                await self.asr_ws.send(last_audio_request)
+                # 发送结束标记的音频帧，携带合包中尚未发送的音频
+                await self._send_audio(self.coalescer.flush() or b"", last=True)
                 logger.bind(tag=TAG).debug("已发送结束音频帧")
             except Exception as e:
                 logger.bind(tag=TAG).debug(f"发送结束音频帧时出错: {e}")
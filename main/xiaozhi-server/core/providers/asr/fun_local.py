@@ -5,12 +5,15 @@ import time
 import shutil
 import psutil
 import asyncio
+import numpy as np
 
 from funasr import AutoModel
 from config.logger import setup_logging
 from typing import Optional, Tuple, List
 from core.providers.asr.utils import lang_tag_filter
 from core.providers.asr.base import ASRProviderBase
+from core.providers.asr.batch_scheduler import ASRBatchScheduler, PCM_BYTES_PER_SECOND
+from core.providers.asr.incremental import IncrementalSessions
 from core.providers.asr.dto.dto import InterfaceType
 
 TAG = __name__
@@ -19,6 +22,10 @@ logger = setup_logging()
 MAX_RETRIES = 2
 RETRY_DELAY = 1  # 重试延迟（秒）
 
+# 流式 paraformer 分块配置：[0, 10, 5] 表示每块 600ms，向后看 300ms
+STREAM_CHUNK_SIZE = [0, 10, 5]
+STREAM_CHUNK_BYTES = STREAM_CHUNK_SIZE[1] * 960 * 2
+
 
 # 捕获标准输出
 class CaptureOutput:
@@ -59,6 +66,14 @@ class ASRProvider(ASRProviderBase):
 
         # 确保输出目录存在
         os.makedirs(self.output_dir, exist_ok=True)
+
+        self.batch_scheduler = None
+        self.incremental_sessions = None
+        streaming = config.get("streaming", False)
+        if str(streaming).lower() in ("true", "1", "yes"):
+            self._init_streaming_model(config)
+            return
+
         with CaptureOutput():
             self.model = AutoModel(
                 model=self.model_dir,
@@ -68,6 +83,75 @@ class ASRProvider(ASRProviderBase):
                 # device="cuda:0",  # 启用GPU加速
             )
 
+        # 动态微批：多个连接同时说完话时合并为一次 generate
+        batch_max_size = int(config.get("batch_max_size", 1))
+        if batch_max_size > 1:
+            self.batch_scheduler = ASRBatchScheduler(
+                self._generate_batch,
+                max_wait_ms=float(config.get("batch_max_wait_ms", 30)),
+                max_batch_size=batch_max_size,
+                name="funasr",
+            )
+            logger.bind(tag=TAG).info(f"FunASR 已启用动态微批，每批最多 {batch_max_size} 条")
+
+    def _init_streaming_model(self, config: dict):
+        """加载流式 paraformer 模型，说话过程中按块增量识别"""
+        with CaptureOutput():
+            self.model = AutoModel(
+                model=self.model_dir,
+                disable_update=True,
+                hub="hf",
+            )
+        self.incremental_sessions = IncrementalSessions(
+            self._stream_create,
+            self._stream_feed,
+            self._stream_finish,
+            workers=int(config.get("stream_workers", 1)),
+            name="funasr",
+        )
+        logger.bind(tag=TAG).info("FunASR 已启用流式增量识别")
+
+    @staticmethod
+    def _stream_create() -> dict:
+        return {"cache": {}, "pending": bytearray(), "texts": []}
+
+    def _stream_generate(self, state: dict, pcm_bytes: bytes, is_final: bool):
+        samples = np.frombuffer(pcm_bytes, dtype=np.int16).astype(np.float32) / 32768
+        result = self.model.generate(
+            input=samples,
+            cache=state["cache"],
+            is_final=is_final,
+            chunk_size=STREAM_CHUNK_SIZE,
+            encoder_chunk_look_back=4,
+            decoder_chunk_look_back=1,
+        )
+        if result and result[0].get("text"):
+            state["texts"].append(result[0]["text"])
+
+    def _stream_feed(self, state: dict, pcm_bytes: bytes):
+        pending = state["pending"]
+        pending.extend(pcm_bytes)
+        while len(pending) >= STREAM_CHUNK_BYTES:
+            chunk = bytes(pending[:STREAM_CHUNK_BYTES])
+            del pending[:STREAM_CHUNK_BYTES]
+            self._stream_generate(state, chunk, is_final=False)
+
+    def _stream_finish(self, state: dict) -> str:
+        # 只需处理最后不足一块的尾部音频
+        self._stream_generate(state, bytes(state["pending"]), is_final=True)
+        return "".join(state["texts"])
+
+    def _generate_batch(self, pcm_list: List[bytes]) -> List[dict]:
+        """批量识别多段PCM，结果与输入顺序一致"""
+        return self.model.generate(
+            input=pcm_list,
+            cache={},
+            language=self.language,
+            use_itn=True,
+            batch_size=len(pcm_list),
+            batch_size_s=60,
+        )
+
     async def speech_to_text(
         self, opus_data: List[bytes], session_id: str, artifacts=None
     ) -> Tuple[Optional[str], Optional[str]]:
@@ -81,17 +165,30 @@ class ASRProvider(ASRProviderBase):
 
                 # 语音识别 - 使用线程池避免阻塞事件循环
                 start_time = time.time()
-                result = await asyncio.to_thread(
-                    self.model.generate,
-                    input=artifacts.pcm_bytes,
-                    cache={},
-                    language=self.language,
-                    use_itn=True,
-                    batch_size_s=60,
-                )
-                text = lang_tag_filter(result[0]["text"])
+                if self.incremental_sessions is not None:
+                    # 流式模型：说话过程中已完成大部分解码，这里只处理尾部音频
+                    raw_text = await self.incremental_sessions.finish(
+                        session_id, artifacts.pcm_bytes
+                    )
+                elif self.batch_scheduler is not None:
+                    result = await self.batch_scheduler.submit(
+                        artifacts.pcm_bytes,
+                        len(artifacts.pcm_bytes) / PCM_BYTES_PER_SECOND,
+                    )
+                    raw_text = result["text"]
+                else:
+                    result = await asyncio.to_thread(
+                        self.model.generate,
+                        input=artifacts.pcm_bytes,
+                        cache={},
+                        language=self.language,
+                        use_itn=True,
+                        batch_size_s=60,
+                    )
+                    raw_text = result[0]["text"]
+                text = lang_tag_filter(raw_text)
                 logger.bind(tag=TAG).debug(
-                    f"语音识别耗时: {time.time() - start_time:.3f}s | 结果: {text['content']}"
+                    f"语音识别耗时: {time.time() - start_time:.3f}s | 结果: {text['content'] if isinstance(text, dict) else text}"
                 )
 
                 return text, artifacts.file_path
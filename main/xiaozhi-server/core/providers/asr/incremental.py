@@ -0,0 +1,107 @@
+"""
+本地ASR增量识别会话管理
+本地流式模型（sherpa-onnx OnlineRecognizer、FunASR 流式 paraformer）在用户说话过程中就开始解码，
+检测到说话结束后只需处理尾部音频，结束到出字的延迟与句子长度无关
+
+本地ASR实例在所有连接间共享，每个连接的解码状态按 session_id 保存在这里。
+同一会话的所有操作固定在同一个线程中按提交顺序执行，不需要加锁，也保证结束时所有音频都已送入模型
+"""
+
+import zlib
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List, Optional
+from config.logger import setup_logging
+
+TAG = __name__
+logger = setup_logging()
+
+
+class IncrementalSessions:
+    """增量识别会话管理器"""
+
+    def __init__(
+        self,
+        create_fn: Callable[[], Any],
+        feed_fn: Callable[[Any, bytes], None],
+        finish_fn: Callable[[Any], Any],
+        workers=1,
+        name="asr",
+        release_fn: Optional[Callable[[Any], None]] = None,
+    ):
+        """
+        Args:
+            create_fn: 创建一个解码状态
+            feed_fn: 向解码状态送入一段PCM并解码已就绪的部分
+            finish_fn: 处理尾部音频并返回最终识别结果
+            workers: 解码线程数，会话按 session_id 哈希固定分配到线程
+            name: 线程名前缀
+            release_fn: 可选，解码状态被丢弃时调用（如把识别器归还到池中），finish_fn 需自行归还
+        """
+        self.create_fn = create_fn
+        self.feed_fn = feed_fn
+        self.finish_fn = finish_fn
+        self.release_fn = release_fn
+        self._sessions = {}
+        self._executors = [
+            ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"{name}-stream-{i}")
+            for i in range(max(int(workers), 1))
+        ]
+
+    def _executor_of(self, session_id: str) -> ThreadPoolExecutor:
+        index = zlib.crc32(session_id.encode("utf-8")) % len(self._executors)
+        return self._executors[index]
+
+    def feed(self, session_id: str, pcm_frames: List[bytes], start=False):
+        """送入音频帧，立即返回，解码在后台线程中进行
+
+        Args:
+            session_id: 会话ID
+            pcm_frames: PCM帧列表
+            start: 是否为一句话的开始，为 True 时丢弃该会话之前的解码状态
+        """
+        self._executor_of(session_id).submit(
+            self._feed, session_id, list(pcm_frames), start
+        )
+
+    def _feed(self, session_id, pcm_frames, start):
+        try:
+            state = self._sessions.get(session_id)
+            if start or state is None:
+                self._release(state)
+                state = self.create_fn()
+                self._sessions[session_id] = state
+            for pcm_frame in pcm_frames:
+                self.feed_fn(state, pcm_frame)
+        except Exception as e:
+            logger.bind(tag=TAG).error(f"增量识别送入音频失败: {e}")
+            self._release(self._sessions.pop(session_id, None))
+
+    async def finish(self, session_id: str, pcm_bytes: bytes):
+        """结束一句话并返回识别结果
+
+        Args:
+            session_id: 会话ID
+            pcm_bytes: 整句PCM，仅在该会话没有增量状态时（如手动模式）用于完整识别
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor_of(session_id), self._finish, session_id, pcm_bytes
+        )
+
+    def _finish(self, session_id, pcm_bytes):
+        state = self._sessions.pop(session_id, None)
+        if state is None:
+            state = self.create_fn()
+            self.feed_fn(state, pcm_bytes)
+        return self.finish_fn(state)
+
+    def discard(self, session_id: str):
+        """丢弃会话的解码状态（语音过短或连接关闭时调用）"""
+        self._executor_of(session_id).submit(
+            lambda: self._release(self._sessions.pop(session_id, None))
+        )
+
+    def _release(self, state):
+        if state is not None and self.release_fn is not None:
+            self.release_fn(state)
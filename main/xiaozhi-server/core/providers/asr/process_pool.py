@@ -0,0 +1,274 @@
+"""
+本地ASR多进程工作池
+每个工作进程加载一份本地ASR模型（fun_local、sherpa_onnx_local、vosk 等），
+主进程把整句PCM写入共享内存，只通过队列传递共享内存名称和识别结果，
+模型推理及其Python前后处理都不再占用主进程的GIL，避免拖慢所有连接的websocket处理
+"""
+
+import os
+import time
+import asyncio
+import itertools
+import threading
+import multiprocessing
+from multiprocessing import shared_memory
+from multiprocessing.connection import wait
+from typing import Optional, Tuple, List
+from config.logger import setup_logging
+from core.providers.asr.base import ASRProviderBase
+from core.providers.asr.dto.dto import InterfaceType
+
+TAG = __name__
+logger = setup_logging()
+
+
+def _attach_shared_memory(name: str) -> shared_memory.SharedMemory:
+    """以只读方式挂载主进程创建的共享内存，生命周期由主进程管理"""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python 3.13 以下没有 track 参数。spawn 启动的工作进程与主进程共用同一个 resource_tracker，
+        # 重复登记不影响；不能在这里取消登记，否则主进程 unlink 时取消登记会报 KeyError
+        return shared_memory.SharedMemory(name=name)
+
+
+def _worker_main(worker_config: dict, task_queue, result_queue):
+    """工作进程入口：加载模型后循环处理识别任务
+
+    发给主进程的消息为 (类型, 进程号, 任务ID, 识别结果, 错误)，类型为 ready、failed、start、result
+    """
+    pid = os.getpid()
+    try:
+        from core.utils.asr import create_instance
+
+        # 音频文件的保存由主进程负责，工作进程只做识别
+        asr = create_instance(worker_config["type"], worker_config, True)
+    except Exception as e:
+        result_queue.put(("failed", pid, None, None, f"ASR工作进程 {pid} 加载模型失败: {e}"))
+        return
+    result_queue.put(("ready", pid, None, None, None))
+
+    loop = asyncio.new_event_loop()
+    while True:
+        task = task_queue.get()
+        if task is None:
+            break
+        task_id, shm_name, size, session_id = task
+        # 登记正在处理的任务，进程中途退出时主进程据此立即结束该任务
+        result_queue.put(("start", pid, task_id, None, None))
+        try:
+            shm = _attach_shared_memory(shm_name)
+            try:
+                pcm_bytes = bytes(shm.buf[:size])
+            finally:
+                shm.close()
+            text, _ = loop.run_until_complete(
+                asr.speech_to_text_wrapper([pcm_bytes], session_id)
+            )
+            result_queue.put(("result", pid, task_id, text, None))
+        except Exception as e:
+            result_queue.put(("result", pid, task_id, None, str(e)))
+
+
+class ASRProvider(ASRProviderBase):
+    def __init__(self, config: dict, delete_audio_file: bool):
+        super().__init__()
+        self.interface_type = InterfaceType.LOCAL
+        self.output_dir = config.get("output_dir", "tmp/")
+        self.delete_audio_file = delete_audio_file
+        os.makedirs(self.output_dir, exist_ok=True)
+
+        self.worker_config = config.get("worker_asr") or {}
+        worker_type = self.worker_config.get("type")
+        if not worker_type:
+            raise ValueError("process_pool 需要配置 worker_asr.type，指定工作进程中使用的本地ASR")
+        if worker_type == "process_pool":
+            raise ValueError("process_pool 的 worker_asr 不能再使用 process_pool")
+
+        self.num_workers = max(int(config.get("workers", 2)), 1)
+        self.timeout = float(config.get("timeout", 30))
+        # 工作进程加载模型失败后，在该时间（秒）内不再重新拉起
+        self.restart_backoff = float(config.get("restart_backoff", 30))
+
+        # 使用 spawn 启动，避免 fork 后继承主进程的线程和模型状态
+        self._ctx = multiprocessing.get_context("spawn")
+        self._task_queue = self._ctx.Queue()
+        self._result_queue = self._ctx.SimpleQueue()
+        self._processes = [None] * self.num_workers
+        self._pending = {}
+        self._pending_lock = threading.Lock()
+        self._task_ids = itertools.count()
+        # 进程状态，由 _pending_lock 保护：已加载模型的进程号、进程号 -> 正在处理的任务ID、
+        # 尚未处理退出的进程、加载失败后的退避截止时间和失败原因
+        self._ready = set()
+        self._running = {}
+        self._watched = set()
+        self._backoff_until = 0.0
+        self._load_error = None
+
+        self._ensure_workers()
+        threading.Thread(
+            target=self._result_reader, name="asr-pool-results", daemon=True
+        ).start()
+        threading.Thread(
+            target=self._monitor, name="asr-pool-monitor", daemon=True
+        ).start()
+        logger.bind(tag=TAG).info(
+            f"ASR多进程工作池已启动，进程数: {self.num_workers}，工作进程ASR: {worker_type}"
+        )
+
+    def _ensure_workers(self) -> bool:
+        """启动工作进程，退出的进程会被重新拉起；加载模型失败后的退避期内不拉起
+
+        Returns:
+            是否有存活的工作进程
+        """
+        with self._pending_lock:
+            in_backoff = time.monotonic() < self._backoff_until
+            alive = False
+            for index, process in enumerate(self._processes):
+                if process is not None and process.is_alive():
+                    alive = True
+                    continue
+                if in_backoff:
+                    continue
+                if process is not None:
+                    logger.bind(tag=TAG).warning(
+                        f"ASR工作进程 {process.pid} 已退出（exitcode={process.exitcode}），重新启动"
+                    )
+                process = self._ctx.Process(
+                    target=_worker_main,
+                    args=(self.worker_config, self._task_queue, self._result_queue),
+                    name=f"asr-worker-{index}",
+                    daemon=True,
+                )
+                process.start()
+                self._processes[index] = process
+                self._watched.add(process)
+                alive = True
+            return alive
+
+    def _result_reader(self):
+        """后台线程：读取识别结果并唤醒等待中的协程"""
+        while True:
+            try:
+                kind, pid, task_id, text, error = self._result_queue.get()
+            except (EOFError, OSError):
+                break
+            with self._pending_lock:
+                if kind == "ready":
+                    self._ready.add(pid)
+                elif kind == "failed":
+                    self._load_error = error
+                elif kind == "start":
+                    self._running[pid] = task_id
+                elif self._running.get(pid) == task_id:
+                    self._running.pop(pid, None)
+            if kind == "ready":
+                logger.bind(tag=TAG).info(f"ASR工作进程 {pid} 已就绪")
+            elif kind == "failed":
+                logger.bind(tag=TAG).error(error)
+            elif kind == "result":
+                self._finish(task_id, text, error)
+
+    def _monitor(self):
+        """后台线程：工作进程退出时立即结束其正在处理的任务；
+        进程未加载完模型就退出时进入退避期，没有存活进程时结束所有等待中的任务"""
+        while True:
+            with self._pending_lock:
+                watched = list(self._watched)
+            if not watched:
+                time.sleep(1)
+                continue
+            wait([p.sentinel for p in watched], timeout=1)
+            for process in watched:
+                if process.is_alive():
+                    continue
+                with self._pending_lock:
+                    self._watched.discard(process)
+                    task_id = self._running.pop(process.pid, None)
+                    loaded = process.pid in self._ready
+                    self._ready.discard(process.pid)
+                    if not loaded:
+                        self._backoff_until = time.monotonic() + self.restart_backoff
+                    no_workers = not any(
+                        p is not None and p.is_alive() for p in self._processes
+                    )
+                if task_id is not None:
+                    self._finish(
+                        task_id,
+                        None,
+                        f"ASR工作进程 {process.pid} 处理中退出（exitcode={process.exitcode}）",
+                    )
+                if not loaded:
+                    logger.bind(tag=TAG).error(
+                        f"ASR工作进程 {process.pid} 加载模型失败，{self.restart_backoff:.0f}s 内不再重新启动"
+                    )
+                if no_workers:
+                    self._fail_all(self._load_error or "ASR工作进程全部退出")
+
+    def _finish(self, task_id, text, error):
+        with self._pending_lock:
+            entry = self._pending.pop(task_id, None)
+        if entry is None:
+            return
+        loop, future = entry
+        loop.call_soon_threadsafe(self._resolve, future, text, error)
+
+    def _fail_all(self, error: str):
+        """结束所有等待中的任务，并清空尚未被领取的任务"""
+        with self._pending_lock:
+            entries = list(self._pending.values())
+            self._pending.clear()
+        for loop, future in entries:
+            loop.call_soon_threadsafe(self._resolve, future, None, error)
+        try:
+            while True:
+                self._task_queue.get_nowait()
+        except Exception:
+            pass
+
+    @staticmethod
+    def _resolve(future: asyncio.Future, text, error):
+        if future.done():
+            return
+        if error:
+            future.set_exception(RuntimeError(error))
+        else:
+            future.set_result(text)
+
+    async def speech_to_text(
+        self, opus_data: List[bytes], session_id: str, artifacts=None
+    ) -> Tuple[Optional[str], Optional[str]]:
+        """把PCM写入共享内存后交给工作进程识别"""
+        if artifacts is None:
+            return "", None
+
+        if not self._ensure_workers():
+            logger.bind(tag=TAG).error(
+                f"ASR工作进程不可用: {self._load_error or '工作进程未启动'}"
+            )
+            return "", artifacts.file_path
+        pcm_bytes = artifacts.pcm_bytes
+        shm = shared_memory.SharedMemory(create=True, size=max(len(pcm_bytes), 1))
+        task_id = next(self._task_ids)
+        try:
+            shm.buf[: len(pcm_bytes)] = pcm_bytes
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            with self._pending_lock:
+                self._pending[task_id] = (loop, future)
+            self._task_queue.put((task_id, shm.name, len(pcm_bytes), session_id))
+            text = await asyncio.wait_for(future, self.timeout)
+            return text, artifacts.file_path
+        except asyncio.TimeoutError:
+            logger.bind(tag=TAG).error(f"ASR工作进程识别超时（{self.timeout}s）")
+            return "", artifacts.file_path
+        except Exception as e:
+            logger.bind(tag=TAG).error(f"ASR工作进程识别失败: {e}")
+            return "", artifacts.file_path
+        finally:
+            with self._pending_lock:
+                self._pending.pop(task_id, None)
+            shm.close()
+            shm.unlink()
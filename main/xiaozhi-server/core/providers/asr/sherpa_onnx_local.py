@@ -1,4 +1,5 @@
 import time
+import asyncio
 import wave
 import os
 import sys
@@ -7,6 +8,8 @@ from config.logger import setup_logging
 from typing import Optional, Tuple, List
 from core.providers.asr.dto.dto import InterfaceType
 from core.providers.asr.base import ASRProviderBase
+from core.providers.asr.batch_scheduler import ASRBatchScheduler, PCM_BYTES_PER_SECOND
+from core.providers.asr.incremental import IncrementalSessions
 
 import numpy as np
 import sherpa_onnx
@@ -16,6 +19,11 @@ from modelscope.hub.file_download import model_file_download
 TAG = __name__
 logger = setup_logging()
 
+# 流式模型类型，使用 OnlineRecognizer 在说话过程中增量识别
+STREAMING_MODEL_TYPES = ("streaming_paraformer", "streaming_zipformer")
+# 结束时补充的静音（0.66秒），让流式模型输出尾部结果
+STREAM_TAIL_PADDING = np.zeros(int(0.66 * 16000), dtype=np.float32)
+
 
 # 捕获标准输出
 class CaptureOutput:
@@ -40,12 +48,18 @@ class ASRProvider(ASRProviderBase):
         self.interface_type = InterfaceType.LOCAL
         self.model_dir = config.get("model_dir")
         self.output_dir = config.get("output_dir")
-        self.model_type = config.get("model_type", "sense_voice")  # 支持 paraformer
+        self.model_type = config.get("model_type", "sense_voice")  # 支持 paraformer、streaming_paraformer、streaming_zipformer
         self.delete_audio_file = delete_audio_file
 
         # 确保输出目录存在
         os.makedirs(self.output_dir, exist_ok=True)
 
+        self.batch_scheduler = None
+        self.incremental_sessions = None
+        if self.model_type in STREAMING_MODEL_TYPES:
+            self._init_streaming_model(config)
+            return
+
         # 初始化模型文件路径
         model_files = {
             "model.int8.onnx": os.path.join(self.model_dir, "model.int8.onnx"),
@@ -96,6 +110,76 @@ class ASRProvider(ASRProviderBase):
                     use_itn=True,
                 )
 
+        # 动态微批：多个连接同时说完话时合并为一次 decode_streams
+        batch_max_size = int(config.get("batch_max_size", 1))
+        if batch_max_size > 1:
+            self.batch_scheduler = ASRBatchScheduler(
+                self._decode_batch,
+                max_wait_ms=float(config.get("batch_max_wait_ms", 30)),
+                max_batch_size=batch_max_size,
+                name="sherpa",
+            )
+            logger.bind(tag=TAG).info(f"Sherpa ASR 已启用动态微批，每批最多 {batch_max_size} 条")
+
+    def _init_streaming_model(self, config: dict):
+        """加载流式模型（OnlineRecognizer），说话过程中增量识别"""
+        tokens = os.path.join(self.model_dir, config.get("tokens", "tokens.txt"))
+        encoder = os.path.join(self.model_dir, config.get("encoder", "encoder.int8.onnx"))
+        decoder = os.path.join(self.model_dir, config.get("decoder", "decoder.int8.onnx"))
+        model_files = [tokens, encoder, decoder]
+        if self.model_type == "streaming_zipformer":
+            joiner = os.path.join(self.model_dir, config.get("joiner", "joiner.int8.onnx"))
+            model_files.append(joiner)
+        for file_path in model_files:
+            if not os.path.isfile(file_path):
+                raise FileNotFoundError(f"流式模型文件不存在: {file_path}")
+
+        with CaptureOutput():
+            if self.model_type == "streaming_zipformer":
+                self.model = sherpa_onnx.OnlineRecognizer.from_transducer(
+                    tokens=tokens,
+                    encoder=encoder,
+                    decoder=decoder,
+                    joiner=joiner,
+                    num_threads=2,
+                    sample_rate=16000,
+                    feature_dim=80,
+                    decoding_method="greedy_search",
+                )
+            else:  # streaming_paraformer
+                self.model = sherpa_onnx.OnlineRecognizer.from_paraformer(
+                    tokens=tokens,
+                    encoder=encoder,
+                    decoder=decoder,
+                    num_threads=2,
+                    sample_rate=16000,
+                    feature_dim=80,
+                    decoding_method="greedy_search",
+                )
+
+        self.incremental_sessions = IncrementalSessions(
+            self.model.create_stream,
+            self._stream_feed,
+            self._stream_finish,
+            workers=int(config.get("stream_workers", 1)),
+            name="sherpa",
+        )
+        logger.bind(tag=TAG).info(f"Sherpa ASR 已启用流式增量识别: {self.model_type}")
+
+    def _stream_feed(self, stream, pcm_bytes: bytes):
+        samples = np.frombuffer(pcm_bytes, dtype=np.int16).astype(np.float32) / 32768
+        stream.accept_waveform(16000, samples)
+        while self.model.is_ready(stream):
+            self.model.decode_stream(stream)
+
+    def _stream_finish(self, stream) -> str:
+        # 补一段静音让模型输出最后几个字
+        stream.accept_waveform(16000, STREAM_TAIL_PADDING)
+        stream.input_finished()
+        while self.model.is_ready(stream):
+            self.model.decode_stream(stream)
+        return self.model.get_result(stream)
+
     def read_wave(self, wave_filename: str) -> Tuple[np.ndarray, int]:
         """
         Args:
@@ -120,8 +204,19 @@ class ASRProvider(ASRProviderBase):
             samples_float32 = samples_float32 / 32768
             return samples_float32, f.getframerate()
 
-    def requires_file(self) -> bool:
-        return True
+    def _decode_batch(self, pcm_list: List[bytes]) -> List[str]:
+        """批量识别多段PCM，结果与输入顺序一致"""
+        streams = []
+        for pcm_bytes in pcm_list:
+            samples = np.frombuffer(pcm_bytes, dtype=np.int16).astype(np.float32) / 32768
+            s = self.model.create_stream()
+            s.accept_waveform(16000, samples)
+            streams.append(s)
+        if len(streams) == 1:
+            self.model.decode_stream(streams[0])
+        else:
+            self.model.decode_streams(streams)
+        return [s.result.text for s in streams]
 
     async def speech_to_text(
         self, opus_data: List[bytes], session_id: str, artifacts=None
@@ -133,12 +228,18 @@ class ASRProvider(ASRProviderBase):
                 return "", None
             file_path = artifacts.file_path
 
+            # 直接使用内存中的PCM，不再读取WAV文件；推理放到线程中，避免阻塞事件循环
             start_time = time.time()
-            s = self.model.create_stream()
-            samples, sample_rate = self.read_wave(file_path)
-            s.accept_waveform(sample_rate, samples)
-            self.model.decode_stream(s)
-            text = s.result.text
+            if self.incremental_sessions is not None:
+                # 流式模型：说话过程中已完成大部分解码，这里只处理尾部音频
+                text = await self.incremental_sessions.finish(session_id, artifacts.pcm_bytes)
+            elif self.batch_scheduler is not None:
+                text = await self.batch_scheduler.submit(
+                    artifacts.pcm_bytes,
+                    len(artifacts.pcm_bytes) / PCM_BYTES_PER_SECOND,
+                )
+            else:
+                text = (await asyncio.to_thread(self._decode_batch, [artifacts.pcm_bytes]))[0]
             logger.bind(tag=TAG).debug(
                 f"语音识别耗时: {time.time() - start_time:.3f}s | 结果: {text}"
             )
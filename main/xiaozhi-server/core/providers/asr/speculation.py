@@ -0,0 +1,107 @@
+"""
+ASR预识别
+VAD检测到短暂停顿（speculative_silence_ms）时提前开始识别，识别在等待完整静音阈值期间进行；
+静音达到阈值时直接提交预识别结果，停顿后继续说话则丢弃预识别结果
+"""
+
+import time
+import asyncio
+import threading
+from config.logger import setup_logging
+
+TAG = __name__
+logger = setup_logging()
+
+
+class SpeculationStats:
+    """预识别统计（进程级）"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started = 0
+        self.committed = 0
+        self.rolled_back = 0
+        # 提交时已在静音期间完成的识别耗时，即被隐藏的延迟
+        self.saved_seconds = 0.0
+        # 被丢弃的预识别已消耗的识别耗时
+        self.wasted_seconds = 0.0
+
+    def record_start(self):
+        with self._lock:
+            self.started += 1
+
+    def record_commit(self, saved_seconds: float):
+        with self._lock:
+            self.committed += 1
+            self.saved_seconds += saved_seconds
+
+    def record_rollback(self, wasted_seconds: float):
+        with self._lock:
+            self.rolled_back += 1
+            self.wasted_seconds += wasted_seconds
+
+    @property
+    def hit_rate(self) -> float:
+        finished = self.committed + self.rolled_back
+        return self.committed / finished if finished else 0.0
+
+    def snapshot(self) -> dict:
+        return {
+            "started": self.started,
+            "committed": self.committed,
+            "rolled_back": self.rolled_back,
+            "hit_rate": self.hit_rate,
+            "saved_seconds": self.saved_seconds,
+            "wasted_seconds": self.wasted_seconds,
+        }
+
+
+speculation_stats = SpeculationStats()
+
+
+class SpeculativeRecognition:
+    """一次预识别"""
+
+    def __init__(self, coro):
+        self.started_at = time.monotonic()
+        self.finished_at = None
+        self.task = asyncio.create_task(coro)
+        self.task.add_done_callback(self._on_done)
+        speculation_stats.record_start()
+
+    def _on_done(self, _task):
+        self.finished_at = time.monotonic()
+
+    def _elapsed(self) -> float:
+        end = self.finished_at if self.finished_at is not None else time.monotonic()
+        return end - self.started_at
+
+    async def commit(self):
+        """静音达到阈值，采用预识别结果 (ASR结果, 声纹结果)；预识别失败时返回 None
+
+        识别出错不会抛出：speech_to_text_wrapper 出错时返回的文本为 None，gather 把异常作为结果返回，
+        这两种情况都按失败处理，由调用方重新识别
+        """
+        # 提交时已经过的识别耗时即被隐藏的延迟
+        saved_seconds = self._elapsed()
+        try:
+            results = await self.task
+            asr_result = results[0]
+            if isinstance(asr_result, Exception):
+                raise asr_result
+            if asr_result[0] is None:
+                raise RuntimeError("识别结果为空")
+        except Exception as e:
+            speculation_stats.record_rollback(self._elapsed())
+            logger.bind(tag=TAG).warning(f"预识别失败，改为重新识别: {e}")
+            return None
+        else:
+            speculation_stats.record_commit(saved_seconds)
+            return results
+        finally:
+            logger.bind(tag=TAG).debug(f"预识别统计: {speculation_stats.snapshot()}")
+
+    def rollback(self):
+        """停顿后继续说话，丢弃预识别"""
+        speculation_stats.record_rollback(self._elapsed())
+        self.task.cancel()
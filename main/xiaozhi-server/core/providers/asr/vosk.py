@@ -1,15 +1,61 @@
 import os
 import json
 import time
+import threading
 from typing import Optional, Tuple, List
 from .base import ASRProviderBase
 from config.logger import setup_logging
 from core.providers.asr.dto.dto import InterfaceType
+from core.providers.asr.incremental import IncrementalSessions
 import vosk
 
 TAG = __name__
 logger = setup_logging()
 
+
+class VoskSession:
+    """一句话的识别状态：识别器及已确定的分段文本"""
+
+    __slots__ = ("recognizer", "texts")
+
+    def __init__(self, recognizer):
+        self.recognizer = recognizer
+        self.texts = []
+
+
+class RecognizerPool:
+    """共享同一个 vosk.Model 的识别器池
+
+    Model 只加载一次且可被多个识别器同时使用，KaldiRecognizer 创建开销很小但带有解码状态，
+    每句话从池中取出一个独立的识别器，结束后重置并归还，避免不同连接之间的状态串扰
+    """
+
+    def __init__(self, model, sample_rate=16000, max_idle=4):
+        self.model = model
+        self.sample_rate = sample_rate
+        self.max_idle = max_idle
+        self._idle = []
+        self._lock = threading.Lock()
+        self.created = 0
+
+    def acquire(self):
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+            self.created += 1
+        return vosk.KaldiRecognizer(self.model, self.sample_rate)
+
+    def release(self, recognizer):
+        try:
+            recognizer.Reset()
+        except Exception:
+            # 无法重置的识别器直接丢弃
+            return
+        with self._lock:
+            if len(self._idle) < self.max_idle:
+                self._idle.append(recognizer)
+
+
 class ASRProvider(ASRProviderBase):
     def __init__(self, config: dict, delete_audio_file: bool = True):
         super().__init__()
@@ -17,12 +63,15 @@ class ASRProvider(ASRProviderBase):
         self.model_path = config.get("model_path")
         self.output_dir = config.get("output_dir", "tmp/")
         self.delete_audio_file = delete_audio_file
-        
+        # 同时解码的线程数，也是池中保留的空闲识别器数量
+        self.max_concurrency = max(int(config.get("max_concurrency", 4)), 1)
+
         # 初始化VOSK模型
         self.model = None
-        self.recognizer = None
+        self.recognizer_pool = None
+        self.incremental_sessions = None
         self._load_model()
-        
+
         # 确保输出目录存在
         os.makedirs(self.output_dir, exist_ok=True)
 
@@ -31,18 +80,51 @@ class ASRProvider(ASRProviderBase):
         try:
             if not os.path.exists(self.model_path):
                 raise FileNotFoundError(f"VOSK模型路径不存在: {self.model_path}")
-                
+
             logger.bind(tag=TAG).info(f"正在加载VOSK模型: {self.model_path}")
             self.model = vosk.Model(self.model_path)
 
-            # 初始化VOSK识别器（采样率必须为16kHz）
-            self.recognizer = vosk.KaldiRecognizer(self.model, 16000)
+            # 识别器按需创建（采样率必须为16kHz），说话过程中增量送入音频
+            self.recognizer_pool = RecognizerPool(
+                self.model, 16000, max_idle=self.max_concurrency
+            )
+            self.incremental_sessions = IncrementalSessions(
+                self._session_create,
+                self._session_feed,
+                self._session_finish,
+                workers=self.max_concurrency,
+                name="vosk",
+                release_fn=self._session_release,
+            )
 
-            logger.bind(tag=TAG).info("VOSK模型加载成功")
+            logger.bind(tag=TAG).info(
+                f"VOSK模型加载成功，并发解码数: {self.max_concurrency}"
+            )
         except Exception as e:
             logger.bind(tag=TAG).error(f"加载VOSK模型失败: {e}")
             raise
 
+    def _session_create(self) -> VoskSession:
+        return VoskSession(self.recognizer_pool.acquire())
+
+    def _session_feed(self, session: VoskSession, pcm_bytes: bytes):
+        if session.recognizer.AcceptWaveform(bytes(pcm_bytes)):
+            text = json.loads(session.recognizer.Result()).get("text", "")
+            if text:
+                session.texts.append(text)
+
+    def _session_finish(self, session: VoskSession) -> str:
+        try:
+            final_text = json.loads(session.recognizer.FinalResult()).get("text", "")
+            if final_text:
+                session.texts.append(final_text)
+            return " ".join(session.texts)
+        finally:
+            self._session_release(session)
+
+    def _session_release(self, session: VoskSession):
+        self.recognizer_pool.release(session.recognizer)
+
     async def speech_to_text(
         self, opus_data: List[bytes], session_id: str, artifacts=None
     ) -> Tuple[Optional[str], Optional[str]]:
@@ -52,7 +134,7 @@ class ASRProvider(ASRProviderBase):
             if not self.model:
                 logger.bind(tag=TAG).error("VOSK模型未加载，无法进行识别")
                 return "", None
-            
+
             if artifacts is None:
                 return "", None
             if not artifacts.pcm_bytes:
@@ -60,32 +142,19 @@ class ASRProvider(ASRProviderBase):
                 return "", None
 
             start_time = time.time()
-            
-            
-            # 进行识别（VOSK推荐每次送入2000字节的数据）
-            chunk_size = 2000
-            text_result = ""
-            
-            for i in range(0, len(artifacts.pcm_bytes), chunk_size):
-                chunk = artifacts.pcm_bytes[i:i+chunk_size]
-                if self.recognizer.AcceptWaveform(chunk):
-                    result = json.loads(self.recognizer.Result())
-                    text = result.get('text', '')
-                    if text:
-                        text_result += text + " "
-            
-            # 获取最终结果
-            final_result = json.loads(self.recognizer.FinalResult())
-            final_text = final_result.get('text', '')
-            if final_text:
-                text_result += final_text
-            
+
+            # 说话过程中已增量送入音频，这里只需取最终结果；
+            # 没有增量状态时（如手动模式）会用整句PCM完整识别
+            text_result = await self.incremental_sessions.finish(
+                session_id, artifacts.pcm_bytes
+            )
+
             logger.bind(tag=TAG).debug(
                 f"VOSK语音识别耗时: {time.time() - start_time:.3f}s | 结果: {text_result.strip()}"
             )
-            
+
             return text_result.strip(), artifacts.file_path
-            
+
         except Exception as e:
             logger.bind(tag=TAG).error(f"VOSK语音识别失败: {e}")
             return "", None
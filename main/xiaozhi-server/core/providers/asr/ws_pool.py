@@ -0,0 +1,189 @@
+"""
+流式ASR预热连接池
+流式ASR每句话都要新建WebSocket连接（TCP、TLS、WebSocket升级及协议初始化），
+这部分耗时发生在用户已经开始说话之后。连接池按 服务商+凭证+ASR配置 在进程内预先建立若干就绪连接，
+检测到说话时直接取用，取走后在后台补充
+
+服务端通常会断开长时间空闲的连接，就绪连接超过 max_idle_seconds 未被取用时关闭；
+最近有人使用时才补充，避免设备都不说话时反复建连
+"""
+
+import json
+import time
+import asyncio
+import hashlib
+from collections import deque
+from typing import Any, Awaitable, Callable
+from config.logger import setup_logging
+
+TAG = __name__
+logger = setup_logging()
+
+# 最近一次取用后多长时间内（秒）保持预热
+WARM_WINDOW_SECONDS = 300
+# 预热失败后的重试间隔（秒）
+RETRY_BACKOFF_SECONDS = 5
+
+
+class WarmSocketPool:
+    """预热的流式ASR连接池"""
+
+    def __init__(self, name: str, size=1, max_idle_seconds=8.0):
+        """
+        Args:
+            name: 连接池名称，用于日志
+            size: 保持的就绪连接数
+            max_idle_seconds: 就绪连接的最长空闲时间，应小于服务端的空闲断开时间
+        """
+        self.name = name
+        self.size = max(int(size), 0)
+        self.max_idle_seconds = float(max_idle_seconds)
+        self.connect_fn = None
+        self._ready = deque()
+        self._warming = 0
+        self._loop = None
+        self._last_used = 0.0
+        self._retry_after = 0.0
+        # 统计信息
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.failures = 0
+
+    def _bind(self, connect_fn: Callable[[], Awaitable[Any]]):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._ready.clear()
+            self._warming = 0
+        self.connect_fn = connect_fn
+
+    def prewarm(self, connect_fn: Callable[[], Awaitable[Any]]):
+        """在可能即将说话时（如设备连接）提前建立就绪连接"""
+        self._bind(connect_fn)
+        self._last_used = time.monotonic()
+        self._replenish()
+
+    async def acquire(self, connect_fn: Callable[[], Awaitable[Any]]):
+        """取出一个就绪连接，没有时立即新建
+
+        Args:
+            connect_fn: 新建连接并完成握手的协程函数，只能依赖服务商配置，不能依赖具体设备连接
+        """
+        self._bind(connect_fn)
+        self._last_used = time.monotonic()
+        while self._ready:
+            ws, created_at = self._ready.popleft()
+            if self._is_usable(ws, created_at):
+                self.hits += 1
+                self._replenish()
+                return ws
+            self._discard(ws)
+        self.misses += 1
+        self._replenish()
+        return await connect_fn()
+
+    def _is_usable(self, ws, created_at) -> bool:
+        if time.monotonic() - created_at > self.max_idle_seconds:
+            return False
+        state = getattr(ws, "state", None)
+        # websockets 的 State.OPEN 值为 1
+        return state is None or getattr(state, "value", state) == 1
+
+    def _discard(self, ws):
+        self.expired += 1
+        asyncio.create_task(self._close(ws))
+
+    @staticmethod
+    async def _close(ws):
+        try:
+            await asyncio.wait_for(ws.close(), timeout=2.0)
+        except Exception:
+            pass
+
+    def _replenish(self):
+        now = time.monotonic()
+        if now < self._retry_after or now - self._last_used > WARM_WINDOW_SECONDS:
+            return
+        for _ in range(self.size - len(self._ready) - self._warming):
+            self._warming += 1
+            asyncio.create_task(self._warm_one())
+
+    async def _warm_one(self):
+        loop = self._loop
+        try:
+            ws = await self.connect_fn()
+        except Exception as e:
+            self.failures += 1
+            self._retry_after = time.monotonic() + RETRY_BACKOFF_SECONDS
+            logger.bind(tag=TAG).warning(f"{self.name} 预热连接失败: {e}")
+            return
+        finally:
+            if self._loop is loop:
+                self._warming -= 1
+        if self._loop is not loop:
+            await self._close(ws)
+            return
+        self._ready.append((ws, time.monotonic()))
+        loop.call_later(self.max_idle_seconds, self._evict_expired)
+
+    def _evict_expired(self):
+        """关闭超过空闲时间的连接，最近有人使用时补充新的连接"""
+        kept = deque()
+        while self._ready:
+            ws, created_at = self._ready.popleft()
+            if self._is_usable(ws, created_at):
+                kept.append((ws, created_at))
+            else:
+                self._discard(ws)
+        self._ready = kept
+        self._replenish()
+
+    async def close(self):
+        """关闭所有就绪连接，并停止补充"""
+        self._last_used = 0.0
+        while self._ready:
+            ws, _ = self._ready.popleft()
+            await self._close(ws)
+
+    def stats(self) -> dict:
+        return {
+            "ready": len(self._ready),
+            "warming": self._warming,
+            "hits": self.hits,
+            "misses": self.misses,
+            "expired": self.expired,
+            "failures": self.failures,
+        }
+
+
+# 按 服务商+地址+凭证+ASR配置 区分的连接池
+_pools = {}
+
+
+def get_ws_pool(provider: str, url: str, credential: str, config: dict):
+    """获取流式ASR的预热连接池，未启用（ws_pool_size 为 0）时返回 None
+
+    Args:
+        provider: 服务商名称
+        url: 连接地址（不含签名等随时间变化的参数）
+        credential: 凭证，只用于区分连接池，不会保存明文
+        config: ASR配置，读取 ws_pool_size 和 ws_pool_idle_seconds；
+            就绪连接在取用前已按配置完成会话初始化（识别参数、热词、语言等），配置不同的ASR不能共用连接池
+    """
+    size = int(config.get("ws_pool_size", 0) or 0)
+    if size <= 0:
+        return None
+    raw = json.dumps([str(credential), config], sort_keys=True, ensure_ascii=False, default=str)
+    digest = hashlib.sha256(raw.encode("utf-8")).hexdigest()[:16]
+    key = (provider, url, digest)
+    pool = _pools.get(key)
+    if pool is None:
+        pool = WarmSocketPool(
+            name=f"{provider}[{digest[:8]}]",
+            size=size,
+            max_idle_seconds=float(config.get("ws_pool_idle_seconds", 8)),
+        )
+        _pools[key] = pool
+        logger.bind(tag=TAG).info(f"{provider} 流式ASR预热连接池已启用，就绪连接数: {size}")
+    return pool
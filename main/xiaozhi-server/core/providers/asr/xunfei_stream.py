@@ -16,6 +16,8 @@ from config.logger import setup_logging
 from wsgiref.handlers import format_date_time
 from core.providers.asr.base import ASRProviderBase
 from core.providers.asr.dto.dto import InterfaceType
+from core.providers.asr.ws_pool import get_ws_pool
+from core.providers.asr.coalesce import FrameCoalescer
 
 TAG = __name__
 logger = setup_logging()
@@ -56,6 +58,16 @@ class ASRProvider(ASRProviderBase):
         self.output_dir = config.get("output_dir", "tmp/")
         self.delete_audio_file = delete_audio_file
 
+        # 预热连接池（ws_pool_size 大于 0 时启用），签名URL随时间变化，按基础地址区分
+        self.ws_pool = get_ws_pool(
+            "xunfei_stream",
+            "ws://iat.cn-huabei-1.xf-yun.com/v1",
+            f"{self.app_id}:{self.api_key}",
+            config,
+        )
+        # 上行音频合包，讯飞每条消息都要JSON+base64封装，合包收益较大
+        self.coalescer = FrameCoalescer.from_config(config)
+
     def create_url(self) -> str:
         """生成认证URL"""
         url = "ws://iat.cn-huabei-1.xf-yun.com/v1"
@@ -97,6 +109,8 @@ class ASRProvider(ASRProviderBase):
 
     async def open_audio_channels(self, conn: "ConnectionHandler"):
         await super().open_audio_channels(conn)
+        if self.ws_pool is not None:
+            self.ws_pool.prewarm(self._open_ws)
 
     async def receive_audio(self, conn: "ConnectionHandler", pcm_frame, audio_have_voice):
         # 先调用父类方法处理基础逻辑
@@ -114,30 +128,41 @@ class ASRProvider(ASRProviderBase):
         # 发送当前音频数据
         if self.asr_ws and self.is_processing and self.server_ready:
             try:
-                await self._send_audio_frame(pcm_frame, STATUS_CONTINUE_FRAME)
+                chunk = self.coalescer.push(pcm_frame, audio_have_voice)
+                if chunk:
+                    await self._send_audio_frame(chunk, STATUS_CONTINUE_FRAME)
             except Exception as e:
                 logger.bind(tag=TAG).warning(f"发送音频数据时发生错误: {e}")
                 await self._cleanup()
 
+    async def _open_ws(self):
+        """生成认证URL并建立WebSocket连接"""
+        ws_url = self.create_url()
+        logger.bind(tag=TAG).info(f"正在连接ASR服务: {ws_url[:50]}...")
+        return await websockets.connect(
+            ws_url,
+            max_size=1000000000,
+            ping_interval=None,
+            ping_timeout=None,
+            close_timeout=10,
+        )
+
     async def _start_recognition(self, conn: "ConnectionHandler"):
         """开始识别会话"""
         try:
             self.is_processing = True
-            # 建立WebSocket连接
-            ws_url = self.create_url()
-            logger.bind(tag=TAG).info(f"正在连接ASR服务: {ws_url[:50]}...")
-
             # 如果为手动模式,设置超时时长为一分钟
             if conn.client_listen_mode == "manual":
                 self.iat_params["eos"] = 60000
 
-            self.asr_ws = await websockets.connect(
-                ws_url,
-                max_size=1000000000,
-                ping_interval=None,
-                ping_timeout=None,
-                close_timeout=10,
-            )
+            # 建立WebSocket连接，优先取用预热好的连接
+            if self.ws_pool is not None:
+                self.asr_ws = await self.ws_pool.acquire(self._open_ws)
+            else:
+                self.asr_ws = await self._open_ws()
+            self.coalescer.reset()
+            if self.coalescer.adaptive:
+                asyncio.create_task(self.coalescer.measure_rtt(self.asr_ws))
 
             logger.bind(tag=TAG).info("ASR WebSocket连接已建立")
             self.server_ready = False
@@ -153,7 +178,9 @@ class ASRProvider(ASRProviderBase):
                 # 发送缓存的音频数据
                 for cached_pcm in conn.asr_audio[-10:]:
                     try:
-                        await self._send_audio_frame(cached_pcm, STATUS_CONTINUE_FRAME)
+                        chunk = self.coalescer.push(cached_pcm)
+                        if chunk:
+                            await self._send_audio_frame(chunk, STATUS_CONTINUE_FRAME)
                     except Exception as e:
                         logger.bind(tag=TAG).info(f"发送缓存音频数据时发生错误: {e}")
                         break
@@ -257,7 +284,10 @@ class ASRProvider(ASRProviderBase):
             # 先发送最后一帧表示音频结束
             if self.asr_ws and self.is_processing:
                 try:
-                    await self._send_audio_frame(b"", STATUS_LAST_FRAME)
+                    # 最后一帧携带合包中尚未发送的音频
+                    await self._send_audio_frame(
+                        self.coalescer.flush() or b"", STATUS_LAST_FRAME
+                    )
                     logger.bind(tag=TAG).debug(f"已发送停止请求")
 
                     await asyncio.sleep(0.25)
@@ -283,7 +313,10 @@ class ASRProvider(ASRProviderBase):
             try:
                 # 先停止音频发送
                 self.is_processing = False
-                await self._send_audio_frame(b"", STATUS_LAST_FRAME)
+                # 最后一帧携带合包中尚未发送的音频
+                await self._send_audio_frame(
+                    self.coalescer.flush() or b"", STATUS_LAST_FRAME
+                )
                 logger.bind(tag=TAG).debug("已发送停止请求")
             except Exception as e:
                 logger.bind(tag=TAG).error(f"发送停止请求失败: {e}")
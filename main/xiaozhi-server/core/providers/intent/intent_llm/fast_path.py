@@ -0,0 +1,215 @@
+"""
+意图识别本地快速通道
+
+在调用意图识别LLM之前，先用本地规则和字符n-gram相似度判断用户意图：
+- 固定指令（退出、播放音乐、设置音量、询问时间日期）直接给出函数调用
+- 可选（chat_gate）：与所有已注册函数描述都不相似、也不含操作类词语的闲聊直接判为 continue_chat。
+  函数描述覆盖不到的说法（如"明天要带伞吗"）会被误判为闲聊，默认关闭
+- 其余拿不准的情况返回 None，交给LLM识别
+"""
+
+import re
+import json
+import math
+import time
+from typing import Dict, List, Optional
+
+# 询问类的退出话语（如"怎么退出了"）不是退出指令
+_QUESTION_WORDS = re.compile(r"怎么|为什么|如何|为啥|吗|呢|？|\?")
+_EXIT_PATTERN = re.compile(
+    r"^(请)?(退出系统|结束对话|退下吧?|我不想(和|跟)你(说话|聊)了|不聊了|再见|拜拜|晚安)(吧|啦|了)?$"
+)
+_RANDOM_MUSIC_PATTERN = re.compile(
+    r"^(给我|帮我)?(播放|放|来|唱)(一|1)?(首|段|点)?(音乐|歌曲?|曲子)(吧|听听|听)?$"
+)
+_SONG_PATTERN = re.compile(r"^(给我|帮我)?(播放|放|来|我想听)(一首|一下)?(.{1,20}?)(这首歌|这首|的歌)?$")
+# 这些内容不是歌名，交给LLM判断
+_NOT_SONG = re.compile(r"新闻|天气|广播|故事|视频|上一首|下一首|暂停|停止|继续")
+_VOLUME_PATTERN = re.compile(r"音量(调|设置|设|改|开)?(到|为|成)?\s*(\d{1,3})\s*(%|％)?")
+_TIME_PATTERN = re.compile(
+    r"^(现在|今天|当前)?(是)?(几点(了|钟)?|什么时间|几号|星期几|礼拜几|周几|什么日子|农历几号|什么节气|几月几号)(了|呀|啊)?$"
+)
+# 含这些词的话语可能需要工具，交给LLM判断
+_ACTION_HINTS = re.compile(
+    r"打开|关闭|关掉|关上|开灯|关灯|调高|调低|调大|调小|音量|亮度|播放|放一|来一|切换|设置|"
+    r"查|搜|找|天气|气温|下雨|下雪|刮风|带伞|冷不冷|热不热|穿什么|多少度|几度|温度|怎么样|"
+    r"新闻|头条|大事|热搜|上网|价格|股市|股价|声音|大一点|小一点|"
+    r"闹钟|提醒|退出|结束|再见|拜拜|音乐|歌|放"
+)
+# 肯定/否定的简短答复依赖上一轮问题的语境
+_SHORT_REPLY = re.compile(r"^(好的?|可以|行|嗯+|是的?|对的?|要|不要|不用|没有|没)(啊|呀|吧|的)?$")
+_PUNCTUATION = re.compile(r"[\s，。！？、,.!?~～…；;：:\"'“”‘’（）()【】\[\]]+")
+
+
+def _ngrams(text):
+    """字符 1-gram 和 2-gram"""
+    grams = {}
+    for i, ch in enumerate(text):
+        grams[ch] = grams.get(ch, 0) + 1
+        if i + 1 < len(text):
+            bigram = text[i:i + 2]
+            grams[bigram] = grams.get(bigram, 0) + 1
+    return grams
+
+
+class IntentFastPath:
+    """本地意图快速分类，命中时跳过意图识别LLM"""
+
+    def __init__(self, config=None):
+        config = config or {}
+        self.enabled = str(config.get("enable", True)).lower() in ("true", "1", "yes")
+        # 闲聊判定：与所有函数描述都不相似时跳过LLM，默认关闭
+        self.chat_gate = str(config.get("chat_gate", False)).lower() in ("true", "1", "yes")
+        # 与最相似函数的相似度低于此值时判为闲聊
+        self.chat_threshold = float(config.get("chat_threshold", 0.02))
+        self._model_key = None
+        self._prototypes = {}
+        self._idf = {}
+        # 统计：总次数、命中次数、命中时的耗时累计（秒）
+        self.total = 0
+        self.hits = 0
+        self.elapsed = 0.0
+
+    def classify(
+        self, text: str, functions: List[Dict], dialogue_history: Optional[List] = None
+    ) -> Optional[Dict]:
+        """返回 {"function_call": {...}} 格式的意图；拿不准时返回 None"""
+        if not self.enabled:
+            return None
+        start = time.perf_counter()
+        self.total += 1
+        result = self._classify(text, functions, dialogue_history)
+        if result is not None:
+            self.hits += 1
+            self.elapsed += time.perf_counter() - start
+        return result
+
+    def stats(self) -> Dict:
+        return {
+            "total": self.total,
+            "hits": self.hits,
+            "hit_ratio": self.hits / self.total if self.total else 0.0,
+            "hit_avg_ms": self.elapsed / self.hits * 1000 if self.hits else 0.0,
+        }
+
+    @staticmethod
+    def _content_of(text):
+        """带说话人信息的消息只取内容"""
+        if text and text.startswith("{"):
+            try:
+                return json.loads(text).get("content", text)
+            except (ValueError, AttributeError):
+                pass
+        return text
+
+    def _classify(self, text, functions, dialogue_history):
+        text = self._content_of(text)
+        clean = _PUNCTUATION.sub("", text or "")
+        if not clean:
+            return None
+        names = {f.get("function", {}).get("name") for f in functions or []}
+
+        rule_result = self._match_rules(clean, text, names)
+        if rule_result is not None:
+            return rule_result
+
+        if not self.chat_gate or _ACTION_HINTS.search(clean):
+            return None
+        if _SHORT_REPLY.match(clean) and self._last_assistant_asked(dialogue_history):
+            return None
+        self._ensure_model(functions)
+        if self._max_similarity(clean) < self.chat_threshold:
+            return {"function_call": {"name": "continue_chat"}}
+        return None
+
+    def _match_rules(self, clean, raw_text, names):
+        if "handle_exit_intent" in names and not _QUESTION_WORDS.search(raw_text):
+            if _EXIT_PATTERN.match(clean):
+                return {
+                    "function_call": {
+                        "name": "handle_exit_intent",
+                        "arguments": {"say_goodbye": "再见，祝您生活愉快！"},
+                    }
+                }
+        if "play_music" in names:
+            if _RANDOM_MUSIC_PATTERN.match(clean):
+                return {"function_call": {"name": "play_music", "arguments": {"song_name": "random"}}}
+            match = _SONG_PATTERN.match(clean)
+            if (
+                match
+                and (match.group(3) == "一首" or match.group(5) or match.group(2) in ("播放", "我想听"))
+                and not _NOT_SONG.search(match.group(4))
+            ):
+                return {
+                    "function_call": {
+                        "name": "play_music",
+                        "arguments": {"song_name": match.group(4)},
+                    }
+                }
+        volume_tool = next((n for n in names if n and n.endswith("set_volume")), None)
+        if volume_tool:
+            match = _VOLUME_PATTERN.search(clean)
+            if match and 0 <= int(match.group(3)) <= 100:
+                return {
+                    "function_call": {
+                        "name": volume_tool,
+                        "arguments": {"volume": int(match.group(3))},
+                    }
+                }
+        if _TIME_PATTERN.match(clean):
+            return {"function_call": {"name": "result_for_context"}}
+        return None
+
+    @staticmethod
+    def _last_assistant_asked(dialogue_history):
+        for message in reversed(dialogue_history or []):
+            if getattr(message, "role", None) == "assistant":
+                content = (getattr(message, "content", None) or "").rstrip()
+                return content.endswith(("？", "?", "吗", "呢"))
+        return False
+
+    def _ensure_model(self, functions):
+        """按函数描述构建每个函数的 TF-IDF 向量，函数集合变化时重建"""
+        key = tuple(f.get("function", {}).get("name", "") for f in functions or [])
+        if key == self._model_key:
+            return
+        docs = {}
+        for func in functions or []:
+            info = func.get("function", {})
+            parts = [info.get("description", "")]
+            for param in info.get("parameters", {}).get("properties", {}).values():
+                parts.append(param.get("description", ""))
+            docs[info.get("name", "")] = _ngrams(_PUNCTUATION.sub("", "".join(parts)))
+
+        doc_freq = {}
+        for grams in docs.values():
+            for gram in grams:
+                doc_freq[gram] = doc_freq.get(gram, 0) + 1
+        count = len(docs)
+        self._idf = {gram: math.log((count + 1) / (df + 0.5)) for gram, df in doc_freq.items()}
+
+        self._prototypes = {}
+        for name, grams in docs.items():
+            vector = {gram: tf * self._idf[gram] for gram, tf in grams.items()}
+            norm = math.sqrt(sum(v * v for v in vector.values())) or 1.0
+            self._prototypes[name] = (vector, norm)
+        self._model_key = key
+
+    def _max_similarity(self, clean):
+        # 函数描述中没出现过的 n-gram 按最大 IDF 计入长度，闲聊内容越多相似度越低
+        unseen_idf = math.log((len(self._prototypes) + 1) / 0.5)
+        query = {}
+        query_norm = 0.0
+        for gram, tf in _ngrams(clean).items():
+            weight = tf * self._idf.get(gram, unseen_idf)
+            query_norm += weight * weight
+            if gram in self._idf:
+                query[gram] = weight
+        if not query:
+            return 0.0
+        query_norm = math.sqrt(query_norm)
+        best = 0.0
+        for vector, norm in self._prototypes.values():
+            dot = sum(weight * vector.get(gram, 0.0) for gram, weight in query.items())
+            best = max(best, dot / (norm * query_norm))
+        return best
@@ -4,6 +4,8 @@ from typing import List, Dict, TYPE_CHECKING
 if TYPE_CHECKING:
     from core.connection import ConnectionHandler
 from ..base import IntentProviderBase
+from .fast_path import IntentFastPath
+from core.utils.prompt_artifacts import artifact_store
 from plugins_func.functions.play_music import initialize_music_handler
 from config.logger import setup_logging
 from core.utils.util import get_system_error_response
@@ -22,13 +24,14 @@ class IntentProvider(IntentProviderBase):
     def __init__(self, config):
         super().__init__(config)
         self.llm = None
-        self.promot = ""
         # 导入全局缓存管理器
         from core.utils.cache.manager import cache_manager, CacheType
 
         self.cache_manager = cache_manager
         self.CacheType = CacheType
         self.history_count = 4  # 默认使用最近4条对话记录
+        # 本地快速通道，命中时跳过意图识别LLM
+        self.fast_path = IntentFastPath(config.get("fast_path"))
 
     def get_intent_system_prompt(self, functions_list: str) -> str:
         """
@@ -139,6 +142,42 @@ class IntentProvider(IntentProviderBase):
             logger.bind(tag=TAG).error(f"Error in generating reply result: {e}")
             return get_system_error_response(self.config)
 
+    def _compiled_system_prompt(self, conn: "ConnectionHandler") -> str:
+        """获取意图识别系统提示词（含音乐列表和智能设备列表）。
+        按（工具摘要, 音乐列表版本, 设备列表）编译一次，所有连接共享，工具、音乐或设备变化时才重建
+        """
+        # 设备端MCP工具已由工具管理器统一收录在工具描述中
+        tool_schema = conn.func_handler.get_tool_schema()
+        music_config = initialize_music_handler(conn)
+
+        home_assistant_cfg = conn.config["plugins"].get("home_assistant")
+        if home_assistant_cfg:
+            devices = tuple(home_assistant_cfg.get("devices", []))
+        else:
+            devices = ()
+
+        def build():
+            prompt = self.get_intent_system_prompt(tool_schema.functions)
+            prompt += f"\n<musicNames>{music_config['music_file_names']}\n</musicNames>"
+            if len(devices) > 0:
+                prompt += "\n下面是我家智能设备列表（位置，设备名，entity_id），可以通过homeassistant控制\n"
+                for device in devices:
+                    prompt += device + "\n"
+            return prompt
+
+        key = ("intent_prompt", tool_schema.digest, music_config.get("version", 0), devices)
+        return artifact_store.get(key, build)
+
+    @staticmethod
+    def _clean_tool_history(conn: "ConnectionHandler"):
+        """普通对话时保留非工具相关的消息"""
+        clean_history = [
+            msg
+            for msg in conn.dialogue.dialogue
+            if msg.role not in ["tool", "function"]
+        ]
+        conn.dialogue.dialogue = clean_history
+
     async def detect_intent(
         self, conn: "ConnectionHandler", dialogue_history: List[Dict], text: str
     ) -> str:
@@ -150,6 +189,21 @@ class IntentProvider(IntentProviderBase):
         # 记录整体开始时间
         total_start_time = time.time()
 
+        # 本地快速通道：固定指令和明显的闲聊不再请求LLM
+        fast_intent = self.fast_path.classify(
+            text, conn.func_handler.get_functions(), dialogue_history
+        )
+        if fast_intent is not None:
+            intent = json.dumps(fast_intent, ensure_ascii=False)
+            stats = self.fast_path.stats()
+            logger.bind(tag=TAG).debug(
+                f"意图快速通道命中: {intent}, 耗时: {(time.time() - total_start_time) * 1000:.3f}ms, "
+                f"跳过LLM比例: {stats['hits']}/{stats['total']}"
+            )
+            if fast_intent["function_call"]["name"] == "continue_chat":
+                self._clean_tool_history(conn)
+            return intent
+
         # 打印使用的模型信息
         model_info = getattr(self.llm, "model_name", str(self.llm.__class__.__name__))
         logger.bind(tag=TAG).debug(f"使用意图识别模型: {model_info}")
@@ -166,31 +220,7 @@ class IntentProvider(IntentProviderBase):
             )
             return cached_intent
 
-        if self.promot == "":
-            functions = conn.func_handler.get_functions()
-            if hasattr(conn, "mcp_client"):
-                mcp_tools = conn.mcp_client.get_available_tools()
-                if mcp_tools is not None and len(mcp_tools) > 0:
-                    if functions is None:
-                        functions = []
-                    functions.extend(mcp_tools)
-
-            self.promot = self.get_intent_system_prompt(functions)
-
-        music_config = initialize_music_handler(conn)
-        music_file_names = music_config["music_file_names"]
-        prompt_music = f"{self.promot}\n<musicNames>{music_file_names}\n</musicNames>"
-
-        home_assistant_cfg = conn.config["plugins"].get("home_assistant")
-        if home_assistant_cfg:
-            devices = home_assistant_cfg.get("devices", [])
-        else:
-            devices = []
-        if len(devices) > 0:
-            hass_prompt = "\n下面是我家智能设备列表（位置，设备名，entity_id），可以通过homeassistant控制\n"
-            for device in devices:
-                hass_prompt += device + "\n"
-            prompt_music += hass_prompt
+        prompt_music = self._compiled_system_prompt(conn)
 
         logger.bind(tag=TAG).debug(f"User prompt: {prompt_music}")
 
@@ -269,13 +299,7 @@ class IntentProvider(IntentProviderBase):
 
                 elif function_name == "continue_chat":
                     # 处理普通对话
-                    # 保留非工具相关的消息
-                    clean_history = [
-                        msg
-                        for msg in conn.dialogue.dialogue
-                        if msg.role not in ["tool", "function"]
-                    ]
-                    conn.dialogue.dialogue = clean_history
+                    self._clean_tool_history(conn)
 
                 else:
                     # 处理函数调用
@@ -1,9 +1,12 @@
+import json
+import httpx
 from config.logger import setup_logging
 from http import HTTPStatus
 import dashscope
 from dashscope import Application
 from core.providers.llm.base import LLMProviderBase
 from core.utils.util import check_model_key
+from core.utils.http_pool import get_http_client
 import time
 
 TAG = __name__
@@ -19,6 +22,8 @@ class LLMProvider(LLMProviderBase):
         self.memory_id = config.get("ali_memory_id")
         self.streaming_chunk_size = config.get("streaming_chunk_size", 3)  # 每次流式返回的字符数
         check_model_key("AliBLLLM", self.api_key)
+        # 流式请求超时（秒），异步接口使用
+        self.timeout = httpx.Timeout(float(config.get("timeout", 120)), connect=10.0)
 
     def response(self, session_id, dialogue):
         # 处理dialogue
@@ -94,6 +99,57 @@ class LLMProvider(LLMProviderBase):
                     if chunk:
                         yield chunk
 
+    def _completion_url(self):
+        # 与SDK一致：仅当配置为 /api/ 形式的地址时才作为基地址
+        base_url = "https://dashscope.aliyuncs.com/api/v1"
+        if self.base_url and ("/api/" in self.base_url):
+            base_url = self.base_url.rstrip("/")
+        return f"{base_url}/apps/{self.app_id}/completion"
+
+    async def response_stream(self, session_id, dialogue, **kwargs):
+        """直接调用百练应用的HTTP流式接口（SDK无异步版本），被取消时立即断开请求"""
+        if self.is_No_prompt:
+            dialogue.pop(0)
+
+        request_input = {"session_id": session_id, "messages": dialogue}
+        if self.memory_id != False:
+            # 百练memory需要prompt参数
+            request_input["memory_id"] = self.memory_id
+            request_input["prompt"] = dialogue[-1].get("content")
+
+        url = self._completion_url()
+        async with get_http_client(url).stream(
+            "POST",
+            url,
+            headers={
+                "Authorization": f"Bearer {self.api_key}",
+                "X-DashScope-SSE": "enable",
+            },
+            json={
+                "input": request_input,
+                # 增量输出，无需再计算差量
+                "parameters": {"incremental_output": True},
+            },
+            timeout=self.timeout,
+        ) as r:
+            if r.status_code != HTTPStatus.OK:
+                body = (await r.aread()).decode("utf-8", "ignore")
+                logger.bind(tag=TAG).error(
+                    f"code={r.status_code}, message={body}, 请参考文档：https://help.aliyun.com/zh/model-studio/developer-reference/error-code"
+                )
+                yield "【阿里百练API服务响应异常】"
+                return
+            async for line in r.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                try:
+                    data = json.loads(line[5:])
+                except json.JSONDecodeError:
+                    continue
+                text = (data.get("output") or {}).get("text")
+                if text:
+                    yield text
+
     def response_with_functions(self, session_id, dialogue, functions=None):
         # 阿里百练当前未支持原生的 function call。为保持兼容，这里回退到普通文本流式输出。
         # 上层会按 (content, tool_calls) 的形式消费，这里始终返回 (token, None)
@@ -102,3 +158,7 @@ class LLMProvider(LLMProviderBase):
         )
         for token in self.response(session_id, dialogue):
             yield token, None
+
+    async def response_stream_with_functions(self, session_id, dialogue, functions=None):
+        async for token in self.response_stream(session_id, dialogue):
+            yield token, None
@@ -1,9 +1,46 @@
+import asyncio
+import threading
 from abc import ABC, abstractmethod
 from config.logger import setup_logging
 
 TAG = __name__
 logger = setup_logging()
 
+_DONE = object()
+
+
+async def iterate_in_thread(factory):
+    """在线程池中迭代同步生成器，转换为异步生成器
+
+    用于尚未实现原生异步接口的服务商：迭代期间仍占用一个线程，
+    被取消时等当前这一步返回后在线程中关闭生成器，释放底层连接
+    """
+    loop = asyncio.get_running_loop()
+    lock = threading.Lock()
+    generator = None
+
+    def _next():
+        nonlocal generator
+        with lock:
+            if generator is None:
+                generator = factory()
+            return next(generator, _DONE)
+
+    def _close():
+        with lock:
+            if generator is not None:
+                generator.close()
+
+    try:
+        while True:
+            item = await loop.run_in_executor(None, _next)
+            if item is _DONE:
+                break
+            yield item
+    finally:
+        loop.run_in_executor(None, _close)
+
+
 class LLMProviderBase(ABC):
     @abstractmethod
     def response(self, session_id, dialogue):
@@ -20,7 +57,7 @@ class LLMProviderBase(ABC):
         for part in self.response("", dialogue, **kwargs):
             result += part
         return result
-    
+
     def response_with_functions(self, session_id, dialogue, functions=None):
         """
         Default implementation for function calling (streaming)
@@ -32,3 +69,42 @@ class LLMProviderBase(ABC):
         for token in self.response(session_id, dialogue):
             yield token, None
 
+    def _async_openai_client(self, base_url, api_key, timeout=None):
+        """获取当前事件循环上的 openai 异步客户端，底层复用共享HTTP连接池"""
+        loop = asyncio.get_running_loop()
+        cached = getattr(self, "_async_openai", None)
+        if cached is None or cached[0] is not loop:
+            import openai
+            from core.utils.http_pool import get_http_client
+
+            client_kwargs = {
+                "api_key": api_key,
+                "base_url": base_url,
+                "http_client": get_http_client(base_url),
+            }
+            if timeout is not None:
+                client_kwargs["timeout"] = timeout
+            cached = (loop, openai.AsyncOpenAI(**client_kwargs))
+            self._async_openai = cached
+        return cached[1]
+
+    async def response_stream(self, session_id, dialogue, **kwargs):
+        """异步流式接口，逐段产出文本
+
+        默认在线程中迭代同步的 response；实现了原生异步的服务商应覆盖本方法，
+        这样调用方取消任务时会立即中断进行中的HTTP请求，不再继续生成和计费
+        """
+        async for token in iterate_in_thread(
+            lambda: self.response(session_id, dialogue, **kwargs)
+        ):
+            yield token
+
+    async def response_stream_with_functions(self, session_id, dialogue, functions=None):
+        """异步流式接口（支持工具调用），逐段产出 (文本, 工具调用)
+
+        默认在线程中迭代同步的 response_with_functions，服务商可覆盖为原生异步实现
+        """
+        async for item in iterate_in_thread(
+            lambda: self.response_with_functions(session_id, dialogue, functions=functions)
+        ):
+            yield item
@@ -1,10 +1,13 @@
 from config.logger import setup_logging
 import json
+import asyncio
 from core.providers.llm.base import LLMProviderBase
 
 # official coze sdk for Python [cozepy](https://github.com/coze-dev/coze-py)
 from cozepy import COZE_CN_BASE_URL
 from cozepy import (
+    AsyncCoze,
+    AsyncTokenAuth,
     Coze,
     TokenAuth,
     Message,
@@ -54,7 +57,42 @@ class LLMProvider(LLMProviderBase):
                 print(event.message.content, end="", flush=True)
                 yield event.message.content
 
-    def response_with_functions(self, session_id, dialogue, functions=None):
+    async def response_stream(self, session_id, dialogue, **kwargs):
+        last_msg = next(m for m in reversed(dialogue) if m["role"] == "user")
+
+        # 异步客户端与事件循环绑定，按循环缓存
+        loop = asyncio.get_running_loop()
+        cached = getattr(self, "_async_coze", None)
+        if cached is None or cached[0] is not loop:
+            cached = (
+                loop,
+                AsyncCoze(
+                    auth=AsyncTokenAuth(token=self.personal_access_token),
+                    base_url=COZE_CN_BASE_URL,
+                ),
+            )
+            self._async_coze = cached
+        coze = cached[1]
+        conversation_id = self.session_conversation_map.get(session_id)
+
+        # 如果没有找到conversation_id，则创建新的对话
+        if not conversation_id:
+            conversation = await coze.conversations.create(messages=[])
+            conversation_id = conversation.id
+            self.session_conversation_map[session_id] = conversation_id  # 更新映射
+
+        async for event in await coze.chat.stream(
+            bot_id=self.bot_id,
+            user_id=self.user_id,
+            additional_messages=[
+                Message.build_user_question_text(last_msg["content"]),
+            ],
+            conversation_id=conversation_id,
+        ):
+            if event.event == ChatEventType.CONVERSATION_MESSAGE_DELTA:
+                yield event.message.content
+
+    def _prepare_function_dialogue(self, dialogue, functions):
         if len(dialogue) == 2 and functions is not None and len(functions) > 0:
             # 第一次调用llm， 取最后一条用户消息，附加tool提示词
             last_msg = dialogue[-1]["content"]
@@ -71,5 +109,12 @@ class LLMProvider(LLMProviderBase):
                     break
                 dialogue.pop()
 
+    def response_with_functions(self, session_id, dialogue, functions=None):
+        self._prepare_function_dialogue(dialogue, functions)
         for token in self.response(session_id, dialogue):
             yield token, None
+
+    async def response_stream_with_functions(self, session_id, dialogue, functions=None):
+        self._prepare_function_dialogue(dialogue, functions)
+        async for token in self.response_stream(session_id, dialogue):
+            yield token, None
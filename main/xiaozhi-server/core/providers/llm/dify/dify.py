@@ -1,9 +1,11 @@
 import json
+import httpx
 from config.logger import setup_logging
 import requests
 from core.providers.llm.base import LLMProviderBase
 from core.providers.llm.system_prompt import get_system_prompt_for_function
 from core.utils.util import check_model_key
+from core.utils.http_pool import get_http_client
 
 TAG = __name__
 logger = setup_logging()
@@ -15,11 +17,13 @@ class LLMProvider(LLMProviderBase):
         self.mode = config.get("mode", "chat-messages")
         self.base_url = config.get("base_url", "https://api.dify.ai/v1").rstrip("/")
         self.session_conversation_map = {}  # 存储session_id和conversation_id的映射
+        # 流式请求超时（秒），异步接口使用
+        self.timeout = httpx.Timeout(float(config.get("timeout", 120)), connect=10.0)
         model_key_msg = check_model_key("DifyLLM", self.api_key)
         if model_key_msg:
             logger.bind(tag=TAG).error(model_key_msg)
 
-    def response(self, session_id, dialogue, **kwargs):
+    def _build_request_json(self, session_id, dialogue) -> dict:
         # 取最后一条用户消息
         last_msg = next(m for m in reversed(dialogue) if m["role"] == "user")
         conversation_id = self.session_conversation_map.get(session_id)
@@ -45,48 +49,63 @@ class LLMProvider(LLMProviderBase):
                 "response_mode": "streaming",
                 "user": session_id,
             }
+        return request_json
 
+    def _parse_line(self, session_id, line):
+        """解析一行SSE数据，返回需要输出的文本，没有时返回 None"""
+        if isinstance(line, bytes):
+            line = line.decode("utf-8")
+        if not line.startswith("data: "):
+            return None
+        event = json.loads(line[6:])
+        if self.mode == "chat-messages":
+            # 如果没有找到conversation_id，则获取此次conversation_id
+            if not self.session_conversation_map.get(session_id):
+                self.session_conversation_map[session_id] = event.get(
+                    "conversation_id"
+                )  # 更新映射
+            # 过滤 message_replace 事件，此事件会全量推一次
+            if event.get("event") != "message_replace" and event.get("answer"):
+                return event["answer"]
+        elif self.mode == "workflows/run":
+            if event.get("event") == "workflow_finished":
+                if event["data"]["status"] == "succeeded":
+                    return event["data"]["outputs"]["answer"]
+                return "【服务响应异常】"
+        elif self.mode == "completion-messages":
+            # 过滤 message_replace 事件，此事件会全量推一次
+            if event.get("event") != "message_replace" and event.get("answer"):
+                return event["answer"]
+        return None
+
+    def response(self, session_id, dialogue, **kwargs):
         with requests.post(
             f"{self.base_url}/{self.mode}",
             headers={"Authorization": f"Bearer {self.api_key}"},
-            json=request_json,
+            json=self._build_request_json(session_id, dialogue),
             stream=True,
         ) as r:
-            if self.mode == "chat-messages":
-                for line in r.iter_lines():
-                    if line.startswith(b"data: "):
-                        event = json.loads(line[6:])
-                        # 如果没有找到conversation_id，则获取此次conversation_id
-                        if not conversation_id:
-                            conversation_id = event.get("conversation_id")
-                            self.session_conversation_map[session_id] = (
-                                conversation_id  # 更新映射
-                            )
-                        # 过滤 message_replace 事件，此事件会全量推一次
-                        if event.get("event") != "message_replace" and event.get(
-                            "answer"
-                        ):
-                            yield event["answer"]
-            elif self.mode == "workflows/run":
-                for line in r.iter_lines():
-                    if line.startswith(b"data: "):
-                        event = json.loads(line[6:])
-                        if event.get("event") == "workflow_finished":
-                            if event["data"]["status"] == "succeeded":
-                                yield event["data"]["outputs"]["answer"]
-                            else:
-                                yield "【服务响应异常】"
-            elif self.mode == "completion-messages":
-                for line in r.iter_lines():
-                    if line.startswith(b"data: "):
-                        event = json.loads(line[6:])
-                        # 过滤 message_replace 事件，此事件会全量推一次
-                        if event.get("event") != "message_replace" and event.get(
-                            "answer"
-                        ):
-                            yield event["answer"]
+            for line in r.iter_lines():
+                text = self._parse_line(session_id, line)
+                if text:
+                    yield text
 
-    def response_with_functions(self, session_id, dialogue, functions=None):
+    async def response_stream(self, session_id, dialogue, **kwargs):
+        url = f"{self.base_url}/{self.mode}"
+        # 退出 stream 上下文（包括被取消）时关闭响应，Dify 随之停止生成
+        async with get_http_client(url).stream(
+            "POST",
+            url,
+            headers={"Authorization": f"Bearer {self.api_key}"},
+            json=self._build_request_json(session_id, dialogue),
+            timeout=self.timeout,
+        ) as r:
+            async for line in r.aiter_lines():
+                text = self._parse_line(session_id, line)
+                if text:
+                    yield text
+
+    def _prepare_function_dialogue(self, dialogue, functions):
         if len(dialogue) == 2 and functions is not None and len(functions) > 0:
             # 第一次调用llm， 取最后一条用户消息，附加tool提示词
             last_msg = dialogue[-1]["content"]
@@ -103,5 +122,12 @@ class LLMProvider(LLMProviderBase):
                     break
                 dialogue.pop()
 
+    def response_with_functions(self, session_id, dialogue, functions=None):
+        self._prepare_function_dialogue(dialogue, functions)
         for token in self.response(session_id, dialogue):
             yield token, None
+
+    async def response_stream_with_functions(self, session_id, dialogue, functions=None):
+        self._prepare_function_dialogue(dialogue, functions)
+        async for token in self.response_stream(session_id, dialogue):
+            yield token, None
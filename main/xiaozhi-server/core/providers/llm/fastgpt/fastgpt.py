@@ -1,8 +1,10 @@
 import json
+import httpx
 from config.logger import setup_logging
 import requests
 from core.providers.llm.base import LLMProviderBase
 from core.utils.util import check_model_key
+from core.utils.http_pool import get_http_client
 
 TAG = __name__
 logger = setup_logging()
@@ -14,51 +16,82 @@ class LLMProvider(LLMProviderBase):
         self.base_url = config.get("base_url")
         self.detail = config.get("detail", False)
         self.variables = config.get("variables", {})
+        # 流式请求超时（秒），异步接口使用
+        self.timeout = httpx.Timeout(float(config.get("timeout", 120)), connect=10.0)
         model_key_msg = check_model_key("FastGPTLLM", self.api_key)
         if model_key_msg:
             logger.bind(tag=TAG).error(model_key_msg)
 
-    def response(self, session_id, dialogue, **kwargs):
+    def _build_request_json(self, session_id, dialogue) -> dict:
         # 取最后一条用户消息
         last_msg = next(m for m in reversed(dialogue) if m["role"] == "user")
+        return {
+            "stream": True,
+            "chatId": session_id,
+            "detail": self.detail,
+            "variables": self.variables,
+            "messages": [{"role": "user", "content": last_msg["content"]}],
+        }
+
+    @staticmethod
+    def _parse_line(line):
+        """解析一行SSE数据，返回 (是否结束, 文本)"""
+        if isinstance(line, bytes):
+            line = line.decode("utf-8")
+        if not line.startswith("data: "):
+            return False, None
+        if line[6:] == "[DONE]":
+            return True, None
+        try:
+            data = json.loads(line[6:])
+        except json.JSONDecodeError:
+            return False, None
+        if "choices" in data and len(data["choices"]) > 0:
+            delta = data["choices"][0].get("delta", {})
+            if delta and "content" in delta and delta["content"] is not None:
+                content = delta["content"]
+                if "<think>" in content or "</think>" in content:
+                    return False, None
+                return False, content
+        return False, None
 
+    def response(self, session_id, dialogue, **kwargs):
         # 发起流式请求
         with requests.post(
             f"{self.base_url}/chat/completions",
             headers={"Authorization": f"Bearer {self.api_key}"},
-            json={
-                "stream": True,
-                "chatId": session_id,
-                "detail": self.detail,
-                "variables": self.variables,
-                "messages": [{"role": "user", "content": last_msg["content"]}],
-            },
+            json=self._build_request_json(session_id, dialogue),
             stream=True,
         ) as r:
             for line in r.iter_lines():
                 if line:
                     try:
-                        if line.startswith(b"data: "):
-                            if line[6:].decode("utf-8") == "[DONE]":
-                                break
-
-                            data = json.loads(line[6:])
-                            if "choices" in data and len(data["choices"]) > 0:
-                                delta = data["choices"][0].get("delta", {})
-                                if (
-                                    delta
-                                    and "content" in delta
-                                    and delta["content"] is not None
-                                ):
-                                    content = delta["content"]
-                                    if "<think>" in content:
-                                        continue
-                                    if "</think>" in content:
-                                        continue
-                                    yield content
-
-                    except json.JSONDecodeError as e:
+                        done, content = self._parse_line(line)
+                        if done:
+                            break
+                        if content:
+                            yield content
+                    except Exception as e:
                         continue
+
+    async def response_stream(self, session_id, dialogue, **kwargs):
+        url = f"{self.base_url}/chat/completions"
+        # 退出 stream 上下文（包括被取消）时关闭响应，FastGPT 随之停止生成
+        async with get_http_client(url).stream(
+            "POST",
+            url,
+            headers={"Authorization": f"Bearer {self.api_key}"},
+            json=self._build_request_json(session_id, dialogue),
+            timeout=self.timeout,
+        ) as r:
+            async for line in r.aiter_lines():
+                if line:
+                    try:
+                        done, content = self._parse_line(line)
+                        if done:
+                            break
+                        if content:
+                            yield content
                     except Exception as e:
                         continue
 
@@ -7,6 +7,42 @@ TAG = __name__
 logger = setup_logging()
 
 
+class ThinkFilter:
+    """过滤流式输出中的 <think></think> 思考内容，处理跨chunk的标签"""
+
+    def __init__(self):
+        self.is_active = True
+        self.buffer = ""
+
+    def feed(self, content: str) -> str:
+        """放入一段输出，返回可以播报的文本"""
+        # 将内容添加到缓冲区
+        self.buffer += content
+
+        # 处理缓冲区中的标签
+        while "<think>" in self.buffer and "</think>" in self.buffer:
+            # 找到完整的<think></think>标签并移除
+            pre = self.buffer.split("<think>", 1)[0]
+            post = self.buffer.split("</think>", 1)[1]
+            self.buffer = pre + post
+
+        # 处理只有开始标签的情况
+        if "<think>" in self.buffer:
+            self.is_active = False
+            self.buffer = self.buffer.split("<think>", 1)[0]
+
+        # 处理只有结束标签的情况
+        if "</think>" in self.buffer:
+            self.is_active = True
+            self.buffer = self.buffer.split("</think>", 1)[1]
+
+        # 如果当前处于活动状态且缓冲区有内容，则输出
+        if self.is_active and self.buffer:
+            text, self.buffer = self.buffer, ""  # 清空缓冲区
+            return text
+        return ""
+
+
 class LLMProvider(LLMProviderBase):
     def __init__(self, config):
         self.model_name = config.get("model_name")
@@ -24,114 +60,65 @@ class LLMProvider(LLMProviderBase):
         # 检查是否是qwen3模型
         self.is_qwen3 = self.model_name and self.model_name.lower().startswith("qwen3")
 
-    def response(self, session_id, dialogue, **kwargs):
+    def _prepare_dialogue(self, dialogue):
         # 如果是qwen3模型，在用户最后一条消息中添加/no_think指令
-        if self.is_qwen3:
-            # 复制对话列表，避免修改原始对话
-            dialogue_copy = dialogue.copy()
-
-            # 找到最后一条用户消息
-            for i in range(len(dialogue_copy) - 1, -1, -1):
-                if dialogue_copy[i]["role"] == "user":
-                    # 在用户消息前添加/no_think指令
-                    dialogue_copy[i]["content"] = (
-                        "/no_think " + dialogue_copy[i]["content"]
-                    )
-                    logger.bind(tag=TAG).debug(f"为qwen3模型添加/no_think指令")
-                    break
-
-            # 使用修改后的对话
-            dialogue = dialogue_copy
+        if not self.is_qwen3:
+            return dialogue
+
+        # 复制对话列表，避免修改原始对话
+        dialogue_copy = dialogue.copy()
+
+        # 找到最后一条用户消息
+        for i in range(len(dialogue_copy) - 1, -1, -1):
+            if dialogue_copy[i]["role"] == "user":
+                # 在用户消息前添加/no_think指令
+                dialogue_copy[i]["content"] = "/no_think " + dialogue_copy[i]["content"]
+                logger.bind(tag=TAG).debug(f"为qwen3模型添加/no_think指令")
+                break
+
+        # 使用修改后的对话
+        return dialogue_copy
+
+    @staticmethod
+    def _split_chunk(chunk):
+        """取出chunk中的 (文本, 工具调用)"""
+        delta = chunk.choices[0].delta if getattr(chunk, "choices", None) else None
+        content = delta.content if hasattr(delta, "content") else None
+        tool_calls = delta.tool_calls if hasattr(delta, "tool_calls") else None
+        return content, tool_calls
 
+    def response(self, session_id, dialogue, **kwargs):
         responses = self.client.chat.completions.create(
-            model=self.model_name, messages=dialogue, stream=True
+            model=self.model_name, messages=self._prepare_dialogue(dialogue), stream=True
         )
-        is_active = True
-        # 用于处理跨chunk的标签
-        buffer = ""
+        think_filter = ThinkFilter()
 
         try:
             for chunk in responses:
                 try:
-                    delta = (
-                        chunk.choices[0].delta
-                        if getattr(chunk, "choices", None)
-                        else None
-                    )
-                    content = delta.content if hasattr(delta, "content") else ""
-
+                    content, _ = self._split_chunk(chunk)
                     if content:
-                        # 将内容添加到缓冲区
-                        buffer += content
-
-                        # 处理缓冲区中的标签
-                        while "<think>" in buffer and "</think>" in buffer:
-                            # 找到完整的<think></think>标签并移除
-                            pre = buffer.split("<think>", 1)[0]
-                            post = buffer.split("</think>", 1)[1]
-                            buffer = pre + post
-
-                        # 处理只有开始标签的情况
-                        if "<think>" in buffer:
-                            is_active = False
-                            buffer = buffer.split("<think>", 1)[0]
-
-                        # 处理只有结束标签的情况
-                        if "</think>" in buffer:
-                            is_active = True
-                            buffer = buffer.split("</think>", 1)[1]
-
-                        # 如果当前处于活动状态且缓冲区有内容，则输出
-                        if is_active and buffer:
-                            yield buffer
-                            buffer = ""  # 清空缓冲区
-
+                        text = think_filter.feed(content)
+                        if text:
+                            yield text
                 except Exception as e:
                     logger.bind(tag=TAG).error(f"Error processing chunk: {e}")
         finally:
             responses.close()
 
     def response_with_functions(self, session_id, dialogue, functions=None):
-        # 如果是qwen3模型，在用户最后一条消息中添加/no_think指令
-        if self.is_qwen3:
-            # 复制对话列表，避免修改原始对话
-            dialogue_copy = dialogue.copy()
-
-            # 找到最后一条用户消息
-            for i in range(len(dialogue_copy) - 1, -1, -1):
-                if dialogue_copy[i]["role"] == "user":
-                    # 在用户消息前添加/no_think指令
-                    dialogue_copy[i]["content"] = (
-                        "/no_think " + dialogue_copy[i]["content"]
-                    )
-                    logger.bind(tag=TAG).debug(f"为qwen3模型添加/no_think指令")
-                    break
-
-            # 使用修改后的对话
-            dialogue = dialogue_copy
-
         stream = self.client.chat.completions.create(
             model=self.model_name,
-            messages=dialogue,
+            messages=self._prepare_dialogue(dialogue),
             stream=True,
             tools=functions,
         )
-
-        is_active = True
-        buffer = ""
+        think_filter = ThinkFilter()
 
         try:
             for chunk in stream:
                 try:
-                    delta = (
-                        chunk.choices[0].delta
-                        if getattr(chunk, "choices", None)
-                        else None
-                    )
-                    content = delta.content if hasattr(delta, "content") else None
-                    tool_calls = (
-                        delta.tool_calls if hasattr(delta, "tool_calls") else None
-                    )
+                    content, tool_calls = self._split_chunk(chunk)
 
                     # 如果是工具调用，直接传递
                     if tool_calls:
@@ -140,32 +127,59 @@ class LLMProvider(LLMProviderBase):
 
                     # 处理文本内容
                     if content:
-                        # 将内容添加到缓冲区
-                        buffer += content
-
-                        # 处理缓冲区中的标签
-                        while "<think>" in buffer and "</think>" in buffer:
-                            # 找到完整的<think></think>标签并移除
-                            pre = buffer.split("<think>", 1)[0]
-                            post = buffer.split("</think>", 1)[1]
-                            buffer = pre + post
-
-                        # 处理只有开始标签的情况
-                        if "<think>" in buffer:
-                            is_active = False
-                            buffer = buffer.split("<think>", 1)[0]
-
-                        # 处理只有结束标签的情况
-                        if "</think>" in buffer:
-                            is_active = True
-                            buffer = buffer.split("</think>", 1)[1]
-
-                        # 如果当前处于活动状态且缓冲区有内容，则输出
-                        if is_active and buffer:
-                            yield buffer, None
-                            buffer = ""  # 清空缓冲区
+                        text = think_filter.feed(content)
+                        if text:
+                            yield text, None
                 except Exception as e:
                     logger.bind(tag=TAG).error(f"Error processing function chunk: {e}")
                     continue
         finally:
             stream.close()
+
+    async def response_stream(self, session_id, dialogue, **kwargs):
+        client = self._async_openai_client(self.base_url, "ollama")
+        stream = await client.chat.completions.create(
+            model=self.model_name, messages=self._prepare_dialogue(dialogue), stream=True
+        )
+        think_filter = ThinkFilter()
+
+        try:
+            async for chunk in stream:
+                try:
+                    content, _ = self._split_chunk(chunk)
+                    if content:
+                        text = think_filter.feed(content)
+                        if text:
+                            yield text
+                except Exception as e:
+                    logger.bind(tag=TAG).error(f"Error processing chunk: {e}")
+        finally:
+            # 被取消时立即关闭响应，Ollama 随之停止生成
+            await stream.close()
+
+    async def response_stream_with_functions(self, session_id, dialogue, functions=None):
+        client = self._async_openai_client(self.base_url, "ollama")
+        stream = await client.chat.completions.create(
+            model=self.model_name,
+            messages=self._prepare_dialogue(dialogue),
+            stream=True,
+            tools=functions,
+        )
+        think_filter = ThinkFilter()
+
+        try:
+            async for chunk in stream:
+                try:
+                    content, tool_calls = self._split_chunk(chunk)
+                    if tool_calls:
+                        yield None, tool_calls
+                        continue
+                    if content:
+                        text = think_filter.feed(content)
+                        if text:
+                            yield text, None
+                except Exception as e:
+                    logger.bind(tag=TAG).error(f"Error processing function chunk: {e}")
+                    continue
+        finally:
+            await stream.close()
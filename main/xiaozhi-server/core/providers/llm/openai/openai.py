@@ -43,6 +43,8 @@ class LLMProvider(LLMProviderBase):
         else:
             # 未配置或配置无效，使用默认值
             custom_timeout = httpx.Timeout(300)
+        self.timeout = custom_timeout
+        self.stream_usage = str(config.get("stream_usage", False)).lower() in ("true", "1", "yes")
 
         param_defaults = {
             "max_tokens": int,
@@ -89,14 +91,18 @@ class LLMProvider(LLMProviderBase):
                 logger.bind(tag=TAG).info(f"为域名 {domain} 禁用思考模式，参数: {params}")
                 break
 
-    def response(self, session_id, dialogue, **kwargs):
-        dialogue = self.normalize_dialogue(dialogue)
-
+    def _build_request_params(self, dialogue, functions=None, **kwargs) -> dict:
+        """构造 chat.completions 请求参数"""
         request_params = {
             "model": self.model_name,
-            "messages": dialogue,
+            "messages": self.normalize_dialogue(dialogue),
             "stream": True,
         }
+        if functions is not None:
+            request_params["tools"] = functions
+        if self.stream_usage:
+            # 流式返回 usage，用于记录输入命中前缀缓存的token数
+            request_params["stream_options"] = {"include_usage": True}
 
         # 添加可选参数,只有当参数不为None时才添加
         optional_params = {
@@ -112,68 +118,119 @@ class LLMProvider(LLMProviderBase):
 
         # 禁用思考模式
         self._apply_thinking_disabled(request_params)
+        return request_params
+
+    def _get_async_client(self) -> openai.AsyncOpenAI:
+        return self._async_openai_client(
+            str(self.client.base_url), self.api_key, self.timeout
+        )
+
+    @staticmethod
+    def _filter_think(content, state: dict):
+        """过滤 <think> 思考内容，state 记录是否处于思考中"""
+        if "<think>" in content:
+            state["active"] = False
+            content = content.split("<think>")[0]
+        if "</think>" in content:
+            state["active"] = True
+            content = content.split("</think>")[-1]
+        return content if state["active"] else ""
+
+    @staticmethod
+    def _cached_tokens(usage_info):
+        """取出命中前缀缓存的输入token数，服务端未返回时为 None"""
+        details = getattr(usage_info, "prompt_tokens_details", None)
+        cached = getattr(details, "cached_tokens", None) if details else None
+        if cached is None:
+            # DeepSeek 使用 prompt_cache_hit_tokens 字段
+            cached = getattr(usage_info, "prompt_cache_hit_tokens", None)
+        return cached
+
+    @classmethod
+    def _log_usage(cls, usage_info):
+        prompt_tokens = getattr(usage_info, "prompt_tokens", None)
+        cached = cls._cached_tokens(usage_info)
+        cache_msg = ""
+        if cached is not None:
+            ratio = f"（{cached / prompt_tokens:.0%}）" if prompt_tokens else ""
+            cache_msg = f"，输入命中缓存 {cached}{ratio}"
+        logger.bind(tag=TAG).info(
+            f"Token 消耗：输入 {prompt_tokens if prompt_tokens is not None else '未知'}，"
+            f"输出 {getattr(usage_info, 'completion_tokens', '未知')}，"
+            f"共计 {getattr(usage_info, 'total_tokens', '未知')}{cache_msg}"
+        )
+
+    def _log_chunk_usage(self, chunk):
+        usage = getattr(chunk, "usage", None)
+        if isinstance(usage, CompletionUsage):
+            self._log_usage(usage)
+
+    @staticmethod
+    def _chunk_content(chunk):
+        try:
+            delta = chunk.choices[0].delta if getattr(chunk, "choices", None) else None
+            return getattr(delta, "content", "") if delta else ""
+        except IndexError:
+            return ""
 
+    def response(self, session_id, dialogue, **kwargs):
+        request_params = self._build_request_params(dialogue, **kwargs)
         responses = self.client.chat.completions.create(**request_params)
 
-        is_active = True
-        try:            
+        state = {"active": True}
+        try:
             for chunk in responses:
-                try:
-                    delta = chunk.choices[0].delta if getattr(chunk, "choices", None) else None
-                    content = getattr(delta, "content", "") if delta else ""
-                except IndexError:
-                    content = ""
+                self._log_chunk_usage(chunk)
+                content = self._chunk_content(chunk)
                 if content:
-                    if "<think>" in content:
-                        is_active = False
-                        content = content.split("<think>")[0]
-                    if "</think>" in content:
-                        is_active = True
-                        content = content.split("</think>")[-1]
-                    if is_active:
+                    content = self._filter_think(content, state)
+                    if content:
                         yield content
         finally:
             responses.close()
 
     def response_with_functions(self, session_id, dialogue, functions=None, **kwargs):
-        dialogue = self.normalize_dialogue(dialogue)
-
-        request_params = {
-            "model": self.model_name,
-            "messages": dialogue,
-            "stream": True,
-            "tools": functions,
-        }
-
-        optional_params = {
-            "max_tokens": kwargs.get("max_tokens", self.max_tokens),
-            "temperature": kwargs.get("temperature", self.temperature),
-            "top_p": kwargs.get("top_p", self.top_p),
-            "frequency_penalty": kwargs.get("frequency_penalty", self.frequency_penalty),
-        }
-
-        for key, value in optional_params.items():
-            if value is not None:
-                request_params[key] = value
-
-        # 禁用思考模式
-        self._apply_thinking_disabled(request_params)
-
+        request_params = self._build_request_params(dialogue, functions, **kwargs)
         stream = self.client.chat.completions.create(**request_params)
 
         try:
             for chunk in stream:
+                # 部分服务在最后一个带 choices 的chunk中返回 usage
+                self._log_chunk_usage(chunk)
                 if getattr(chunk, "choices", None):
                     delta = chunk.choices[0].delta
                     content = getattr(delta, "content", "")
                     tool_calls = getattr(delta, "tool_calls", None)
                     yield content, tool_calls
-                elif isinstance(getattr(chunk, "usage", None), CompletionUsage):
-                    usage_info = getattr(chunk, "usage", None)
-                    logger.bind(tag=TAG).info(
-                        f"Token 消耗：输入 {getattr(usage_info, 'prompt_tokens', '未知')}，"
-                        f"输出 {getattr(usage_info, 'completion_tokens', '未知')}，"
-                        f"共计 {getattr(usage_info, 'total_tokens', '未知')}"
-                    )
         finally:
             stream.close()
+
+    async def response_stream(self, session_id, dialogue, **kwargs):
+        request_params = self._build_request_params(dialogue, **kwargs)
+        stream = await self._get_async_client().chat.completions.create(**request_params)
+
+        state = {"active": True}
+        try:
+            async for chunk in stream:
+                self._log_chunk_usage(chunk)
+                content = self._chunk_content(chunk)
+                if content:
+                    content = self._filter_think(content, state)
+                    if content:
+                        yield content
+        finally:
+            # 被取消时立即关闭响应，服务端随之停止生成
+            await stream.close()
+
+    async def response_stream_with_functions(self, session_id, dialogue, functions=None, **kwargs):
+        request_params = self._build_request_params(dialogue, functions, **kwargs)
+        stream = await self._get_async_client().chat.completions.create(**request_params)
+
+        try:
+            async for chunk in stream:
+                self._log_chunk_usage(chunk)
+                if getattr(chunk, "choices", None):
+                    delta = chunk.choices[0].delta
+                    yield getattr(delta, "content", ""), getattr(delta, "tool_calls", None)
+        finally:
+            await stream.close()
@@ -86,3 +86,55 @@ class LLMProvider(LLMProviderBase):
                     yield None, tool_calls
         finally:
             stream.close()
+
+    async def response_stream(self, session_id, dialogue, **kwargs):
+        client = self._async_openai_client(self.base_url, "xinference")
+        stream = await client.chat.completions.create(
+            model=self.model_name, messages=dialogue, stream=True
+        )
+        is_active = True
+        try:
+            async for chunk in stream:
+                try:
+                    delta = (
+                        chunk.choices[0].delta
+                        if getattr(chunk, "choices", None)
+                        else None
+                    )
+                    content = delta.content if hasattr(delta, "content") else ""
+                    if content:
+                        if "<think>" in content:
+                            is_active = False
+                            content = content.split("<think>")[0]
+                        if "</think>" in content:
+                            is_active = True
+                            content = content.split("</think>")[-1]
+                        if is_active:
+                            yield content
+                except Exception as e:
+                    logger.bind(tag=TAG).error(f"Error processing chunk: {e}")
+        finally:
+            # 被取消时立即关闭响应，服务端随之停止生成
+            await stream.close()
+
+    async def response_stream_with_functions(self, session_id, dialogue, functions=None):
+        client = self._async_openai_client(self.base_url, "xinference")
+        stream = await client.chat.completions.create(
+            model=self.model_name,
+            messages=dialogue,
+            stream=True,
+            tools=functions,
+        )
+
+        try:
+            async for chunk in stream:
+                delta = chunk.choices[0].delta
+                content = delta.content
+                tool_calls = delta.tool_calls
+
+                if content:
+                    yield content, tool_calls
+                elif tool_calls:
+                    yield None, tool_calls
+        finally:
+            await stream.close()
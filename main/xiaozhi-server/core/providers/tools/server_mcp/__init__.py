@@ -3,5 +3,13 @@
 from .mcp_manager import ServerMCPManager
 from .mcp_executor import ServerMCPExecutor
 from .mcp_client import ServerMCPClient
+from .mcp_pool import ServerMCPPool, SharedMCPServer, server_mcp_pool
 
-__all__ = ["ServerMCPManager", "ServerMCPExecutor", "ServerMCPClient"]
+__all__ = [
+    "ServerMCPManager",
+    "ServerMCPExecutor",
+    "ServerMCPClient",
+    "ServerMCPPool",
+    "SharedMCPServer",
+    "server_mcp_pool",
+]
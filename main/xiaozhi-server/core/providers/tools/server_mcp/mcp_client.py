@@ -132,9 +132,28 @@ class ServerMCPClient:
             raise RuntimeError("服务端MCP客户端未初始化")
 
         real_name = self.name_mapping.get(name, name)
-        loop = self._worker_task.get_loop()
         coro = self.session.call_tool(real_name, arguments=arguments, read_timeout_seconds=read_timeout_seconds, progress_callback=progress_callback, meta=meta)
+        return await self._run_in_worker_loop(coro)
+
+    async def ping(self, timeout: float = 5) -> bool:
+        """向MCP服务发送ping，用于健康检查
 
+        Returns:
+            bool: 服务在超时时间内响应返回True
+        """
+        if not self.is_connected():
+            return False
+        try:
+            await asyncio.wait_for(
+                self._run_in_worker_loop(self.session.send_ping()), timeout=timeout
+            )
+            return True
+        except Exception:
+            return False
+
+    async def _run_in_worker_loop(self, coro):
+        """会话属于工作协程所在的事件循环，其他事件循环中调用时转交执行"""
+        loop = self._worker_task.get_loop()
         if loop is asyncio.get_running_loop():
             return await coro
 
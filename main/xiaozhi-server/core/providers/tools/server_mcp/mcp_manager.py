@@ -2,7 +2,6 @@
 
 import asyncio
 import os
-import json
 from typing import Dict, Any, List
 
 from mcp.types import LoggingMessageNotificationParams
@@ -10,6 +9,7 @@ from mcp.types import LoggingMessageNotificationParams
 from config.config_loader import get_project_dir
 from config.logger import setup_logging
 from .mcp_client import ServerMCPClient
+from .mcp_pool import server_mcp_pool
 
 TAG = __name__
 logger = setup_logging()
@@ -27,27 +27,28 @@ class ServerMCPManager:
             logger.bind(tag=TAG).warning(
                 f"请检查mcp服务配置文件：data/.mcp_server_settings.json"
             )
-        self.clients: Dict[str, ServerMCPClient] = {}
+        # 共享服务为 SharedMCPServer 句柄，isolated 服务为本连接独占的 ServerMCPClient
+        self.clients: Dict[str, Any] = {}
         self.tools = []
         self._init_lock = asyncio.Lock()
 
     def load_config(self) -> Dict[str, Any]:
-        """加载MCP服务配置"""
+        """加载MCP服务配置，文件未修改时各连接复用同一次读取结果"""
         if len(self.config_path) == 0:
             return {}
-
-        try:
-            with open(self.config_path, "r", encoding="utf-8") as f:
-                config = json.load(f)
-            return config.get("mcpServers", {})
-        except Exception as e:
-            logger.bind(tag=TAG).error(
-                f"Error loading MCP config from {self.config_path}: {e}"
-            )
-            return {}
+        return server_mcp_pool.load_settings(self.config_path)
 
     async def _init_server(self, name: str, srv_config: Dict[str, Any]):
         """初始化单个MCP服务"""
+        if server_mcp_pool.enable and server_mcp_pool.is_shared(srv_config):
+            # 从进程级连接池获取，服务只在首次使用时启动
+            client = await server_mcp_pool.acquire(name, srv_config)
+            if client is not None:
+                async with self._init_lock:
+                    self.clients[name] = client
+                    self.tools.extend(client.get_available_tools())
+            return
+
         client = None
         try:
             # 初始化服务端MCP客户端
@@ -144,6 +145,11 @@ class ServerMCPManager:
                     f"执行工具 {tool_name} 失败 (尝试 {attempt+1}/{max_retries}): {e}"
                 )
 
+                if getattr(target_client, "shared", False):
+                    # 共享服务由连接池检查并重启失联的副本
+                    await asyncio.sleep(retry_interval)
+                    continue
+
                 # 尝试重新连接
                 logger.bind(tag=TAG).info(
                     f"重试前尝试重新连接 MCP 客户端 {client_name}"
@@ -0,0 +1,317 @@
+"""进程级共享的服务端MCP客户端池
+
+每个连接各自启动 data/.mcp_server_settings.json 中的MCP服务时，command 类服务每个连接都会拉起一个
+子进程（常见的是 npx），启动要数秒，每个进程占用上百MB内存。连接池让每个服务只启动一次（或少量副本）：
+- tools/list 只在启动时获取一次，所有连接共用同一份工具定义
+- 各连接的 call_tool 在共享会话上并发执行（MCP 按请求ID区分响应），多副本时分给进行中请求最少的副本
+- 定期 ping 检查，进程退出或无响应的副本自动重启
+- 服务配置变化后新连接使用新配置启动的服务，旧服务在无人使用后关闭
+需要每个连接独立进程的服务，在 .mcp_server_settings.json 中为其设置 "isolated": true
+"""
+
+import os
+import json
+import time
+import asyncio
+import hashlib
+from typing import Any, Dict, List, Optional
+
+from mcp.types import LoggingMessageNotificationParams
+
+from config.logger import setup_logging
+from .mcp_client import ServerMCPClient
+
+TAG = __name__
+logger = setup_logging()
+
+
+class _PooledServer:
+    """池中的一个MCP服务及其副本"""
+
+    def __init__(self, name: str, srv_config: Dict[str, Any], fingerprint: str, replicas: int):
+        self.name = name
+        self.config = srv_config
+        self.fingerprint = fingerprint
+        self.replica_count = replicas
+        self.replicas: List[Optional[ServerMCPClient]] = []
+        self.inflight: Dict[ServerMCPClient, int] = {}  # 副本 -> 进行中的请求数
+        self.tools: List[Dict[str, Any]] = []
+        self.tools_dict: Dict[str, Any] = {}
+        self.refs = 0
+        self.idle_since: Optional[float] = None
+        self.failed_at: Optional[float] = None
+        self.lock = asyncio.Lock()
+
+    def healthy_replicas(self) -> List[ServerMCPClient]:
+        return [c for c in self.replicas if c is not None and c.is_connected()]
+
+
+class SharedMCPServer:
+    """连接持有的共享MCP服务句柄，接口与 ServerMCPClient 一致，cleanup 只归还引用"""
+
+    shared = True
+
+    def __init__(self, pool: "ServerMCPPool", entry: _PooledServer):
+        self._pool = pool
+        self._entry = entry
+        self._released = False
+
+    def has_tool(self, name: str) -> bool:
+        return name in self._entry.tools_dict
+
+    def get_available_tools(self) -> List[Dict[str, Any]]:
+        return self._entry.tools
+
+    def is_connected(self) -> bool:
+        return bool(self._entry.healthy_replicas())
+
+    async def call_tool(self, name: str, arguments: dict, **kwargs) -> Any:
+        return await self._pool.call_tool(self._entry, name, arguments, **kwargs)
+
+    async def cleanup(self):
+        if not self._released:
+            self._released = True
+            self._pool.release(self._entry)
+
+
+class ServerMCPPool:
+    """进程级共享的服务端MCP客户端池，按 (服务名, 配置) 区分"""
+
+    def __init__(self, enable=True, replicas=1, health_check_interval=30, idle_seconds=300):
+        self.enable = enable
+        self.replicas = replicas
+        self.health_check_interval = health_check_interval
+        self.idle_seconds = idle_seconds
+        # 单个副本的启动超时（秒），启动失败后在 retry_seconds 内不再尝试，避免每个新连接都等待超时
+        self.start_timeout = 10
+        self.retry_seconds = 30
+        self._entries: Dict[tuple, _PooledServer] = {}
+        self._settings_cache = (None, None, {})  # (路径, 修改时间, 服务配置)
+        self._health_task: Optional[asyncio.Task] = None
+        self._checks = set()
+        self.started = 0
+        self.restarted = 0
+        self.reused = 0
+
+    def configure(self, config: dict):
+        pool_config = config.get("mcp_server_pool") or {}
+        self.enable = str(pool_config.get("enable", True)).lower() in ("true", "1", "yes")
+        self.replicas = max(1, int(pool_config.get("replicas", 1)))
+        self.health_check_interval = float(pool_config.get("health_check_interval", 30))
+        self.idle_seconds = float(pool_config.get("idle_seconds", 300))
+
+    def load_settings(self, path: str) -> Dict[str, Any]:
+        """读取 .mcp_server_settings.json 中的服务配置，文件未修改时直接返回上次的结果"""
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError as e:
+            logger.bind(tag=TAG).error(f"Error loading MCP config from {path}: {e}")
+            return {}
+        cached_path, cached_mtime, servers = self._settings_cache
+        if cached_path == path and cached_mtime == mtime:
+            return servers
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                servers = json.load(f).get("mcpServers", {})
+        except Exception as e:
+            logger.bind(tag=TAG).error(f"Error loading MCP config from {path}: {e}")
+            return {}
+        self._settings_cache = (path, mtime, servers)
+        return servers
+
+    @staticmethod
+    def is_shared(srv_config: Dict[str, Any]) -> bool:
+        return not srv_config.get("isolated", False)
+
+    async def acquire(self, name: str, srv_config: Dict[str, Any]) -> Optional[SharedMCPServer]:
+        """获取共享的MCP服务，首次使用时启动；启动失败返回 None"""
+        fingerprint = hashlib.sha256(
+            json.dumps(srv_config, sort_keys=True, ensure_ascii=False).encode("utf-8")
+        ).hexdigest()
+        key = (name, fingerprint)
+        entry = self._entries.get(key)
+        if entry is None:
+            replicas = max(1, int(srv_config.get("replicas", self.replicas)))
+            entry = _PooledServer(name, srv_config, fingerprint, replicas)
+            self._entries[key] = entry
+
+        async with entry.lock:
+            if not entry.healthy_replicas():
+                if entry.failed_at is not None and time.monotonic() - entry.failed_at < self.retry_seconds:
+                    return None
+                await self._start_locked(entry)
+                if not entry.healthy_replicas():
+                    entry.failed_at = time.monotonic()
+                    return None
+            else:
+                self.reused += 1
+            entry.failed_at = None
+            entry.refs += 1
+            entry.idle_since = None
+
+        self._ensure_health_task()
+        await self._evict_idle()
+        return SharedMCPServer(self, entry)
+
+    def release(self, entry: _PooledServer):
+        if entry.refs > 0:
+            entry.refs -= 1
+            if entry.refs == 0:
+                entry.idle_since = time.monotonic()
+
+    async def call_tool(self, entry: _PooledServer, name: str, arguments: dict, **kwargs) -> Any:
+        """在进行中请求最少的健康副本上调用工具，没有健康副本时先重启"""
+        client = self._pick(entry)
+        if client is None:
+            async with entry.lock:
+                if not entry.healthy_replicas():
+                    await self._start_locked(entry)
+            client = self._pick(entry)
+            if client is None:
+                raise RuntimeError(f"MCP服务 {entry.name} 不可用")
+
+        entry.inflight[client] = entry.inflight.get(client, 0) + 1
+        try:
+            return await client.call_tool(name, arguments, **kwargs)
+        except Exception:
+            # 调用失败时检查该副本，确认失联后重启，由调用方重试
+            check = asyncio.create_task(self._check_replica(entry, client))
+            self._checks.add(check)
+            check.add_done_callback(self._checks.discard)
+            raise
+        finally:
+            if client in entry.inflight:
+                entry.inflight[client] -= 1
+
+    @staticmethod
+    def _pick(entry: _PooledServer) -> Optional[ServerMCPClient]:
+        healthy = entry.healthy_replicas()
+        if not healthy:
+            return None
+        return min(healthy, key=lambda c: entry.inflight.get(c, 0))
+
+    async def _start_locked(self, entry: _PooledServer):
+        """启动缺失或失联的副本，调用方需持有 entry.lock"""
+        while len(entry.replicas) < entry.replica_count:
+            entry.replicas.append(None)
+        tasks = [
+            self._restart_replica_locked(entry, i)
+            for i, client in enumerate(entry.replicas)
+            if client is None or not client.is_connected()
+        ]
+        if tasks:
+            await asyncio.gather(*tasks)
+
+    async def _restart_replica_locked(self, entry: _PooledServer, index: int):
+        old = entry.replicas[index]
+        if old is not None:
+            entry.replicas[index] = None
+            entry.inflight.pop(old, None)
+            await old.cleanup()
+            self.restarted += 1
+            logger.bind(tag=TAG).warning(f"重启服务端MCP服务: {entry.name}#{index}")
+
+        logger.bind(tag=TAG).info(f"初始化服务端MCP客户端: {entry.name}#{index}")
+        client = ServerMCPClient(entry.config)
+        try:
+            await asyncio.wait_for(
+                client.initialize(logging_callback=self._logging_callback),
+                timeout=self.start_timeout,
+            )
+            if not client.is_connected():
+                raise RuntimeError("MCP客户端连接失败")
+        except Exception as e:
+            logger.bind(tag=TAG).error(
+                f"Failed to initialize MCP server {entry.name}: {str(e) or 'Timeout'}"
+            )
+            await client.cleanup()
+            return
+
+        entry.replicas[index] = client
+        self.started += 1
+        if not entry.tools:
+            # tools/list 只取第一个启动成功的副本，各副本的工具相同
+            entry.tools = client.get_available_tools()
+            entry.tools_dict = dict(client.tools_dict)
+
+    async def _check_replica(self, entry: _PooledServer, client: ServerMCPClient):
+        if await client.ping():
+            return
+        async with entry.lock:
+            if client in entry.replicas:
+                await self._restart_replica_locked(entry, entry.replicas.index(client))
+
+    def _ensure_health_task(self):
+        if self.health_check_interval <= 0:
+            return
+        if self._health_task is None or self._health_task.done():
+            self._health_task = asyncio.get_running_loop().create_task(self._health_loop())
+
+    async def _health_loop(self):
+        """定期检查各副本，关闭空闲的服务；池为空时退出"""
+        while self._entries:
+            await asyncio.sleep(self.health_check_interval)
+            try:
+                await self._evict_idle()
+                for entry in list(self._entries.values()):
+                    if entry.refs == 0:
+                        # 空闲的服务在下次被获取时再检查
+                        continue
+                    for client in list(entry.replicas):
+                        if client is not None:
+                            await self._check_replica(entry, client)
+                    if entry.refs > 0 and len(entry.healthy_replicas()) < entry.replica_count:
+                        async with entry.lock:
+                            await self._start_locked(entry)
+            except Exception as e:
+                logger.bind(tag=TAG).error(f"服务端MCP健康检查出错: {e}")
+
+    async def _evict_idle(self):
+        now = time.monotonic()
+        for key, entry in list(self._entries.items()):
+            if (
+                entry.refs == 0
+                and entry.idle_since is not None
+                and now - entry.idle_since >= self.idle_seconds
+                and not entry.lock.locked()
+            ):
+                self._entries.pop(key, None)
+                await self._close_entry(entry)
+
+    async def _close_entry(self, entry: _PooledServer):
+        for client in entry.replicas:
+            if client is not None:
+                await client.cleanup()
+        entry.replicas = []
+        logger.bind(tag=TAG).info(f"服务端MCP服务已关闭: {entry.name}")
+
+    async def close_all(self):
+        """关闭池中所有服务，用于进程退出"""
+        entries = list(self._entries.values())
+        self._entries.clear()
+        tasks = list(self._checks)
+        if self._health_task is not None:
+            tasks.append(self._health_task)
+            self._health_task = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await asyncio.gather(
+            *(self._close_entry(entry) for entry in entries), return_exceptions=True
+        )
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "servers": len(self._entries),
+            "replicas": sum(len(e.healthy_replicas()) for e in self._entries.values()),
+            "in_use": sum(1 for e in self._entries.values() if e.refs > 0),
+            "started": self.started,
+            "restarted": self.restarted,
+            "reused": self.reused,
+        }
+
+    async def _logging_callback(self, params: LoggingMessageNotificationParams):
+        logger.bind(tag=TAG).info(f"[Server Log - {params.level.upper()}] {params.data}")
+
+
+server_mcp_pool = ServerMCPPool()
@@ -6,7 +6,7 @@ from config.logger import setup_logging
 from plugins_func.loadplugins import auto_import_modules
 
 from .base import ToolType
-from plugins_func.register import Action, ActionResponse
+from plugins_func.register import Action, ActionResponse, all_function_registry
 from .unified_tool_manager import ToolManager
 from .server_plugins import ServerPluginExecutor
 from .server_mcp import ServerMCPExecutor
@@ -51,6 +51,16 @@ class UnifiedToolHandler:
             ToolType.MCP_ENDPOINT, self.mcp_endpoint_executor
         )
 
+        # 提前执行：参数完整后不等LLM流结束就开始执行的工具
+        early_config = self.config.get("early_tool_execution", {}) or {}
+        self.early_execute_enabled = str(early_config.get("enable", True)).lower() in (
+            "true",
+            "1",
+            "yes",
+        )
+        # 配置中额外允许提前执行的工具名（如只读的MCP工具）
+        self.early_execute_tools = set(early_config.get("tools", []) or [])
+
         # 初始化标志
         self.finish_init = False
 
@@ -121,6 +131,10 @@ class UnifiedToolHandler:
         """获取所有工具的函数描述"""
         return self.tool_manager.get_function_descriptions()
 
+    def get_tool_schema(self):
+        """获取编译后的工具描述（含序列化JSON和摘要），工具变化时才重新编译"""
+        return self.tool_manager.get_tool_schema()
+
     def current_support_functions(self) -> List[str]:
         """获取当前支持的函数名称列表"""
         func_names = self.tool_manager.get_supported_tool_names()
@@ -136,6 +150,17 @@ class UnifiedToolHandler:
         """检查是否有指定工具"""
         return self.tool_manager.has_tool(tool_name)
 
+    def can_execute_early(self, tool_name: str) -> bool:
+        """工具是否允许在LLM流式输出未结束时提前执行"""
+        if not self.early_execute_enabled or not self.has_tool(tool_name):
+            return False
+        if tool_name in self.early_execute_tools:
+            return True
+        if self.tool_manager.get_tool_type(tool_name) != ToolType.SERVER_PLUGIN:
+            return False
+        func_item = all_function_registry.get(tool_name)
+        return bool(func_item and func_item.early_execute)
+
     async def handle_llm_function_call(
         self, conn, function_call_data: Dict[str, Any]
     ) -> Optional[ActionResponse]:
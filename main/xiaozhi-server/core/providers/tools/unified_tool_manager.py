@@ -3,6 +3,7 @@
 from typing import Dict, List, Optional, Any
 from config.logger import setup_logging
 from plugins_func.register import Action, ActionResponse
+from core.utils.prompt_artifacts import ToolSchema, compile_tool_schema
 from .base import ToolType, ToolDefinition, ToolExecutor
 
 
@@ -15,6 +16,7 @@ class ToolManager:
         self.executors: Dict[ToolType, ToolExecutor] = {}
         self._cached_tools: Optional[Dict[str, ToolDefinition]] = None
         self._cached_function_descriptions: Optional[List[Dict[str, Any]]] = None
+        self._cached_schema: Optional[ToolSchema] = None
 
     def register_executor(self, tool_type: ToolType, executor: ToolExecutor):
         """注册工具执行器"""
@@ -26,6 +28,7 @@ class ToolManager:
         """使缓存失效"""
         self._cached_tools = None
         self._cached_function_descriptions = None
+        self._cached_schema = None
 
     def get_all_tools(self) -> Dict[str, ToolDefinition]:
         """获取所有工具定义"""
@@ -59,6 +62,12 @@ class ToolManager:
         self._cached_function_descriptions = descriptions
         return descriptions
 
+    def get_tool_schema(self) -> ToolSchema:
+        """获取编译后的工具描述，工具变化前每轮复用同一份（相同工具集合的连接共享）"""
+        if self._cached_schema is None:
+            self._cached_schema = compile_tool_schema(self.get_function_descriptions())
+        return self._cached_schema
+
     def has_tool(self, tool_name: str) -> bool:
         """检查是否存在指定工具"""
         tools = self.get_all_tools()
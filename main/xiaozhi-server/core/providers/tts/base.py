@@ -19,6 +19,7 @@ from core.utils.tts import MarkdownCleaner, convert_percentage_to_range
 from core.utils.output_counter import add_device_output
 from core.handle.reportHandle import enqueue_tts_report
 from core.handle.sendAudioHandle import sendAudioMessage
+from core.utils.pipeline import BridgeQueue
 from core.utils.util import audio_bytes_to_data_stream, audio_to_data_stream
 from core.providers.tts.dto.dto import (
     TTSMessageDTO,
@@ -313,6 +314,10 @@ class TTSProviderBase(ABC):
                 sample_rate=conn.sample_rate, channels=1, frame_size_ms=60
             )
 
+        if getattr(conn, "use_async_pipeline", False):
+            self._open_async_pipeline(conn)
+            return
+
         # tts 消化线程
         self.tts_priority_thread = threading.Thread(
             target=self.tts_text_priority_thread, daemon=True
@@ -325,6 +330,24 @@ class TTSProviderBase(ABC):
         )
         self.audio_play_priority_thread.start()
 
+    def _open_async_pipeline(self, conn):
+        """asyncio 管线模式：文本分句与音频下发改为事件循环任务"""
+        self.tts_text_queue = BridgeQueue(conn.loop)
+        self.tts_audio_queue = BridgeQueue(
+            conn.loop, maxsize=int(conn.config.get("tts_audio_queue_size", 1000))
+        )
+        if type(self).tts_text_priority_thread is TTSProviderBase.tts_text_priority_thread:
+            self.tts_priority_task = asyncio.create_task(self._tts_text_priority_task())
+        else:
+            # 流式TTS子类自行维护了双向流状态，文本处理仍在线程中，队列兼容线程读取
+            self.tts_priority_thread = threading.Thread(
+                target=self.tts_text_priority_thread, daemon=True
+            )
+            self.tts_priority_thread.start()
+        self.audio_play_priority_task = asyncio.create_task(
+            self._audio_play_priority_task()
+        )
+
     def store_tts_text(self, sentence_id, text):
         """存储指定 sentence_id 对应的文本，用于流式TTS获取正确的字幕文本
 
@@ -372,37 +395,7 @@ class TTSProviderBase(ABC):
         while not self.conn.stop_event.is_set():
             try:
                 message = self.tts_text_queue.get(timeout=1)
-                if self.conn.client_abort:
-                    logger.bind(tag=TAG).info("收到打断信息，终止TTS文本处理线程")
-                    continue
-                # 过滤旧消息：检查sentence_id是否匹配
-                if message.sentence_id != self.conn.sentence_id:
-                    continue
-                if message.sentence_type == SentenceType.FIRST:
-                    self.current_sentence_id = message.sentence_id
-                    self.tts_stop_request = False
-                    self.processed_chars = 0
-                    self.tts_text_buff = []
-                    self.is_first_sentence = True
-                    self.tts_audio_first_sentence = True
-                elif ContentType.TEXT == message.content_type:
-                    self.tts_text_buff.append(message.content_detail)
-                    segment_text = self._get_segment_text()
-                    if segment_text:
-                        self.to_tts_stream(segment_text, opus_handler=self.handle_opus)
-                elif ContentType.FILE == message.content_type:
-                    self._process_remaining_text_stream(opus_handler=self.handle_opus)
-                    tts_file = message.content_file
-                    if tts_file and os.path.exists(tts_file):
-                        self._process_audio_file_stream(
-                            tts_file, callback=self.handle_opus
-                        )
-                if message.sentence_type == SentenceType.LAST:
-                    self._process_remaining_text_stream(opus_handler=self.handle_opus)
-                    self.tts_audio_queue.put(
-                        (message.sentence_type, [], message.content_detail, message.sentence_id)
-                    )
-
+                self._handle_tts_text_message(message)
             except queue.Empty:
                 continue
             except Exception as e:
@@ -411,20 +404,98 @@ class TTSProviderBase(ABC):
                 )
                 continue
 
+    async def _tts_text_priority_task(self):
+        """文本处理任务（asyncio 管线模式），合成在共享线程池中执行"""
+        loop = asyncio.get_running_loop()
+        while not self.conn.stop_event.is_set():
+            try:
+                message = await self.tts_text_queue.async_get(timeout=1)
+                await loop.run_in_executor(
+                    self.conn.executor, self._handle_tts_text_message, message
+                )
+            except asyncio.TimeoutError:
+                continue
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.bind(tag=TAG).error(
+                    f"处理TTS文本失败: {str(e)}, 类型: {type(e).__name__}, 堆栈: {traceback.format_exc()}"
+                )
+                continue
+
+    def _handle_tts_text_message(self, message):
+        if self.conn.client_abort:
+            logger.bind(tag=TAG).info("收到打断信息，终止TTS文本处理线程")
+            return
+        # 过滤旧消息：检查sentence_id是否匹配
+        if message.sentence_id != self.conn.sentence_id:
+            return
+        if message.sentence_type == SentenceType.FIRST:
+            self.current_sentence_id = message.sentence_id
+            self.tts_stop_request = False
+            self.processed_chars = 0
+            self.tts_text_buff = []
+            self.is_first_sentence = True
+            self.tts_audio_first_sentence = True
+        elif ContentType.TEXT == message.content_type:
+            self.tts_text_buff.append(message.content_detail)
+            segment_text = self._get_segment_text()
+            if segment_text:
+                self.to_tts_stream(segment_text, opus_handler=self.handle_opus)
+        elif ContentType.FILE == message.content_type:
+            self._process_remaining_text_stream(opus_handler=self.handle_opus)
+            tts_file = message.content_file
+            if tts_file and os.path.exists(tts_file):
+                self._process_audio_file_stream(
+                    tts_file, callback=self.handle_opus
+                )
+        if message.sentence_type == SentenceType.LAST:
+            self._process_remaining_text_stream(opus_handler=self.handle_opus)
+            self.tts_audio_queue.put(
+                (message.sentence_type, [], message.content_detail, message.sentence_id)
+            )
+
+    @staticmethod
+    def _unpack_audio_item(item):
+        if len(item) == 4:
+            return item
+        sentence_type, audio_datas, text = item
+        return sentence_type, audio_datas, text, None
+
+    def _collect_audio_report(self, report_state, sentence_type, audio_datas, text):
+        """收到下一个文本开始或会话结束时进行上报，report_state 为 [待上报文本, 待上报音频]"""
+        if sentence_type is not SentenceType.MIDDLE:
+            if self.report_on_last:
+                # 累积模式：适用于全程只有一个语音流的TTS（如seed-tts-2.0）
+                # FIRST时只记录文本，音频持续累积，仅在LAST时统一上报
+                if text:
+                    report_state[0] = text
+                if sentence_type == SentenceType.LAST:
+                    enqueue_tts_report(self.conn, report_state[0], report_state[1])
+                    report_state[1] = []
+                    report_state[0] = None
+            else:
+                # 非累积模式：每个句子分别上报
+                if report_state[0] is not None:
+                    enqueue_tts_report(self.conn, report_state[0], report_state[1])
+                report_state[1] = []
+                report_state[0] = text
+
+        # 收集上报音频数据
+        if isinstance(audio_datas, bytes):
+            report_state[1].append(audio_datas)
+
     def _audio_play_priority_thread(self):
         # 需要上报的文本和音频列表
-        enqueue_text = None
-        enqueue_audio = []
+        report_state = [None, []]
         while not self.conn.stop_event.is_set():
             text = None
             try:
                 try:
                     item = self.tts_audio_queue.get(timeout=0.1)
-                    if len(item) == 4:
-                        sentence_type, audio_datas, text, sentence_id = item
-                    else:
-                        sentence_type, audio_datas, text = item
-                        sentence_id = None
+                    sentence_type, audio_datas, text, sentence_id = (
+                        self._unpack_audio_item(item)
+                    )
                 except queue.Empty:
                     if self.conn.stop_event.is_set():
                         break
@@ -432,30 +503,10 @@ class TTSProviderBase(ABC):
 
                 if self.conn.client_abort:
                     logger.bind(tag=TAG).debug("收到打断信号，跳过当前音频数据")
-                    enqueue_text, enqueue_audio = None, []
+                    report_state = [None, []]
                     continue
 
-                # 收到下一个文本开始或会话结束时进行上报
-                if sentence_type is not SentenceType.MIDDLE:
-                    if self.report_on_last:
-                        # 累积模式：适用于全程只有一个语音流的TTS（如seed-tts-2.0）
-                        # FIRST时只记录文本，音频持续累积，仅在LAST时统一上报
-                        if text:
-                            enqueue_text = text
-                        if sentence_type == SentenceType.LAST:
-                            enqueue_tts_report(self.conn, enqueue_text, enqueue_audio)
-                            enqueue_audio = []
-                            enqueue_text = None
-                    else:
-                        # 非累积模式：每个句子分别上报
-                        if enqueue_text is not None:
-                            enqueue_tts_report(self.conn, enqueue_text, enqueue_audio)
-                        enqueue_audio = []
-                        enqueue_text = text
-
-                # 收集上报音频数据
-                if isinstance(audio_datas, bytes):
-                    enqueue_audio.append(audio_datas)
+                self._collect_audio_report(report_state, sentence_type, audio_datas, text)
 
                 # 发送音频
                 future = asyncio.run_coroutine_threadsafe(
@@ -471,6 +522,39 @@ class TTSProviderBase(ABC):
             except Exception as e:
                 logger.bind(tag=TAG).error(f"audio_play_priority_thread: {text} {e}")
 
+    async def _audio_play_priority_task(self):
+        """音频下发任务（asyncio 管线模式）"""
+        report_state = [None, []]
+        while not self.conn.stop_event.is_set():
+            text = None
+            try:
+                try:
+                    item = await self.tts_audio_queue.async_get(timeout=1)
+                except asyncio.TimeoutError:
+                    continue
+                sentence_type, audio_datas, text, sentence_id = self._unpack_audio_item(
+                    item
+                )
+
+                if self.conn.client_abort:
+                    logger.bind(tag=TAG).debug("收到打断信号，跳过当前音频数据")
+                    report_state = [None, []]
+                    continue
+
+                self._collect_audio_report(report_state, sentence_type, audio_datas, text)
+
+                await sendAudioMessage(
+                    self.conn, sentence_type, audio_datas, text, sentence_id
+                )
+
+                if self.conn.max_output_size > 0 and text:
+                    add_device_output(self.conn.headers.get("device-id"), len(text))
+
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.bind(tag=TAG).error(f"audio_play_priority_task: {text} {e}")
+
     async def start_session(self, session_id):
         pass
 
@@ -7,3 +7,23 @@ class VADProviderBase(ABC):
     def is_vad(self, conn, data) -> bool:
         """检测音频数据中的语音活动"""
         pass
+
+    async def is_vad_async(self, conn, data) -> bool:
+        """异步检测接口，默认直接调用同步检测，支持批量推理的实现可重写"""
+        return self.is_vad(conn, data)
+
+    def compute_speech_probs(self, conn, data) -> Optional[list]:
+        """只做模型推理、不更新连接的语音状态，返回各音频块的语音概率
+
+        供音频入口分片线程调用；不支持拆分的实现返回 None，由事件循环调用 is_vad
+        """
+        return None
+
+    def apply_speech_probs(self, conn, speech_probs: list) -> bool:
+        """按顺序用语音概率更新连接的语音状态，返回当前是否有声音
+
+        只在 compute_speech_probs 返回概率时调用，重写了 compute_speech_probs 的实现需同时重写
+        """
+        raise NotImplementedError(
+            f"{type(self).__name__} 重写了 compute_speech_probs 但未实现 apply_speech_probs"
+        )
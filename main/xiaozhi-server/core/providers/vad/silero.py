@@ -1,13 +1,99 @@
 import time
 import os
+import asyncio
 import numpy as np
 import onnxruntime
+from concurrent.futures import ThreadPoolExecutor
 from config.logger import setup_logging
 from core.providers.vad.base import VADProviderBase
 
 TAG = __name__
 logger = setup_logging()
 
+# Silero VAD 每次推理的采样点数（16kHz）及需要拼接的上下文长度
+CHUNK_SAMPLES = 512
+CONTEXT_SAMPLES = 64
+
+
+class SileroBatchEngine:
+    """跨连接的 Silero VAD 批量推理引擎
+
+    在短时间窗口内收集所有连接待推理的音频块，堆叠成一个 batch 做一次推理，
+    再把概率和状态分发回各连接。Silero 的 state 形状为 (2, B, 128)，天然支持批量。
+    """
+
+    def __init__(self, session, window_ms=8, max_batch_size=64):
+        self.session = session
+        self.window = max(window_ms, 0) / 1000
+        self.max_batch_size = max(int(max_batch_size), 1)
+        self._pending = []
+        self._flush_handle = None
+        self._loop = None
+        # 推理放到独立线程，避免阻塞事件循环；单线程保证批次按顺序执行
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="vad-batch")
+        self._sr = np.array(16000, dtype=np.int64)
+        # 统计信息
+        self.total_batches = 0
+        self.total_chunks = 0
+
+    async def infer(self, audio_input: np.ndarray, state: np.ndarray):
+        """提交一个音频块，返回 (speech_prob, new_state)
+
+        Args:
+            audio_input: 已拼接上下文的输入，形状 (1, 576)
+            state: 该连接的状态，形状 (2, 1, 128)
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._pending = []
+            self._flush_handle = None
+        future = loop.create_future()
+        self._pending.append((audio_input, state, future))
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.window, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._pending = self._pending, []
+        if batch:
+            self._loop.create_task(self._run_batch(batch))
+
+    def _run_session(self, inputs, states):
+        return self.session.run(
+            None, {"input": inputs, "state": states, "sr": self._sr}
+        )
+
+    async def _run_batch(self, batch):
+        try:
+            inputs = np.concatenate([item[0] for item in batch], axis=0)
+            states = np.concatenate([item[1] for item in batch], axis=1)
+            out, new_states = await self._loop.run_in_executor(
+                self._executor, self._run_session, inputs, states
+            )
+            self.total_batches += 1
+            self.total_chunks += len(batch)
+            for idx, (_, _, future) in enumerate(batch):
+                if not future.done():
+                    future.set_result(
+                        (float(out[idx].item()), new_states[:, idx : idx + 1, :])
+                    )
+        except Exception as e:
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+
+    @property
+    def average_batch_size(self):
+        if self.total_batches == 0:
+            return 0.0
+        return self.total_chunks / self.total_batches
+
 
 class VADProvider(VADProviderBase):
     def __init__(self, config):
@@ -16,9 +102,12 @@ class VADProvider(VADProviderBase):
         model_path = os.path.join(
             config["model_dir"], "src", "silero_vad", "data", "silero_vad.onnx"
         )
+        batch_enabled = config.get("batch_enabled", False)
+        self.batch_enabled = str(batch_enabled).lower() in ("true", "1", "yes")
+
         opts = onnxruntime.SessionOptions()
         opts.inter_op_num_threads = 1
-        opts.intra_op_num_threads = 1
+        opts.intra_op_num_threads = int(config.get("intra_op_num_threads", 1))
         self.session = onnxruntime.InferenceSession(
             model_path, providers=["CPUExecutionProvider"], sess_options=opts
         )
@@ -34,14 +123,31 @@ class VADProvider(VADProviderBase):
             int(min_silence_duration_ms) if min_silence_duration_ms else 1000
         )
 
+        # 预识别：静音达到该时长（毫秒）时提前开始ASR，0 表示关闭
+        speculative_silence_ms = int(config.get("speculative_silence_ms", 0) or 0)
+        self.speculative_silence_ms = (
+            speculative_silence_ms
+            if 0 < speculative_silence_ms < self.silence_threshold_ms
+            else 0
+        )
+
         self.frame_window_threshold = 3
 
+        self.batch_engine = None
+        if self.batch_enabled:
+            self.batch_engine = SileroBatchEngine(
+                self.session,
+                window_ms=float(config.get("batch_window_ms", 8)),
+                max_batch_size=int(config.get("batch_max_size", 64)),
+            )
+            logger.bind(tag=TAG).info("SileroVAD 已启用跨连接批量推理")
+
     def _init_connection_state(self, conn):
         """为连接初始化独立的 VAD 状态"""
         if not hasattr(conn, "_vad_state"):
             conn._vad_state = np.zeros((2, 1, 128), dtype=np.float32)
         if not hasattr(conn, "_vad_context"):
-            conn._vad_context = np.zeros((1, 64), dtype=np.float32)
+            conn._vad_context = np.zeros((1, CONTEXT_SAMPLES), dtype=np.float32)
 
     def release_conn_resources(self, conn):
         """释放连接的 VAD 资源（连接关闭时调用）"""
@@ -52,10 +158,62 @@ class VADProvider(VADProviderBase):
                 except Exception:
                     pass
 
-    def is_vad(self, conn, pcm_frame):
-        # 手动模式：直接返回True，不进行实时VAD检测，所有音频都缓存
+    def _next_chunk_input(self, conn):
+        """从连接缓冲区取出一个音频块并拼接上下文，缓冲区不足一块时返回 None"""
+        # 零拷贝取出一块，直接转换写入模型输入，不产生中间数组
+        chunk = conn.client_audio_buffer.read(CHUNK_SAMPLES * 2)
+        if chunk is None:
+            return None
+
+        audio_input = np.empty((1, CONTEXT_SAMPLES + CHUNK_SAMPLES), dtype=np.float32)
+        audio_input[:, :CONTEXT_SAMPLES] = conn._vad_context
+        np.multiply(
+            np.frombuffer(chunk, dtype=np.int16),
+            1.0 / 32768.0,
+            out=audio_input[0, CONTEXT_SAMPLES:],
+            casting="unsafe",
+        )
+        return audio_input
+
+    def _update_voice_state(self, conn, speech_prob):
+        """根据语音概率更新连接的语音状态，返回当前是否有声音"""
+        # 双阈值判断
+        if speech_prob >= self.vad_threshold:
+            is_voice = True
+        elif speech_prob <= self.vad_threshold_low:
+            is_voice = False
+        else:
+            is_voice = conn.last_is_voice
+
+        # 声音没低于最低值则延续前一个状态，判断为有声音
+        conn.last_is_voice = is_voice
+
+        # 更新滑动窗口
+        conn.client_voice_window.append(is_voice)
+        client_have_voice = (
+            conn.client_voice_window.count(True) >= self.frame_window_threshold
+        )
+
+        # 如果之前有声音，但本次没有声音，且与上次有声音的时间差已经超过了静默阈值，则认为已经说完一句话
+        if conn.client_have_voice and not client_have_voice:
+            stop_duration = time.time() * 1000 - conn.vad_last_voice_time
+            if stop_duration >= self.silence_threshold_ms:
+                conn.client_voice_stop = True
+            elif (
+                self.speculative_silence_ms
+                and stop_duration >= self.speculative_silence_ms
+            ):
+                conn.client_voice_pause = True
+        if client_have_voice:
+            conn.client_have_voice = True
+            conn.client_voice_pause = False
+            conn.vad_last_voice_time = time.time() * 1000
+        return client_have_voice
+
+    def compute_speech_probs(self, conn, pcm_frame):
+        # 手动模式不做实时VAD检测
         if conn.client_listen_mode == "manual":
-            return True
+            return []
 
         try:
             self._init_connection_state(conn)
@@ -63,16 +221,11 @@ class VADProvider(VADProviderBase):
             # pcm_frame已经是处理后的PCM数据
             conn.client_audio_buffer.extend(pcm_frame)
 
-            client_have_voice = False
-            while len(conn.client_audio_buffer) >= 512 * 2:
-                chunk = conn.client_audio_buffer[: 512 * 2]
-                conn.client_audio_buffer = conn.client_audio_buffer[512 * 2 :]
-
-                audio_int16 = np.frombuffer(chunk, dtype=np.int16)
-                audio_float32 = audio_int16.astype(np.float32) / 32768.0
-                audio_input = np.concatenate(
-                    [conn._vad_context, audio_float32.reshape(1, -1)], axis=1
-                ).astype(np.float32)
+            speech_probs = []
+            while True:
+                audio_input = self._next_chunk_input(conn)
+                if audio_input is None:
+                    break
 
                 ort_inputs = {
                     "input": audio_input,
@@ -82,34 +235,54 @@ class VADProvider(VADProviderBase):
                 out, state = self.session.run(None, ort_inputs)
 
                 conn._vad_state = state
-                conn._vad_context = audio_input[:, -64:]
-                speech_prob = out.item()
-
-                # 双阈值判断
-                if speech_prob >= self.vad_threshold:
-                    is_voice = True
-                elif speech_prob <= self.vad_threshold_low:
-                    is_voice = False
-                else:
-                    is_voice = conn.last_is_voice
-
-                # 声音没低于最低值则延续前一个状态，判断为有声音
-                conn.last_is_voice = is_voice
-
-                # 更新滑动窗口
-                conn.client_voice_window.append(is_voice)
-                client_have_voice = (
-                    conn.client_voice_window.count(True) >= self.frame_window_threshold
-                )
+                conn._vad_context = audio_input[:, -CONTEXT_SAMPLES:]
+                speech_probs.append(out.item())
+
+            return speech_probs
+        except Exception as e:
+            logger.bind(tag=TAG).error(f"Error processing audio packet: {e}")
+            return []
+
+    def apply_speech_probs(self, conn, speech_probs):
+        # 手动模式：直接返回True，所有音频都缓存
+        if conn.client_listen_mode == "manual":
+            return True
+
+        client_have_voice = False
+        for speech_prob in speech_probs:
+            client_have_voice = self._update_voice_state(conn, speech_prob)
+        return client_have_voice
+
+    def is_vad(self, conn, pcm_frame):
+        # 手动模式：直接返回True，不进行实时VAD检测，所有音频都缓存
+        if conn.client_listen_mode == "manual":
+            return True
 
-                # 如果之前有声音，但本次没有声音，且与上次有声音的时间差已经超过了静默阈值，则认为已经说完一句话
-                if conn.client_have_voice and not client_have_voice:
-                    stop_duration = time.time() * 1000 - conn.vad_last_voice_time
-                    if stop_duration >= self.silence_threshold_ms:
-                        conn.client_voice_stop = True
-                if client_have_voice:
-                    conn.client_have_voice = True
-                    conn.vad_last_voice_time = time.time() * 1000
+        return self.apply_speech_probs(conn, self.compute_speech_probs(conn, pcm_frame))
+
+    async def is_vad_async(self, conn, pcm_frame):
+        if self.batch_engine is None or conn.client_listen_mode == "manual":
+            return self.is_vad(conn, pcm_frame)
+
+        try:
+            self._init_connection_state(conn)
+            conn.client_audio_buffer.extend(pcm_frame)
+
+            client_have_voice = False
+            while True:
+                audio_input = self._next_chunk_input(conn)
+                if audio_input is None:
+                    break
+                # 同一连接的音频块必须串行（依赖上一块的状态），不同连接在批次中合并
+                speech_prob, state = await self.batch_engine.infer(
+                    audio_input, conn._vad_state
+                )
+                if not hasattr(conn, "_vad_state"):
+                    # 等待推理期间连接已释放
+                    return False
+                conn._vad_state = state
+                conn._vad_context = audio_input[:, -CONTEXT_SAMPLES:]
+                client_have_voice = self._update_voice_state(conn, speech_prob)
 
             return client_have_voice
         except Exception as e:
@@ -0,0 +1,210 @@
+"""
+ASR音频工件工具
+- 内存文件：需要文件路径的ASR使用 memfd 匿名内存文件（/proc/self/fd/N），不落盘；
+  不支持 memfd 的平台退回临时文件
+- 磁盘空间检查：按目录缓存剩余空间，间隔内只扣减已登记写入的字节数，不再每句话调用 disk_usage
+- 归档写入：delete_audio 为 false 时，录音由后台线程批量写入磁盘，不阻塞识别流程
+"""
+
+import os
+import time
+import queue
+import shutil
+import struct
+import tempfile
+import threading
+from typing import List, Optional, Tuple
+from config.logger import setup_logging
+
+TAG = __name__
+logger = setup_logging()
+
+
+def pcm_to_wav(pcm_data: bytes, sample_rate=16000) -> bytes:
+    """为单声道16bit PCM添加WAV文件头"""
+    data_size = len(pcm_data)
+    header = struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF",
+        36 + data_size,
+        b"WAVE",
+        b"fmt ",
+        16,  # fmt块大小
+        1,  # PCM格式
+        1,  # 单声道
+        sample_rate,
+        sample_rate * 2,  # 字节率
+        2,  # 块对齐
+        16,  # 位深
+        b"data",
+        data_size,
+    )
+    return b"".join((header, pcm_data))
+
+
+def create_memory_wav(pcm_data: bytes, name="asr", allow_memfd=True) -> Tuple[str, int]:
+    """把PCM写成内存中的WAV文件
+
+    Args:
+        allow_memfd: 为 False 时始终写带 .wav 后缀的临时文件。memfd 路径 /proc/self/fd/N 没有扩展名，
+            路径要交给按文件名判断格式的外部SDK（如 dashscope 上传本地文件）时不能使用
+
+    Returns:
+        (文件路径, 文件描述符)，描述符为 -1 表示退回了临时文件，使用完后调用 release_memory_wav
+    """
+    wav_data = pcm_to_wav(pcm_data)
+    if allow_memfd and hasattr(os, "memfd_create") and os.path.isdir("/proc/self/fd"):
+        fd = os.memfd_create(f"{name}.wav")
+        try:
+            os.write(fd, wav_data)
+            os.lseek(fd, 0, os.SEEK_SET)
+        except Exception:
+            os.close(fd)
+            raise
+        return f"/proc/self/fd/{fd}", fd
+    with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as temp_file:
+        temp_file.write(wav_data)
+        return temp_file.name, -1
+
+
+def release_memory_wav(path: Optional[str], fd: int):
+    """释放 create_memory_wav 创建的文件"""
+    if fd >= 0:
+        os.close(fd)
+    elif path and os.path.exists(path):
+        os.unlink(path)
+
+
+class DiskSpaceCache:
+    """按目录缓存磁盘剩余空间"""
+
+    def __init__(self, interval=5.0):
+        """
+        Args:
+            interval: 重新调用 disk_usage 的最小间隔（秒）
+        """
+        self.interval = interval
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    def has_space(self, path: str, needed: int) -> bool:
+        """目录剩余空间是否足够，足够时预先扣减 needed 字节"""
+        now = time.monotonic()
+        with self._lock:
+            checked_at, free = self._cache.get(path, (0.0, 0))
+            if now - checked_at >= self.interval:
+                free = shutil.disk_usage(path).free
+                checked_at = now
+            if free < needed:
+                self._cache[path] = (checked_at, free)
+                return False
+            self._cache[path] = (checked_at, free - needed)
+            return True
+
+
+_disk_space_cache = DiskSpaceCache()
+
+
+def has_disk_space(path: str, needed: int) -> bool:
+    """检查目录剩余空间（带缓存）"""
+    return _disk_space_cache.has_space(path, needed)
+
+
+def set_disk_check_interval(interval: float):
+    """设置重新检查磁盘剩余空间的间隔（秒）"""
+    _disk_space_cache.interval = max(float(interval), 0)
+
+
+class AudioArchiver:
+    """后台批量写入录音文件"""
+
+    def __init__(self, batch_size=16, flush_interval_ms=500, queue_size=1000):
+        """
+        Args:
+            batch_size: 每批最多写入的文件数
+            flush_interval_ms: 未攒满一批时最长等待时间（毫秒）
+            queue_size: 待写入队列上限，队列满时丢弃新的归档请求
+        """
+        self.batch_size = max(int(batch_size), 1)
+        self.flush_interval = max(float(flush_interval_ms), 0) / 1000
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._thread = threading.Thread(
+            target=self._writer, name="asr-audio-archiver", daemon=True
+        )
+        self._thread.start()
+        # 统计信息
+        self.written = 0
+        self.batches = 0
+        self.dropped = 0
+
+    def submit(self, file_path: str, pcm_data: bytes) -> bool:
+        """登记一个待写入的录音，立即返回"""
+        try:
+            self._queue.put_nowait((file_path, pcm_data))
+            return True
+        except queue.Full:
+            self.dropped += 1
+            logger.bind(tag=TAG).warning(f"录音归档队列已满，丢弃: {file_path}")
+            return False
+
+    def _collect(self) -> List[Tuple[str, bytes]]:
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _writer(self):
+        while True:
+            batch = self._collect()
+            for file_path, pcm_data in batch:
+                try:
+                    with open(file_path, "wb") as f:
+                        f.write(pcm_to_wav(pcm_data))
+                    self.written += 1
+                except Exception as e:
+                    logger.bind(tag=TAG).error(f"录音归档写入失败 {file_path}: {e}")
+            self.batches += 1
+
+    def stats(self) -> dict:
+        return {
+            "pending": self._queue.qsize(),
+            "written": self.written,
+            "batches": self.batches,
+            "dropped": self.dropped,
+        }
+
+
+# 全局单例
+_audio_archiver_instance = None
+_audio_archiver_lock = threading.Lock()
+
+
+def get_audio_archiver(config: dict) -> AudioArchiver:
+    """
+    获取录音归档写入器（单例模式）
+
+    Args:
+        config: 全局配置，仅首次调用时读取 asr_audio_artifacts 配置
+
+    Returns:
+        AudioArchiver实例
+    """
+    global _audio_archiver_instance
+    if _audio_archiver_instance is None:
+        with _audio_archiver_lock:
+            if _audio_archiver_instance is None:
+                artifacts_config = config.get("asr_audio_artifacts", {})
+                _audio_archiver_instance = AudioArchiver(
+                    batch_size=int(artifacts_config.get("archive_batch_size", 16)),
+                    flush_interval_ms=float(
+                        artifacts_config.get("archive_flush_interval_ms", 500)
+                    ),
+                )
+    return _audio_archiver_instance
@@ -0,0 +1,157 @@
+"""
+音频入口分片模块
+按设备ID哈希把连接固定分配到 N 个工作线程，在工作线程中完成 Opus 解码、AEC 和 VAD 推理，
+事件循环只接收解码后的 PCM 和 VAD 概率，说话设备增多时事件循环延迟保持平稳
+
+同一连接的音频包始终由同一个分片线程按顺序处理，解码器、VAD 模型状态等逐包依赖的
+数据只会被该线程访问，无需加锁
+"""
+
+import os
+import zlib
+import queue
+import threading
+from typing import NamedTuple, Optional
+from config.logger import setup_logging
+
+TAG = __name__
+logger = setup_logging()
+
+
+class IngressFrame(NamedTuple):
+    """分片线程处理后投递给事件循环的音频帧"""
+
+    pcm: bytes
+    # 各音频块的语音概率，None 表示 VAD 不支持拆分推理，需要在事件循环中检测
+    speech_probs: Optional[list]
+
+
+def is_audio_ingress_enabled(config: dict) -> bool:
+    """配置是否启用了音频入口分片"""
+    enabled = config.get("audio_ingress", {}).get("enabled", False)
+    return str(enabled).lower() in ("true", "1", "yes")
+
+
+class AudioIngress:
+    """音频入口分片线程池"""
+
+    def __init__(self, num_shards=None, queue_size=2000):
+        """
+        Args:
+            num_shards: 分片线程数，默认CPU核数
+            queue_size: 每个分片的待处理队列上限，队列满时丢弃新到的音频包
+        """
+        self.num_shards = max(int(num_shards or os.cpu_count() or 1), 1)
+        self._queues = [queue.Queue(maxsize=queue_size) for _ in range(self.num_shards)]
+        self._threads = []
+        for idx, shard_queue in enumerate(self._queues):
+            thread = threading.Thread(
+                target=self._shard_worker,
+                args=(shard_queue,),
+                name=f"audio-ingress-{idx}",
+                daemon=True,
+            )
+            thread.start()
+            self._threads.append(thread)
+        # 统计信息
+        self.processed = 0
+        self.dropped = 0
+
+    def shard_of(self, conn) -> int:
+        """按设备ID（无设备ID时用会话ID）计算连接所属分片，结果缓存在连接上"""
+        shard = getattr(conn, "_ingress_shard", None)
+        if shard is None:
+            key = conn.device_id or conn.session_id
+            shard = zlib.crc32(str(key).encode("utf-8")) % self.num_shards
+            conn._ingress_shard = shard
+        return shard
+
+    def submit(self, conn, opus_packet: bytes, timestamp: int = 0) -> bool:
+        """提交一个音频包，在事件循环中调用，不会阻塞
+
+        Args:
+            conn: 连接对象
+            opus_packet: Opus编码的音频数据
+            timestamp: MQTT网关音频包的时间戳，大于0且启用AEC时做回声消除
+
+        Returns:
+            bool: 是否成功入队
+        """
+        try:
+            self._queues[self.shard_of(conn)].put_nowait((conn, opus_packet, timestamp))
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    def _shard_worker(self, shard_queue: queue.Queue):
+        while True:
+            conn, opus_packet, timestamp = shard_queue.get()
+            if conn.stop_event.is_set():
+                continue
+            try:
+                self._process_packet(conn, opus_packet, timestamp)
+                self.processed += 1
+            except Exception as e:
+                logger.bind(tag=TAG).error(f"音频入口分片处理失败: {e}")
+
+    @staticmethod
+    def _process_packet(conn, opus_packet: bytes, timestamp: int):
+        pcm_frame = conn._decode_opus_packet(opus_packet)
+        if not pcm_frame:
+            return
+
+        # AEC处理：如果timestamp>0且启用了AEC
+        if timestamp > 0 and conn.client_aec:
+            pcm_frame = conn._apply_aec(timestamp, pcm_frame)
+
+        # 事件循环请求的重置在本线程执行，VAD缓冲区只在所属分片线程中读写
+        reset_seq = conn.vad_reset_seq
+        if conn.vad_reset_applied != reset_seq:
+            conn.client_audio_buffer.clear()
+            conn.vad_reset_applied = reset_seq
+
+        speech_probs = None
+        if conn.vad is not None:
+            speech_probs = conn.vad.compute_speech_probs(conn, pcm_frame)
+
+        # asr_audio_queue 在两种管线模式下都是线程安全且不会阻塞的队列
+        conn.asr_audio_queue.put(IngressFrame(pcm_frame, speech_probs))
+
+    def stats(self) -> dict:
+        return {
+            "shards": self.num_shards,
+            "pending": [q.qsize() for q in self._queues],
+            "processed": self.processed,
+            "dropped": self.dropped,
+        }
+
+
+# 全局单例
+_audio_ingress_instance = None
+_audio_ingress_lock = threading.Lock()
+
+
+def get_audio_ingress(config: dict) -> AudioIngress:
+    """
+    获取音频入口分片线程池（单例模式）
+
+    Args:
+        config: 全局配置，仅首次调用时读取 audio_ingress 配置
+
+    Returns:
+        AudioIngress实例
+    """
+    global _audio_ingress_instance
+    if _audio_ingress_instance is None:
+        with _audio_ingress_lock:
+            if _audio_ingress_instance is None:
+                ingress_config = config.get("audio_ingress", {})
+                _audio_ingress_instance = AudioIngress(
+                    num_shards=ingress_config.get("shards"),
+                    queue_size=int(ingress_config.get("queue_size", 2000)),
+                )
+                logger.bind(tag=TAG).info(
+                    f"音频入口分片已启用，分片线程数: {_audio_ingress_instance.num_shards}"
+                )
+    return _audio_ingress_instance
@@ -1,8 +1,23 @@
 import uuid
 import re
+import json
+import threading
 from typing import List, Dict
 from datetime import datetime
 
+# 中日韩字符（含全角标点），本地估算时按每字1个token计
+_CJK_PATTERN = re.compile(r"[\u3000-\u9fff\uac00-\ud7af\uff00-\uffef]")
+# 每条消息的角色、分隔符等固定开销
+MESSAGE_TOKEN_OVERHEAD = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """本地估算token数：中日韩字符每字1个，其余约4个字符1个"""
+    if not text:
+        return 0
+    cjk = len(_CJK_PATTERN.findall(text))
+    return cjk + (len(text) - cjk + 3) // 4
+
 
 class Message:
     def __init__(
@@ -22,14 +37,117 @@ class Message:
         self.is_temporary = is_temporary  # 标记临时消息（如工具调用提醒）
 
 
-class Dialogue:
+# 前缀缓存布局下，system 中时间占位符替换成的固定文本
+CONTEXT_TIME_HINT = "见最近一条 <context> 消息"
+
+
+class _SerializedSegment:
+    """增量序列化的一段消息（few-shot 或对话历史），只处理新追加的消息"""
+
     def __init__(self):
-        self.dialogue: List[Message] = []
+        self.entries = []  # [(uniq_id, 消息dict, 估算token数)]
+        self.tokens = 0
+        # 尚无 tool 响应的 tool_call id（按出现顺序）
+        self.pending_tool_calls = {}
+
+    def append(self, message: "Message", item: dict):
+        tokens = MESSAGE_TOKEN_OVERHEAD + estimate_tokens(message.content)
+        if message.tool_calls:
+            tokens += estimate_tokens(json.dumps(message.tool_calls, ensure_ascii=False))
+        self.entries.append((message.uniq_id, item, tokens))
+        self.tokens += tokens
+        if message.role == "assistant" and message.tool_calls:
+            for tc in message.tool_calls:
+                tc_id = tc.get("id") if isinstance(tc, dict) else getattr(tc, "id", None)
+                if tc_id:
+                    self.pending_tool_calls[tc_id] = None
+        elif message.role == "tool" and message.tool_call_id:
+            self.pending_tool_calls.pop(message.tool_call_id, None)
+
+    def drop_before(self, index: int):
+        """丢弃前 index 条消息，重新统计token数和悬空的 tool_calls"""
+        kept = self.entries[index:]
+        self.entries = []
+        self.tokens = 0
+        self.pending_tool_calls = {}
+        for uniq_id, item, tokens in kept:
+            self.entries.append((uniq_id, item, tokens))
+            self.tokens += tokens
+            for tc in item.get("tool_calls") or []:
+                tc_id = tc.get("id") if isinstance(tc, dict) else getattr(tc, "id", None)
+                if tc_id:
+                    self.pending_tool_calls[tc_id] = None
+            if item["role"] == "tool":
+                self.pending_tool_calls.pop(item.get("tool_call_id"), None)
+
+    def export(self, dialogue: List[Dict]):
+        # 返回副本：部分服务商会就地修改消息（如 dify 给最后一条拼接工具提示词）
+        for _, item, _ in self.entries:
+            dialogue.append(dict(item))
+        # 修复被打断导致的悬空 tool_calls，防止大模型 API 报 400 错误
+        for missing_id in self.pending_tool_calls:
+            dialogue.append(
+                {
+                    "role": "tool",
+                    "tool_call_id": missing_id,
+                    "content": '{"status": "interrupted", "message": "动作已取消/被打断"}',
+                }
+            )
+
+
+class Dialogue:
+    def __init__(
+        self,
+        cache_friendly: bool = False,
+        token_budget: int = 0,
+        keep_recent_turns: int = 4,
+    ):
+        self._messages: List[Message] = []
+        # 前缀缓存友好布局：system、工具和 few-shot 每轮保持字节不变，
+        # 时间、记忆、说话人等易变内容放到最后一条用户消息之前的 <context> 消息中
+        self.cache_friendly = cache_friendly
+        # 对话历史（不含 system 和 few-shot）的token预算，0 表示不限制
+        self.token_budget = token_budget
+        # 超出预算汇总旧对话时，至少保留的最近轮数（按用户消息计）
+        self.keep_recent_turns = keep_recent_turns
+        # 旧对话的汇总，附加在 system 末尾
+        self.summary = None
+        # 汇总函数 summarizer(上次汇总, 待汇总的消息列表) -> 新汇总，在 executor 中执行；
+        # 未设置时超出预算直接丢弃最早的对话
+        self._summarizer = None
+        self._summary_executor = None
+        self._summarizing = False
+        self._lock = threading.RLock()
+        self._reset_serialized()
         # 获取当前时间
         self.current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
+    @property
+    def dialogue(self) -> List[Message]:
+        """完整的消息列表（包含已汇总的旧对话，供记忆保存等使用）"""
+        return self._messages
+
+    @dialogue.setter
+    def dialogue(self, messages: List[Message]):
+        # 外部整体替换消息列表时，按新列表重建序列化缓存，保留已汇总的位置
+        with self._lock:
+            self._messages = list(messages)
+            self._reset_serialized()
+
+    def _reset_serialized(self):
+        self._scan_pos = 0
+        self._fewshot = _SerializedSegment()
+        self._history = _SerializedSegment()
+        # 已被汇总的消息，重建时跳过
+        self._summarized_ids = getattr(self, "_summarized_ids", set())
+
+    def set_summarizer(self, summarizer, executor):
+        """设置后台汇总旧对话的函数及执行它的线程池"""
+        self._summarizer = summarizer
+        self._summary_executor = executor
+
     def put(self, message: Message):
-        self.dialogue.append(message)
+        self._messages.append(message)
 
     def getMessages(self, m, dialogue):
         if m.tool_calls is not None:
@@ -47,6 +165,83 @@ class Dialogue:
         else:
             dialogue.append({"role": m.role, "content": m.content})
 
+    def _sync_serialized(self):
+        """只序列化上次之后新追加的消息"""
+        for m in self._messages[self._scan_pos:]:
+            if m.role == "system" or m.uniq_id in self._summarized_ids:
+                continue
+            items = []
+            self.getMessages(m, items)
+            segment = self._fewshot if m.is_temporary else self._history
+            segment.append(m, items[0])
+        self._scan_pos = len(self._messages)
+
+    @property
+    def history_tokens(self) -> int:
+        """当前窗口内对话历史的估算token数"""
+        with self._lock:
+            self._sync_serialized()
+            return self._history.tokens
+
+    def _find_cut(self) -> int:
+        """超出预算时找汇总的截止位置：只在用户消息处截断，保证工具调用链完整"""
+        entries = self._history.entries
+        user_positions = [i for i, (_, item, _) in enumerate(entries) if item["role"] == "user"]
+        # 至少保留最近 keep_recent_turns 轮
+        candidates = user_positions[: max(0, len(user_positions) - self.keep_recent_turns)]
+        # 汇总后降到预算的一半，避免每轮都触发汇总
+        target = self.token_budget // 2
+        remaining = self._history.tokens
+        cut = 0
+        previous = 0
+        for position in candidates:
+            remaining -= sum(tokens for _, _, tokens in entries[previous:position])
+            previous = position
+            cut = position
+            if remaining <= target:
+                break
+        return cut
+
+    def _maybe_roll_up(self):
+        if self.token_budget <= 0 or self._summarizing:
+            return
+        if self._history.tokens <= self.token_budget:
+            return
+        cut = self._find_cut()
+        if cut <= 0:
+            return
+        if self._summarizer is None or self._summary_executor is None:
+            self._apply_cut(self._history.entries[cut][0], self.summary)
+            return
+        rolled = [dict(item) for _, item, _ in self._history.entries[:cut]]
+        cut_id = self._history.entries[cut][0]
+        self._summarizing = True
+        try:
+            self._summary_executor.submit(self._run_summary, self.summary, rolled, cut_id)
+        except Exception:
+            # 线程池已关闭（连接关闭中），放弃本次汇总
+            self._summarizing = False
+
+    def _run_summary(self, previous_summary, rolled, cut_id):
+        try:
+            summary = self._summarizer(previous_summary, rolled)
+        except Exception:
+            summary = None
+        with self._lock:
+            self._summarizing = False
+            if summary:
+                self._apply_cut(cut_id, summary)
+
+    def _apply_cut(self, cut_id, summary):
+        """把 cut_id 之前的历史移出窗口，由汇总代替"""
+        entries = self._history.entries
+        index = next((i for i, entry in enumerate(entries) if entry[0] == cut_id), None)
+        if index is None:
+            return
+        self._summarized_ids.update(entry[0] for entry in entries[:index])
+        self._history.drop_before(index)
+        self.summary = summary
+
     def get_llm_dialogue(self) -> List[Dict[str, str]]:
         # 直接调用get_llm_dialogue_with_memory，传入None作为memory_str
         # 这样确保说话人功能在所有调用路径下都生效
@@ -61,40 +256,11 @@ class Dialogue:
         else:
             self.put(Message(role="system", content=new_content))
 
-    def _ensure_tool_calls_complete(self, messages: List[Message]) -> List[Message]:
-        """
-        确保所有 tool_calls 都有对应的 tool 响应
-        修复被打断导致的悬空 tool_calls，防止大模型 API 报 400 错误
-        """
-        pending_tool_calls = set()
-        result = []
-
-        for msg in messages:
-            result.append(msg)
-
-            if msg.role == "assistant" and msg.tool_calls:
-                for tc in msg.tool_calls:
-                    tc_id = tc.get("id") if isinstance(tc, dict) else getattr(tc, "id", None)
-                    if tc_id:
-                        pending_tool_calls.add(tc_id)
-
-            elif msg.role == "tool" and msg.tool_call_id:
-                pending_tool_calls.discard(msg.tool_call_id)
-
-        for missing_id in pending_tool_calls:
-            dummy_tool_msg = Message(
-                role="tool",
-                content='{"status": "interrupted", "message": "动作已取消/被打断"}',
-                tool_call_id=missing_id
-            )
-            result.append(dummy_tool_msg)
-
-        return result
-
     def get_llm_dialogue_with_memory(
             self, memory_str: str = None, voiceprint_config: dict = None,
-            current_speaker: str = None,
+            current_speaker: str = None, pending: Message = None,
     ) -> List[Dict[str, str]]:
+        """pending: 尚未写入对话历史的本轮消息（如预先发起请求时的用户消息），追加在末尾"""
         # 构建对话
         dialogue = []
 
@@ -103,61 +269,94 @@ class Dialogue:
             (msg for msg in self.dialogue if msg.role == "system"), None
         )
 
+        context_message = None
         if system_message:
             full_prompt = system_message.content
+            speakers_info = self._build_speakers_info(voiceprint_config, current_speaker)
 
-            # 替换时间占位符
-            full_prompt = full_prompt.replace(
-                "{{current_time}}", datetime.now().strftime("%H:%M")
-            )
-
-            # 填充记忆
-            if memory_str is not None:
-                full_prompt = re.sub(
-                    r"<memory>.*?</memory>",
-                    f"<memory>\n{memory_str}\n</memory>",
-                    full_prompt,
-                    flags=re.DOTALL,
+            if self.cache_friendly:
+                # system 不再随时间、记忆和说话人变化，易变内容单独成一条消息
+                full_prompt = full_prompt.replace("{{current_time}}", CONTEXT_TIME_HINT)
+                context = f"<context>\n当前时间：{datetime.now().strftime('%H:%M')}"
+                if memory_str is not None:
+                    context += f"\n<memory>\n{memory_str}\n</memory>"
+                context += f"{speakers_info}\n</context>"
+                context_message = {"role": "user", "content": context}
+            else:
+                # 替换时间占位符
+                full_prompt = full_prompt.replace(
+                    "{{current_time}}", datetime.now().strftime("%H:%M")
                 )
 
-            # 追加说话人信息
-            try:
-                current_speaker_name = (current_speaker or "").strip()
-                # 仅在本轮注入了有效身份时才输出 speakers_info，避免列表里的名字每轮
-                # 重复出现诱导模型反复称呼；后续轮不再注入身份，靠对话历史首轮保留
-                if current_speaker_name and current_speaker_name != "未知说话人":
-                    speakers = voiceprint_config.get("speakers", [])
-                    speakers_info = "\n<speakers_info>"
-                    speakers_info += f"\n当前说话人：{current_speaker_name}"
-                    for speaker_str in speakers:
-                        try:
-                            parts = speaker_str.split(",", 2)
-                            if len(parts) >= 2:
-                                name = parts[1].strip()
-                                description = (
-                                    parts[2].strip() if len(parts) >= 3 else ""
-                                )
-                                speakers_info += f"\n- {name}：{description}"
-                        except:
-                            pass
-                    speakers_info += "\n</speakers_info>"
-                    full_prompt += speakers_info
-            except:
-                pass
+                # 填充记忆
+                if memory_str is not None:
+                    full_prompt = re.sub(
+                        r"<memory>.*?</memory>",
+                        f"<memory>\n{memory_str}\n</memory>",
+                        full_prompt,
+                        flags=re.DOTALL,
+                    )
+
+                # 追加说话人信息
+                full_prompt += speakers_info
+
+            # 超出token预算被汇总的旧对话（只在汇总更新时变化）
+            if self.summary:
+                full_prompt += f"\n<history_summary>\n{self.summary}\n</history_summary>"
 
             dialogue.append({"role": "system", "content": full_prompt})
 
-        # 第二段：few-shot 示例（会话内不变）
-        non_system_messages = [m for m in self.dialogue if m.role != "system"]
-        fewshot_messages = [m for m in non_system_messages if m.is_temporary]
-        complete_fewshot = self._ensure_tool_calls_complete(fewshot_messages)
-        for m in complete_fewshot:
-            self.getMessages(m, dialogue)
+        with self._lock:
+            # 只序列化新增的消息，超出预算时在后台汇总旧对话
+            self._sync_serialized()
+            self._maybe_roll_up()
+
+            # 第二段：few-shot 示例（会话内不变）
+            self._fewshot.export(dialogue)
+
+            # 第三段：实际对话历史（不含 few-shot）
+            history_start = len(dialogue)
+            self._history.export(dialogue)
 
-        # 第三段：实际对话历史（不含 few-shot）
-        actual_messages = [m for m in non_system_messages if not m.is_temporary]
-        complete_actual = self._ensure_tool_calls_complete(actual_messages)
-        for m in complete_actual:
-            self.getMessages(m, dialogue)
+        if pending is not None:
+            self.getMessages(pending, dialogue)
+
+        if context_message is not None:
+            # 放在最后一条用户消息之前：之前的内容都能命中前缀缓存，
+            # 且最后一条 user 仍是用户原话（dify/coze 等只取最后一条用户消息）
+            insert_at = len(dialogue)
+            for i in range(len(dialogue) - 1, history_start - 1, -1):
+                if dialogue[i]["role"] == "user":
+                    insert_at = i
+                    break
+            dialogue.insert(insert_at, context_message)
 
         return dialogue
+
+    @staticmethod
+    def _build_speakers_info(voiceprint_config: dict, current_speaker: str) -> str:
+        """构建说话人信息，没有有效身份时返回空字符串"""
+        speakers_info = ""
+        try:
+            current_speaker_name = (current_speaker or "").strip()
+            # 仅在本轮注入了有效身份时才输出 speakers_info，避免列表里的名字每轮
+            # 重复出现诱导模型反复称呼；后续轮不再注入身份，靠对话历史首轮保留
+            if current_speaker_name and current_speaker_name != "未知说话人":
+                speakers = voiceprint_config.get("speakers", [])
+                speakers_info = "\n<speakers_info>"
+                speakers_info += f"\n当前说话人：{current_speaker_name}"
+                for speaker_str in speakers:
+                    try:
+                        parts = speaker_str.split(",", 2)
+                        if len(parts) >= 2:
+                            name = parts[1].strip()
+                            description = (
+                                parts[2].strip() if len(parts) >= 3 else ""
+                            )
+                            speakers_info += f"\n- {name}：{description}"
+                    except:
+                        pass
+                speakers_info += "\n</speakers_info>"
+        except:
+            return ""
+        return speakers_info
@@ -0,0 +1,111 @@
+"""
+进程级共享的异步HTTP客户端
+按 (事件循环, 目标主机) 复用 httpx.AsyncClient，连接保持长连接，
+同一主机的后续请求不再重复TCP和TLS握手，也不再每个请求占用一个线程
+"""
+
+import asyncio
+import threading
+from urllib.parse import urlsplit
+from config.logger import setup_logging
+import httpx
+
+TAG = __name__
+logger = setup_logging()
+
+# 默认配置，可通过 http_pool 配置覆盖
+DEFAULT_HTTP_POOL_CONFIG = {
+    # 是否启用HTTP/2（需要安装 h2，未安装时退回HTTP/1.1）
+    "http2": False,
+    # 每个主机的最大连接数
+    "max_connections_per_host": 32,
+    # 每个主机保持的空闲长连接数
+    "max_keepalive_per_host": 32,
+    # 空闲长连接的保持时间（秒）
+    "keepalive_expiry": 60,
+    "connect_timeout": 5,
+    "timeout": 30,
+    # 证书校验：true、false 或自定义CA证书文件路径
+    "verify": True,
+    # 是否读取 HTTP(S)_PROXY、NO_PROXY、SSL_CERT_FILE 等环境变量
+    "trust_env": True,
+}
+
+_http_pool_config = dict(DEFAULT_HTTP_POOL_CONFIG)
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def configure_http_pool(config: dict):
+    """应用全局配置中的 http_pool 配置，需在创建客户端之前调用"""
+    _http_pool_config.update(config.get("http_pool") or {})
+
+
+def _origin_of(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def _http2_enabled() -> bool:
+    if str(_http_pool_config.get("http2", False)).lower() not in ("true", "1", "yes"):
+        return False
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        logger.bind(tag=TAG).warning("未安装 h2，HTTP/2 不可用，使用HTTP/1.1")
+        _http_pool_config["http2"] = False
+        return False
+    return True
+
+
+def _create_client(origin: str) -> httpx.AsyncClient:
+    limits = httpx.Limits(
+        max_connections=int(_http_pool_config["max_connections_per_host"]),
+        max_keepalive_connections=int(_http_pool_config["max_keepalive_per_host"]),
+        keepalive_expiry=float(_http_pool_config["keepalive_expiry"]),
+    )
+    timeout = httpx.Timeout(
+        float(_http_pool_config["timeout"]),
+        connect=float(_http_pool_config["connect_timeout"]),
+    )
+    verify = _http_pool_config.get("verify", True)
+    if str(verify).lower() in ("true", "false"):
+        verify = str(verify).lower() == "true"
+    logger.bind(tag=TAG).debug(f"创建共享HTTP客户端: {origin}")
+    return httpx.AsyncClient(
+        limits=limits,
+        timeout=timeout,
+        http2=_http2_enabled(),
+        verify=verify,
+        trust_env=str(_http_pool_config.get("trust_env", True)).lower()
+        in ("true", "1", "yes"),
+    )
+
+
+def get_http_client(url: str) -> httpx.AsyncClient:
+    """获取目标主机的共享异步HTTP客户端，必须在事件循环中调用
+
+    Args:
+        url: 请求地址，按协议和主机区分连接池
+    """
+    loop = asyncio.get_running_loop()
+    key = (id(loop), _origin_of(url))
+    with _clients_lock:
+        entry = _clients.get(key)
+        if entry is None or entry[0] is not loop or entry[1].is_closed:
+            # 清理已关闭事件循环的客户端
+            for stale_key in [k for k, v in _clients.items() if v[0].is_closed()]:
+                _clients.pop(stale_key, None)
+            entry = (loop, _create_client(key[1]))
+            _clients[key] = entry
+    return entry[1]
+
+
+async def close_http_clients():
+    """关闭当前事件循环上的所有共享客户端（服务退出时调用）"""
+    loop = asyncio.get_running_loop()
+    with _clients_lock:
+        owned = [k for k, v in _clients.items() if v[0] is loop]
+        clients = [_clients.pop(k)[1] for k in owned]
+    for client in clients:
+        await client.aclose()
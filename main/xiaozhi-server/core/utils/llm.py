@@ -1,5 +1,9 @@
 import os
 import sys
+import json
+import time
+import hashlib
+import threading
 
 # 添加项目根目录到Python路径
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -16,8 +20,133 @@ def create_instance(class_name, *args, **kwargs):
     # 创建LLM实例
     if os.path.exists(os.path.join('core', 'providers', 'llm', class_name, f'{class_name}.py')):
         lib_name = f'core.providers.llm.{class_name}.{class_name}'
-        if lib_name not in sys.modules:
-            sys.modules[lib_name] = importlib.import_module(f'{lib_name}')
-        return sys.modules[lib_name].LLMProvider(*args, **kwargs)
+        # import_module 自带模块级锁，多线程并发创建时不会拿到未初始化完成的模块
+        module = importlib.import_module(lib_name)
+        return module.LLMProvider(*args, **kwargs)
 
     raise ValueError(f"不支持的LLM类型: {class_name}，请检查该配置的type是否设置正确")
+
+
+class SharedLLMRegistry:
+    """进程级共享的LLM实例注册表
+
+    相同 (类型, 配置) 的LLM只创建一个实例，各连接共用其中的HTTP客户端和长连接，
+    按引用计数管理，引用归零且空闲超过 idle_seconds 后才释放
+    """
+
+    def __init__(self, enable=True, idle_seconds=300):
+        self.enable = enable
+        self.idle_seconds = idle_seconds
+        self._entries = {}  # key -> [实例, 引用计数, 空闲起始时间]
+        self._keys = {}  # id(实例) -> key
+        self._lock = threading.Lock()
+        self.created = 0
+        self.reused = 0
+
+    def configure(self, config: dict):
+        registry_config = config.get("llm_registry") or {}
+        self.enable = str(registry_config.get("enable", True)).lower() in ("true", "1", "yes")
+        self.idle_seconds = float(registry_config.get("idle_seconds", 300))
+
+    @staticmethod
+    def _key_of(class_name, config) -> str:
+        # 包含 base_url、api_key、模型和所有参数，任一不同都不会共用
+        raw = json.dumps([class_name, config], sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def acquire(self, class_name, config):
+        """获取共享实例，引用计数加一；未启用时每次新建"""
+        if not self.enable:
+            return create_instance(class_name, config)
+        key = self._key_of(class_name, config)
+        with self._lock:
+            self._evict_idle_locked()
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry[1] += 1
+                entry[2] = None
+                self.reused += 1
+                return entry[0]
+        # 创建可能较慢（导入SDK、初始化客户端），不在锁内进行
+        instance = create_instance(class_name, config)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                # 并发创建时以先注册的为准
+                entry[1] += 1
+                entry[2] = None
+                self.reused += 1
+                return entry[0]
+            self._entries[key] = [instance, 1, None]
+            self._keys[id(instance)] = key
+            self.created += 1
+        return instance
+
+    def retain(self, instance):
+        """为已经获取的共享实例再增加一个引用（如连接沿用服务器的LLM），非注册表创建的实例忽略"""
+        if instance is None:
+            return
+        with self._lock:
+            key = self._keys.get(id(instance))
+            entry = self._entries.get(key) if key else None
+            if entry is not None and entry[0] is instance:
+                entry[1] += 1
+                entry[2] = None
+
+    def release(self, instance):
+        """归还实例，引用计数减一；非注册表创建的实例忽略"""
+        if instance is None:
+            return
+        with self._lock:
+            key = self._keys.get(id(instance))
+            entry = self._entries.get(key) if key else None
+            if entry is not None and entry[0] is instance and entry[1] > 0:
+                entry[1] -= 1
+                if entry[1] == 0:
+                    entry[2] = time.monotonic()
+            self._evict_idle_locked()
+
+    def _evict_idle_locked(self):
+        now = time.monotonic()
+        expired = [
+            key
+            for key, (_, refs, idle_since) in self._entries.items()
+            if refs == 0 and idle_since is not None and now - idle_since >= self.idle_seconds
+        ]
+        for key in expired:
+            instance = self._entries.pop(key)[0]
+            self._keys.pop(id(instance), None)
+            # 关闭同步客户端的连接池，异步请求使用的是进程级共享连接池，无需关闭
+            client = getattr(instance, "client", None)
+            close = getattr(client, "close", None)
+            if callable(close):
+                try:
+                    close()
+                except Exception as e:
+                    logger.warning(f"关闭空闲LLM客户端失败: {e}")
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "instances": len(self._entries),
+                "in_use": sum(1 for entry in self._entries.values() if entry[1] > 0),
+                "created": self.created,
+                "reused": self.reused,
+            }
+
+
+llm_registry = SharedLLMRegistry()
+
+
+def acquire_instance(class_name, config):
+    """获取共享LLM实例，连接关闭时需调用 release_instance 归还"""
+    return llm_registry.acquire(class_name, config)
+
+
+def retain_instance(instance):
+    """沿用他处已获取的共享LLM实例时增加引用，用完同样调用 release_instance 归还"""
+    llm_registry.retain(instance)
+
+
+def release_instance(instance):
+    llm_registry.release(instance)
@@ -1,6 +1,8 @@
 from typing import Dict, Any
 from config.logger import setup_logging
 from core.utils import tts, llm, intent, memory, vad, asr
+from core.utils.audio_archive import get_audio_archiver
+from core.utils.http_pool import configure_http_pool
 
 TAG = __name__
 logger = setup_logging()
@@ -41,7 +43,8 @@ def initialize_modules(
             if "type" not in config["LLM"][select_llm_module]
             else config["LLM"][select_llm_module]["type"]
         )
-        modules["llm"] = llm.create_instance(
+        # 相同配置的LLM在进程内共用一个实例，使用方需调用 llm.release_instance 归还
+        modules["llm"] = llm.acquire_instance(
             llm_type,
             config["LLM"][select_llm_module],
         )
@@ -122,10 +125,17 @@ def initialize_asr(config):
         if "type" not in config["ASR"][select_asr_module]
         else config["ASR"][select_asr_module]["type"]
     )
+    delete_audio = str(config.get("delete_audio", True)).lower() in ("true", "1", "yes")
+    configure_http_pool(config)
     new_asr = asr.create_instance(
         asr_type,
         config["ASR"][select_asr_module],
-        str(config.get("delete_audio", True)).lower() in ("true", "1", "yes"),
+        delete_audio,
+    )
+    # 保留录音时由后台线程批量写入磁盘
+    new_asr.configure_artifacts(
+        config.get("asr_audio_artifacts", {}),
+        None if delete_audio else get_audio_archiver(config),
     )
     logger.bind(tag=TAG).info("ASR模块初始化完成")
     return new_asr
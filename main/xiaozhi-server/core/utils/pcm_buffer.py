@@ -0,0 +1,138 @@
+"""
+PCM 音频缓冲区
+- PcmArena：预分配的连续内存区，写入只做一次拷贝，按块读取返回 memoryview，
+  替代 VAD 缓冲区每推理一块就重新切片分配 bytearray 的写法
+- PcmFrameBuffer：只保存解码得到的帧引用，预录音窗口截断只移动起始下标，
+  整句话结束时只合并一次，合并结果供 ASR、声纹和上报共用
+"""
+
+from typing import List, Optional
+
+# 16kHz 16bit 单声道 60ms 一帧
+PCM_FRAME_BYTES = 1920
+
+
+class PcmArena:
+    """可增长的 PCM 连续缓冲区
+
+    - 数据保存在 [start, end) 区间，读取头部数据只移动 start，不拷贝
+    - 尾部空间不足时，先把有效数据整体挪到开头（剩余数据不足一块，代价很低），仍不足则按倍数扩容
+    - 扩容时换用新的 bytearray，已取出的 memoryview 仍指向旧内存，不会失效
+    """
+
+    def __init__(self, capacity=PCM_FRAME_BYTES * 8):
+        self._buf = bytearray(capacity)
+        self._start = 0
+        self._end = 0
+        # 统计信息
+        self.allocations = 1
+        self.bytes_copied = 0
+
+    def _reserve(self, size: int):
+        if self._end + size <= len(self._buf):
+            return
+        live = self._end - self._start
+        if live + size <= len(self._buf) // 2:
+            # 有效数据挪到开头，腾出尾部空间（此时 start >= live，源和目标不重叠）
+            self._buf[0:live] = memoryview(self._buf)[self._start : self._end]
+        else:
+            capacity = len(self._buf) * 2
+            while live + size > capacity:
+                capacity *= 2
+            new_buf = bytearray(capacity)
+            new_buf[0:live] = memoryview(self._buf)[self._start : self._end]
+            self._buf = new_buf
+            self.allocations += 1
+        self.bytes_copied += live
+        self._start = 0
+        self._end = live
+
+    def write(self, data):
+        """写入一段PCM数据"""
+        size = len(data)
+        if size == 0:
+            return
+        self._reserve(size)
+        self._buf[self._end : self._end + size] = data
+        self._end += size
+        self.bytes_copied += size
+
+    extend = write
+
+    def read(self, size: int) -> Optional[memoryview]:
+        """从头部取出 size 字节，返回零拷贝视图，数据不足时返回 None
+
+        返回的视图在下一次写入前有效，调用方需要在此之前用完或自行拷贝
+        """
+        if self._end - self._start < size:
+            return None
+        view = memoryview(self._buf)[self._start : self._start + size]
+        self._start += size
+        return view
+
+    def view(self) -> memoryview:
+        """当前全部数据的连续视图（零拷贝）"""
+        return memoryview(self._buf)[self._start : self._end]
+
+    def clear(self):
+        self._start = 0
+        self._end = 0
+
+    def __len__(self):
+        return max(self._end - self._start, 0)
+
+
+class PcmFrameBuffer:
+    """ASR 帧缓冲区，兼容原帧列表的常用操作（append / len / 切片 / 迭代 / clear）
+
+    - 帧只保存引用，不拷贝
+    - keep_last_frames 截断预录音窗口时只移动起始下标，头部积累到一定数量才统一删除
+    - to_bytes 把整句话合并为一个连续的 bytes，每句话只做这一次拷贝
+    """
+
+    # 起始下标超过该值时才真正删除列表头部
+    COMPACT_THRESHOLD = 64
+
+    def __init__(self):
+        self._frames: List[bytes] = []
+        self._head = 0
+        self.nbytes = 0
+
+    def append(self, frame: bytes):
+        self._frames.append(frame)
+        self.nbytes += len(frame)
+
+    def keep_last_frames(self, count: int):
+        """只保留最近 count 帧（预录音窗口）"""
+        while len(self._frames) - self._head > count:
+            self.nbytes -= len(self._frames[self._head])
+            self._head += 1
+        if self._head >= self.COMPACT_THRESHOLD:
+            del self._frames[: self._head]
+            self._head = 0
+
+    def frames(self) -> List[bytes]:
+        return self._frames[self._head :]
+
+    def to_bytes(self) -> bytes:
+        """合并为一个连续的 bytes"""
+        if self._head == 0:
+            return b"".join(self._frames)
+        return b"".join(self.frames())
+
+    def clear(self):
+        self._frames.clear()
+        self._head = 0
+        self.nbytes = 0
+
+    def __len__(self):
+        return len(self._frames) - self._head
+
+    def __bool__(self):
+        return len(self) > 0
+
+    def __iter__(self):
+        return iter(self.frames())
+
+    def __getitem__(self, index):
+        return self.frames()[index]
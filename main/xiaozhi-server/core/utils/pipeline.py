@@ -0,0 +1,185 @@
+"""
+asyncio 管线模式支持模块
+提供进程级共享线程池，以及可同时被事件循环和普通线程读写的桥接队列，
+用于把每个连接的 ASR 接收、TTS 分句、音频下发从独立线程改为事件循环任务
+"""
+
+import os
+import time
+import queue
+import asyncio
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from config.logger import setup_logging
+
+TAG = __name__
+logger = setup_logging()
+
+PIPELINE_MODE_THREAD = "thread"
+PIPELINE_MODE_ASYNCIO = "asyncio"
+
+
+def is_async_pipeline(config: dict) -> bool:
+    """配置是否启用了 asyncio 管线模式"""
+    return str(config.get("pipeline_mode", PIPELINE_MODE_THREAD)).lower() == (
+        PIPELINE_MODE_ASYNCIO
+    )
+
+
+class BridgeQueue:
+    """线程与事件循环之间的桥接队列
+
+    - put 可在任意线程调用：在事件循环线程内不会阻塞，在其他线程中队列满时阻塞等待（背压）
+    - get / get_nowait 兼容 queue.Queue 的用法，供仍在线程中运行的消费者使用
+    - async_get 供事件循环中的任务使用，不占用线程
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, maxsize=0, drop_oldest=False):
+        """
+        Args:
+            loop: 消费者所在的事件循环
+            maxsize: 队列上限，0 表示不限制
+            drop_oldest: 队列满时丢弃最旧的数据而不是阻塞生产者（适用于实时音频）
+        """
+        self._loop = loop
+        self._maxsize = maxsize
+        self._drop_oldest = drop_oldest
+        self._items = deque()
+        self._cond = threading.Condition()
+        self._not_empty = asyncio.Event()
+        self._closed = False
+        self.dropped = 0
+
+    def _in_loop_thread(self):
+        try:
+            return asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            return False
+
+    def _wakeup(self):
+        if self._in_loop_thread():
+            self._not_empty.set()
+        elif not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._not_empty.set)
+
+    def _full(self):
+        return 0 < self._maxsize <= len(self._items)
+
+    def put(self, item, timeout=None):
+        in_loop = self._in_loop_thread()
+        with self._cond:
+            if self._closed:
+                return
+            if self._full():
+                if self._drop_oldest:
+                    self._items.popleft()
+                    self.dropped += 1
+                elif not in_loop:
+                    # 非事件循环线程的生产者在队列满时等待消费
+                    deadline = None if timeout is None else time.monotonic() + timeout
+                    while self._full() and not self._closed:
+                        remaining = None
+                        if deadline is not None:
+                            remaining = deadline - time.monotonic()
+                            if remaining <= 0:
+                                raise queue.Full
+                        self._cond.wait(remaining)
+                    if self._closed:
+                        return
+            self._items.append(item)
+            self._cond.notify_all()
+        self._wakeup()
+
+    put_nowait = put
+
+    def get_nowait(self):
+        with self._cond:
+            if not self._items:
+                raise queue.Empty
+            item = self._items.popleft()
+            self._cond.notify_all()
+            return item
+
+    def get(self, block=True, timeout=None):
+        """线程消费者使用的阻塞获取，语义同 queue.Queue.get"""
+        with self._cond:
+            if not block:
+                return self.get_nowait()
+            deadline = None if timeout is None else time.monotonic() + timeout
+            while not self._items:
+                remaining = None
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise queue.Empty
+                self._cond.wait(remaining)
+            item = self._items.popleft()
+            self._cond.notify_all()
+            return item
+
+    async def async_get(self, timeout=None):
+        """事件循环任务使用的获取方法，超时抛出 asyncio.TimeoutError"""
+        deadline = None if timeout is None else self._loop.time() + timeout
+        while True:
+            try:
+                return self.get_nowait()
+            except queue.Empty:
+                pass
+            self._not_empty.clear()
+            # 清除事件后再检查一次，避免错过清除前到达的数据
+            if self.qsize() > 0:
+                continue
+            if deadline is None:
+                await self._not_empty.wait()
+            else:
+                remaining = deadline - self._loop.time()
+                if remaining <= 0:
+                    raise asyncio.TimeoutError
+                await asyncio.wait_for(self._not_empty.wait(), remaining)
+
+    def close(self):
+        """关闭队列：丢弃剩余数据并唤醒所有等待中的生产者，之后的 put 直接忽略"""
+        with self._cond:
+            self._closed = True
+            self._items.clear()
+            self._cond.notify_all()
+        self._wakeup()
+
+    def task_done(self):
+        """兼容 queue.Queue 接口"""
+        pass
+
+    def qsize(self):
+        return len(self._items)
+
+    def empty(self):
+        return not self._items
+
+
+# 全局单例
+_shared_executor_instance = None
+_shared_executor_lock = threading.Lock()
+
+
+def get_shared_executor(max_workers=None):
+    """
+    获取进程级共享线程池（单例模式）
+
+    Args:
+        max_workers: 线程数，仅首次调用时生效，默认 min(64, CPU核数*8)
+
+    Returns:
+        ThreadPoolExecutor实例
+    """
+    global _shared_executor_instance
+    if _shared_executor_instance is None:
+        with _shared_executor_lock:
+            if _shared_executor_instance is None:
+                if not max_workers:
+                    max_workers = min(64, (os.cpu_count() or 1) * 8)
+                _shared_executor_instance = ThreadPoolExecutor(
+                    max_workers=int(max_workers), thread_name_prefix="xiaozhi-shared"
+                )
+                logger.bind(tag=TAG).info(f"进程级共享线程池已创建，线程数: {max_workers}")
+    return _shared_executor_instance
@@ -0,0 +1,94 @@
+"""
+提示词与工具描述的编译产物缓存
+
+工具描述（OpenAI tools 格式）和意图识别系统提示词按内容版本编译一次，进程内所有连接共享：
+- 工具集合按序列化后的JSON摘要区分，同样的工具集合得到同一个对象
+- 意图识别提示词按（工具摘要, 音乐列表版本, 智能设备列表）区分
+只有工具、音乐或设备发生变化时才会重新编译；同一份产物每轮输出完全一致，也利于服务商的前缀缓存
+"""
+
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List
+
+from config.logger import setup_logging
+
+TAG = __name__
+logger = setup_logging()
+
+
+class ToolSchema:
+    """一组工具描述的编译结果，视为只读"""
+
+    def __init__(self, functions: List[Dict[str, Any]], schema_json: str, digest: str):
+        self.functions = functions
+        self.json = schema_json
+        self.digest = digest
+        self.names = tuple(f.get("function", {}).get("name", "") for f in functions)
+        self._extended = {}
+        self._lock = threading.Lock()
+
+    def with_tool(self, tool: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """追加一个固定工具（如 direct_answer）后的列表，同一工具只构建一次"""
+        name = tool.get("function", {}).get("name", "")
+        extended = self._extended.get(name)
+        if extended is None:
+            with self._lock:
+                extended = self._extended.get(name)
+                if extended is None:
+                    extended = self.functions + [tool]
+                    self._extended[name] = extended
+        return extended
+
+
+class ArtifactStore:
+    """按键缓存编译产物，超过上限时淘汰最久未使用的"""
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.builds = 0
+
+    def get(self, key: Hashable, builder: Callable[[], Any]):
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return self._items[key]
+        # 在锁外编译，同一键并发编译时以先写入的为准
+        value = builder()
+        with self._lock:
+            if key in self._items:
+                self.hits += 1
+                return self._items[key]
+            self._items[key] = value
+            self.builds += 1
+            if len(self._items) > self.max_entries:
+                self._items.popitem(last=False)
+        logger.bind(tag=TAG).debug(f"编译提示词产物: {key[0]}，当前缓存 {len(self._items)} 项")
+        return value
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._items), "hits": self.hits, "builds": self.builds}
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+
+artifact_store = ArtifactStore()
+
+
+def compile_tool_schema(functions: List[Dict[str, Any]]) -> ToolSchema:
+    """把工具描述编译为共享的 ToolSchema，内容相同的工具集合返回同一个对象"""
+    schema_json = json.dumps(functions, ensure_ascii=False, sort_keys=True)
+    digest = hashlib.sha256(schema_json.encode("utf-8")).hexdigest()
+    return artifact_store.get(
+        ("tool_schema", digest),
+        lambda: ToolSchema(list(functions), schema_json, digest),
+    )
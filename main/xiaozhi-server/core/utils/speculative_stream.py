@@ -0,0 +1,70 @@
+"""
+预先发起的LLM流式请求
+
+意图识别与主LLM生成并发执行：主LLM的流式输出先在后台读取并缓冲，不送TTS；
+意图确认为普通对话后，按顺序回放缓冲内容并接续实时输出；否则取消请求。
+"""
+
+import asyncio
+
+
+class SpeculativeStream:
+    """后台读取并缓冲LLM流，确认采用后可作为普通异步流迭代"""
+
+    def __init__(self, loop, open_stream):
+        """
+        Args:
+            loop: 连接所在的事件循环
+            open_stream: 无参协程函数，返回LLM的异步流
+        """
+        self._items = []
+        self._done = False
+        self._error = None
+        self._changed = asyncio.Event()
+        self._task = loop.create_task(self._pump(open_stream))
+
+    @property
+    def buffered(self):
+        """已缓冲的输出段数"""
+        return len(self._items)
+
+    async def _pump(self, open_stream):
+        stream = None
+        try:
+            stream = await open_stream()
+            async for item in stream:
+                self._items.append(item)
+                self._changed.set()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self._error = e
+        finally:
+            self._done = True
+            self._changed.set()
+            if stream is not None and hasattr(stream, "aclose"):
+                await stream.aclose()
+
+    async def iterate(self):
+        """先回放已缓冲的输出，再接续后续到达的输出；提前关闭时取消后台请求"""
+        index = 0
+        try:
+            while True:
+                if index < len(self._items):
+                    item = self._items[index]
+                    index += 1
+                    yield item
+                    continue
+                if self._done:
+                    if self._error is not None:
+                        raise self._error
+                    return
+                self._changed.clear()
+                await self._changed.wait()
+        finally:
+            self.cancel()
+
+    def cancel(self):
+        """放弃本次请求，关闭进行中的HTTP响应"""
+        if not self._task.done():
+            self._task.cancel()
@@ -0,0 +1,188 @@
+"""
+流式JSON参数增量解析
+
+LLM 以流式方式逐段输出工具调用的 arguments，本模块只处理每次新到达的片段，
+不重复扫描已接收的内容：
+- 实时解码顶层对象中指定字符串字段的值（正确处理 \\" \\\\ \\n \\uXXXX 及代理对，转义可跨片段）
+- 跟踪对象/数组嵌套和字符串状态，顶层JSON闭合时标记 complete
+"""
+
+import re
+
+# 字符串内需要特殊处理的字符：结束引号和转义符
+_STRING_SPECIAL = re.compile(r'["\\]')
+
+_SIMPLE_ESCAPES = {
+    '"': '"',
+    "\\": "\\",
+    "/": "/",
+    "b": "\b",
+    "f": "\f",
+    "n": "\n",
+    "r": "\r",
+    "t": "\t",
+}
+
+
+class JsonFieldStream:
+    """可续接的JSON扫描器：按片段喂入，返回目标字段新解码出的文本"""
+
+    def __init__(self, field=None):
+        """
+        Args:
+            field: 需要实时解码的顶层字符串字段名，为 None 时只跟踪结构
+        """
+        self.field = field
+        # 顶层JSON已闭合
+        self.complete = False
+        # 目标字段已出现 / 目标字段字符串已结束
+        self.field_found = False
+        self.field_done = False
+        # 遇到无法解析的内容，之后的片段不再处理
+        self.error = False
+
+        self._stack = []
+        self._expect_key = False
+        self._current_key = None
+        self._in_string = False
+        self._is_key = False
+        self._capture = False
+        self._key_parts = []
+        self._value_parts = []
+        # None 表示不在转义中；否则为反斜杠之后已收到的字符
+        self._escape = None
+        self._high_surrogate = None
+
+    @property
+    def value(self):
+        """目标字段目前已解码的完整文本"""
+        return "".join(self._value_parts)
+
+    def feed(self, chunk):
+        """喂入新片段，返回本次新解码出的目标字段文本"""
+        out = []
+        i = 0
+        n = len(chunk)
+        while i < n and not self.complete and not self.error:
+            if self._in_string:
+                if self._escape is not None:
+                    i = self._consume_escape(chunk, i, out)
+                    continue
+                match = _STRING_SPECIAL.search(chunk, i)
+                end = match.start() if match else n
+                if end > i:
+                    self._emit(chunk[i:end], out)
+                if end == n:
+                    break
+                if chunk[end] == "\\":
+                    self._escape = ""
+                else:
+                    self._end_string(out)
+                i = end + 1
+                continue
+
+            c = chunk[i]
+            i += 1
+            if c in " \t\r\n":
+                continue
+            if c == '"':
+                self._start_string()
+            elif c == "{" or c == "[":
+                self._stack.append(c)
+                self._expect_key = c == "{"
+            elif c == "}" or c == "]":
+                if not self._stack or self._stack[-1] != ("{" if c == "}" else "["):
+                    self.error = True
+                    break
+                self._stack.pop()
+                self._expect_key = False
+                if not self._stack:
+                    self.complete = True
+            elif c == ",":
+                self._expect_key = bool(self._stack) and self._stack[-1] == "{"
+            elif c == ":":
+                self._expect_key = False
+            elif not self._stack:
+                # 顶层不是对象或数组，不按参数对象处理
+                self.error = True
+            # 其余为数字、true/false/null 等非字符串值，无需解码
+
+        if not out:
+            return ""
+        text = "".join(out)
+        self._value_parts.append(text)
+        return text
+
+    def _start_string(self):
+        self._in_string = True
+        self._is_key = self._expect_key and bool(self._stack) and self._stack[-1] == "{"
+        self._capture = (
+            not self._is_key
+            and self.field is not None
+            and len(self._stack) == 1
+            and self._stack[0] == "{"
+            and self._current_key == self.field
+        )
+        if self._capture:
+            self.field_found = True
+        if self._is_key:
+            self._key_parts = []
+            self._expect_key = False
+
+    def _end_string(self, out):
+        self._flush_surrogate(out)
+        self._in_string = False
+        if self._is_key:
+            if len(self._stack) == 1:
+                self._current_key = "".join(self._key_parts)
+            self._is_key = False
+        elif self._capture:
+            self._capture = False
+            self.field_done = True
+
+    def _consume_escape(self, chunk, i, out):
+        self._escape += chunk[i]
+        i += 1
+        if self._escape[0] == "u":
+            if len(self._escape) < 5:
+                return i
+            try:
+                code = int(self._escape[1:], 16)
+            except ValueError:
+                self.error = True
+                return i
+            self._escape = None
+            self._emit_code_point(code, out)
+            return i
+        text = _SIMPLE_ESCAPES.get(self._escape, self._escape)
+        self._escape = None
+        self._emit(text, out)
+        return i
+
+    def _emit_code_point(self, code, out):
+        if 0xD800 <= code <= 0xDBFF:
+            self._flush_surrogate(out)
+            self._high_surrogate = code
+            return
+        if 0xDC00 <= code <= 0xDFFF and self._high_surrogate is not None:
+            high = self._high_surrogate
+            self._high_surrogate = None
+            self._emit(chr(0x10000 + ((high - 0xD800) << 10) + (code - 0xDC00)), out)
+            return
+        self._emit(chr(code), out)
+
+    def _flush_surrogate(self, out):
+        # 孤立的高位代理无法组成字符，用替换字符代替
+        if self._high_surrogate is not None:
+            self._high_surrogate = None
+            self._append("\ufffd", out)
+
+    def _emit(self, text, out):
+        self._flush_surrogate(out)
+        self._append(text, out)
+
+    def _append(self, text, out):
+        if self._is_key:
+            self._key_parts.append(text)
+        elif self._capture:
+            out.append(text)
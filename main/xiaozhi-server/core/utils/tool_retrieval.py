@@ -0,0 +1,178 @@
+"""
+按相关度筛选工具
+
+function_call 模式下工具很多时（多个MCP服务、设备工具等），每轮把全部工具描述发给LLM会占用大量输入token。
+这里用工具名、描述和参数说明建立本地 BM25 索引，每轮只发送与用户问题最相关的 top_k 个工具，
+再加上固定保留的工具（如退出）和最近几轮用过的工具。
+"""
+
+import re
+import math
+from typing import Dict, Iterable, List
+
+import numpy as np
+
+from core.utils.prompt_artifacts import artifact_store
+
+_ASCII_WORD = re.compile(r"[a-z0-9]+")
+_CJK_RUN = re.compile(r"[一-鿿]+")
+_CAMEL = re.compile(r"([a-z])([A-Z])")
+
+# 语音助手常见说法与工具描述用词不一致（设备端/MCP 工具多为英文描述），问题中出现左侧词时补充右侧的词
+ALIASES = {
+    "音量": "volume",
+    "声音": "volume sound",
+    "亮度": "brightness",
+    "屏幕": "screen display",
+    "灯": "light lamp",
+    "灯带": "led strip",
+    "颜色": "color",
+    "色": "color",
+    "电量": "battery",
+    "电池": "battery",
+    "拍照": "camera photo",
+    "照片": "photo image",
+    "摄像头": "camera",
+    "看看": "camera",
+    "主题": "theme",
+    "下雨": "天气",
+    "气温": "天气",
+    "温度": "temperature 天气",
+    "放": "播放 play",
+    "首": "歌曲",
+    "歌": "音乐 歌曲 music song",
+    "日程": "calendar schedule event",
+    "日历": "calendar",
+    "会议": "calendar event",
+    "提醒": "reminder",
+    "闹钟": "alarm",
+    "倒计时": "countdown timer",
+    "计时": "timer",
+    "邮件": "email mail",
+    "文件": "file",
+    "翻译": "translate",
+    "英文": "english",
+    "算": "calculate math",
+    "乘": "math",
+    "股价": "stock price",
+    "股票": "stock",
+    "快递": "express delivery package",
+    "开车": "route driving travel",
+    "路线": "route",
+    "多久": "time",
+    "怎么做": "recipe cooking",
+    "菜": "recipe dish",
+    "记一下": "note add",
+    "笔记": "note",
+    "空调": "climate",
+    "窗帘": "cover",
+}
+
+
+def _split(text: str) -> List[str]:
+    text = _CAMEL.sub(r"\1 \2", text)
+    tokens = _ASCII_WORD.findall(text.lower())
+    for run in _CJK_RUN.findall(text):
+        tokens.extend(run)
+        tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+    return tokens
+
+
+def tokenize(text: str, aliases: Dict[str, str] = ALIASES) -> List[str]:
+    """英文按单词（拆分驼峰和下划线），中文按单字和双字切分，并补充同义词"""
+    if not text:
+        return []
+    tokens = _split(text)
+    expanded = [alias for word, alias in aliases.items() if word in text]
+    if expanded:
+        tokens.extend(_split(" ".join(expanded)))
+    return tokens
+
+
+def _tool_text(function: Dict) -> str:
+    info = function.get("function", {})
+    name = info.get("name", "")
+    parts = [name.replace(".", " ").replace("_", " ")] * 2
+    parts.append(info.get("description", ""))
+    for param_name, param in (info.get("parameters", {}) or {}).get("properties", {}).items():
+        parts.append(param_name.replace("_", " "))
+        if isinstance(param, dict):
+            parts.append(param.get("description", ""))
+    return " ".join(p for p in parts if p)
+
+
+class ToolIndex:
+    """工具描述的 BM25 索引，按工具集合摘要缓存共享"""
+
+    def __init__(self, functions: List[Dict], k1: float = 1.2, b: float = 0.75):
+        self.names = [f.get("function", {}).get("name", "") for f in functions]
+        # 同义词只用于扩展用户问题，工具描述按原文切分
+        docs = [_split(_tool_text(f)) for f in functions]
+        lengths = np.array([len(d) for d in docs], dtype=np.float32)
+        avg_length = float(lengths.mean()) if len(docs) else 1.0
+        norms = k1 * (1 - b + b * lengths / max(avg_length, 1.0))
+
+        postings = {}
+        for doc_id, tokens in enumerate(docs):
+            counts = {}
+            for token in tokens:
+                counts[token] = counts.get(token, 0) + 1
+            for token, tf in counts.items():
+                postings.setdefault(token, []).append((doc_id, tf))
+
+        count = len(docs)
+        # 每个词的倒排表：文档下标数组和预先算好的 BM25 权重
+        self._postings = {}
+        for token, items in postings.items():
+            doc_ids = np.array([d for d, _ in items], dtype=np.int32)
+            tfs = np.array([tf for _, tf in items], dtype=np.float32)
+            idf = math.log(1 + (count - len(items) + 0.5) / (len(items) + 0.5))
+            weights = idf * tfs * (k1 + 1) / (tfs + norms[doc_ids])
+            self._postings[token] = (doc_ids, weights)
+
+    def scores(self, query: str, aliases: Dict[str, str] = ALIASES) -> np.ndarray:
+        scores = np.zeros(len(self.names), dtype=np.float32)
+        for token in set(tokenize(query, aliases)):
+            posting = self._postings.get(token)
+            if posting is not None:
+                scores[posting[0]] += posting[1]
+        return scores
+
+    def search(self, query: str, top_k: int, aliases: Dict[str, str] = ALIASES) -> List[str]:
+        """返回得分大于0的前 top_k 个工具名"""
+        scores = self.scores(query, aliases)
+        if top_k < len(scores):
+            candidates = np.argpartition(-scores, top_k)[:top_k]
+        else:
+            candidates = np.arange(len(scores))
+        ranked = sorted(candidates, key=lambda i: -scores[i])
+        return [self.names[i] for i in ranked if scores[i] > 0]
+
+
+class ToolRetriever:
+    """按用户问题筛选本轮发送给LLM的工具"""
+
+    def __init__(self, config: Dict):
+        self.top_k = int(config.get("top_k", 8))
+        # 工具总数不超过该值时不筛选
+        self.min_tools = int(config.get("min_tools", 16))
+        self.pinned = set(config.get("pinned", []) or [])
+        # 额外的同义词，合并到内置同义词表
+        self.aliases = dict(ALIASES, **(config.get("aliases") or {}))
+
+    def select(self, tool_schema, query: str, extra_pinned: Iterable[str] = ()) -> List[Dict]:
+        """返回筛选后的工具列表，保持工具原有顺序"""
+        functions = tool_schema.functions
+        if len(functions) <= self.min_tools or not query:
+            return functions
+        index = artifact_store.get(
+            ("tool_index", tool_schema.digest), lambda: ToolIndex(functions)
+        )
+        matched = index.search(query, self.top_k, self.aliases)
+        if not matched:
+            # 没有任何工具与问题相关时不做筛选，避免误删需要的工具
+            return functions
+        keep = set(matched)
+        keep.update(self.pinned)
+        keep.update(extra_pinned)
+        return [f for f, name in zip(functions, index.names) if name in keep]
@@ -2,15 +2,96 @@ import asyncio
 import time
 import aiohttp
 import requests
+import numpy as np
 from urllib.parse import urlparse, parse_qs
-from typing import Optional, Dict
+from typing import Optional, Dict, NamedTuple
 from config.logger import setup_logging
 from core.utils.cache.manager import cache_manager
 from core.utils.cache.config import CacheType
+from core.utils.audio_archive import pcm_to_wav
 
 TAG = __name__
 logger = setup_logging()
 
+UNKNOWN_SPEAKER = "未知说话人"
+# 16kHz 16bit 单声道，每秒字节数
+PCM_BYTES_PER_SECOND = 32000
+# 声学特征：每帧FFT点数和频带数
+FINGERPRINT_FFT = 512
+FINGERPRINT_BANDS = 24
+
+
+def voice_fingerprint(pcm: bytes) -> Optional[np.ndarray]:
+    """计算一段语音的长时平均频谱（对数频带能量），用于粗略判断前后两轮是否为同一人
+
+    只用于决定能否沿用上一次的远程识别结果，不能代替声纹识别
+    """
+    samples = np.frombuffer(pcm[: len(pcm) // 2 * 2], dtype=np.int16)
+    frame_count = len(samples) // FINGERPRINT_FFT
+    if frame_count < 8:
+        return None
+    frames = samples[: frame_count * FINGERPRINT_FFT].reshape(frame_count, FINGERPRINT_FFT)
+    frames = frames.astype(np.float32) * np.hanning(FINGERPRINT_FFT).astype(np.float32)
+    # 去掉静音帧，只统计有声部分
+    energy = np.mean(frames * frames, axis=1)
+    frames = frames[energy > energy.max() * 0.05]
+    if len(frames) == 0:
+        # 数字静音（全零）没有有声帧
+        return None
+    spectrum = np.abs(np.fft.rfft(frames, axis=1)) ** 2
+    # 对数间隔的频带，低频分辨率更高
+    edges = np.unique(
+        np.geomspace(2, spectrum.shape[1], FINGERPRINT_BANDS + 1).astype(int)
+    )
+    bands = np.stack(
+        [spectrum[:, lo:hi].mean(axis=1) for lo, hi in zip(edges[:-1], edges[1:])],
+        axis=1,
+    )
+    fingerprint = np.log(bands + 1e-6).mean(axis=0)
+    fingerprint -= fingerprint.mean()
+    norm = np.linalg.norm(fingerprint)
+    if norm == 0 or not np.isfinite(norm):
+        return None
+    return fingerprint / norm
+
+
+class SpeakerCacheEntry(NamedTuple):
+    name: str
+    """远程识别得到的说话人名称"""
+    score: float
+    """远程识别的相似度"""
+    fingerprint: np.ndarray
+    """识别所用语音的声学特征"""
+    confirmed_at: float
+    """远程识别完成时间（monotonic）"""
+
+
+class VoiceprintCacheStats:
+    """声纹缓存与提前识别的统计（进程级）"""
+
+    def __init__(self):
+        self.lookups = 0
+        self.cache_hits = 0
+        self.remote_calls = 0
+        self.early_starts = 0
+
+    @property
+    def hit_rate(self) -> float:
+        return self.cache_hits / self.lookups if self.lookups else 0.0
+
+    def snapshot(self) -> dict:
+        return {
+            "lookups": self.lookups,
+            "cache_hits": self.cache_hits,
+            "remote_calls": self.remote_calls,
+            "remote_calls_saved": self.cache_hits,
+            "early_starts": self.early_starts,
+            "hit_rate": round(self.hit_rate, 3),
+        }
+
+
+voiceprint_stats = VoiceprintCacheStats()
+
 
 class VoiceprintProvider:
     """声纹识别服务提供者"""
@@ -21,6 +102,17 @@ class VoiceprintProvider:
         self.speaker_map = self._parse_speakers()
         # 声纹识别相似度阈值，默认0.4
         self.similarity_threshold = float(config.get("similarity_threshold", 0.4))
+        # 识别结果缓存：置信度按半衰期衰减，0为不缓存
+        self.cache_half_life = float(config.get("cache_half_life_seconds", 30) or 0)
+        self.cache_fingerprint_similarity = float(
+            config.get("cache_fingerprint_similarity", 0.92)
+        )
+        # 说话超过该时长后用开头一段音频提前识别，0为不提前
+        self.early_start_bytes = int(
+            float(config.get("early_start_seconds", 1.5) or 0) * PCM_BYTES_PER_SECOND
+        )
+        self._cache: Optional[SpeakerCacheEntry] = None
+        self._early_task: Optional[asyncio.Task] = None
         
         # 解析API地址和密钥
         self.api_url = None
@@ -137,11 +229,90 @@ class VoiceprintProvider:
         
         return is_healthy
     
+    def maybe_start_early(self, asr_audio, voiced_bytes: int, session_id: str):
+        """说话过程中调用：有声部分足够长时用已有音频提前开始识别，每句话只启动一次
+
+        Args:
+            asr_audio: 当前句的音频缓冲（PcmFrameBuffer）
+            voiced_bytes: 其中语音开始后的字节数（不含预录音）
+        """
+        if (
+            self._early_task is not None
+            or not self.early_start_bytes
+            or voiced_bytes < self.early_start_bytes
+        ):
+            return
+        voiceprint_stats.early_starts += 1
+        self._early_task = asyncio.create_task(
+            self._identify_cached(asr_audio.to_bytes(), session_id)
+        )
+
+    def reset_utterance(self):
+        """一句话处理结束，丢弃未使用的提前识别"""
+        if self._early_task is not None and not self._early_task.done():
+            self._early_task.cancel()
+        self._early_task = None
+
+    async def identify(self, pcm: bytes, session_id: str) -> Optional[str]:
+        """识别一句话的说话人：优先使用提前识别的结果，其次是缓存，最后才请求远程接口"""
+        if self._early_task is not None:
+            # 预识别被回滚时不能连带取消提前识别
+            return await asyncio.shield(self._early_task)
+        return await self._identify_cached(pcm, session_id)
+
+    async def _identify_cached(self, pcm: bytes, session_id: str) -> Optional[str]:
+        voiceprint_stats.lookups += 1
+        fingerprint = voice_fingerprint(pcm) if self.cache_half_life > 0 else None
+        name = self._lookup_cache(fingerprint)
+        if name is not None:
+            voiceprint_stats.cache_hits += 1
+            logger.bind(tag=TAG).info(
+                f"声纹缓存命中: {name}，累计命中率 {voiceprint_stats.hit_rate:.1%}"
+            )
+            return name
+
+        name, score = await self._identify_remote(pcm_to_wav(pcm), session_id)
+        self._update_cache(name, score, fingerprint)
+        return name
+
+    def _lookup_cache(self, fingerprint) -> Optional[str]:
+        entry = self._cache
+        if entry is None or fingerprint is None:
+            return None
+        age = time.monotonic() - entry.confirmed_at
+        confidence = entry.score * 0.5 ** (age / self.cache_half_life)
+        if confidence < self.similarity_threshold:
+            self._cache = None
+            return None
+        # 相似度为 NaN 时也视为不匹配
+        if not float(np.dot(fingerprint, entry.fingerprint)) >= self.cache_fingerprint_similarity:
+            return None
+        return entry.name
+
+    def _update_cache(self, name, score, fingerprint):
+        """只缓存明确识别出的说话人，未知或失败时清空缓存"""
+        if (
+            fingerprint is not None
+            and np.all(np.isfinite(fingerprint))
+            and name
+            and name != UNKNOWN_SPEAKER
+            and score >= self.similarity_threshold
+        ):
+            self._cache = SpeakerCacheEntry(name, score, fingerprint, time.monotonic())
+        else:
+            self._cache = None
+
     async def identify_speaker(self, audio_data: bytes, session_id: str) -> Optional[str]:
-        """识别说话人"""
+        """识别说话人（WAV数据，不经过缓存）"""
+        name, _ = await self._identify_remote(audio_data, session_id)
+        return name
+
+    async def _identify_remote(self, audio_data: bytes, session_id: str):
+        """请求远程声纹接口，返回 (说话人名称, 相似度)"""
         if not self.enabled or not self.api_url or not self.api_key:
             logger.bind(tag=TAG).debug("声纹识别功能已禁用或未配置，跳过识别")
-            return None
+            return None, 0.0
+        voiceprint_stats.remote_calls += 1
             
         try:
             api_start_time = time.monotonic()
@@ -174,25 +345,25 @@ class VoiceprintProvider:
                         # 相似度阈值检查
                         if score < self.similarity_threshold:
                             logger.bind(tag=TAG).warning(f"声纹识别相似度{score:.3f}低于阈值{self.similarity_threshold}")
-                            return "未知说话人"
+                            return UNKNOWN_SPEAKER, score
                         
                         if speaker_id and speaker_id in self.speaker_map:
                             result_name = self.speaker_map[speaker_id]["name"]
                             logger.bind(tag=TAG).info(f"声纹识别成功: {result_name} (相似度: {score:.3f})")
-                            return result_name
+                            return result_name, score
                         else:
                             logger.bind(tag=TAG).warning(f"未识别的说话人ID: {speaker_id}")
-                            return "未知说话人"
+                            return UNKNOWN_SPEAKER, score
                     else:
                         logger.bind(tag=TAG).error(f"声纹识别API错误: HTTP {response.status}")
-                        return None
+                        return None, 0.0
                         
         except asyncio.TimeoutError:
             elapsed = time.monotonic() - api_start_time
             logger.bind(tag=TAG).error(f"声纹识别超时: {elapsed:.3f}s")
-            return None
+            return None, 0.0
         except Exception as e:
             elapsed = time.monotonic() - api_start_time
             logger.bind(tag=TAG).error(f"声纹识别失败: {e}")
-            return None
+            return None, 0.0
 
@@ -34,6 +34,8 @@ from core.connection import ConnectionHandler
 from config.config_loader import get_config_from_api_async
 from core.auth import AuthManager, AuthenticationError
 from core.utils.modules_initialize import initialize_modules
+from core.utils import llm as llm_utils
+from core.providers.tools.server_mcp.mcp_pool import server_mcp_pool
 from core.utils.util import check_vad_update, check_asr_update
 
 TAG = __name__
@@ -44,6 +46,9 @@ class WebSocketServer:
         self.config = config
         self.logger = setup_logging(config)
         self.config_lock = asyncio.Lock()
+        # 服务端MCP连接池和LLM共享实例表是进程级的，只按服务器配置设置，不受各设备的私有配置影响
+        server_mcp_pool.configure(self.config)
+        llm_utils.llm_registry.configure(self.config)
         modules = initialize_modules(
             self.logger,
             self.config,
@@ -174,6 +179,8 @@ class WebSocketServer:
                 )
                 # 更新配置
                 self.config = new_config
+                server_mcp_pool.configure(new_config)
+                llm_utils.llm_registry.configure(new_config)
                 # 重新初始化组件
                 modules = initialize_modules(
                     self.logger,
@@ -192,6 +199,8 @@ class WebSocketServer:
                 if "asr" in modules:
                     self._asr = modules["asr"]
                 if "llm" in modules:
+                    # 归还旧实例（配置未变时为同一实例，仅引用计数减一）
+                    llm_utils.release_instance(self._llm)
                     self._llm = modules["llm"]
                 if "intent" in modules:
                     self._intent = modules["intent"]
@@ -0,0 +1,108 @@
+import os
+import time
+import wave
+import asyncio
+import logging
+import statistics
+from tabulate import tabulate
+from config.config_loader import get_project_dir, read_config
+from core.utils.asr import create_instance as create_stt_instance
+
+# 设置全局日志级别为WARNING，抑制INFO级别日志
+logging.basicConfig(level=logging.WARNING)
+
+description = "本地离线ASR动态微批调度测试（1/8/32路并发说话人）"
+
+# 参与测试的本地ASR配置名
+ASR_NAMES = ["FunASR", "SherpaASR", "SherpaParaformerASR"]
+# 并发说话人数
+CONCURRENCY = [1, 8, 32]
+# 每个说话人连续识别的句数
+UTTERANCES_PER_SPEAKER = 3
+# 对比的批大小（1表示不启用微批）
+BATCH_SIZES = [1, 8, 32]
+BATCH_MAX_WAIT_MS = 30
+TEST_WAV = os.path.join("config", "assets", "wakeup_words.wav")
+
+
+def _load_pcm(path):
+    with wave.open(path, "rb") as wf:
+        return wf.readframes(wf.getnframes())
+
+
+async def _speaker(asr, pcm_bytes, latencies, idx):
+    for n in range(UTTERANCES_PER_SPEAKER):
+        start = time.monotonic()
+        await asr.speech_to_text_wrapper([pcm_bytes], f"bench-{idx}-{n}")
+        latencies.append(time.monotonic() - start)
+
+
+async def _run(asr, pcm_bytes, concurrency):
+    latencies = []
+    start = time.monotonic()
+    await asyncio.gather(
+        *[_speaker(asr, pcm_bytes, latencies, i) for i in range(concurrency)]
+    )
+    elapsed = time.monotonic() - start
+    latencies.sort()
+    audio_seconds = len(pcm_bytes) / 32000 * len(latencies)
+    return {
+        "p50": statistics.median(latencies),
+        "p99": latencies[max(int(len(latencies) * 0.99) - 1, 0)],
+        "throughput": len(latencies) / elapsed,
+        "rtf": elapsed / audio_seconds,
+    }
+
+
+async def main():
+    config = read_config(get_project_dir() + "config.yaml")
+    pcm_bytes = _load_pcm(TEST_WAV)
+    print(f"测试音频: {TEST_WAV}，时长 {len(pcm_bytes) / 32000:.2f}s")
+
+    rows = []
+    for asr_name in ASR_NAMES:
+        asr_config = dict(config["ASR"][asr_name])
+        if not os.path.isdir(asr_config.get("model_dir", "")):
+            print(f"跳过 {asr_name}：模型目录不存在 {asr_config.get('model_dir')}")
+            continue
+        for batch_size in BATCH_SIZES:
+            asr_config["batch_max_size"] = batch_size
+            asr_config["batch_max_wait_ms"] = BATCH_MAX_WAIT_MS
+            asr = create_stt_instance(asr_config["type"], asr_config, True)
+            # 预热
+            await asr.speech_to_text_wrapper([pcm_bytes], "warmup")
+            scheduler = getattr(asr, "batch_scheduler", None)
+            for concurrency in CONCURRENCY:
+                before = (
+                    (scheduler.total_batches, scheduler.total_items, scheduler.total_queue_wait)
+                    if scheduler
+                    else (0, 0, 0.0)
+                )
+                result = await _run(asr, pcm_bytes, concurrency)
+                metrics = {}
+                if scheduler and scheduler.total_items > before[1]:
+                    items = scheduler.total_items - before[1]
+                    metrics = {
+                        "avg_batch_size": items / (scheduler.total_batches - before[0]),
+                        "avg_queue_wait_ms": (scheduler.total_queue_wait - before[2]) / items * 1000,
+                    }
+                rows.append(
+                    [
+                        asr_name,
+                        batch_size,
+                        concurrency,
+                        f"{result['p50'] * 1000:.0f}",
+                        f"{result['p99'] * 1000:.0f}",
+                        f"{result['throughput']:.2f}",
+                        f"{result['rtf']:.3f}",
+                        f"{metrics.get('avg_batch_size', 1):.1f}",
+                        f"{metrics.get('avg_queue_wait_ms', 0):.1f}",
+                    ]
+                )
+
+    headers = ["ASR", "最大批大小", "并发说话人", "P50延迟(ms)", "P99延迟(ms)", "句/秒", "整体RTF", "平均批大小", "平均排队(ms)"]
+    print(tabulate(rows, headers=headers, tablefmt="github"))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
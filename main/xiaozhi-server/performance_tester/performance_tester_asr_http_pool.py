@@ -0,0 +1,156 @@
+import os
+import ssl
+import time
+import asyncio
+import logging
+import tempfile
+import statistics
+import subprocess
+import requests
+from aiohttp import web
+from tabulate import tabulate
+from core.utils.http_pool import configure_http_pool, get_http_client, close_http_clients
+
+# 设置全局日志级别为WARNING，抑制INFO级别日志
+logging.basicConfig(level=logging.WARNING)
+
+description = "非流式远程ASR共享HTTP连接池与每次新建连接的握手开销对比（本地模拟ASR服务）"
+
+# 并发说话人数
+CONCURRENCY = [1, 8, 32]
+# 每个说话人识别的句数
+UTTERANCES_PER_SPEAKER = 10
+# 模拟ASR服务的识别耗时（秒）
+SERVER_PROCESS_SECONDS = 0.02
+# 每句上传的音频大小（2秒16kHz PCM）
+PCM_BYTES = b"\0" * 64000
+HOST = "localhost"
+PORT = 18766
+
+
+class StandInServer:
+    """本地模拟的ASR服务，统计新建连接数"""
+
+    def __init__(self):
+        self.transports = set()
+
+    async def handle(self, request: web.Request):
+        # 保留传输对象的引用，避免对象回收后 id 复用导致少计
+        self.transports.add(request.transport)
+        await request.read()
+        await asyncio.sleep(SERVER_PROCESS_SECONDS)
+        return web.json_response({"text": "今天天气怎么样"})
+
+    @property
+    def connections(self):
+        return len(self.transports)
+
+
+def _make_certificate(workdir):
+    """生成自签名证书，没有 openssl 时退回HTTP"""
+    cert = os.path.join(workdir, "cert.pem")
+    key = os.path.join(workdir, "key.pem")
+    try:
+        subprocess.run(
+            [
+                "openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes",
+                "-keyout", key, "-out", cert, "-days", "1",
+                "-subj", f"/CN={HOST}", "-addext", f"subjectAltName=DNS:{HOST}",
+            ],
+            check=True,
+            capture_output=True,
+        )
+        return cert, key
+    except (OSError, subprocess.CalledProcessError):
+        return None, None
+
+
+async def _blocking_speaker(url, verify, latencies):
+    """改造前：每句话在线程中 requests.post，每次新建TCP和TLS连接"""
+    for _ in range(UTTERANCES_PER_SPEAKER):
+        start = time.monotonic()
+        response = await asyncio.to_thread(requests.post, url, data=PCM_BYTES, verify=verify)
+        response.json()
+        latencies.append(time.monotonic() - start)
+
+
+async def _pooled_speaker(url, verify, latencies):
+    """改造后：共享异步连接池，复用长连接"""
+    for _ in range(UTTERANCES_PER_SPEAKER):
+        start = time.monotonic()
+        response = await get_http_client(url).post(url, content=PCM_BYTES)
+        response.json()
+        latencies.append(time.monotonic() - start)
+
+
+async def _run(server, speaker, url, verify, concurrency):
+    server.transports.clear()
+    latencies = []
+    await asyncio.gather(
+        *[speaker(url, verify, latencies) for _ in range(concurrency)]
+    )
+    return {
+        "p50": statistics.median(latencies),
+        "mean": statistics.mean(latencies),
+        "connections": server.connections,
+        "count": len(latencies),
+    }
+
+
+async def main():
+    server = StandInServer()
+    app = web.Application(client_max_size=16 * 1024 * 1024)
+    app.router.add_post("/asr", server.handle)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        cert, key = _make_certificate(workdir)
+        ssl_context = None
+        if cert:
+            ssl_context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+            ssl_context.load_cert_chain(cert, key)
+        scheme = "https" if ssl_context else "http"
+        url = f"{scheme}://{HOST}:{PORT}/asr"
+        verify = cert if cert else True
+        configure_http_pool({"http_pool": {"verify": verify}})
+
+        site = web.TCPSite(runner, HOST, PORT, ssl_context=ssl_context)
+        await site.start()
+        print(f"模拟ASR服务: {url}，服务端识别耗时 {SERVER_PROCESS_SECONDS * 1000:.0f}ms")
+
+        rows = []
+        try:
+            # 预热：创建共享客户端，排除首次创建的开销
+            await _run(server, _pooled_speaker, url, verify, 1)
+            for concurrency in CONCURRENCY:
+                blocking = await _run(server, _blocking_speaker, url, verify, concurrency)
+                pooled = await _run(server, _pooled_speaker, url, verify, concurrency)
+                saved_ms = (blocking["mean"] - pooled["mean"]) * 1000
+                rows.append(
+                    [
+                        concurrency,
+                        f"{blocking['p50'] * 1000:.1f}",
+                        f"{pooled['p50'] * 1000:.1f}",
+                        f"{saved_ms:.1f}",
+                        f"{blocking['connections']}/{blocking['count']}",
+                        f"{pooled['connections']}/{pooled['count']}",
+                    ]
+                )
+        finally:
+            await close_http_clients()
+            await runner.cleanup()
+
+    headers = [
+        "并发说话人",
+        "每次新建连接P50(ms)",
+        "共享连接池P50(ms)",
+        "平均每句节省(ms)",
+        "新建连接/请求(改造前)",
+        "新建连接/请求(改造后)",
+    ]
+    print(tabulate(rows, headers=headers, tablefmt="github"))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
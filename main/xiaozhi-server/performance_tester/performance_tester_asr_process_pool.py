@@ -0,0 +1,98 @@
+import os
+import time
+import wave
+import asyncio
+import logging
+import statistics
+from tabulate import tabulate
+from config.config_loader import get_project_dir, read_config
+from core.utils.asr import create_instance as create_stt_instance
+
+# 设置全局日志级别为WARNING，抑制INFO级别日志
+logging.basicConfig(level=logging.WARNING)
+
+description = "本地ASR进程内识别与多进程工作池的事件循环延迟对比"
+
+POOL_ASR_NAME = "ProcessPoolASR"
+# 并发说话人数
+CONCURRENCY = [1, 4, 16]
+# 每个说话人识别的句数
+UTTERANCES_PER_SPEAKER = 3
+# 事件循环延迟采样间隔（秒），模拟websocket处理的心跳
+LAG_PROBE_INTERVAL = 0.01
+TEST_WAV = os.path.join("config", "assets", "wakeup_words.wav")
+
+
+async def _probe_lag(lag_samples, stop_event):
+    while not stop_event.is_set():
+        before = time.monotonic()
+        await asyncio.sleep(LAG_PROBE_INTERVAL)
+        lag_samples.append(time.monotonic() - before - LAG_PROBE_INTERVAL)
+
+
+async def _speaker(asr, pcm_bytes, latencies, idx):
+    for n in range(UTTERANCES_PER_SPEAKER):
+        start = time.monotonic()
+        await asr.speech_to_text_wrapper([pcm_bytes], f"bench-{idx}-{n}")
+        latencies.append(time.monotonic() - start)
+
+
+async def _run(asr, pcm_bytes, concurrency):
+    lag_samples = []
+    latencies = []
+    stop_event = asyncio.Event()
+    probe = asyncio.create_task(_probe_lag(lag_samples, stop_event))
+    start = time.monotonic()
+    await asyncio.gather(
+        *[_speaker(asr, pcm_bytes, latencies, i) for i in range(concurrency)]
+    )
+    elapsed = time.monotonic() - start
+    stop_event.set()
+    await probe
+    lag_samples.sort()
+    return {
+        "throughput": len(latencies) / elapsed,
+        "p50": statistics.median(latencies),
+        "lag_p99": lag_samples[max(int(len(lag_samples) * 0.99) - 1, 0)],
+        "lag_max": lag_samples[-1],
+    }
+
+
+async def main():
+    config = read_config(get_project_dir() + "config.yaml")
+    pool_config = config["ASR"][POOL_ASR_NAME]
+    worker_config = pool_config["worker_asr"]
+    if not os.path.isdir(worker_config.get("model_dir", worker_config.get("model_path", ""))):
+        print(f"工作进程ASR模型目录不存在，请先修改 {POOL_ASR_NAME}.worker_asr 配置")
+        return
+    with wave.open(TEST_WAV, "rb") as wf:
+        pcm_bytes = wf.readframes(wf.getnframes())
+
+    candidates = [
+        (f"进程内 {worker_config['type']}", worker_config),
+        (f"工作池 x{pool_config.get('workers', 2)}", pool_config),
+    ]
+    rows = []
+    for label, asr_config in candidates:
+        asr = create_stt_instance(asr_config["type"], asr_config, True)
+        # 预热（工作池需要等待工作进程加载模型）
+        await asr.speech_to_text_wrapper([pcm_bytes], "warmup")
+        for concurrency in CONCURRENCY:
+            result = await _run(asr, pcm_bytes, concurrency)
+            rows.append(
+                [
+                    label,
+                    concurrency,
+                    f"{result['throughput']:.2f}",
+                    f"{result['p50'] * 1000:.0f}",
+                    f"{result['lag_p99'] * 1000:.1f}",
+                    f"{result['lag_max'] * 1000:.1f}",
+                ]
+            )
+
+    headers = ["方式", "并发说话人", "句/秒", "P50识别延迟(ms)", "P99循环延迟(ms)", "最大循环延迟(ms)"]
+    print(tabulate(rows, headers=headers, tablefmt="github"))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
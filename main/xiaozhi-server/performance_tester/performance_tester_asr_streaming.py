@@ -0,0 +1,95 @@
+import os
+import time
+import wave
+import asyncio
+import logging
+from tabulate import tabulate
+from config.config_loader import get_project_dir, read_config
+from core.utils.asr import create_instance as create_stt_instance
+
+# 设置全局日志级别为WARNING，抑制INFO级别日志
+logging.basicConfig(level=logging.WARNING)
+
+description = "本地ASR流式增量识别与离线整句识别的说话结束到出字延迟对比"
+
+# (离线配置名, 流式配置名)
+ASR_PAIRS = [("FunASR", "FunASRStreaming"), ("SherpaParaformerASR", "SherpaStreamingASR")]
+# 测试的句子长度（秒）
+UTTERANCE_SECONDS = [2, 5, 10, 20]
+# VAD判定说话结束前的静音时长（秒），这段时间内流式模型仍在接收音频
+TRAILING_SILENCE_SECONDS = 1.0
+FRAME_BYTES = 1920
+TEST_WAV = os.path.join("config", "assets", "wakeup_words.wav")
+
+
+def _build_utterance(pcm_bytes, seconds):
+    target = int(seconds * 32000)
+    repeated = pcm_bytes * (target // len(pcm_bytes) + 1)
+    speech = repeated[:target]
+    silence = bytes(int(TRAILING_SILENCE_SECONDS * 32000))
+    audio = speech + silence
+    return audio, [audio[i : i + FRAME_BYTES] for i in range(0, len(audio), FRAME_BYTES)]
+
+
+def _create(config, name):
+    asr_config = config["ASR"].get(name)
+    if not asr_config or not os.path.isdir(asr_config.get("model_dir", "")):
+        print(f"跳过 {name}：模型目录不存在")
+        return None
+    return create_stt_instance(asr_config["type"], asr_config, True)
+
+
+async def _offline_latency(asr, audio):
+    start = time.monotonic()
+    await asr.speech_to_text_wrapper([audio], "bench-offline")
+    return time.monotonic() - start
+
+
+async def _streaming_latency(asr, audio, frames):
+    sessions = asr.incremental_sessions
+    session_id = "bench-streaming"
+    loop = asyncio.get_running_loop()
+    feed_start = time.monotonic()
+    sessions.feed(session_id, frames[:1], start=True)
+    sessions.feed(session_id, frames[1:])
+    # 等待所有帧解码完成，模拟说话过程中实时送入的情况
+    await loop.run_in_executor(sessions._executor_of(session_id), lambda: None)
+    feed_rtf = (time.monotonic() - feed_start) / (len(audio) / 32000)
+
+    start = time.monotonic()
+    await asr.speech_to_text_wrapper([audio], session_id)
+    return time.monotonic() - start, feed_rtf
+
+
+async def main():
+    config = read_config(get_project_dir() + "config.yaml")
+    with wave.open(TEST_WAV, "rb") as wf:
+        pcm_bytes = wf.readframes(wf.getnframes())
+
+    rows = []
+    for offline_name, streaming_name in ASR_PAIRS:
+        offline = _create(config, offline_name)
+        streaming = _create(config, streaming_name)
+        if offline is None or streaming is None:
+            continue
+        for seconds in UTTERANCE_SECONDS:
+            audio, frames = _build_utterance(pcm_bytes, seconds)
+            offline_latency = await _offline_latency(offline, audio)
+            streaming_latency, feed_rtf = await _streaming_latency(streaming, audio, frames)
+            rows.append(
+                [
+                    f"{offline_name} / {streaming_name}",
+                    seconds,
+                    f"{offline_latency * 1000:.0f}",
+                    f"{streaming_latency * 1000:.0f}",
+                    f"{feed_rtf:.3f}",
+                ]
+            )
+
+    headers = ["离线 / 流式", "句子长度(s)", "离线出字延迟(ms)", "流式出字延迟(ms)", "流式增量解码RTF"]
+    print(tabulate(rows, headers=headers, tablefmt="github"))
+    print("流式增量解码RTF需小于1，才能在说话过程中跟上实时音频")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
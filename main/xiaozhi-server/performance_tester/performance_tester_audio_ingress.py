@@ -0,0 +1,167 @@
+import time
+import asyncio
+import logging
+import threading
+from collections import deque
+import numpy as np
+import opuslib_next
+from tabulate import tabulate
+from core.providers.vad.silero import VADProvider
+from core.utils.audio_ingress import AudioIngress
+from core.utils.pipeline import BridgeQueue
+from core.utils.pcm_buffer import PcmArena
+
+# 设置全局日志级别为WARNING，抑制INFO级别日志
+logging.basicConfig(level=logging.WARNING)
+
+description = "音频入口分片（解码/AEC/VAD移出事件循环）事件循环延迟测试"
+
+# 同时说话的设备数量
+DEVICE_COUNTS = [50, 100, 200, 400]
+# 分片线程数
+SHARDS = 4
+# 每轮测试时长（秒）
+TEST_DURATION = 10
+# 设备上行音频帧间隔（秒），每帧60ms
+FRAME_INTERVAL = 0.06
+# 事件循环延迟采样间隔（秒）
+LAG_PROBE_INTERVAL = 0.01
+VAD_CONFIG = {"model_dir": "models/snakers4_silero-vad"}
+
+
+def _make_opus_packets(count=50):
+    """生成一段带语音能量的Opus数据包，循环使用"""
+    encoder = opuslib_next.Encoder(16000, 1, opuslib_next.APPLICATION_AUDIO)
+    t = np.arange(960) / 16000
+    packets = []
+    for i in range(count):
+        tone = 0.3 * np.sin(2 * np.pi * (200 + 10 * i) * t)
+        pcm = (tone * 32767).astype(np.int16).tobytes()
+        packets.append(encoder.encode(pcm, 960))
+    return packets
+
+
+class SimConn:
+    """模拟连接，只保留入口处理需要的属性"""
+
+    def __init__(self, idx, vad, loop):
+        self.device_id = f"sim-device-{idx}"
+        self.session_id = self.device_id
+        self.vad = vad
+        self.stop_event = threading.Event()
+        self.client_aec = False
+        self.client_listen_mode = "auto"
+        self.client_audio_buffer = PcmArena()
+        self.vad_reset_seq = 0
+        self.vad_reset_applied = 0
+        self.client_have_voice = False
+        self.client_voice_window = deque(maxlen=5)
+        self.vad_last_voice_time = 0.0
+        self.client_voice_stop = False
+        self.last_is_voice = False
+        self.asr_audio_queue = BridgeQueue(loop, maxsize=500, drop_oldest=True)
+        self.frames = 0
+        self._decoder = opuslib_next.Decoder(16000, 1)
+
+    def _decode_opus_packet(self, opus_packet):
+        return self._decoder.decode(opus_packet, 960)
+
+    def _apply_aec(self, timestamp, pcm_frame):
+        return pcm_frame
+
+
+async def _consume(conn):
+    """模拟事件循环中的ASR音频消费任务"""
+    while not conn.stop_event.is_set():
+        try:
+            frame = await conn.asr_audio_queue.async_get(timeout=1)
+        except asyncio.TimeoutError:
+            continue
+        conn.vad.apply_speech_probs(conn, frame.speech_probs)
+        conn.frames += 1
+
+
+async def _probe_lag(lag_samples, stop_event):
+    while not stop_event.is_set():
+        before = time.monotonic()
+        await asyncio.sleep(LAG_PROBE_INTERVAL)
+        lag_samples.append(time.monotonic() - before - LAG_PROBE_INTERVAL)
+
+
+async def _run_scenario(mode, device_count, vad, packets):
+    loop = asyncio.get_running_loop()
+    conns = [SimConn(i, vad, loop) for i in range(device_count)]
+    ingress = AudioIngress(num_shards=SHARDS) if mode == "ingress" else None
+    consumers = []
+    if ingress is not None:
+        consumers = [asyncio.create_task(_consume(conn)) for conn in conns]
+
+    stop_event = threading.Event()
+    lag_samples = []
+    probe = asyncio.create_task(_probe_lag(lag_samples, stop_event))
+
+    start = time.monotonic()
+    tick = 0
+    while time.monotonic() - start < TEST_DURATION:
+        packet = packets[tick % len(packets)]
+        for conn in conns:
+            if ingress is not None:
+                ingress.submit(conn, packet)
+            else:
+                # 旧路径：在事件循环中解码并做VAD
+                pcm_frame = conn._decode_opus_packet(packet)
+                vad.is_vad(conn, pcm_frame)
+                conn.frames += 1
+            # 让出事件循环，模拟逐个websocket消息到达
+            await asyncio.sleep(0)
+        tick += 1
+        await asyncio.sleep(max(start + tick * FRAME_INTERVAL - time.monotonic(), 0))
+
+    stop_event.set()
+    for conn in conns:
+        conn.stop_event.set()
+    await probe
+    for task in consumers:
+        task.cancel()
+
+    expected = tick * device_count
+    lag_samples.sort()
+    return {
+        "mode": mode,
+        "devices": device_count,
+        "frames": sum(conn.frames for conn in conns),
+        "expected": expected,
+        "lag_p50": lag_samples[len(lag_samples) // 2] if lag_samples else 0.0,
+        "lag_p99": lag_samples[int(len(lag_samples) * 0.99) - 1] if lag_samples else 0.0,
+        "lag_max": lag_samples[-1] if lag_samples else 0.0,
+        "dropped": ingress.dropped if ingress is not None else 0,
+    }
+
+
+async def main():
+    vad = VADProvider(VAD_CONFIG)
+    packets = _make_opus_packets()
+    results = []
+    for device_count in DEVICE_COUNTS:
+        for mode in ("loop", "ingress"):
+            print(f"测试 {mode} 模式，说话设备数: {device_count}")
+            results.append(await _run_scenario(mode, device_count, vad, packets))
+
+    headers = ["模式", "设备数", "处理帧数/应到帧数", "P50循环延迟(ms)", "P99循环延迟(ms)", "最大循环延迟(ms)", "丢弃包数"]
+    rows = [
+        [
+            r["mode"],
+            r["devices"],
+            f"{r['frames']}/{r['expected']}",
+            f"{r['lag_p50'] * 1000:.1f}",
+            f"{r['lag_p99'] * 1000:.1f}",
+            f"{r['lag_max'] * 1000:.1f}",
+            r["dropped"],
+        ]
+        for r in results
+    ]
+    print(tabulate(rows, headers=headers, tablefmt="github"))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,114 @@
+import time
+import logging
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from tabulate import tabulate
+from core.utils.dialogue import Dialogue, Message, estimate_tokens
+
+# 设置全局日志级别为WARNING，抑制INFO级别日志
+logging.basicConfig(level=logging.WARNING)
+
+description = "对话历史构建对比：长会话中每轮构建LLM消息的耗时与输入token数（全量重建 / 增量序列化 / token预算+汇总）"
+
+# 会话总轮数及统计点
+TURNS = 2000
+CHECKPOINTS = [100, 500, 1000, 2000]
+# token预算方案的配置
+TOKEN_BUDGET = 3000
+KEEP_RECENT_TURNS = 4
+
+
+def _legacy_build(dialogue):
+    """改造前的做法：每轮过滤全部消息并逐条转换"""
+    result = []
+    system_message = next((m for m in dialogue.dialogue if m.role == "system"), None)
+    if system_message:
+        result.append({"role": "system", "content": system_message.content})
+    non_system = [m for m in dialogue.dialogue if m.role != "system"]
+    for group in ([m for m in non_system if m.is_temporary], [m for m in non_system if not m.is_temporary]):
+        pending = set()
+        for m in group:
+            dialogue.getMessages(m, result)
+            if m.role == "assistant" and m.tool_calls:
+                pending.update(tc["id"] for tc in m.tool_calls)
+            elif m.role == "tool":
+                pending.discard(m.tool_call_id)
+    return result
+
+
+def _summarize(previous_summary, messages):
+    # 模拟LLM汇总：耗时5ms，输出约100字
+    time.sleep(0.005)
+    return f"用户先后聊了{len(messages)}条消息，喜欢爬山和听音乐。" * 4
+
+
+def _turn_messages(i):
+    messages = [Message(role="user", content=f"第{i}轮：帮我查一下明天的天气，顺便放首歌")]
+    if i % 3 == 0:
+        tc_id = f"call_{i}"
+        messages.append(
+            Message(
+                role="assistant",
+                tool_calls=[{"id": tc_id, "type": "function", "function": {"name": "get_weather", "arguments": "{}"}}],
+            )
+        )
+        messages.append(Message(role="tool", tool_call_id=tc_id, content="明天晴，25度"))
+    messages.append(Message(role="assistant", content="明天晴天，气温25度，适合出门走走，给你放一首轻松的歌吧。"))
+    return messages
+
+
+def _run(mode):
+    executor = ThreadPoolExecutor(max_workers=1)
+    if mode == "budget":
+        dialogue = Dialogue(token_budget=TOKEN_BUDGET, keep_recent_turns=KEEP_RECENT_TURNS)
+        dialogue.set_summarizer(_summarize, executor)
+    else:
+        dialogue = Dialogue()
+    dialogue.update_system_message("你是小智。" * 200)
+    dialogue.put(Message(role="user", content="给我讲个故事吧", is_temporary=True))
+    dialogue.put(Message(role="assistant", content="好呀，你想听什么类型的？", is_temporary=True))
+
+    results = {}
+    elapsed_list = []
+    for i in range(1, TURNS + 1):
+        messages = _turn_messages(i)
+        dialogue.put(messages[0])
+        start = time.perf_counter()
+        if mode == "legacy":
+            built = _legacy_build(dialogue)
+        else:
+            built = dialogue.get_llm_dialogue_with_memory(None, {})
+        elapsed_list.append(time.perf_counter() - start)
+        for message in messages[1:]:
+            dialogue.put(message)
+        if mode == "budget":
+            # 实际每轮间隔（用户说话、播放回复）远大于汇总耗时，等待本轮触发的汇总完成
+            executor.submit(lambda: None).result()
+        if i in CHECKPOINTS:
+            tokens = sum(estimate_tokens(m.get("content") or "") + 4 for m in built)
+            # 取统计点前20轮的平均耗时，减少单次测量抖动
+            recent = elapsed_list[-20:]
+            results[i] = (sum(recent) / len(recent) * 1000, tokens)
+    executor.shutdown(wait=True)
+    return results
+
+
+async def main():
+    rows = []
+    for mode, name in [
+        ("legacy", "每轮全量重建"),
+        ("incremental", "增量序列化"),
+        ("budget", f"增量+预算{TOKEN_BUDGET}"),
+    ]:
+        results = await asyncio.to_thread(_run, mode)
+        for turn in CHECKPOINTS:
+            elapsed, tokens = results[turn]
+            rows.append([name, turn, f"{elapsed:.3f}", tokens])
+
+    headers = ["方式", "轮次", "每轮构建耗时(ms)", "输入token(估算)"]
+    print(f"{TURNS}轮对话，每3轮一次工具调用，预算方案保留最近{KEEP_RECENT_TURNS}轮并后台汇总")
+    print(tabulate(rows, headers=headers, tablefmt="github"))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
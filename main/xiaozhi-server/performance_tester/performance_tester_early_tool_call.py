@@ -0,0 +1,124 @@
+import json
+import time
+import asyncio
+import logging
+import statistics
+from types import SimpleNamespace
+from tabulate import tabulate
+from core.utils.stream_json import JsonFieldStream
+
+# 设置全局日志级别为WARNING，抑制INFO级别日志
+logging.basicConfig(level=logging.WARNING)
+
+description = "工具提前执行对比：LLM流结束后再执行工具 与 参数完整即执行 的工具结果就绪耗时（模拟流式工具调用）"
+
+# 模拟LLM每段输出间隔（秒）及每段参数字符数
+CHUNK_SECONDS = 0.03
+CHUNK_CHARS = 4
+# 模拟工具执行耗时（秒），如天气、新闻、HA状态查询
+TOOL_SECONDS = 0.3
+# 所有工具调用输出后，模型还会继续输出的段数（如思考/补充文字）
+TAIL_CHUNKS = 20
+ROUNDS = 5
+
+SCENARIOS = [
+    ("单工具", [("get_weather", {"location": "北京"})]),
+    (
+        "三个并行工具",
+        [
+            ("get_weather", {"location": "北京"}),
+            ("get_news_from_newsnow", {"source": "澎湃新闻", "detail": False}),
+            ("hass_get_state", {"entity_id": "light.living_room"}),
+        ],
+    ),
+]
+
+
+def _tool_delta(index, name=None, arguments=""):
+    function = SimpleNamespace(name=name, arguments=arguments)
+    return SimpleNamespace(index=index, id=f"call_{index}" if name else None, function=function)
+
+
+async def _llm_stream(calls):
+    """按OpenAI流式格式逐段输出工具调用参数，最后输出一段尾部"""
+    for index, (name, arguments) in enumerate(calls):
+        await asyncio.sleep(CHUNK_SECONDS)
+        yield _tool_delta(index, name=name)
+        text = json.dumps(arguments, ensure_ascii=False)
+        for i in range(0, len(text), CHUNK_CHARS):
+            await asyncio.sleep(CHUNK_SECONDS)
+            yield _tool_delta(index, arguments=text[i:i + CHUNK_CHARS])
+    for _ in range(TAIL_CHUNKS):
+        await asyncio.sleep(CHUNK_SECONDS)
+        yield None
+
+
+async def _execute_tool(tool_call):
+    json.loads(tool_call["arguments"])
+    await asyncio.sleep(TOOL_SECONDS)
+    return tool_call["name"]
+
+
+def _merge(tool_calls_list, delta):
+    if delta.index >= len(tool_calls_list):
+        tool_calls_list.append(
+            {"id": "", "name": "", "arguments": "", "_parser": JsonFieldStream("response"), "_complete": False}
+        )
+    entry = tool_calls_list[delta.index]
+    if delta.id:
+        entry["id"] = delta.id
+    if delta.function.name:
+        entry["name"] = delta.function.name
+    if delta.function.arguments:
+        entry["arguments"] += delta.function.arguments
+        entry["_parser"].feed(delta.function.arguments)
+        entry["_complete"] = entry["_parser"].complete
+
+
+async def _run(calls, early):
+    start = time.monotonic()
+    tool_calls_list = []
+    async for delta in _llm_stream(calls):
+        if delta is None:
+            continue
+        _merge(tool_calls_list, delta)
+        if early:
+            for tc in tool_calls_list:
+                if tc["_complete"] and "_task" not in tc:
+                    tc["_task"] = asyncio.create_task(_execute_tool(tc))
+    stream_end = time.monotonic() - start
+    tasks = [tc.get("_task") or asyncio.create_task(_execute_tool(tc)) for tc in tool_calls_list]
+    results = []
+    for task in tasks:
+        results.append(await task)
+    assert results == [name for name, _ in calls]
+    return stream_end, time.monotonic() - start
+
+
+async def main():
+    rows = []
+    for scenario, calls in SCENARIOS:
+        for early, name in [(False, "流结束后执行"), (True, "参数完整即执行")]:
+            samples = [await _run(calls, early) for _ in range(ROUNDS)]
+            stream_end = statistics.mean(s for s, _ in samples)
+            ready = statistics.mean(r for _, r in samples)
+            rows.append(
+                [
+                    scenario,
+                    name,
+                    f"{stream_end * 1000:.0f}",
+                    f"{ready * 1000:.0f}",
+                    f"{(ready - stream_end) * 1000:.0f}",
+                ]
+            )
+
+    headers = ["场景", "方式", "LLM流结束(ms)", "工具结果全部就绪(ms)", "流结束后仍需等待(ms)"]
+    print(
+        f"每段间隔{CHUNK_SECONDS * 1000:.0f}ms，工具耗时{TOOL_SECONDS * 1000:.0f}ms，"
+        f"工具调用后尾部{TAIL_CHUNKS}段，每种{ROUNDS}轮取平均"
+    )
+    print(tabulate(rows, headers=headers, tablefmt="github"))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,155 @@
+import time
+import asyncio
+import logging
+import statistics
+from tabulate import tabulate
+from plugins_func.loadplugins import auto_import_modules
+from plugins_func.register import all_function_registry
+from core.providers.intent.intent_llm.fast_path import IntentFastPath
+
+# 设置全局日志级别为WARNING，抑制INFO级别日志
+logging.basicConfig(level=logging.WARNING)
+
+description = "意图识别本地快速通道：跳过意图LLM的比例、判定准确率、本地耗时及节省的意图识别延迟"
+
+# 意图识别LLM一次往返的参考耗时（毫秒），用于估算节省的延迟
+INTENT_LLM_MS = 800
+# 与 config.yaml 中 intent_llm 默认加载的插件一致，另加设备端的音量工具
+FUNCTIONS = ["handle_exit_intent", "play_music", "get_weather", "get_news_from_newsnow", "web_search"]
+DEVICE_VOLUME_TOOL = {
+    "type": "function",
+    "function": {
+        "name": "self_audio_speaker_set_volume",
+        "description": "设置设备音量，如果不确定当前音量，先调用获取设备状态",
+        "parameters": {
+            "type": "object",
+            "properties": {"volume": {"type": "integer", "description": "音量 0-100"}},
+        },
+    },
+}
+
+# (用户话语, 期望意图)；None 表示需要LLM结合参数和语境判断的话语
+UTTERANCES = [
+    ("你好呀", "continue_chat"),
+    ("你叫什么名字", "continue_chat"),
+    ("给我讲个笑话吧", "continue_chat"),
+    ("我今天好累啊", "continue_chat"),
+    ("你喜欢吃什么", "continue_chat"),
+    ("陪我聊聊天", "continue_chat"),
+    ("你觉得我应该学编程吗", "continue_chat"),
+    ("讲个睡前故事", "continue_chat"),
+    ("今天心情不太好", "continue_chat"),
+    ("你是机器人吗", "continue_chat"),
+    ("我刚下班", "continue_chat"),
+    ("夸夸我", "continue_chat"),
+    ("一加一等于几", "continue_chat"),
+    ("哈哈哈太好笑了", "continue_chat"),
+    ("谢谢你", "continue_chat"),
+    ("你会说英语吗", "continue_chat"),
+    ("我有点饿了", "continue_chat"),
+    ("帮我想个周末的安排", "continue_chat"),
+    ("你最喜欢什么颜色", "continue_chat"),
+    ("晚饭吃什么好呢", "continue_chat"),
+    ("退出系统", "handle_exit_intent"),
+    ("再见", "handle_exit_intent"),
+    ("拜拜", "handle_exit_intent"),
+    ("我不想和你说话了", "handle_exit_intent"),
+    ("怎么退出了？", None),
+    ("播放音乐", "play_music"),
+    ("放首歌", "play_music"),
+    ("来一首歌吧", "play_music"),
+    ("播放两只老虎", "play_music"),
+    ("我想听稻香", "play_music"),
+    ("放一首晴天", "play_music"),
+    ("音量调到50", "self_audio_speaker_set_volume"),
+    ("音量设置为30%", "self_audio_speaker_set_volume"),
+    ("声音大一点", None),
+    ("现在几点了", "result_for_context"),
+    ("今天星期几", "result_for_context"),
+    ("今天几号", "result_for_context"),
+    ("今天农历几号", "result_for_context"),
+    ("明天北京天气怎么样", None),
+    ("外面会下雨吗", None),
+    ("来条新闻", None),
+    ("有什么科技新闻", None),
+    ("帮我搜一下最新的手机发布会", None),
+    ("杭州今天多少度", None),
+    ("我在哪个城市", None),
+    ("今天适合穿什么", None),
+    # 函数描述覆盖不到的说法，不能判为闲聊
+    ("明天会下雪吗", "get_weather"),
+    ("明天要带伞吗", "get_weather"),
+    ("外面刮风了吗", "get_weather"),
+    ("北京明天怎么样", "get_weather"),
+    ("最近有什么大事", "get_news_from_newsnow"),
+    ("给我讲讲今天的头条", "get_news_from_newsnow"),
+    ("帮我上网找一下iPhone价格", "web_search"),
+    ("今天股市怎么样", "web_search"),
+    ("放周杰伦", "play_music"),
+    # 带说话人信息的消息按内容判断
+    ('{"speaker": "小明", "content": "退出系统"}', "handle_exit_intent"),
+]
+
+
+def _functions():
+    auto_import_modules("plugins_func.functions")
+    return [all_function_registry[name].description for name in FUNCTIONS] + [DEVICE_VOLUME_TOOL]
+
+
+def _bench(functions, config):
+    classifier = IntentFastPath(config)
+    # 首次调用构建模型，不计入耗时统计
+    classifier.classify("你好", functions)
+    classifier.total = classifier.hits = 0
+
+    latencies = []
+    hits = correct = 0
+    wrong = []
+    for text, expected in UTTERANCES:
+        start = time.perf_counter()
+        result = classifier.classify(text, functions)
+        latencies.append((time.perf_counter() - start) * 1000)
+        if result is None:
+            continue
+        hits += 1
+        name = result["function_call"]["name"]
+        if name == expected:
+            correct += 1
+        else:
+            wrong.append(f"{text}->{name}")
+
+    total = len(UTTERANCES)
+    sorted_latencies = sorted(latencies)
+    column = [
+        f"{hits / total:.0%}",
+        f"{correct / hits:.0%}" if hits else "-",
+        f"{statistics.mean(latencies):.3f}",
+        f"{sorted_latencies[int(total * 0.99) - 1]:.3f}",
+        f"{hits / total * INTENT_LLM_MS:.0f}",
+    ]
+    return column, wrong
+
+
+async def main():
+    functions = await asyncio.to_thread(_functions)
+    modes = [("仅固定指令(默认)", {}), ("固定指令+闲聊判定", {"chat_gate": True})]
+    columns = []
+    for name, config in modes:
+        column, wrong = await asyncio.to_thread(_bench, functions, config)
+        columns.append(column)
+        if wrong:
+            print(f"{name} 误判: {wrong}")
+    metrics = [
+        "跳过意图LLM比例",
+        "快速通道判定准确率",
+        "本地判定平均耗时(ms)",
+        "本地判定P99耗时(ms)",
+        "平均每轮节省意图识别耗时(ms)",
+    ]
+    rows = [[metric] + [column[i] for column in columns] for i, metric in enumerate(metrics)]
+    print(f"意图LLM参考耗时{INTENT_LLM_MS}ms，{len(UTTERANCES)}条话语，函数：{', '.join(FUNCTIONS)} + 设备音量工具")
+    print(tabulate(rows, headers=["指标"] + [name for name, _ in modes], tablefmt="github"))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,193 @@
+import json
+import time
+import asyncio
+import logging
+import threading
+import statistics
+from concurrent.futures import ThreadPoolExecutor
+from aiohttp import web
+from tabulate import tabulate
+from core.providers.llm.openai.openai import LLMProvider
+from core.utils.http_pool import close_http_clients
+
+# 设置全局日志级别为WARNING，抑制INFO级别日志
+logging.basicConfig(level=logging.WARNING)
+
+description = "LLM流式请求打断对比：同步线程迭代与异步原生取消的线程占用、打断到服务端停止生成的延迟（本地模拟OpenAI接口）"
+
+# 并发会话数
+SESSIONS = 20
+# 模拟服务：每个token间隔，以及第 PAUSE_AFTER 个token后的停顿（模拟推理/工具思考）
+TOKEN_SECONDS = 0.04
+PAUSE_AFTER = 10
+PAUSE_SECONDS = 2.0
+TOTAL_TOKENS = 60
+# 用户在请求开始后多久打断
+ABORT_AFTER = 1.0
+HOST = "127.0.0.1"
+PORT = 18770
+
+
+class StandInServer:
+    """本地模拟的OpenAI流式接口：记录每个请求发现客户端断开的时间和生成的token数"""
+
+    def __init__(self):
+        self.stops = []
+
+    async def completions(self, request):
+        await request.json()
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await response.prepare(request)
+        tokens = 0
+        try:
+            for i in range(TOTAL_TOKENS):
+                delay = PAUSE_SECONDS if i == PAUSE_AFTER else TOKEN_SECONDS
+                deadline = time.monotonic() + delay
+                # 停顿期间也检查连接，客户端断开后立即停止生成
+                while time.monotonic() < deadline:
+                    if request.transport is None or request.transport.is_closing():
+                        raise ConnectionResetError
+                    await asyncio.sleep(0.005)
+                chunk = {
+                    "id": "bench",
+                    "object": "chat.completion.chunk",
+                    "created": 0,
+                    "model": "mock",
+                    "choices": [{"index": 0, "delta": {"content": "字"}, "finish_reason": None}],
+                }
+                await response.write(f"data: {json.dumps(chunk)}\n\n".encode())
+                tokens += 1
+            await response.write(b"data: [DONE]\n\n")
+        except (ConnectionResetError, asyncio.CancelledError):
+            pass
+        self.stops.append((time.monotonic(), tokens))
+        return response
+
+
+class ThreadPeak:
+    """采样进程线程数峰值"""
+
+    def __init__(self):
+        self.base = threading.active_count()
+        self.peak = self.base
+
+    async def run(self):
+        while True:
+            self.peak = max(self.peak, threading.active_count())
+            await asyncio.sleep(0.01)
+
+
+def _sync_session(provider, abort_flag):
+    # 原实现：线程中迭代同步流，每收到一段才检查打断标志
+    stream = provider.response("bench", [{"role": "user", "content": "你好"}])
+    try:
+        for _ in stream:
+            if abort_flag.is_set():
+                break
+    finally:
+        stream.close()
+
+
+async def _async_session(provider, abort_event):
+    # 新实现：打断事件与读取下一段竞争，打断时取消进行中的读取
+    stream = provider.response_stream("bench", [{"role": "user", "content": "你好"}])
+    abort_wait = asyncio.ensure_future(abort_event.wait())
+    next_item = None
+    try:
+        while True:
+            next_item = asyncio.ensure_future(stream.__anext__())
+            await asyncio.wait({next_item, abort_wait}, return_when=asyncio.FIRST_COMPLETED)
+            if not next_item.done():
+                break
+            try:
+                next_item.result()
+            except StopAsyncIteration:
+                break
+    finally:
+        abort_wait.cancel()
+        if next_item is not None and not next_item.done():
+            next_item.cancel()
+            await asyncio.gather(next_item, return_exceptions=True)
+        await stream.aclose()
+
+
+async def _run(mode, provider, server):
+    server.stops = []
+    peak = ThreadPeak()
+    sampler = asyncio.create_task(peak.run())
+    loop = asyncio.get_running_loop()
+    start = time.monotonic()
+    executor = None
+    if mode == "sync":
+        # 与原来每个连接在自己的线程池中执行对话一致，每个会话占用一个线程
+        executor = ThreadPoolExecutor(max_workers=SESSIONS)
+        flags = [threading.Event() for _ in range(SESSIONS)]
+        sessions = [
+            loop.run_in_executor(executor, _sync_session, provider, flag) for flag in flags
+        ]
+    else:
+        flags = [asyncio.Event() for _ in range(SESSIONS)]
+        sessions = [
+            asyncio.ensure_future(_async_session(provider, flag)) for flag in flags
+        ]
+    await asyncio.sleep(ABORT_AFTER)
+    abort_time = time.monotonic()
+    for flag in flags:
+        flag.set()
+    await asyncio.gather(*sessions)
+    session_done = time.monotonic()
+    # 等服务端全部发现断开
+    while len(server.stops) < SESSIONS and time.monotonic() - abort_time < 10:
+        await asyncio.sleep(0.01)
+    sampler.cancel()
+    if executor is not None:
+        executor.shutdown(wait=False)
+    stop_lags = [max(0.0, t - abort_time) for t, _ in server.stops]
+    tokens = [n for _, n in server.stops]
+    return [
+        peak.peak - peak.base,
+        f"{(session_done - abort_time) * 1000:.0f}",
+        f"{statistics.mean(stop_lags) * 1000:.0f}",
+        f"{max(stop_lags) * 1000:.0f}",
+        f"{statistics.mean(tokens):.1f}",
+        f"{session_done - start:.2f}",
+    ]
+
+
+async def main():
+    server = StandInServer()
+    app = web.Application()
+    app.router.add_post("/v1/chat/completions", server.completions)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, HOST, PORT).start()
+
+    provider = LLMProvider(
+        {"model_name": "mock", "api_key": "sk-benchmark", "base_url": f"http://{HOST}:{PORT}/v1"}
+    )
+    rows = []
+    try:
+        for mode, name in [("sync", "线程中迭代同步流"), ("async", "异步流+取消")]:
+            rows.append([name] + await _run(mode, provider, server))
+    finally:
+        await close_http_clients()
+        await runner.cleanup()
+
+    headers = [
+        "方式",
+        "新增线程数",
+        "打断到会话结束(ms)",
+        "打断到服务端停止平均(ms)",
+        "最长(ms)",
+        "每请求生成token",
+        "会话总耗时(s)",
+    ]
+    print(
+        f"{SESSIONS}个并发会话，token间隔{TOKEN_SECONDS * 1000:.0f}ms，第{PAUSE_AFTER}个token后停顿{PAUSE_SECONDS}s，"
+        f"开始{ABORT_AFTER}s后打断"
+    )
+    print(tabulate(rows, headers=headers, tablefmt="github"))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,106 @@
+import json
+import time
+import asyncio
+import logging
+import statistics
+from aiohttp import web
+from tabulate import tabulate
+from core.utils import llm as llm_utils
+
+# 设置全局日志级别为WARNING，抑制INFO级别日志
+logging.basicConfig(level=logging.WARNING)
+
+description = "LLM实例共享注册表对比：多连接相同配置下的LLM实例数和获取实例+首个请求的耗时（本地模拟OpenAI接口）"
+
+# 模拟的设备连接数及其使用的不同智能体配置数
+CONNECTIONS = 200
+AGENT_CONFIGS = 4
+# 同时在线（并发请求）的连接数
+CONCURRENCY = 20
+HOST = "127.0.0.1"
+PORT = 18771
+
+
+class StandInServer:
+    """本地模拟的OpenAI流式接口"""
+
+    async def completions(self, request):
+        await request.json()
+        body = ""
+        for text in ["你好", "，", "我在"]:
+            chunk = {
+                "id": "bench",
+                "object": "chat.completion.chunk",
+                "created": 0,
+                "model": "mock",
+                "choices": [{"index": 0, "delta": {"content": text}, "finish_reason": None}],
+            }
+            body += f"data: {json.dumps(chunk)}\n\n"
+        body += "data: [DONE]\n\n"
+        return web.Response(body=body.encode(), content_type="text/event-stream")
+
+
+def _agent_config(index):
+    return {
+        "type": "openai",
+        "model_name": f"mock-{index}",
+        "api_key": "sk-benchmark",
+        "base_url": f"http://{HOST}:{PORT}/v1",
+        "temperature": 0.7,
+    }
+
+
+def _connection(use_registry, index):
+    # 模拟一个连接：获取私有配置中的LLM，完成一轮请求后关闭连接
+    config = _agent_config(index % AGENT_CONFIGS)
+    start = time.monotonic()
+    if use_registry:
+        llm = llm_utils.acquire_instance("openai", config)
+    else:
+        llm = llm_utils.create_instance("openai", config)
+    llm.response_no_stream("你是小智", "你好")
+    elapsed = time.monotonic() - start
+    if use_registry:
+        llm_utils.release_instance(llm)
+    return llm, elapsed
+
+
+async def _run(use_registry, server):
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+
+    async def one(index):
+        async with semaphore:
+            return await asyncio.to_thread(_connection, use_registry, index)
+
+    results = await asyncio.gather(*[one(i) for i in range(CONNECTIONS)])
+    latencies = sorted(elapsed for _, elapsed in results)
+    return [
+        len({instance for instance, _ in results}),
+        f"{statistics.mean(latencies) * 1000:.1f}",
+        f"{latencies[int(len(latencies) * 0.95)] * 1000:.1f}",
+    ]
+
+
+async def main():
+    server = StandInServer()
+    app = web.Application()
+    app.router.add_post("/v1/chat/completions", server.completions)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, HOST, PORT).start()
+
+    rows = []
+    try:
+        for use_registry, name in [(False, "每连接新建实例"), (True, "共享注册表")]:
+            rows.append([name] + await _run(use_registry, server))
+    finally:
+        await runner.cleanup()
+
+    headers = ["方式", "LLM实例数", "平均耗时(ms)", "P95耗时(ms)"]
+    print(f"{CONNECTIONS}个连接，{AGENT_CONFIGS}种智能体配置，并发{CONCURRENCY}")
+    print(tabulate(rows, headers=headers, tablefmt="github"))
+    print(f"注册表统计: {llm_utils.llm_registry.stats()}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,109 @@
+import os
+import sys
+import json
+import time
+import asyncio
+import logging
+import tempfile
+import psutil
+from types import SimpleNamespace
+from tabulate import tabulate
+from core.providers.tools.server_mcp.mcp_manager import ServerMCPManager
+from core.providers.tools.server_mcp.mcp_pool import server_mcp_pool
+
+# 设置全局日志级别为WARNING，抑制INFO级别日志
+logging.basicConfig(level=logging.WARNING)
+
+description = "服务端MCP连接池对比：每个连接各自启动MCP服务 与 进程级共享 的启动耗时、子进程数、内存占用和并发调用耗时"
+
+# 同时在线的连接数、每个连接并发的工具调用数
+CONNECTIONS = 10
+CALLS_PER_CONNECTION = 3
+# 模拟的MCP服务：启动耗时（秒，类似 npx 拉起）、常驻内存（MB）、单次工具调用耗时（秒）
+SERVER_STARTUP_SECONDS = 1.0
+SERVER_MEMORY_MB = 50
+TOOL_SECONDS = 0.2
+
+SERVER_SCRIPT = f"""
+import asyncio, time
+from mcp.server.fastmcp import FastMCP
+time.sleep({SERVER_STARTUP_SECONDS})
+ballast = bytearray({SERVER_MEMORY_MB} * 1024 * 1024)
+mcp = FastMCP("bench")
+
+@mcp.tool()
+async def lookup(key: str) -> str:
+    \"\"\"查询指定键的值\"\"\"
+    await asyncio.sleep({TOOL_SECONDS})
+    return key
+
+mcp.run()
+"""
+
+
+def _children():
+    return psutil.Process().children(recursive=True)
+
+
+async def _run(settings_path, shared):
+    server_mcp_pool.configure({"mcp_server_pool": {"enable": shared, "health_check_interval": 0}})
+    managers = []
+    for _ in range(CONNECTIONS):
+        manager = ServerMCPManager(SimpleNamespace(config={}, func_handler=None))
+        manager.config_path = settings_path
+        managers.append(manager)
+
+    start = time.monotonic()
+    await asyncio.gather(*(m.initialize_servers() for m in managers))
+    init_seconds = time.monotonic() - start
+
+    children = _children()
+    rss_mb = sum(p.memory_info().rss for p in children) / 1024 / 1024
+
+    start = time.monotonic()
+    await asyncio.gather(
+        *(
+            m.execute_tool("lookup", {"key": str(i)})
+            for m in managers
+            for i in range(CALLS_PER_CONNECTION)
+        )
+    )
+    call_seconds = time.monotonic() - start
+
+    for m in managers:
+        await m.cleanup_all()
+    await server_mcp_pool.close_all()
+    return [
+        f"{init_seconds * 1000:.0f}",
+        len(children),
+        f"{rss_mb:.0f}",
+        f"{call_seconds * 1000:.0f}",
+    ]
+
+
+async def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        script = os.path.join(tmp, "bench_server.py")
+        with open(script, "w", encoding="utf-8") as f:
+            f.write(SERVER_SCRIPT)
+        settings_path = os.path.join(tmp, "mcp_server_settings.json")
+        with open(settings_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {"mcpServers": {"bench": {"command": sys.executable, "args": [script]}}}, f
+            )
+
+        rows = []
+        for shared, name in [(False, "每个连接各自启动"), (True, "进程级共享")]:
+            rows.append([name] + await _run(settings_path, shared))
+
+    headers = ["方式", f"{CONNECTIONS}个连接初始化耗时(ms)", "MCP子进程数", "子进程内存(MB)", "并发调用总耗时(ms)"]
+    print(
+        f"{CONNECTIONS}个连接，每个连接并发{CALLS_PER_CONNECTION}次调用；模拟服务启动{SERVER_STARTUP_SECONDS}s、"
+        f"常驻{SERVER_MEMORY_MB}MB、单次调用{TOOL_SECONDS * 1000:.0f}ms"
+    )
+    print(tabulate(rows, headers=headers, tablefmt="github"))
+    print(f"连接池统计: {server_mcp_pool.stats()}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
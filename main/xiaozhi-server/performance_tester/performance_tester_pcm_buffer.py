@@ -0,0 +1,137 @@
+import io
+import os
+import time
+import wave
+import struct
+import asyncio
+from tabulate import tabulate
+from core.utils.pcm_buffer import PcmArena, PcmFrameBuffer
+
+description = "VAD/ASR PCM缓冲区每句话的内存分配次数与拷贝字节数对比"
+
+FRAME_BYTES = 1920
+# VAD每次推理的字节数（512采样点）
+VAD_CHUNK_BYTES = 1024
+# 一句话的组成：说话前静音帧、语音帧、说话后静音帧（60ms一帧）
+SILENT_BEFORE = 30
+VOICE_FRAMES = 50
+SILENT_AFTER = 17
+PREROLL_FRAMES = 10
+ROUNDS = 500
+
+
+class Counter:
+    def __init__(self):
+        self.allocations = 0
+        self.bytes_copied = 0
+
+    def add(self, size):
+        self.allocations += 1
+        self.bytes_copied += size
+
+
+def _frames():
+    total = SILENT_BEFORE + VOICE_FRAMES + SILENT_AFTER
+    return [os.urandom(FRAME_BYTES) for _ in range(total)]
+
+
+def legacy_utterance(frames, counter: Counter):
+    """原实现：bytearray 切片、帧列表截断、多次拼接、BytesIO 生成WAV"""
+    vad_buffer = bytearray()
+    asr_audio = []
+    for idx, frame in enumerate(frames):
+        # VAD: extend 后每推理一块都重新切片分配
+        vad_buffer.extend(frame)
+        counter.bytes_copied += len(frame)
+        while len(vad_buffer) >= VAD_CHUNK_BYTES:
+            chunk = vad_buffer[:VAD_CHUNK_BYTES]
+            counter.add(len(chunk))
+            vad_buffer = vad_buffer[VAD_CHUNK_BYTES:]
+            counter.add(len(vad_buffer))
+        # ASR: 静音时截断帧列表
+        asr_audio.append(frame)
+        if idx < SILENT_BEFORE:
+            asr_audio = asr_audio[-PREROLL_FRAMES:]
+            counter.add(0)
+
+    # receive_audio 合并
+    pcm_bytes = b"".join(asr_audio)
+    counter.add(len(pcm_bytes))
+    # 声纹WAV：写入BytesIO再读出
+    wav_buffer = io.BytesIO()
+    with wave.open(wav_buffer, "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(16000)
+        wav_file.writeframes(pcm_bytes)
+    counter.add(len(pcm_bytes))
+    wav_buffer.seek(0)
+    wav_data = wav_buffer.read()
+    counter.add(len(wav_data))
+    # 上报快照和上报WAV
+    snapshot = [pcm_bytes].copy()
+    counter.add(0)
+    report_wav = bytes(44) + b"".join(snapshot)
+    counter.add(len(report_wav))
+    return wav_data
+
+
+def arena_utterance(frames, counter: Counter, vad_buffer: PcmArena, asr_audio: PcmFrameBuffer):
+    """新实现：VAD预分配缓冲区按块零拷贝读取，ASR只存帧引用，整句只合并一次"""
+    vad_before = (vad_buffer.allocations, vad_buffer.bytes_copied)
+    for idx, frame in enumerate(frames):
+        vad_buffer.write(frame)
+        while vad_buffer.read(VAD_CHUNK_BYTES) is not None:
+            pass
+        asr_audio.append(frame)
+        if idx < SILENT_BEFORE:
+            asr_audio.keep_last_frames(PREROLL_FRAMES)
+
+    pcm_bytes = asr_audio.to_bytes()
+    counter.add(len(pcm_bytes))
+    asr_audio.clear()
+    # 声纹WAV：文件头和PCM直接拼接
+    header = struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF", 36 + len(pcm_bytes), b"WAVE", b"fmt ", 16, 1, 1,
+        16000, 32000, 2, 16, b"data", len(pcm_bytes),
+    )
+    wav_data = b"".join((header, pcm_bytes))
+    counter.add(len(wav_data))
+    # 上报直接使用合并后的 bytes
+    report_wav = bytes(44) + b"".join([pcm_bytes])
+    counter.add(len(report_wav))
+
+    counter.allocations += vad_buffer.allocations - vad_before[0]
+    counter.bytes_copied += vad_buffer.bytes_copied - vad_before[1]
+    return wav_data
+
+
+def _bench(name, func, frames, *args):
+    counter = Counter()
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        func(frames, counter, *args)
+    elapsed = time.perf_counter() - start
+    return [
+        name,
+        f"{counter.allocations / ROUNDS:.0f}",
+        f"{counter.bytes_copied / ROUNDS / 1024:.1f}",
+        f"{elapsed / ROUNDS * 1_000_000:.0f}",
+    ]
+
+
+async def main():
+    frames = _frames()
+    utterance_kb = len(frames[SILENT_BEFORE - PREROLL_FRAMES :]) * FRAME_BYTES / 1024
+    print(f"每句话 {len(frames)} 帧，送入ASR的音频约 {utterance_kb:.1f}KB，测试 {ROUNDS} 句")
+    rows = [
+        _bench("原实现(bytearray/list)", legacy_utterance, frames),
+        _bench("PcmArena/PcmFrameBuffer", arena_utterance, frames, PcmArena(), PcmFrameBuffer()),
+    ]
+    headers = ["实现", "每句分配次数", "每句拷贝KB", "每句耗时(us)"]
+    print(tabulate(rows, headers=headers, tablefmt="github"))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
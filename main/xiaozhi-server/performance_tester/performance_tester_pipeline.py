@@ -0,0 +1,231 @@
+import time
+import queue
+import asyncio
+import logging
+import statistics
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from tabulate import tabulate
+from core.utils.pipeline import BridgeQueue, get_shared_executor
+
+# 设置全局日志级别为WARNING，抑制INFO级别日志
+logging.basicConfig(level=logging.WARNING)
+
+description = "连接管线模式（thread / asyncio）并发性能测试"
+
+# 模拟设备数量
+DEVICE_COUNTS = [500, 1000, 2000]
+# 每轮测试时长（秒）
+TEST_DURATION = 10
+# 设备上行音频帧间隔（秒）
+FRAME_INTERVAL = 0.06
+# 每台设备发起一轮对话的间隔（秒）
+TURN_INTERVAL = 2.0
+# 模拟一次TTS合成的阻塞耗时（秒）
+SYNTH_COST = 0.02
+
+
+async def _send_audio(latencies, turn_start):
+    """模拟下发音频到设备"""
+    await asyncio.sleep(0)
+    if turn_start is not None:
+        latencies.append(time.monotonic() - turn_start)
+
+
+async def _handle_audio(frame):
+    """模拟VAD/ASR处理一帧音频"""
+    await asyncio.sleep(0)
+
+
+class ThreadDevice:
+    """模拟旧模式：每个连接独立线程 + 独立线程池"""
+
+    def __init__(self, loop, latencies, stop_event):
+        self.loop = loop
+        self.latencies = latencies
+        self.stop_event = stop_event
+        self.executor = ThreadPoolExecutor(max_workers=5)
+        self.asr_queue = queue.Queue()
+        self.text_queue = queue.Queue()
+        self.audio_queue = queue.Queue()
+        for target in (self._asr_thread, self._text_thread, self._audio_thread):
+            threading.Thread(target=target, daemon=True).start()
+
+    def _asr_thread(self):
+        while not self.stop_event.is_set():
+            try:
+                frame = self.asr_queue.get(timeout=1)
+                asyncio.run_coroutine_threadsafe(_handle_audio(frame), self.loop).result()
+            except queue.Empty:
+                continue
+
+    def _text_thread(self):
+        while not self.stop_event.is_set():
+            try:
+                turn_start = self.text_queue.get(timeout=1)
+                time.sleep(SYNTH_COST)
+                self.audio_queue.put(turn_start)
+            except queue.Empty:
+                continue
+
+    def _audio_thread(self):
+        while not self.stop_event.is_set():
+            try:
+                turn_start = self.audio_queue.get(timeout=0.1)
+                asyncio.run_coroutine_threadsafe(
+                    _send_audio(self.latencies, turn_start), self.loop
+                ).result()
+            except queue.Empty:
+                continue
+
+    def feed_frame(self, frame):
+        self.asr_queue.put(frame)
+
+    def start_turn(self):
+        self.executor.submit(self.text_queue.put, time.monotonic())
+
+    def close(self):
+        self.executor.shutdown(wait=False)
+
+
+class AsyncDevice:
+    """模拟asyncio管线模式：事件循环任务 + 进程级共享线程池"""
+
+    def __init__(self, loop, latencies, stop_event):
+        self.loop = loop
+        self.latencies = latencies
+        self.stop_event = stop_event
+        self.executor = get_shared_executor()
+        self.asr_queue = BridgeQueue(loop, maxsize=500, drop_oldest=True)
+        self.text_queue = BridgeQueue(loop)
+        self.audio_queue = BridgeQueue(loop, maxsize=1000)
+        self.tasks = [
+            asyncio.create_task(self._asr_task()),
+            asyncio.create_task(self._text_task()),
+            asyncio.create_task(self._audio_task()),
+        ]
+
+    async def _asr_task(self):
+        while not self.stop_event.is_set():
+            try:
+                frame = await self.asr_queue.async_get(timeout=1)
+                await _handle_audio(frame)
+            except asyncio.TimeoutError:
+                continue
+
+    def _synthesize(self, turn_start):
+        time.sleep(SYNTH_COST)
+        self.audio_queue.put(turn_start)
+
+    async def _text_task(self):
+        while not self.stop_event.is_set():
+            try:
+                turn_start = await self.text_queue.async_get(timeout=1)
+                await self.loop.run_in_executor(self.executor, self._synthesize, turn_start)
+            except asyncio.TimeoutError:
+                continue
+
+    async def _audio_task(self):
+        while not self.stop_event.is_set():
+            try:
+                turn_start = await self.audio_queue.async_get(timeout=1)
+                await _send_audio(self.latencies, turn_start)
+            except asyncio.TimeoutError:
+                continue
+
+    def feed_frame(self, frame):
+        self.asr_queue.put(frame)
+
+    def start_turn(self):
+        self.text_queue.put(time.monotonic())
+
+    def close(self):
+        for task in self.tasks:
+            task.cancel()
+
+
+async def _run_scenario(mode: str, device_count: int) -> dict:
+    loop = asyncio.get_running_loop()
+    stop_event = threading.Event()
+    latencies = []
+    threads_before = threading.active_count()
+    device_cls = ThreadDevice if mode == "thread" else AsyncDevice
+
+    devices = []
+    try:
+        for _ in range(device_count):
+            devices.append(device_cls(loop, latencies, stop_event))
+    except RuntimeError as e:
+        # 线程数达到系统上限
+        stop_event.set()
+        for device in devices:
+            device.close()
+        return {"mode": mode, "devices": device_count, "error": f"创建失败({len(devices)}): {e}"}
+
+    threads_after = threading.active_count()
+    frame = b"\x00" * 1920
+    start = time.monotonic()
+    next_turn = [start + TURN_INTERVAL * i / device_count for i in range(device_count)]
+    lag_samples = []
+    while time.monotonic() - start < TEST_DURATION:
+        tick = time.monotonic()
+        for idx, device in enumerate(devices):
+            device.feed_frame(frame)
+            if tick >= next_turn[idx]:
+                next_turn[idx] += TURN_INTERVAL
+                device.start_turn()
+        before_sleep = time.monotonic()
+        await asyncio.sleep(FRAME_INTERVAL)
+        lag_samples.append(time.monotonic() - before_sleep - FRAME_INTERVAL)
+
+    stop_event.set()
+    for device in devices:
+        device.close()
+
+    latencies.sort()
+    p99 = latencies[int(len(latencies) * 0.99) - 1] if latencies else 0.0
+    return {
+        "mode": mode,
+        "devices": device_count,
+        "threads_per_conn": (threads_after - threads_before) / device_count,
+        "turns": len(latencies),
+        "p50": statistics.median(latencies) if latencies else 0.0,
+        "p99": p99,
+        "loop_lag": max(lag_samples) if lag_samples else 0.0,
+    }
+
+
+def _print_results(results):
+    headers = ["模式", "设备数", "每连接线程数", "完成轮次", "P50延迟(ms)", "P99延迟(ms)", "最大循环延迟(ms)"]
+    rows = []
+    for r in results:
+        if "error" in r:
+            rows.append([r["mode"], r["devices"], r["error"], "-", "-", "-", "-"])
+            continue
+        rows.append(
+            [
+                r["mode"],
+                r["devices"],
+                f"{r['threads_per_conn']:.2f}",
+                r["turns"],
+                f"{r['p50'] * 1000:.1f}",
+                f"{r['p99'] * 1000:.1f}",
+                f"{r['loop_lag'] * 1000:.1f}",
+            ]
+        )
+    print(tabulate(rows, headers=headers, tablefmt="github"))
+
+
+async def main():
+    results = []
+    for device_count in DEVICE_COUNTS:
+        for mode in ("thread", "asyncio"):
+            print(f"测试 {mode} 模式，模拟设备数: {device_count}")
+            results.append(await _run_scenario(mode, device_count))
+            # 等待上一轮线程退出
+            await asyncio.sleep(2)
+    _print_results(results)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
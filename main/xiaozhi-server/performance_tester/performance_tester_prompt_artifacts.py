@@ -0,0 +1,130 @@
+import time
+import asyncio
+import logging
+from types import SimpleNamespace
+from tabulate import tabulate
+from core.providers.intent.intent_llm.intent_llm import IntentProvider
+from core.utils.prompt_artifacts import artifact_store, compile_tool_schema
+from plugins_func.functions import play_music
+
+# 设置全局日志级别为WARNING，抑制INFO级别日志
+logging.basicConfig(level=logging.WARNING)
+
+description = "意图提示词与工具描述编译产物缓存对比：每轮重建 与 按版本共享 的单轮耗时、多连接的产物份数"
+
+# 连接数、每个连接的对话轮数
+CONNECTIONS = 50
+TURNS = 20
+# 工具数、音乐文件数、智能设备数
+TOOLS = 20
+MUSIC_FILES = 500
+DEVICES = 30
+
+DIRECT_ANSWER_TOOL = {"type": "function", "function": {"name": "direct_answer", "parameters": {}}}
+
+
+def _functions():
+    return [
+        {
+            "type": "function",
+            "function": {
+                "name": f"tool_{i}",
+                "description": f"示例工具{i}，当用户要求做第{i}类事情时调用",
+                "parameters": {
+                    "type": "object",
+                    "properties": {"query": {"type": "string", "description": "查询内容"}},
+                },
+            },
+        }
+        for i in range(TOOLS)
+    ]
+
+
+class StandInToolHandler:
+    """与统一工具处理器一致：工具描述缓存到工具变化为止"""
+
+    def __init__(self, functions):
+        self._functions = functions
+        self._schema = None
+
+    def get_functions(self):
+        return self._functions
+
+    def get_tool_schema(self):
+        if self._schema is None:
+            self._schema = compile_tool_schema(self._functions)
+        return self._schema
+
+
+def _legacy_turn(provider, conn, cached_prompt):
+    """改造前：每轮复制工具列表，并重新拼接音乐列表和设备列表"""
+    functions = list(conn.func_handler.get_functions())
+    functions.append(DIRECT_ANSWER_TOOL)
+    music_config = play_music.initialize_music_handler(conn)
+    prompt = f"{cached_prompt}\n<musicNames>{music_config['music_file_names']}\n</musicNames>"
+    devices = conn.config["plugins"]["home_assistant"]["devices"]
+    hass_prompt = "\n下面是我家智能设备列表（位置，设备名，entity_id），可以通过homeassistant控制\n"
+    for device in devices:
+        hass_prompt += device + "\n"
+    return functions, prompt + hass_prompt
+
+
+def _artifact_turn(provider, conn):
+    functions = conn.func_handler.get_tool_schema().with_tool(DIRECT_ANSWER_TOOL)
+    return functions, provider._compiled_system_prompt(conn)
+
+
+def _bench():
+    play_music.MUSIC_CACHE.update(
+        {
+            "music_dir": "./music",
+            "music_ext": (".mp3",),
+            "refresh_time": 60,
+            "music_files": [f"歌曲{i}.mp3" for i in range(MUSIC_FILES)],
+            "music_file_names": [f"歌曲{i}" for i in range(MUSIC_FILES)],
+            "scan_time": time.time(),
+            "version": 1,
+        }
+    )
+    config = {"plugins": {"home_assistant": {"devices": [f"客厅,灯{i},light.l{i}" for i in range(DEVICES)]}}}
+    provider = IntentProvider({})
+    rows = []
+    for mode, name in [("legacy", "每轮重建"), ("artifact", "按版本共享")]:
+        artifact_store.clear()
+        prompts = []
+        tool_lists = []
+        start = time.perf_counter()
+        for _ in range(CONNECTIONS):
+            # 每个连接有自己的工具处理器，工具集合相同
+            conn = SimpleNamespace(func_handler=StandInToolHandler(_functions()), config=config)
+            cached_prompt = provider.get_intent_system_prompt(conn.func_handler.get_functions())
+            for _ in range(TURNS):
+                if mode == "legacy":
+                    functions, prompt = _legacy_turn(provider, conn, cached_prompt)
+                else:
+                    functions, prompt = _artifact_turn(provider, conn)
+                prompts.append(prompt)
+                tool_lists.append(functions)
+        elapsed = time.perf_counter() - start
+        rows.append(
+            [
+                name,
+                f"{elapsed / (CONNECTIONS * TURNS) * 1000:.3f}",
+                len({id(p) for p in prompts}),
+                len({id(f) for f in tool_lists}),
+                len(set(prompts)),
+            ]
+        )
+    return rows
+
+
+async def main():
+    rows = await asyncio.to_thread(_bench)
+    headers = ["方式", "单轮准备耗时(ms)", "提示词对象份数", "工具列表对象份数", "提示词内容种数"]
+    print(f"{CONNECTIONS}个连接×{TURNS}轮，{TOOLS}个工具，{MUSIC_FILES}首音乐，{DEVICES}个智能设备")
+    print(tabulate(rows, headers=headers, tablefmt="github"))
+    print(f"产物缓存统计: {artifact_store.stats()}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,190 @@
+import json
+import time
+import asyncio
+import logging
+import statistics
+from datetime import datetime, timedelta
+from aiohttp import web
+from tabulate import tabulate
+from core.utils import dialogue as dialogue_module
+from core.utils.dialogue import Dialogue, Message
+from core.providers.llm.openai.openai import LLMProvider
+from core.utils.http_pool import close_http_clients
+
+# 设置全局日志级别为WARNING，抑制INFO级别日志
+logging.basicConfig(level=logging.WARNING)
+
+description = "提示词前缀缓存布局对比：多轮对话的输入缓存命中率与首字延迟（本地模拟带前缀缓存的OpenAI接口）"
+
+# 对话轮数，每轮间隔的模拟时间（分钟）
+TURNS = 12
+MINUTES_PER_TURN = 1
+# 模拟服务：每个token的预填充耗时，前缀缓存按块命中
+PREFILL_MS_PER_TOKEN = 0.08
+CHARS_PER_TOKEN = 1.5
+CACHE_BLOCK_TOKENS = 16
+HOST = "127.0.0.1"
+PORT = 18772
+
+
+class FakeClock:
+    """按轮推进的模拟时钟，替换对话模块中的当前时间"""
+
+    start = datetime(2025, 1, 1, 9, 0)
+    offset = timedelta()
+
+    @classmethod
+    def now(cls):
+        return cls.start + cls.offset
+
+
+class StandInServer:
+    """本地模拟的OpenAI流式接口：按最长公共前缀模拟前缀缓存，未命中部分按token计预填充耗时"""
+
+    def __init__(self):
+        self.history = []
+        # 每个请求的 (命中缓存token数, 输入token数)
+        self.usages = []
+
+    @staticmethod
+    def _prompt_text(body):
+        # 工具描述在消息之前，与服务端拼接 prompt 的顺序一致
+        return json.dumps(body.get("tools"), ensure_ascii=False) + json.dumps(
+            body["messages"], ensure_ascii=False
+        )
+
+    async def completions(self, request):
+        body = await request.json()
+        prompt = self._prompt_text(body)
+        best = 0
+        for previous in self.history:
+            n = 0
+            limit = min(len(previous), len(prompt))
+            while n < limit and previous[n] == prompt[n]:
+                n += 1
+            best = max(best, n)
+        self.history.append(prompt)
+        prompt_tokens = int(len(prompt) / CHARS_PER_TOKEN)
+        cached = int(best / CHARS_PER_TOKEN) // CACHE_BLOCK_TOKENS * CACHE_BLOCK_TOKENS
+        self.usages.append((cached, prompt_tokens))
+        await asyncio.sleep((prompt_tokens - cached) * PREFILL_MS_PER_TOKEN / 1000)
+
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await response.prepare(request)
+        chunk = {
+            "id": "bench",
+            "object": "chat.completion.chunk",
+            "created": 0,
+            "model": "mock",
+            "choices": [{"index": 0, "delta": {"content": "好的"}, "finish_reason": "stop"}],
+        }
+        await response.write(f"data: {json.dumps(chunk)}\n\n".encode())
+        usage = {
+            "id": "bench",
+            "object": "chat.completion.chunk",
+            "created": 0,
+            "model": "mock",
+            "choices": [],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": 1,
+                "total_tokens": prompt_tokens + 1,
+                "prompt_tokens_details": {"cached_tokens": cached},
+            },
+        }
+        await response.write(f"data: {json.dumps(usage)}\n\n".encode())
+        await response.write(b"data: [DONE]\n\n")
+        return response
+
+
+def _build_dialogue(cache_friendly):
+    dialogue = Dialogue(cache_friendly=cache_friendly)
+    with open("agent-base-prompt.txt", "r", encoding="utf-8") as f:
+        dialogue.update_system_message(f.read())
+    # few-shot 示例
+    dialogue.put(Message(role="user", content="给我讲个故事吧", is_temporary=True))
+    dialogue.put(Message(role="assistant", content="好呀，你想听什么类型的呀？", is_temporary=True))
+    return dialogue
+
+
+async def _run(cache_friendly, provider, server):
+    server.history = []
+    server.usages = []
+    dialogue = _build_dialogue(cache_friendly)
+    tools = [
+        {
+            "type": "function",
+            "function": {
+                "name": f"tool_{i}",
+                "description": f"示例工具{i}，用于模拟工具描述占用的输入长度" * 3,
+                "parameters": {"type": "object", "properties": {"q": {"type": "string"}}},
+            },
+        }
+        for i in range(8)
+    ]
+    voiceprint = {"speakers": ["A,张三,测试说话人"]}
+    ttfts = []
+    for turn in range(TURNS):
+        FakeClock.offset = timedelta(minutes=turn * MINUTES_PER_TURN)
+        dialogue.put(Message(role="user", content=f"第{turn + 1}个问题，帮我想想今天做什么"))
+        messages = dialogue.get_llm_dialogue_with_memory(
+            f"用户喜欢爬山；最近一次聊到第{turn}个话题",
+            voiceprint,
+            "张三" if turn == 0 else None,
+        )
+        start = time.monotonic()
+        first = None
+        async for _ in provider.response_stream_with_functions("bench", messages, tools):
+            if first is None:
+                first = time.monotonic() - start
+        ttfts.append(first)
+        dialogue.put(Message(role="assistant", content=f"第{turn + 1}个回答，去公园走走吧"))
+
+    # 首轮没有可复用的前缀，从第2轮开始统计
+    cached = sum(c for c, _ in server.usages[1:])
+    prompt_tokens = sum(p for _, p in server.usages[1:])
+    return [
+        f"{cached / prompt_tokens:.0%}",
+        prompt_tokens - cached,
+        f"{statistics.mean(ttfts[1:]) * 1000:.1f}",
+    ]
+
+
+async def main():
+    server = StandInServer()
+    app = web.Application()
+    app.router.add_post("/v1/chat/completions", server.completions)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, HOST, PORT).start()
+
+    dialogue_module.datetime = FakeClock
+    provider = LLMProvider(
+        {
+            "model_name": "mock",
+            "api_key": "sk-benchmark",
+            "base_url": f"http://{HOST}:{PORT}/v1",
+            "stream_usage": True,
+        }
+    )
+    rows = []
+    try:
+        # 预热连接，避免首个请求的建连耗时计入对比
+        await _run(False, provider, server)
+        for cache_friendly, name in [(False, "原布局"), (True, "前缀缓存布局")]:
+            rows.append([name] + await _run(cache_friendly, provider, server))
+    finally:
+        dialogue_module.datetime = datetime
+        await close_http_clients()
+        await runner.cleanup()
+
+    headers = ["布局", "输入命中缓存比例", "未命中输入token合计", "平均首字延迟(ms)"]
+    print(
+        f"{TURNS}轮对话（统计第2轮起），每轮间隔{MINUTES_PER_TURN}分钟，记忆每轮变化，"
+        f"模拟预填充{PREFILL_MS_PER_TOKEN}ms/token"
+    )
+    print(tabulate(rows, headers=headers, tablefmt="github"))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
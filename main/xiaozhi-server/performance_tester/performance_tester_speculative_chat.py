@@ -0,0 +1,99 @@
+import time
+import asyncio
+import logging
+import statistics
+from tabulate import tabulate
+from core.utils.speculative_stream import SpeculativeStream
+
+# 设置全局日志级别为WARNING，抑制INFO级别日志
+logging.basicConfig(level=logging.WARNING)
+
+description = "意图识别与主LLM并发对比：先识别意图再发起对话 与 识别期间预先发起对话 的首字播报延迟及被取消请求的浪费"
+
+# 模拟耗时（秒）：意图识别LLM往返、主LLM首字延迟、后续每段间隔
+INTENT_SECONDS = 0.6
+CHAT_TTFT_SECONDS = 0.5
+CHAT_TOKEN_SECONDS = 0.03
+CHAT_TOKENS = 40
+# 每10轮中识别为普通对话的轮数，其余为播放音乐等工具意图
+CHAT_TURNS_PER_10 = 8
+ROUNDS = 20
+
+
+class StandInLLM:
+    """模拟的流式LLM，记录实际生成的段数"""
+
+    def __init__(self):
+        self.generated = 0
+
+    async def stream(self):
+        await asyncio.sleep(CHAT_TTFT_SECONDS)
+        for i in range(CHAT_TOKENS):
+            if i:
+                await asyncio.sleep(CHAT_TOKEN_SECONDS)
+            self.generated += 1
+            yield "字"
+
+
+async def _detect_intent(is_chat):
+    await asyncio.sleep(INTENT_SECONDS)
+    return "continue_chat" if is_chat else "play_music"
+
+
+async def _turn(llm, is_chat, speculative_mode):
+    """返回从收到用户文本到第一段送TTS的耗时，非对话意图返回 None"""
+    start = time.monotonic()
+    speculative = None
+    if speculative_mode:
+        async def open_stream():
+            return llm.stream()
+
+        speculative = SpeculativeStream(asyncio.get_running_loop(), open_stream)
+    intent = await _detect_intent(is_chat)
+    if intent != "continue_chat":
+        if speculative is not None:
+            speculative.cancel()
+        return None
+    stream = speculative.iterate() if speculative is not None else llm.stream()
+    first = None
+    async for _ in stream:
+        if first is None:
+            first = time.monotonic() - start
+    return first
+
+
+async def _run(speculative_mode):
+    llm = StandInLLM()
+    latencies = []
+    for i in range(ROUNDS):
+        is_chat = i % 10 < CHAT_TURNS_PER_10
+        first = await _turn(llm, is_chat, speculative_mode)
+        if first is not None:
+            latencies.append(first)
+    # 等待被取消的请求结束
+    await asyncio.sleep(0.05)
+    chat_turns = len(latencies)
+    wasted = llm.generated - chat_turns * CHAT_TOKENS
+    return [
+        f"{statistics.mean(latencies) * 1000:.0f}",
+        f"{max(latencies) * 1000:.0f}",
+        ROUNDS - chat_turns,
+        wasted,
+    ]
+
+
+async def main():
+    rows = []
+    for speculative_mode, name in [(False, "先识别意图再发起对话"), (True, "识别期间预先发起对话")]:
+        rows.append([name] + await _run(speculative_mode))
+
+    headers = ["方式", "普通对话首字平均(ms)", "首字最长(ms)", "工具意图轮数", "被取消请求多生成的段数"]
+    print(
+        f"{ROUNDS}轮，其中每10轮{CHAT_TURNS_PER_10}轮为普通对话；意图识别{INTENT_SECONDS * 1000:.0f}ms，"
+        f"主LLM首字{CHAT_TTFT_SECONDS * 1000:.0f}ms"
+    )
+    print(tabulate(rows, headers=headers, tablefmt="github"))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
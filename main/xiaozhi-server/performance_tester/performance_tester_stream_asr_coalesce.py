@@ -0,0 +1,109 @@
+import time
+import asyncio
+import logging
+import statistics
+import websockets
+from tabulate import tabulate
+from core.providers.asr.coalesce import FrameCoalescer
+
+# 设置全局日志级别为WARNING，抑制INFO级别日志
+logging.basicConfig(level=logging.WARNING)
+
+description = "流式ASR上行音频合包前后的消息数与断句延迟对比（本地模拟流式ASR服务）"
+
+# 设备帧间隔（秒）和每帧PCM大小（60ms 16kHz 16bit）
+FRAME_SECONDS = 0.06
+FRAME = b"\1" * 1920
+SILENCE = b"\0" * 1920
+# 每个说话人：说话帧数 + 句尾静音帧数
+VOICE_FRAMES = 40
+SILENCE_FRAMES = 10
+# 并发说话人数
+SPEAKERS = 20
+# 合包配置：(名称, 配置)
+CASES = [
+    ("逐帧发送", {"coalesce_ms": 0}),
+    ("合包120ms", {"coalesce_ms": 120}),
+    ("合包180ms", {"coalesce_ms": 180}),
+    ("按RTT自适应", {"coalesce_adaptive": "true"}),
+]
+HOST = "127.0.0.1"
+PORT = 18768
+
+
+class StandInServer:
+    """本地模拟的流式ASR服务：统计消息数，记录收到首个静音字节的时间"""
+
+    def __init__(self):
+        self.messages = 0
+        self.silence_lags = []
+        self.audio_lags = []
+
+    async def handle(self, ws):
+        # 客户端先发送各帧的产生时间，之后按字节偏移推算每段音频的延迟
+        frame_times = []
+        received = 0
+        silence_seen = False
+        try:
+            async for message in ws:
+                if isinstance(message, str):
+                    frame_times.append(float(message))
+                    continue
+                now = time.monotonic()
+                self.messages += 1
+                first_frame = received // len(FRAME)
+                received += len(message)
+                self.audio_lags.append(now - frame_times[first_frame])
+                if not silence_seen and b"\0" in message:
+                    silence_seen = True
+                    self.silence_lags.append(now - frame_times[VOICE_FRAMES])
+        except websockets.ConnectionClosed:
+            pass
+
+
+async def _speaker(config):
+    coalescer = FrameCoalescer.from_config(config)
+    async with websockets.connect(f"ws://{HOST}:{PORT}") as ws:
+        await coalescer.measure_rtt(ws)
+        for i in range(VOICE_FRAMES + SILENCE_FRAMES):
+            have_voice = i < VOICE_FRAMES
+            await ws.send(str(time.monotonic()))
+            chunk = coalescer.push(FRAME if have_voice else SILENCE, have_voice)
+            if chunk:
+                await ws.send(chunk)
+            await asyncio.sleep(FRAME_SECONDS)
+        chunk = coalescer.flush()
+        if chunk:
+            await ws.send(chunk)
+    return coalescer.chunk_ms
+
+
+async def main():
+    rows = []
+    for name, config in CASES:
+        server = StandInServer()
+        async with websockets.serve(server.handle, HOST, PORT):
+            chunk_ms = await asyncio.gather(*[_speaker(config) for _ in range(SPEAKERS)])
+        rows.append(
+            [
+                name,
+                max(chunk_ms),
+                server.messages // SPEAKERS,
+                f"{statistics.mean(server.silence_lags) * 1000:.1f}",
+                f"{statistics.mean(server.audio_lags) * 1000:.1f}",
+            ]
+        )
+
+    headers = [
+        "方式",
+        "合包时长(ms)",
+        "每句音频消息数",
+        "静音到达服务端延迟(ms)",
+        "音频块平均延迟(ms)",
+    ]
+    print(f"每句{VOICE_FRAMES}帧语音+{SILENCE_FRAMES}帧静音，{SPEAKERS}个说话人并发")
+    print(tabulate(rows, headers=headers, tablefmt="github"))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
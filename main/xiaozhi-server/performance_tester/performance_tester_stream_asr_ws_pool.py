@@ -0,0 +1,113 @@
+import time
+import asyncio
+import logging
+import statistics
+import websockets
+from tabulate import tabulate
+from core.providers.asr.ws_pool import WarmSocketPool
+
+# 设置全局日志级别为WARNING，抑制INFO级别日志
+logging.basicConfig(level=logging.WARNING)
+
+description = "流式ASR预热连接池与每句新建连接的首包延迟对比（本地模拟流式ASR服务）"
+
+# 模拟的网络往返时间（秒），TCP+TLS+WebSocket升级约需3个往返，协议初始化再1个往返
+RTT_SECONDS = [0.02, 0.05, 0.1]
+HANDSHAKE_ROUND_TRIPS = 3
+# 每组测试的句数
+UTTERANCES = 20
+# 句与句之间的间隔（秒），留出后台补充连接的时间
+GAP_SECONDS = 0.5
+HOST = "127.0.0.1"
+PORT = 18767
+
+
+class StandInServer:
+    """本地模拟的流式ASR服务：握手和初始化都注入网络延迟"""
+
+    def __init__(self):
+        self.rtt = 0.0
+        self.connections = 0
+
+    async def process_request(self, connection, request):
+        # 模拟TCP、TLS和WebSocket升级的往返
+        await asyncio.sleep(self.rtt * HANDSHAKE_ROUND_TRIPS)
+        return None
+
+    async def handle(self, ws):
+        self.connections += 1
+        try:
+            # 初始化请求：等待一个往返后回复就绪
+            await ws.recv()
+            await asyncio.sleep(self.rtt)
+            await ws.send("ready")
+            async for _ in ws:
+                pass
+        except websockets.ConnectionClosed:
+            pass
+
+
+async def _open_session():
+    """建立连接并完成初始化，与豆包流式ASR的 _open_session 一致"""
+    ws = await websockets.connect(
+        f"ws://{HOST}:{PORT}", ping_interval=None, ping_timeout=None
+    )
+    await ws.send("init")
+    await ws.recv()
+    return ws
+
+
+async def _run(pool):
+    """返回检测到说话到发出第一个音频包的耗时"""
+    latencies = []
+    if pool is not None:
+        pool.prewarm(_open_session)
+        await asyncio.sleep(GAP_SECONDS)
+    for _ in range(UTTERANCES):
+        start = time.monotonic()
+        if pool is not None:
+            ws = await pool.acquire(_open_session)
+        else:
+            ws = await _open_session()
+        await ws.send(b"\0" * 640)
+        latencies.append(time.monotonic() - start)
+        await ws.close()
+        await asyncio.sleep(GAP_SECONDS)
+    return latencies
+
+
+async def main():
+    server = StandInServer()
+    rows = []
+    async with websockets.serve(
+        server.handle, HOST, PORT, process_request=server.process_request
+    ):
+        for rtt in RTT_SECONDS:
+            server.rtt = rtt
+            cold = await _run(None)
+            pool = WarmSocketPool("benchmark", size=1, max_idle_seconds=8)
+            warm = await _run(pool)
+            stats = pool.stats()
+            await pool.close()
+            rows.append(
+                [
+                    f"{rtt * 1000:.0f}",
+                    f"{statistics.median(cold) * 1000:.1f}",
+                    f"{statistics.median(warm) * 1000:.1f}",
+                    f"{(statistics.mean(cold) - statistics.mean(warm)) * 1000:.1f}",
+                    f"{stats['hits']}/{stats['hits'] + stats['misses']}",
+                ]
+            )
+
+    headers = [
+        "RTT(ms)",
+        "每句新建连接P50(ms)",
+        "预热连接池P50(ms)",
+        "平均每句节省(ms)",
+        "命中/取用",
+    ]
+    print(tabulate(rows, headers=headers, tablefmt="github"))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
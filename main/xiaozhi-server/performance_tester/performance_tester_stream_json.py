@@ -0,0 +1,136 @@
+import re
+import json
+import time
+import random
+import asyncio
+import logging
+from tabulate import tabulate
+from core.utils.stream_json import JsonFieldStream
+
+# 设置全局日志级别为WARNING，抑制INFO级别日志
+logging.basicConfig(level=logging.WARNING)
+
+description = "direct_answer流式参数解析对比：每段都重新提取全部参数 与 增量JSON解析 的累计CPU耗时和单段最大耗时"
+
+# 回复长度（字符）
+RESPONSE_LENGTHS = [200, 1000, 4000, 8000]
+# 模拟LLM每段输出的参数字符数
+CHUNK_MIN = 1
+CHUNK_MAX = 6
+_DA_STREAM_BUFFER = 5
+
+
+def _legacy_extract(arguments_str):
+    """改造前的 _extract_direct_answer_response：每次处理完整的参数字符串"""
+    try:
+        data = json.loads(arguments_str)
+        if isinstance(data, dict) and "response" in data:
+            return data["response"]
+    except (json.JSONDecodeError, TypeError):
+        pass
+    marker = '"response": "'
+    idx = arguments_str.find(marker)
+    if idx < 0:
+        marker = '"response":"'
+        idx = arguments_str.find(marker)
+    if idx < 0:
+        return ""
+    raw = arguments_str[idx + len(marker):]
+    if raw.endswith('"}'):
+        raw = raw[:-2]
+    elif raw.endswith('"'):
+        raw = raw[:-1]
+    return raw.replace('\\"', '"').replace('\\n', '\n').replace('\\\\', '\\')
+
+
+def _legacy_clean(text):
+    garbage_chars = frozenset('")\'}）')
+    lines = [
+        line
+        for line in text.split("\n")
+        if not (line.strip() and len(line.strip()) <= 8 and all(c in garbage_chars for c in line.strip()))
+    ]
+    return re.sub(r'["\'}\]]+$', "", "\n".join(lines).rstrip()).rstrip()
+
+
+def _make_chunks(length):
+    sentence = '今天天气不错，我们去"公园"散步吧。\n'
+    text = (sentence * (length // len(sentence) + 1))[:length]
+    arguments = json.dumps({"response": text}, ensure_ascii=False)
+    chunks = []
+    i = 0
+    while i < len(arguments):
+        size = random.randint(CHUNK_MIN, CHUNK_MAX)
+        chunks.append(arguments[i:i + size])
+        i += size
+    return text, chunks
+
+
+def _run_legacy(chunks):
+    arguments = ""
+    sent = 0
+    streamed = []
+    worst = 0.0
+    for chunk in chunks:
+        start = time.perf_counter()
+        arguments += chunk
+        da_text = _legacy_extract(arguments)
+        if da_text and len(da_text) > sent:
+            safe_end = max(sent, len(da_text) - _DA_STREAM_BUFFER)
+            if safe_end > sent:
+                new_part = _legacy_clean(da_text[sent:safe_end])
+                if new_part:
+                    sent = safe_end
+                    streamed.append(new_part)
+        worst = max(worst, time.perf_counter() - start)
+    # 流结束后刷新缓冲区中剩余的部分
+    remaining = _legacy_clean(_legacy_extract(arguments)[sent:])
+    if remaining:
+        streamed.append(remaining)
+    return worst, streamed
+
+
+def _run_incremental(chunks):
+    parser = JsonFieldStream("response")
+    streamed = []
+    worst = 0.0
+    for chunk in chunks:
+        start = time.perf_counter()
+        text = parser.feed(chunk)
+        if text:
+            streamed.append(text)
+        worst = max(worst, time.perf_counter() - start)
+    return worst, streamed
+
+
+def _bench():
+    random.seed(0)
+    rows = []
+    for length in RESPONSE_LENGTHS:
+        text, chunks = _make_chunks(length)
+        for name, runner in [("每段全量重提取", _run_legacy), ("增量解析", _run_incremental)]:
+            start = time.perf_counter()
+            worst, streamed = runner(chunks)
+            total = time.perf_counter() - start
+            rows.append(
+                [
+                    length,
+                    len(chunks),
+                    name,
+                    f"{total * 1000:.2f}",
+                    f"{worst * 1000:.3f}",
+                    "是" if "".join(streamed) == text else "否",
+                ]
+            )
+    return rows
+
+
+async def main():
+    rows = await asyncio.to_thread(_bench)
+    headers = ["回复长度(字符)", "片段数", "方式", "累计耗时(ms)", "单段最大耗时(ms)", "流式文本与原文一致"]
+    print(f"每段{CHUNK_MIN}-{CHUNK_MAX}个字符，回复内容含引号与换行转义")
+    print(tabulate(rows, headers=headers, tablefmt="github"))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
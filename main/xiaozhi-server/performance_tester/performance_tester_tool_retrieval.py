@@ -0,0 +1,185 @@
+import json
+import time
+import asyncio
+import logging
+from tabulate import tabulate
+from core.utils.dialogue import estimate_tokens
+from core.utils.prompt_artifacts import artifact_store, compile_tool_schema
+from core.utils.tool_retrieval import ToolIndex, ToolRetriever
+
+# 设置全局日志级别为WARNING，抑制INFO级别日志
+logging.basicConfig(level=logging.WARNING)
+
+description = "工具筛选离线评估：标注问题集上 BM25 工具检索的召回率、每轮发送的工具数与工具描述token数"
+
+# 评估的 top_k 取值，始终保留的工具
+TOP_KS = [4, 8, 12]
+PINNED = ["handle_exit_intent"]
+
+
+def _tool(name, desc, **params):
+    return {
+        "type": "function",
+        "function": {
+            "name": name,
+            "description": desc,
+            "parameters": {
+                "type": "object",
+                "properties": {k: {"type": "string", "description": v} for k, v in params.items()},
+                "required": list(params),
+            },
+        },
+    }
+
+
+# 服务端插件（中文描述）、设备端MCP工具（英文描述）、HA及常见MCP服务工具
+TOOLS = [
+    _tool("handle_exit_intent", "当用户想结束对话或需要退出系统时调用", say_goodbye="和用户友好结束对话的告别语"),
+    _tool("play_music", "当用户要求播放音乐、歌曲时调用。", song_name="歌曲名称，如果用户没有指定具体歌名则为'random'"),
+    _tool("get_weather", "获取某个地点的天气，用户应提供一个位置，比如用户说杭州天气，参数为：杭州。", location="地点名，例如杭州", lang="返回用户使用的语言code"),
+    _tool("get_news_from_newsnow", "获取最新新闻，随机选择一条新闻进行播报。", source="新闻源，例如澎湃新闻、百度热搜", detail="是否获取详细内容"),
+    _tool("change_role", "当用户想切换角色/模型性格/助手名字时调用,可选的角色有：[机车女友,英语老师,好奇小男孩]", role_name="要切换的角色名字", role="要切换的角色的职业"),
+    _tool("web_search", "联网搜索实时信息，当用户询问最新事件、百科知识或需要查资料时调用", query="搜索关键词"),
+    _tool("get_lunar", "用于获取公历日期对应的农历、黄历、节气、生肖、宜忌等信息", date="要查询的日期", query="要查询的内容"),
+    _tool("search_from_ragflow", "用于从知识库中查询信息，回答产品手册、公司制度等问题", question="要查询的问题"),
+    _tool("hass_get_state", "获取智能家居设备的状态，例如灯是否打开、空调温度、窗帘位置", entity_id="需要查询的设备id"),
+    _tool("hass_set_state", "设置智能家居设备的状态，包括开关灯、调节灯亮度和颜色、调节空调温度、打开关闭窗帘", entity_id="设备id", state="要设置的状态"),
+    _tool("hass_play_music", "通过智能家居的媒体播放器播放音乐", media_content_id="歌曲或专辑名"),
+    _tool("self.get_device_status", "Provides the real-time information of the device, including the current status of the audio speaker, screen, battery, network, etc."),
+    _tool("self.audio_speaker.set_volume", "Set the volume of the audio speaker. If the current volume is unknown, you must call get_device_status first.", volume="An integer between 0 and 100"),
+    _tool("self.screen.set_brightness", "Set the brightness of the screen.", brightness="An integer between 0 and 100"),
+    _tool("self.screen.set_theme", "Set the theme of the screen. The theme can be light or dark.", theme="light or dark"),
+    _tool("self.camera.take_photo", "Take a photo and explain it. Use this tool after the user asks you to see something.", question="The question that you want to ask about the photo"),
+    _tool("self.battery.get_level", "Get the battery level and charging state of the device."),
+    _tool("self.network.get_wifi", "Get the wifi network name and signal strength."),
+    _tool("self.led.set_color", "Set the color of the RGB led strip on the device.", color="Color name or hex value"),
+    _tool("calendar.list_events", "List upcoming calendar events and schedule for a given day.", date="The day to list"),
+    _tool("calendar.create_event", "Create a calendar event with title and time.", title="Event title", start_time="Start time"),
+    _tool("reminder.create", "Create a reminder that notifies the user at the given time.", content="What to remind", time="When to remind"),
+    _tool("alarm.set", "Set an alarm clock for the given time.", time="Alarm time"),
+    _tool("alarm.cancel", "Cancel an existing alarm clock.", alarm_id="Alarm id"),
+    _tool("timer.start", "Start a countdown timer.", seconds="Duration in seconds"),
+    _tool("email.send", "Send an email to a contact.", to="Recipient", subject="Subject", body="Email body"),
+    _tool("email.list_unread", "List unread emails in the inbox."),
+    _tool("file.read", "Read the content of a file from the workspace.", path="File path"),
+    _tool("file.write", "Write content to a file in the workspace.", path="File path", content="Content"),
+    _tool("translate.text", "Translate text between languages, e.g. Chinese to English.", text="Text to translate", target="Target language"),
+    _tool("calculator.evaluate", "Evaluate a math expression and return the result.", expression="Math expression"),
+    _tool("stock.get_quote", "Get the latest stock price quote for a ticker symbol.", symbol="Ticker symbol"),
+    _tool("express.track", "Track an express delivery package by tracking number.", number="Tracking number"),
+    _tool("map.route", "Plan a driving or walking route between two places and estimate travel time.", origin="Start place", destination="End place"),
+    _tool("recipe.search", "Search cooking recipes by dish name or ingredients.", dish="Dish name"),
+    _tool("story.tell", "讲一个适合儿童的故事，可以指定主题", topic="故事主题"),
+    _tool("radio.play", "播放网络电台或广播节目", station="电台名称"),
+    _tool("podcast.play", "播放播客或有声书节目", title="节目名称"),
+    _tool("notes.add", "Add a note to the user's notebook.", content="Note content"),
+    _tool("notes.search", "Search notes in the user's notebook.", keyword="Keyword"),
+]
+
+# 标注的问题集：（用户问题, 期望调用的工具）
+QUERIES = [
+    ("我要睡觉了，再见", "handle_exit_intent"),
+    ("放一首周杰伦的晴天", "play_music"),
+    ("来点音乐", "play_music"),
+    ("明天北京天气怎么样", "get_weather"),
+    ("上海会下雨吗", "get_weather"),
+    ("今天有什么新闻", "get_news_from_newsnow"),
+    ("播报一下百度热搜", "get_news_from_newsnow"),
+    ("换成英语老师", "change_role"),
+    ("你切换成机车女友的角色吧", "change_role"),
+    ("帮我查一下最新的世界杯比分", "web_search"),
+    ("搜索一下量子计算是什么", "web_search"),
+    ("今天农历几号", "get_lunar"),
+    ("明天黄历宜忌是什么", "get_lunar"),
+    ("公司的请假制度是怎样的", "search_from_ragflow"),
+    ("产品手册里怎么重置设备", "search_from_ragflow"),
+    ("客厅的灯开着吗", "hass_get_state"),
+    ("空调现在多少度", "hass_get_state"),
+    ("把卧室的灯打开", "hass_set_state"),
+    ("关上客厅窗帘", "hass_set_state"),
+    ("把音量调到50", "self.audio_speaker.set_volume"),
+    ("声音大一点", "self.audio_speaker.set_volume"),
+    ("屏幕亮度调低一点", "self.screen.set_brightness"),
+    ("换成深色主题", "self.screen.set_theme"),
+    ("拍张照片看看我手里是什么", "self.camera.take_photo"),
+    ("还剩多少电量", "self.battery.get_level"),
+    ("连的是哪个wifi", "self.network.get_wifi"),
+    ("灯带改成红色", "self.led.set_color"),
+    ("我明天有什么日程", "calendar.list_events"),
+    ("帮我在日历上加一个下午三点的会议", "calendar.create_event"),
+    ("提醒我八点吃药", "reminder.create"),
+    ("定一个明早七点的闹钟", "alarm.set"),
+    ("取消明早的闹钟", "alarm.cancel"),
+    ("倒计时五分钟", "timer.start"),
+    ("给张三发邮件说我晚点到", "email.send"),
+    ("有没有未读邮件", "email.list_unread"),
+    ("读一下notes.txt文件", "file.read"),
+    ("把这句话翻译成英文", "translate.text"),
+    ("算一下123乘以456", "calculator.evaluate"),
+    ("苹果的股价多少", "stock.get_quote"),
+    ("我的快递到哪了", "express.track"),
+    ("从家开车到公司要多久", "map.route"),
+    ("红烧肉怎么做", "recipe.search"),
+    ("给我讲个小兔子的故事", "story.tell"),
+    ("我想听广播电台", "radio.play"),
+    ("播放有声书三体", "podcast.play"),
+    ("记一下明天要买牛奶", "notes.add"),
+]
+
+
+def _evaluate(schema, top_k):
+    retriever = ToolRetriever({"top_k": top_k, "min_tools": 0, "pinned": PINNED})
+    hits = 0
+    misses = []
+    sent_tools = 0
+    sent_tokens = 0
+    start = time.perf_counter()
+    for query, expected in QUERIES:
+        functions = retriever.select(schema, query)
+        names = [f["function"]["name"] for f in functions]
+        if expected in names:
+            hits += 1
+        else:
+            misses.append(query)
+        sent_tools += len(functions)
+        sent_tokens += estimate_tokens(json.dumps(functions, ensure_ascii=False))
+    elapsed = time.perf_counter() - start
+    count = len(QUERIES)
+    return [
+        f"top {top_k}",
+        f"{hits / count * 100:.1f}%",
+        f"{sent_tools / count:.1f}",
+        f"{sent_tokens / count:.0f}",
+        f"{elapsed / count * 1000:.3f}",
+    ], misses
+
+
+def _bench():
+    artifact_store.clear()
+    schema = compile_tool_schema(TOOLS)
+    start = time.perf_counter()
+    ToolIndex(TOOLS)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    full_tokens = estimate_tokens(json.dumps(TOOLS, ensure_ascii=False))
+    rows = [["全部工具", "100.0%", f"{len(TOOLS)}", f"{full_tokens}", "-"]]
+    all_misses = {}
+    for top_k in TOP_KS:
+        row, misses = _evaluate(schema, top_k)
+        rows.append(row)
+        all_misses[top_k] = misses
+    return rows, build_ms, all_misses
+
+
+async def main():
+    rows, build_ms, misses = await asyncio.to_thread(_bench)
+    headers = ["方式", "召回率", "平均发送工具数", "工具描述token数", "单次筛选耗时(ms)"]
+    print(f"{len(TOOLS)}个工具，{len(QUERIES)}条标注问题，固定保留: {PINNED}；建索引耗时 {build_ms:.2f}ms")
+    print(tabulate(rows, headers=headers, tablefmt="github"))
+    for top_k, queries in misses.items():
+        if queries:
+            print(f"top {top_k} 未召回: {queries}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,88 @@
+import os
+import time
+import asyncio
+import logging
+import numpy as np
+import onnxruntime
+from tabulate import tabulate
+
+# 设置全局日志级别为WARNING，抑制INFO级别日志
+logging.basicConfig(level=logging.WARNING)
+
+description = "Silero VAD 批量推理吞吐测试（帧/秒 vs batch大小）"
+
+MODEL_PATH = os.path.join(
+    "models", "snakers4_silero-vad", "src", "silero_vad", "data", "silero_vad.onnx"
+)
+BATCH_SIZES = [1, 2, 4, 8, 16, 32, 64, 128]
+# 每个batch大小下测试的总音频块数
+TOTAL_CHUNKS = 4096
+# 每个音频块的采样点数（512采样点 + 64上下文）
+INPUT_SAMPLES = 512 + 64
+
+
+def _create_session(intra_op_threads: int) -> onnxruntime.InferenceSession:
+    opts = onnxruntime.SessionOptions()
+    opts.inter_op_num_threads = 1
+    opts.intra_op_num_threads = intra_op_threads
+    return onnxruntime.InferenceSession(
+        MODEL_PATH, providers=["CPUExecutionProvider"], sess_options=opts
+    )
+
+
+def _bench_batch(session, batch_size: int) -> dict:
+    rng = np.random.default_rng(0)
+    inputs = (rng.standard_normal((batch_size, INPUT_SAMPLES)) * 0.1).astype(np.float32)
+    state = np.zeros((2, batch_size, 128), dtype=np.float32)
+    sr = np.array(16000, dtype=np.int64)
+    rounds = max(TOTAL_CHUNKS // batch_size, 1)
+
+    # 预热
+    session.run(None, {"input": inputs, "state": state, "sr": sr})
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        _, state = session.run(None, {"input": inputs, "state": state, "sr": sr})
+    elapsed = time.perf_counter() - start
+    chunks = rounds * batch_size
+    return {
+        "batch_size": batch_size,
+        "chunks_per_sec": chunks / elapsed,
+        "batch_ms": elapsed / rounds * 1000,
+        "per_chunk_us": elapsed / chunks * 1_000_000,
+    }
+
+
+async def main():
+    if not os.path.exists(MODEL_PATH):
+        print(f"模型文件不存在: {MODEL_PATH}，请在 main/xiaozhi-server 目录下运行")
+        return
+
+    rows = []
+    for intra_op_threads in (1, 2):
+        session = _create_session(intra_op_threads)
+        baseline = None
+        for batch_size in BATCH_SIZES:
+            result = await asyncio.to_thread(_bench_batch, session, batch_size)
+            if baseline is None:
+                baseline = result["chunks_per_sec"]
+            # 每个音频块为32ms音频，换算为可支撑的实时连接数
+            realtime_conns = result["chunks_per_sec"] * 0.032
+            rows.append(
+                [
+                    intra_op_threads,
+                    batch_size,
+                    f"{result['chunks_per_sec']:.0f}",
+                    f"{result['chunks_per_sec'] / baseline:.2f}x",
+                    f"{result['batch_ms']:.3f}",
+                    f"{result['per_chunk_us']:.1f}",
+                    f"{realtime_conns:.0f}",
+                ]
+            )
+
+    headers = ["intra_op线程", "batch大小", "帧/秒", "相对batch=1", "单批耗时(ms)", "单帧耗时(us)", "可支撑实时连接数"]
+    print(tabulate(rows, headers=headers, tablefmt="github"))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,141 @@
+import time
+import asyncio
+import logging
+import statistics
+import numpy as np
+from aiohttp import web
+from tabulate import tabulate
+from core.utils.pcm_buffer import PcmFrameBuffer
+from core.utils.audio_archive import pcm_to_wav
+from core.utils.voiceprint_provider import VoiceprintProvider, voiceprint_stats
+
+# 设置全局日志级别为WARNING，抑制INFO级别日志
+logging.basicConfig(level=logging.WARNING)
+
+description = "声纹识别缓存与提前识别对比：远程调用次数及说完话后等待声纹结果的时间（本地模拟声纹服务）"
+
+SAMPLE_RATE = 16000
+FRAME_SAMPLES = 960
+# 模拟声纹服务的识别耗时（秒）
+SERVER_PROCESS_SECONDS = 0.3
+# 对话轮次：(说话人, 说话时长秒)
+TURNS = [("A", 2.4), ("A", 3.0), ("A", 1.2), ("B", 2.4), ("B", 3.0), ("A", 2.4)]
+# 模拟的两个说话人：基频和共振峰
+VOICES = {"A": (120, (700, 1200, 2600)), "B": (230, (400, 2100, 3000))}
+HOST = "127.0.0.1"
+PORT = 18769
+
+
+def synthesize(speaker, seconds, rng):
+    """合成带共振峰的谐波语音，基频每轮有小幅抖动"""
+    f0, formants = VOICES[speaker]
+    f0 *= rng.uniform(0.95, 1.05)
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    signal = np.zeros_like(t)
+    for k in range(1, int(4000 / f0)):
+        freq = k * f0
+        gain = sum(np.exp(-(((freq - f) / 150) ** 2)) for f in formants) + 0.05
+        signal += gain * np.sin(2 * np.pi * freq * t + rng.uniform(0, 2 * np.pi))
+    # 4Hz 音节包络和少量噪声
+    signal *= 0.6 + 0.4 * np.sin(2 * np.pi * 4 * t) ** 2
+    signal += rng.normal(0, 0.02, len(t))
+    signal = signal / np.abs(signal).max() * 12000
+    return signal.astype(np.int16).tobytes()
+
+
+class StandInServer:
+    """本地模拟的声纹服务：按基频区分两个说话人"""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def health(self, request):
+        return web.json_response({"status": "healthy"})
+
+    async def identify(self, request):
+        self.calls += 1
+        form = await request.post()
+        wav = form["file"].file.read()
+        samples = np.frombuffer(wav[44:], dtype=np.int16).astype(np.float32)[:4096]
+        # 自相关估计基频
+        corr = np.correlate(samples, samples, mode="full")[len(samples) - 1 :]
+        min_lag, max_lag = SAMPLE_RATE // 400, SAMPLE_RATE // 70
+        window = corr[min_lag:max_lag]
+        # 取第一个接近最大值的峰，避免倍频误判
+        f0 = SAMPLE_RATE / (min_lag + np.argmax(window > window.max() * 0.9))
+        await asyncio.sleep(SERVER_PROCESS_SECONDS)
+        speaker_id = "A" if f0 < 175 else "B"
+        return web.json_response({"speaker_id": speaker_id, "score": 0.8})
+
+
+async def _run(mode, utterances):
+    config = {
+        "url": f"http://{HOST}:{PORT}/voiceprint?key=test",
+        "speakers": ["A,张三,测试说话人A", "B,李四,测试说话人B"],
+        "cache_half_life_seconds": 30 if mode != "baseline" else 0,
+        "early_start_seconds": 1.5 if mode == "cache_early" else 0,
+    }
+    # 初始化时同步做健康检查，放到线程中避免阻塞本地模拟服务
+    provider = await asyncio.to_thread(VoiceprintProvider, config)
+    waits, names = [], []
+    for pcm in utterances:
+        buffer = PcmFrameBuffer()
+        frame_bytes = FRAME_SAMPLES * 2
+        for offset in range(0, len(pcm), frame_bytes):
+            buffer.append(pcm[offset : offset + frame_bytes])
+            provider.maybe_start_early(buffer, buffer.nbytes, "benchmark")
+            await asyncio.sleep(FRAME_SAMPLES / SAMPLE_RATE)
+        start = time.monotonic()
+        if mode == "baseline":
+            name = await provider.identify_speaker(pcm_to_wav(buffer.to_bytes()), "benchmark")
+        else:
+            name = await provider.identify(buffer.to_bytes(), "benchmark")
+        waits.append(time.monotonic() - start)
+        names.append(name)
+        provider.reset_utterance()
+    return waits, names
+
+
+async def main():
+    server = StandInServer()
+    app = web.Application()
+    app.router.add_get("/voiceprint/health", server.health)
+    app.router.add_post("/voiceprint/identify", server.identify)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, HOST, PORT).start()
+
+    rng = np.random.default_rng(0)
+    utterances = [synthesize(speaker, seconds, rng) for speaker, seconds in TURNS]
+    expected = ["张三" if speaker == "A" else "李四" for speaker, _ in TURNS]
+
+    rows = []
+    try:
+        for mode, name in [
+            ("baseline", "每轮远程识别"),
+            ("cache", "缓存"),
+            ("cache_early", "缓存+提前识别"),
+        ]:
+            server.calls = 0
+            waits, names = await _run(mode, utterances)
+            correct = sum(a == b for a, b in zip(names, expected))
+            rows.append(
+                [
+                    name,
+                    f"{server.calls}/{len(TURNS)}",
+                    f"{statistics.mean(waits) * 1000:.0f}",
+                    f"{max(waits) * 1000:.0f}",
+                    f"{correct}/{len(TURNS)}",
+                ]
+            )
+    finally:
+        await runner.cleanup()
+
+    headers = ["方式", "远程调用/轮次", "说完后平均等待(ms)", "最长等待(ms)", "识别正确"]
+    print(f"模拟声纹服务识别耗时 {SERVER_PROCESS_SECONDS * 1000:.0f}ms，轮次: {TURNS}")
+    print(tabulate(rows, headers=headers, tablefmt="github"))
+    print(f"累计统计: {voiceprint_stats.snapshot()}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -147,6 +147,7 @@ def map_category(category_text):
     "get_news_from_chinanews",
     GET_NEWS_FROM_CHINANEWS_FUNCTION_DESC,
     ToolType.SYSTEM_CTL,
+    early_execute=True,
 )
 async def get_news_from_chinanews(
     conn: "ConnectionHandler",
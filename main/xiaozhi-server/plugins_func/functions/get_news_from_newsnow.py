@@ -172,6 +172,7 @@ async def fetch_news_detail(url):
     "get_news_from_newsnow",
     GET_NEWS_FROM_NEWSNOW_FUNCTION_DESC,
     ToolType.SYSTEM_CTL,
+    early_execute=True,
 )
 async def get_news_from_newsnow(
     conn: "ConnectionHandler",
@@ -30,7 +30,7 @@ get_lunar_function_desc = {
 }
 
 
-@register_function("get_lunar", get_lunar_function_desc, ToolType.WAIT)
+@register_function("get_lunar", get_lunar_function_desc, ToolType.WAIT, early_execute=True)
 def get_lunar(date=None, query=None):
     """
     用于获取当前的阴历/农历，和天干地支、节气、生肖、星座、八字、宜忌等黄历信息
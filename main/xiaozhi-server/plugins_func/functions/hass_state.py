@@ -70,7 +70,7 @@ hass_set_state_function_desc = {
 }
 
 
-@register_function("hass_get_state", hass_get_state_function_desc, ToolType.SYSTEM_CTL)
+@register_function("hass_get_state", hass_get_state_function_desc, ToolType.SYSTEM_CTL, early_execute=True)
 async def hass_get_state(conn: "ConnectionHandler", entity_id=""):
     try:
         ha_response = await handle_hass_get_state(conn, entity_id)
@@ -95,6 +95,18 @@ def get_music_files(music_dir, music_ext):
     return music_files, music_file_names
 
 
+def _scan_music_files():
+    """扫描音乐目录，歌曲列表有变化时递增版本号（意图识别提示词据此失效重建）"""
+    music_files, music_file_names = get_music_files(
+        MUSIC_CACHE["music_dir"], MUSIC_CACHE["music_ext"]
+    )
+    if music_file_names != MUSIC_CACHE.get("music_file_names"):
+        MUSIC_CACHE["version"] = MUSIC_CACHE.get("version", 0) + 1
+    MUSIC_CACHE["music_files"] = music_files
+    MUSIC_CACHE["music_file_names"] = music_file_names
+    MUSIC_CACHE["scan_time"] = time.time()
+
+
 def initialize_music_handler(conn: "ConnectionHandler"):
     global MUSIC_CACHE
     if MUSIC_CACHE == {}:
@@ -115,10 +127,7 @@ def initialize_music_handler(conn: "ConnectionHandler"):
             MUSIC_CACHE["music_ext"] = (".mp3", ".wav", ".p3")
             MUSIC_CACHE["refresh_time"] = 60
         # 获取音乐文件列表
-        MUSIC_CACHE["music_files"], MUSIC_CACHE["music_file_names"] = get_music_files(
-            MUSIC_CACHE["music_dir"], MUSIC_CACHE["music_ext"]
-        )
-        MUSIC_CACHE["scan_time"] = time.time()
+        _scan_music_files()
     return MUSIC_CACHE
 
 
@@ -134,10 +143,7 @@ async def handle_music_command(conn: "ConnectionHandler", text):
     if os.path.exists(MUSIC_CACHE["music_dir"]):
         if time.time() - MUSIC_CACHE["scan_time"] > MUSIC_CACHE["refresh_time"]:
             # 刷新音乐文件列表
-            MUSIC_CACHE["music_files"], MUSIC_CACHE["music_file_names"] = (
-                get_music_files(MUSIC_CACHE["music_dir"], MUSIC_CACHE["music_ext"])
-            )
-            MUSIC_CACHE["scan_time"] = time.time()
+            _scan_music_files()
 
         potential_song = _extract_song_name(clean_text)
         if potential_song:
@@ -26,7 +26,10 @@ SEARCH_FROM_RAGFLOW_FUNCTION_DESC = {
 
 
 @register_function(
-    "search_from_ragflow", SEARCH_FROM_RAGFLOW_FUNCTION_DESC, ToolType.SYSTEM_CTL
+    "search_from_ragflow",
+    SEARCH_FROM_RAGFLOW_FUNCTION_DESC,
+    ToolType.SYSTEM_CTL,
+    early_execute=True,
 )
 async def search_from_ragflow(conn: "ConnectionHandler", question=None):
     # 确保字符串参数正确处理编码
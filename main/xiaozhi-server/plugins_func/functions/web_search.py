@@ -112,7 +112,7 @@ async def _search_tavily(api_key: str, query: str, max_results: int) -> str:
     return "\n".join(lines)
 
 
-@register_function("web_search", WEB_SEARCH_FUNCTION_DESC, ToolType.SYSTEM_CTL)
+@register_function("web_search", WEB_SEARCH_FUNCTION_DESC, ToolType.SYSTEM_CTL, early_execute=True)
 async def web_search(conn: "ConnectionHandler", query: str = None):
     logger.bind(tag=TAG).info(f"web_search 被调用 | query={query}")
     if not query:
@@ -43,11 +43,13 @@ class ActionResponse:
 
 
 class FunctionItem:
-    def __init__(self, name, description, func, type):
+    def __init__(self, name, description, func, type, early_execute=False):
         self.name = name
         self.description = description
         self.func = func
         self.type = type
+        # 是否允许在LLM流式输出未结束、参数已完整时提前执行（仅限幂等/只读的工具）
+        self.early_execute = early_execute
 
 
 class DeviceTypeRegistry:
@@ -82,11 +84,11 @@ all_function_registry = {}
 module_func_map = {}
 
 
-def register_function(name, desc, type=None):
+def register_function(name, desc, type=None, early_execute=False):
     """注册函数到函数注册字典的装饰器"""
 
     def decorator(func):
-        all_function_registry[name] = FunctionItem(name, desc, func, type)
+        all_function_registry[name] = FunctionItem(name, desc, func, type, early_execute)
         # 记录模块名到函数名的映射，用于 expand 模块级别的插件配置
         module_name = func.__module__.split(".")[-1]
         module_func_map.setdefault(module_name, []).append(name)